@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Remote batch runner for cloud_exec_para.py (--remote-batch mode)
+
+Uploaded to the instance together with a JSON manifest and started detached
+(nohup setsid), so the whole workload list runs without any host round-trip.
+The host only follows the status stream and may disconnect/reconnect at any
+time (e.g. laptop sleep); the run continues regardless.
+
+Manifest (written by cloud_exec_para.py):
+    {
+      "steps": [{"index": 1, "cmd": "...", "kind": "setup" | "workload",
+                 "fingerprint": "..."}, ...],   # fingerprint: setup steps only
+      "post_process": ["...", ...],
+      "setup_count": 5,
+      "workload_timeout": 10800,
+      "workload_timeout_limit": 1,
+      "workload_error_limit": 2,
+      "reports_dir": "~/cloud_onehour/results",
+      "fingerprint_file": "~/.cloud_exec_setup_fingerprints",
+      "error_count": 0,          # carried over when resuming (--resume)
+      "timeout_count": 0,
+      "prefetch": "..." | null   # started (self-detaching) before the first workload
+    }
+
+Status stream: <state_dir>/status.jsonl, one JSON object per line:
+    {"seq": N, "event": "start" | "end" | "post_start" | "post_end" | "done", ...}
+
+Semantics mirror the host-driven loop in run_ssh_commands():
+- setup step failure: fatal, stop immediately (post_process is skipped)
+- workload failure: counted against workload_error_limit; when reached the
+  remaining workloads are skipped and post_process still runs
+- workload timeout: counted against workload_timeout_limit; exceeding it
+  stops immediately (post_process is skipped)
+- setup step whose fingerprint is already in fingerprint_file: skipped
+  (reported as SUCCESS with "skipped": true); recorded there after success
+- prefetch (lookahead download service): run once right before the first
+  workload step; its failure never affects the batch
+
+Requires only the Python 3 standard library (runs before setup installs anything).
+
+Usage:
+    python3 cloud_batch_runner.py <manifest.json> [--state-dir DIR]
+"""
+
+import argparse
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+DEFAULT_STATE_DIR = "/tmp/cloud_exec_batch"
+
+
+class StatusStream:
+    """Append-only JSONL event stream (fsync'd so a reconnecting tail never sees partial lines)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.seq = 0
+
+    def emit(self, event: str, **fields) -> None:
+        self.seq += 1
+        record = {"seq": self.seq, "event": event, "ts": round(time.time(), 3)}
+        record.update(fields)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def run_step(index: int, cmd: str, timeout: int, state_dir: Path) -> tuple:
+    """
+    Run one step with the same wrapper log/marker files the host-driven mode uses.
+
+    Returns:
+        (status, returncode, duration) where status is SUCCESS, FAILED or TIMEOUT
+    """
+    log_file = Path(f"/tmp/cloud_exec_cmd_{index}.log")
+    marker_file = Path(f"/tmp/cloud_exec_cmd_{index}_done.marker")
+    try:
+        marker_file.unlink()
+    except FileNotFoundError:
+        pass
+
+    start = time.time()
+    with open(log_file, "w") as log_f:
+        proc = subprocess.Popen(
+            ["bash", "-lc", cmd],
+            stdin=subprocess.DEVNULL,
+            stdout=log_f,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+        (state_dir / "current.pid").write_text(str(proc.pid))
+        try:
+            rc = proc.wait(timeout=timeout)
+            status = "SUCCESS" if rc == 0 else "FAILED"
+        except subprocess.TimeoutExpired:
+            status, rc = "TIMEOUT", None
+            log_f.write(f"\n[cloud_batch_runner] Timed out after {timeout}s, diagnostics follow\n")
+            log_f.flush()
+            subprocess.run(
+                "ps auxf | head -100; echo ===MEM===; free -h; echo ===DISK===; df -h",
+                shell=True, stdout=log_f, stderr=subprocess.STDOUT, timeout=30
+            )
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            proc.wait()
+
+    marker_file.write_text(("SUCCESS" if status == "SUCCESS" else "FAILED") + "\n")
+    return status, rc, round(time.time() - start, 1)
+
+
+def archive_failure_logs(index: int, cmd: str, reports_dir: str, reason: str) -> None:
+    """Copy the wrapper log and the workload's own log into <reports_dir>/debug_logs."""
+    dbg_dir = Path(os.path.expanduser(reports_dir)) / "debug_logs"
+    candidates = [f"/tmp/cloud_exec_cmd_{index}.log", f"/tmp/cloud_exec_cmd_{index}_done.marker"]
+    match = re.search(r'>\s*(/tmp/[^\s]+\.log)', cmd)
+    if match:
+        candidates.append(match.group(1))
+    ts = time.strftime("%Y%m%d_%H%M%S")
+    try:
+        dbg_dir.mkdir(parents=True, exist_ok=True)
+        for src in candidates:
+            if os.path.isfile(src):
+                dst = dbg_dir / f"{os.path.basename(src)}.w{index}.{ts}"
+                dst.write_bytes(Path(src).read_bytes())
+        print(f"archived:{reason} (w{index})", flush=True)
+    except OSError as e:
+        print(f"[WARN] Failed to archive failure logs for w{index}: {e}", flush=True)
+
+
+def read_fingerprints(path: Path) -> set:
+    """Fingerprints of setup steps already completed on this instance (or its image)."""
+    try:
+        return set(path.read_text().split())
+    except OSError:
+        return set()
+
+
+def record_fingerprint(path: Path, fingerprint: str) -> None:
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(fingerprint + "\n")
+    except OSError as e:
+        print(f"[WARN] Failed to record setup fingerprint: {e}", flush=True)
+
+
+def start_prefetch(cmd: str) -> None:
+    """Start the lookahead prefetch; the command detaches itself and returns at once."""
+    try:
+        subprocess.run(["bash", "-lc", cmd], stdin=subprocess.DEVNULL, timeout=60)
+    except (subprocess.TimeoutExpired, OSError) as e:
+        print(f"[WARN] Failed to start lookahead prefetch: {e}", flush=True)
+
+
+def abort_requested(state_dir: Path) -> bool:
+    """The host can stop the batch between steps by creating <state_dir>/abort."""
+    return (state_dir / "abort").exists()
+
+
+def run_batch(manifest: dict, state_dir: Path) -> str:
+    stream = StatusStream(state_dir / "status.jsonl")
+    steps = manifest.get("steps", [])
+    post_process = manifest.get("post_process", [])
+    setup_count = int(manifest.get("setup_count", 0))
+    workload_timeout = int(manifest.get("workload_timeout", 10800))
+    timeout_limit = int(manifest.get("workload_timeout_limit", 0))
+    error_limit = int(manifest.get("workload_error_limit", 1))
+    reports_dir = manifest.get("reports_dir", "~/cloud_onehour/results")
+    fingerprint_file = Path(os.path.expanduser(manifest.get("fingerprint_file", "~/.cloud_exec_setup_fingerprints")))
+    installed = read_fingerprints(fingerprint_file)
+
+    stream.emit("batch_start", total=len(steps), setup_count=setup_count, pid=os.getpid())
+
+    # Non-zero when resuming: failures from the interrupted attempt still count
+    error_count = int(manifest.get("error_count", 0))
+    timeout_count = int(manifest.get("timeout_count", 0))
+    prefetch_cmd = manifest.get("prefetch")
+    result = "SUCCESS"
+    for step in steps:
+        index, cmd = step["index"], step["cmd"]
+        if abort_requested(state_dir):
+            result = "ABORTED_BY_HOST"
+            break
+
+        if prefetch_cmd and step.get("kind") == "workload":
+            start_prefetch(prefetch_cmd)
+            prefetch_cmd = None
+
+        fingerprint = step.get("fingerprint")
+        stream.emit("start", index=index, cmd=cmd, kind=step.get("kind", "workload"))
+        if fingerprint and fingerprint in installed:
+            stream.emit("end", index=index, status="SUCCESS", rc=0, duration=0.0, skipped=True)
+            continue
+        status, rc, duration = run_step(index, cmd, workload_timeout, state_dir)
+        stream.emit("end", index=index, status=status, rc=rc, duration=duration)
+
+        if status == "SUCCESS":
+            if fingerprint:
+                record_fingerprint(fingerprint_file, fingerprint)
+            continue
+
+        archive_failure_logs(index, cmd, reports_dir, "batch-timeout" if status == "TIMEOUT" else "batch-failed")
+
+        if index <= setup_count:
+            result = "SETUP_FAILED"
+            break
+
+        if status == "TIMEOUT":
+            timeout_count += 1
+            if timeout_limit > 0 and timeout_count > timeout_limit:
+                result = "TIMEOUT_LIMIT"
+                break
+            continue
+
+        error_count += 1
+        if error_limit > 0 and error_count >= error_limit:
+            result = "ERROR_LIMIT"
+            break
+
+    # post_process always runs unless the run was fatally stopped (same as host mode)
+    post_failed = False
+    if result in ("SUCCESS", "ERROR_LIMIT"):
+        for j, cmd in enumerate(post_process, start=1):
+            stream.emit("post_start", index=j, cmd=cmd)
+            start = time.time()
+            try:
+                rc = subprocess.run(
+                    ["bash", "-lc", cmd], stdin=subprocess.DEVNULL, timeout=workload_timeout
+                ).returncode
+            except subprocess.TimeoutExpired:
+                rc = None
+            if rc != 0:
+                post_failed = True
+            stream.emit("post_end", index=j, status="SUCCESS" if rc == 0 else "FAILED",
+                        rc=rc, duration=round(time.time() - start, 1))
+
+    stream.emit("done", result=result, post_process_failed=post_failed,
+                error_count=error_count, timeout_count=timeout_count)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a cloud_exec_para.py workload manifest on this instance")
+    parser.add_argument("manifest", help="Path to manifest JSON")
+    parser.add_argument("--state-dir", default=DEFAULT_STATE_DIR,
+                        help=f"Directory for status.jsonl and pid files (default: {DEFAULT_STATE_DIR})")
+    args = parser.parse_args()
+
+    state_dir = Path(args.state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    (state_dir / "runner.pid").write_text(str(os.getpid()))
+
+    with open(args.manifest, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    result = run_batch(manifest, state_dir)
+    return 0 if result == "SUCCESS" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
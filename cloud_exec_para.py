@@ -19,23 +19,36 @@ Usage:
 
 """
 
+import base64
+import copy
+import hashlib
+import heapq
 import json
 import py_compile
+import queue
+import random
 import subprocess
+import tarfile
 import os
 import time
 import sys
 import signal
+import socket
 import threading
 import re
 import argparse
+import asyncio
+import atexit
 import shlex
+import shutil
 import tempfile
 from pathlib import Path
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import wait as wait_futures
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Tuple, List, Callable
+from typing import Dict, Any, Optional, Tuple, List, Callable, Awaitable
 
 # =========================================================================================
 # GLOBAL VARIABLES
@@ -61,6 +74,8 @@ SSH_USER_TABLE = {
     ('rhel',   'gcp'): 'gcp_user',   # Set via instance metadata
     ('rhel',   'oci'): 'opc',
     ('orcl',   'oci'): 'opc',
+    ('ubuntu', 'sim'): 'ubuntu',     # SimulatedProvider (scripts/sim_bench.py)
+    ('rhel',   'sim'): 'ec2-user',
 }
 
 
@@ -298,6 +313,147 @@ class CloudProvider(ABC):
             Status string ('running', 'terminated', 'unknown', etc.)
         """
         pass
+
+    def status_scope(self, inst: Dict[str, Any]) -> Optional[Tuple[str, ...]]:
+        """
+        Scope answered by one batched status call (e.g. AWS region, GCP project).
+
+        Returns None when the CSP has no batched query (statuses are then
+        fetched per instance).
+        """
+        return None
+
+    def status_key(self, instance_id: str, inst: Dict[str, Any]) -> str:
+        """Identifier the batched query reports an instance under (ID; GCP: name)."""
+        return instance_id
+
+    def describe_instance_statuses(
+        self,
+        scope: Tuple[str, ...],
+        keys: List[str],
+        logger: Optional['InstanceLogger'] = None
+    ) -> Optional[Dict[str, str]]:
+        """
+        One CLI call for the statuses of all keys in a scope.
+
+        Returns:
+            {key: status} (lowercase; keys missing from the answer are treated
+            as 'notfound'), or None if the batched call failed
+        """
+        return None
+
+    def cached_instance_status(
+        self,
+        instance_id: str,
+        inst: Dict[str, Any],
+        logger: Optional['InstanceLogger'] = None
+    ) -> str:
+        """Instance status served from the shared STATUS_CACHE (batched per scope)."""
+        return STATUS_CACHE.get(self, instance_id, inst, logger)
+
+    # ========================================
+    # Spot / Preemptible Pricing
+    # ========================================
+
+    # Fraction of the on-demand CPU price paid for spot capacity when the CSP
+    # offers no price query (override per CSP or via "spot_price_ratio").
+    DEFAULT_SPOT_PRICE_RATIO = 0.4
+
+    def get_effective_price(
+        self,
+        instance_id: str,
+        inst: Dict[str, Any],
+        logger: Optional['InstanceLogger'] = None
+    ) -> float:
+        """
+        Hourly price actually paid for a launched instance (CPU + extra storage).
+
+        On-demand instances pay cpu_cost_hour[730h-mo]; spot instances pay the
+        discounted CPU price (storage is never discounted).
+
+        Args:
+            instance_id: Launched instance ID
+            inst: Instance definition (spot flag in inst['_spot'])
+            logger: Logger for status messages
+
+        Returns:
+            Effective hourly cost in USD
+        """
+        cpu_cost = inst.get('cpu_cost_hour[730h-mo]', 0.0)
+        storage_cost = inst.get('extra_150g_storage_cost_hour', 0.0) if inst.get('extra_150g_storage') else 0.0
+        if not inst.get('_spot'):
+            return cpu_cost + storage_cost
+        spot_cpu_cost = self.get_spot_cpu_price(instance_id, inst, logger)
+        if spot_cpu_cost is None:
+            ratio = inst.get('spot_price_ratio', self.csp_config.get('spot_price_ratio', self.DEFAULT_SPOT_PRICE_RATIO))
+            spot_cpu_cost = cpu_cost * ratio
+            if logger:
+                logger.info(f"Spot price: {spot_cpu_cost:.5f} USD/h (on-demand {cpu_cost} x {ratio})")
+        return spot_cpu_cost + storage_cost
+
+    def get_spot_cpu_price(
+        self,
+        instance_id: str,
+        inst: Dict[str, Any],
+        logger: Optional['InstanceLogger'] = None
+    ) -> Optional[float]:
+        """Query the current spot CPU price from the CSP; None when not available."""
+        return None
+
+    # ========================================
+    # Shared Resource Prefetch (RESOURCE_CACHE)
+    # ========================================
+
+    def resource_lookups(
+        self,
+        instances: List[Dict[str, Any]],
+        logger: Optional['InstanceLogger'] = None
+    ) -> List[Callable[[], Any]]:
+        """Lookups (going through RESOURCE_CACHE) needed to launch these instances."""
+        return []
+
+    def prefetch_resources(self, instances: List[Dict[str, Any]], logger: Optional['InstanceLogger'] = None) -> None:
+        """
+        Run every resource lookup of the run in parallel (all regions at once).
+
+        Cached entries return immediately; failures are only reported here, the
+        launch repeats the lookup and handles the error as before.
+        """
+        lookups = self.resource_lookups(instances, logger)
+        if not lookups:
+            return
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=min(16, len(lookups))) as executor:
+            futures = [executor.submit(lookup) for lookup in lookups]
+            failed = sum(1 for future in futures if future.exception() is not None)
+        print(f"[{self.csp_config.get('name', 'unknown').upper()}] Resources for {len(lookups)} lookups ready in "
+              f"{time.time() - started:.1f}s ({RESOURCE_CACHE.summary()}"
+              f"{f', {failed} failed' if failed else ''})")
+
+    # ========================================
+    # Baked Images (--bake)
+    # ========================================
+
+    def image_location(self, inst: Dict[str, Any]) -> str:
+        """Where an image of this instance can be used (region by default)."""
+        return inst.get('region') or self.csp_config.get('region', '')
+
+    def create_image(
+        self,
+        instance_id: str,
+        inst: Dict[str, Any],
+        image_name: str,
+        logger: Optional['InstanceLogger'] = None
+    ) -> Optional[str]:
+        """
+        Snapshot a running instance into a bootable image and wait until it is usable.
+
+        Returns:
+            Image ID, or None on failure / when the CSP does not support it
+        """
+        if logger:
+            logger.error(f"{self.csp_config.get('name', 'unknown')}: image baking is not supported")
+        return None
     
     # ========================================
     # Common Quota Management Methods
@@ -569,6 +725,29 @@ def retry_with_exponential_backoff(
             time.sleep(delay)
 
 
+async def aretry_with_exponential_backoff(
+    func: Callable[[], Awaitable[Any]],
+    max_retries: int = 5,
+    base_delay: float = 2.0,
+    max_delay: float = 60.0,
+    logger: Optional['InstanceLogger'] = None,
+    error_classifier: Optional[Callable[[Exception], bool]] = None
+) -> Any:
+    """retry_with_exponential_backoff() for coroutines: func returns an awaitable, the delays are asyncio.sleep."""
+    for attempt in range(max_retries):
+        try:
+            return await func()
+        except Exception as e:
+            if error_classifier and not error_classifier(e):
+                raise
+            if attempt == max_retries - 1:
+                raise
+            delay = min(base_delay * (2 ** attempt), max_delay)
+            if logger:
+                logger.warn(f"Retry {attempt+1}/{max_retries} after {delay:.1f}s: {e}")
+            await asyncio.sleep(delay)
+
+
 # =========================================================================================
 # ACTIVE INSTANCES MANAGEMENT
 # =========================================================================================
@@ -697,12 +876,60 @@ def verify_json_files(config_path: str) -> bool:
     print("[✓] JSON syntax check passed: cloud_config.json / cloud_instances.json")
     return True
 
+# Emergency cleanup settings (main() applies emergency_cleanup_deadline and the log dir)
+EMERGENCY_CLEANUP_DEADLINE = 120  # seconds for the whole fan-out
+EMERGENCY_CLEANUP_REPORT = Path("unterminated_instances.json")
+
+
+def _emergency_terminate_batches(instances: List[Dict[str, Any]]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Group instances into terminate calls: one per AWS region (many
+    --instance-ids), one per GCP project/zone (many names), one per OCI
+    instance (the OCI CLI terminates a single instance per call).
+
+    Returns:
+        [(shell command, [inst_info, ...]), ...]
+    """
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for inst_info in instances:
+        cloud = inst_info['cloud']
+        if cloud == 'aws':
+            key = ('aws', inst_info.get('region', 'ap-northeast-1'))
+        elif cloud == 'gcp':
+            key = ('gcp', inst_info.get('project'), inst_info.get('zone') or inst_info.get('region'))
+        else:
+            key = (cloud, inst_info.get('region'), inst_info['instance_id'])
+        groups.setdefault(key, []).append(inst_info)
+
+    batches = []
+    for key, members in groups.items():
+        if key[0] == 'aws':
+            ids = " ".join(m['instance_id'] for m in members)
+            batches.append((f"aws ec2 terminate-instances --region {key[1]} --instance-ids {ids}", members))
+        elif key[0] == 'gcp':
+            names = " ".join(m.get('name', m['instance_id']) for m in members)
+            batches.append((f"gcloud compute instances delete {names} --project={key[1]} --zone={key[2]} --quiet",
+                            members))
+        elif key[0] == 'oci':
+            prefix = f"OCI_REGION={key[1]} " if key[1] else ""
+            batches.append((f"{prefix}oci compute instance terminate --instance-id {key[2]} --force", members))
+        else:
+            batches.append(("", members))
+    return batches
+
+
 def cleanup_active_instances(signum=None, frame=None):
     """
     Emergency cleanup on interruption (Ctrl+C or kill signal).
 
-    Terminates all active instances to prevent ongoing charges.
-    Continues attempting all terminations even if individual ones fail.
+    Terminates all active instances to prevent ongoing charges.  Terminate
+    calls are batched per AWS region / GCP zone and run concurrently under a
+    global deadline (EMERGENCY_CLEANUP_DEADLINE).  A failed batch is retried
+    per instance while time remains.  An accepted request only counts once
+    the instance's terminated state has been observed (status polled like
+    wait_for_termination()); the others are reported as "termination
+    requested".  Instances whose termination could not be confirmed are
+    written to EMERGENCY_CLEANUP_REPORT with their manual cleanup commands.
 
     Args:
         signum: Signal number (SIGINT or SIGTERM)
@@ -711,92 +938,129 @@ def cleanup_active_instances(signum=None, frame=None):
     print("\n[CLEANUP] Interrupt received. Terminating all active instances...")
 
     with active_instances_lock:
-        if not active_instances:
-            print("[CLEANUP] No active instances to terminate.")
-            if signum:
-                sys.exit(1)
-            return
-
-        print(f"[CLEANUP] Found {len(active_instances)} active instance(s). Starting termination...")
+        pending = list(active_instances)
+    if not pending:
+        print("[CLEANUP] No active instances to terminate.")
+        if signum:
+            sys.exit(1)
+        return
+
+    print(f"[CLEANUP] Found {len(pending)} active instance(s). Starting termination...")
+    deadline = time.time() + EMERGENCY_CLEANUP_DEADLINE
+    failed: Dict[str, str] = {}  # instance_id -> reason
+    requested = set()  # terminate call accepted
+    confirmed = set()  # terminated state observed
+    terminal_statuses = {"terminated", "shutting-down", "shutting_down", "deleted", "notfound"}
+
+    def terminate(cmd: str, members: List[Dict[str, Any]]) -> Tuple[bool, str]:
+        remaining = deadline - time.time()
+        if not cmd:
+            return False, f"unsupported cloud '{members[0]['cloud']}'"
+        if remaining <= 1:
+            return False, "global cleanup deadline reached"
+        names = ", ".join(m.get('name', m['instance_id']) for m in members)
+        print(f"[CLEANUP] Terminating {members[0]['cloud']} instance(s): {names}")
+        try:
+            result = subprocess.run(cmd, shell=True, timeout=remaining, capture_output=True)
+        except subprocess.TimeoutExpired:
+            return False, "termination request timed out"
+        if result.returncode != 0:
+            err = result.stderr.decode().strip() if isinstance(result.stderr, bytes) else (result.stderr or "").strip()
+            return False, err or f"terminate command failed with rc={result.returncode}"
+        return True, ""
+
+    def observe(m: Dict[str, Any]) -> str:
+        """Poll one instance until its terminated state is seen or the deadline; returns the last status."""
+        status = "unknown"
+        while time.time() < deadline - 1:
+            status = str(get_instance_status(
+                m['cloud'], m.get('name', m['instance_id']) if m['cloud'] == 'gcp' else m['instance_id'],
+                region=m.get('region'), project=m.get('project'), zone=m.get('zone') or m.get('region')
+            ) or "unknown").strip().lower()
+            if status in terminal_statuses:
+                break
+            time.sleep(min(5, max(0.0, deadline - time.time() - 1)))
+        return status
 
-        remaining_instances = []
+    batches = _emergency_terminate_batches(pending)
+    executor = ThreadPoolExecutor(max_workers=min(max(len(batches), len(pending)), 32))
+    try:
+        futures = {executor.submit(terminate, cmd, members): members for cmd, members in batches}
+        retry = []
+        for future in as_completed(futures):
+            members = futures[future]
+            ok, reason = future.result()
+            if ok:
+                requested.update(m['instance_id'] for m in members)
+            elif len(members) > 1 and time.time() < deadline - 1:
+                # One bad ID fails the whole batch: retry the members individually
+                retry.extend(_emergency_terminate_batches([m])[0] for m in members)
+            else:
+                for m in members:
+                    failed[m['instance_id']] = reason
 
-        for inst_info in active_instances:
-            cloud = inst_info['cloud']
-            instance_id = inst_info['instance_id']
-            instance_name = inst_info.get('name', instance_id)
+        futures = {executor.submit(terminate, cmd, members): members for cmd, members in retry}
+        for future in as_completed(futures):
+            members = futures[future]
+            ok, reason = future.result()
+            for m in members:
+                if ok:
+                    requested.add(m['instance_id'])
+                else:
+                    failed[m['instance_id']] = reason
 
-            print(f"[CLEANUP] Terminating {cloud} instance: {instance_name} ({instance_id})")
+        # An accepted terminate call is not a terminated instance yet
+        futures = {executor.submit(observe, m): m for m in pending if m['instance_id'] in requested}
+        try:
+            for future in as_completed(futures, timeout=max(0.0, deadline - time.time())):
+                m = futures[future]
+                status = future.result()
+                if status in terminal_statuses:
+                    confirmed.add(m['instance_id'])
+                else:
+                    failed[m['instance_id']] = f"terminated state not observed (last status: {status})"
+        except FutureTimeoutError:
+            pass
+    finally:
+        # Do not wait for calls still running past the deadline
+        executor.shutdown(wait=False, cancel_futures=True)
 
-            try:
-                if cloud == 'aws':
-                    region = inst_info.get('region', 'ap-northeast-1')
-                    result = subprocess.run(
-                        f"aws ec2 terminate-instances --region {region} --instance-ids {instance_id}",
-                        shell=True,
-                        timeout=30,
-                        capture_output=True
-                    )
-                    if result.returncode != 0:
-                        err = result.stderr.decode().strip() if isinstance(result.stderr, bytes) else (result.stderr or "").strip()
-                        raise RuntimeError(err or f"AWS terminate command failed with rc={result.returncode}")
-                    print(f"[CLEANUP] AWS instance {instance_id} termination initiated")
-
-                elif cloud == 'gcp':
-                    project = inst_info.get('project')
-                    zone = inst_info.get('region') or inst_info.get('zone')
-                    result = subprocess.run(
-                        f"gcloud compute instances delete {instance_name} "
-                        f"--project={project} --zone={zone} --quiet",
-                        shell=True,
-                        timeout=30,
-                        capture_output=True
-                    )
-                    if result.returncode != 0:
-                        err = result.stderr.decode().strip() if isinstance(result.stderr, bytes) else (result.stderr or "").strip()
-                        raise RuntimeError(err or f"GCP delete command failed with rc={result.returncode}")
-                    print(f"[CLEANUP] GCP instance {instance_name} termination initiated")
-
-                elif cloud == 'oci':
-                    region = inst_info.get('region')
-                    cmd_prefix = f"OCI_REGION={region} " if region else ""
-                    result = subprocess.run(
-                        f"{cmd_prefix}oci compute instance terminate --instance-id {instance_id} --force",
-                        shell=True,
-                        timeout=300,  # OCI takes longer
-                        capture_output=True
-                    )
-                    if result.returncode != 0:
-                        err = result.stderr.decode().strip() if isinstance(result.stderr, bytes) else (result.stderr or "").strip()
-                        raise RuntimeError(err or f"OCI terminate command failed with rc={result.returncode}")
-                    print(f"[CLEANUP] OCI instance {instance_id} termination initiated")
+    unconfirmed = [m for m in pending if m['instance_id'] not in confirmed]
+    for m in unconfirmed:
+        if m['instance_id'] in requested:
+            failed.setdefault(m['instance_id'], "terminated state not observed before deadline")
+        else:
+            failed.setdefault(m['instance_id'], "termination not confirmed before deadline")
 
-            except subprocess.TimeoutExpired:
-                print(f"[CLEANUP] Warning: Termination timeout for {instance_id}. "
-                      f"Instance may still be running. Please check manually.")
-                remaining_instances.append(inst_info)
-                # Continue to next instance
+    with active_instances_lock:
+        active_instances[:] = [
+            inst for inst in active_instances
+            if inst['instance_id'] not in confirmed
+        ]
 
-            except Exception as e:
-                print(f"[CLEANUP] Error terminating {instance_id}: {e}")
-                # Display manual cleanup command
-                if cloud == 'aws':
-                    print(f"[CLEANUP] Manual cleanup: aws ec2 terminate-instances --region {inst_info.get('region')} --instance-ids {instance_id}")
-                elif cloud == 'gcp':
-                    zone = inst_info.get('region') or inst_info.get('zone')
-                    print(f"[CLEANUP] Manual cleanup: gcloud compute instances delete {instance_name} --project={inst_info.get('project')} --zone={zone}")
-                elif cloud == 'oci':
-                    region = inst_info.get('region')
-                    prefix = f"OCI_REGION={region} " if region else ""
-                    print(f"[CLEANUP] Manual cleanup: {prefix}oci compute instance terminate --instance-id {instance_id} --force")
-                remaining_instances.append(inst_info)
-                # Continue to next instance
-
-        active_instances[:] = remaining_instances
-        if active_instances:
-            print(f"[CLEANUP] {len(active_instances)} instance(s) still require manual verification.")
-        else:
-            print("[CLEANUP] All termination requests sent successfully. Exiting.")
+    if unconfirmed:
+        report = []
+        for m in unconfirmed:
+            manual_cmd = get_manual_cleanup_command(
+                m['cloud'], m['instance_id'], m.get('name', m['instance_id']), {},
+                region=m.get('region'), project=m.get('project'), zone=m.get('zone') or m.get('region')
+            )
+            if m['instance_id'] in requested:
+                print(f"[CLEANUP] Termination requested for {m['instance_id']}, but {failed[m['instance_id']]}")
+            else:
+                print(f"[CLEANUP] Error terminating {m['instance_id']}: {failed[m['instance_id']]}")
+            print(f"[CLEANUP] Manual cleanup: {manual_cmd}")
+            report.append({**m, 'reason': failed[m['instance_id']], 'manual_cleanup': manual_cmd,
+                           'termination_requested': m['instance_id'] in requested})
+        try:
+            with open(EMERGENCY_CLEANUP_REPORT, 'w', encoding='utf-8') as f:
+                json.dump({'time': datetime.now().isoformat(timespec='seconds'), 'instances': report}, f, indent=2)
+            print(f"[CLEANUP] Unconfirmed instances written to {EMERGENCY_CLEANUP_REPORT}")
+        except OSError as e:
+            print(f"[CLEANUP] Could not write {EMERGENCY_CLEANUP_REPORT}: {e}")
+        print(f"[CLEANUP] {len(unconfirmed)} instance(s) still require manual verification.")
+    else:
+        print("[CLEANUP] All instances confirmed terminated. Exiting.")
 
     if signum:
         sys.exit(1)
@@ -872,12 +1136,16 @@ def wait_for_termination(
         "none",
     }
 
+    # Terminate was just requested: do not trust a cached 'running'
+    STATUS_CACHE.invalidate(provider, instance_id, inst)
+
     while time.time() < deadline:
-        status = provider.get_instance_status(instance_id, inst, logger=logger)
+        status = provider.cached_instance_status(instance_id, inst, logger=logger)
         last_status = (status or "unknown").strip().lower()
 
         if last_status in terminal_statuses:
             logger.info(f"Termination confirmed: {inst['name']} -> {status}")
+            STATUS_CACHE.forget(provider, instance_id, inst)
             return
 
         if last_status in transitional_statuses:
@@ -898,15 +1166,32 @@ def wait_for_termination(
 # =========================================================================================
 
 class Dashboard:
-    """Manages real-time console dashboard for parallel execution."""
+    """
+    Manages real-time console dashboard for parallel execution.
+
+    Updates only mark the state changed; the render thread copies it under
+    the lock (history lists are copy-on-write) and formats outside of it.
+    It redraws when something changed, at most once per MIN_RENDER_INTERVAL,
+    and every REFRESH_INTERVAL for the running timers.  On a terminal only
+    the rows that differ from the previous frame are rewritten, and when the
+    detailed table does not fit the terminal an aggregated view per
+    CSP/region is shown instead (dashboard.log always gets the full table).
+    """
+    MIN_RENDER_INTERVAL = 1.0
+    REFRESH_INTERVAL = 5.0
+
     def __init__(self, enabled=True):
         self.enabled = enabled
         self.lock = threading.Lock()
         self.instances = {}
         self.start_time = datetime.now()
         self.log_dir = None
+        self.quota = None
+        self.budget = None
         self._running = False
         self._thread = None
+        self._changed = threading.Event()
+        self._last_frame = []
 
         # ANSI colors
         self.HEADER = '\033[95m'
@@ -936,6 +1221,7 @@ class Dashboard:
                 'history': [],
                 'color': self.BLUE
             }
+        self._changed.set()
 
     def update(self, instance_name, status=None, step=None, color=None):
         if not self.enabled: return
@@ -957,6 +1243,29 @@ class Dashboard:
                             data['start_time'] = datetime.now()
                 if color: data['color'] = color
                 data['last_update'] = datetime.now()
+                self._changed.set()
+
+    def set_cost(self, instance_name, cpu_cost):
+        """Replace the hourly CPU cost (e.g. with the spot price once launched)."""
+        if not self.enabled: return
+        with self.lock:
+            if instance_name in self.instances:
+                self.instances[instance_name]['cpu_cost'] = cpu_cost
+                self._changed.set()
+
+    def set_quota(self, quota):
+        """Live vCPU quota usage from VcpuAdmissionController.snapshot()."""
+        if not self.enabled: return
+        with self.lock:
+            self.quota = quota
+        self._changed.set()
+
+    def set_budget(self, budget):
+        """Budget cap and projection from BudgetGuard."""
+        if not self.enabled: return
+        with self.lock:
+            self.budget = budget
+        self._changed.set()
 
     def remove(self, instance_name):
         """Remove instance from dashboard (e.g., failed before instance_id)."""
@@ -965,6 +1274,7 @@ class Dashboard:
         with self.lock:
             if instance_name in self.instances:
                 del self.instances[instance_name]
+                self._changed.set()
 
     def add_history(self, instance_name, step_name, duration_sec, status="OK"):
         """Record a completed step in history."""
@@ -1009,11 +1319,14 @@ class Dashboard:
                     except:
                         pass
 
-                data['history'].append({
+                # Copy-on-write: render snapshots keep referencing the old list
+                data['history'] = data['history'] + [{
                     'status': stat_str,
                     'name': simple_name,
-                    'duration': dur_str
-                })
+                    'duration': dur_str,
+                    'seconds': duration_sec
+                }]
+                self._changed.set()
 
     def set_log_dir(self, log_dir):
         self.log_dir = log_dir
@@ -1027,52 +1340,176 @@ class Dashboard:
 
     def stop(self):
         self._running = False
+        self._changed.set()
         if self._thread:
             self._thread.join(timeout=1.0)
         # Avoid rendering on shutdown to prevent stdout lock issues
 
     def _render_loop(self):
         self._render_once()
+        last_render = time.time()
         while self._running:
-            time.sleep(5)
+            self._changed.wait(timeout=self.REFRESH_INTERVAL)
+            if not self._running:
+                break
+            # Coalesce bursts of updates into one frame per MIN_RENDER_INTERVAL
+            time.sleep(max(0.0, last_render + self.MIN_RENDER_INTERVAL - time.time()))
+            self._changed.clear()
             self._render_once()
+            last_render = time.time()
+
+    def _snapshot(self):
+        """Copy the state under the lock; formatting then runs without it."""
+        with self.lock:
+            return {name: dict(data) for name, data in self.instances.items()}, self.quota, self.budget
 
     def _render_once(self):
+        instances, quota, budget = self._snapshot()
+        detail = self._detail_lines(instances, quota)
+        if budget:
+            detail.insert(1, self._budget_line(instances, budget))
+        full_output = "\n".join(detail)
+
+        console_lines = full_output.split("\n")
+        is_tty = sys.stdout.isatty()
+        if is_tty and len(console_lines) >= shutil.get_terminal_size().lines:
+            console_lines = self._compact_lines(instances, quota)
+            if budget:
+                console_lines.insert(1, self._budget_line(instances, budget))
+        self._emit(console_lines, is_tty)
+
+        # Write to dashboard.log
+        if self.log_dir:
+            try:
+                ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+                clean_output = ansi_escape.sub('', full_output)
+
+                dashboard_file = self.log_dir / "dashboard.log"
+                with open(dashboard_file, 'w') as f:
+                    f.write(f"Last Update: {datetime.now()}\n")
+                    f.write(clean_output + "\n")
+            except Exception:
+                pass
+
+    def _emit(self, lines, is_tty):
+        """Print a frame; on a terminal rewrite only the rows that changed."""
+        previous, self._last_frame = self._last_frame, lines
+        if not is_tty or len(previous) != len(lines):
+            print("\033[2J\033[H" + "\n".join(lines))
+        else:
+            changed = [
+                f"\033[{row};1H\033[2K{line}"
+                for row, (line, old) in enumerate(zip(lines, previous), start=1)
+                if line != old
+            ]
+            if not changed:
+                return
+            sys.stdout.write("".join(changed) + f"\033[{len(lines)};1H\n")
+        sys.stdout.flush()
+
+    def _instance_cost(self, data):
+        """(duration, hours, cost so far) of one instance."""
+        end = data['end_time'] if data['end_time'] else datetime.now()
+        duration = end - data['start_time']
+        hours = duration.total_seconds() / 3600.0
+        return duration, hours, hours * (data['cpu_cost'] + data['storage_cost'])
+
+    def _budget_line(self, instances, budget):
+        """Live spend (from the instance timers) against the --budget-usd cap."""
+        final = ('COMPLETED', 'TERMINATED', 'ERROR', 'TERM_TIMEOUT', 'TERM_FAILED')
+        spent = sum(self._instance_cost(data)[2] for data in instances.values())
+        burn = sum(data['cpu_cost'] + data['storage_cost']
+                   for data in instances.values() if data.get('status') not in final)
+        color = self.FAIL if budget['projected'] > budget['cap'] else self.GREEN
+        return (f"BUDGET: ${spent:.2f} / ${budget['cap']:.2f} | burn ${burn:.2f}/h | "
+                f"{color}projected ${budget['projected']:.2f}{self.ENDC}")
+
+    def _compact_lines(self, instances, quota):
+        """Aggregated view per CSP/region for more instances than terminal rows."""
+        run_str = str(datetime.now() - self.start_time).split('.')[0]
+        lines = [f"{self.BOLD}CLOUD BENCHMARKING EXECUTOR (Run: {run_str}) - {len(instances)} instances{self.ENDC}"]
+        if quota:
+            total = quota['quota']
+            pct = 100 * quota['used'] // total if total > 0 else 0
+            lines.append(f"QUOTA: {quota['used']}/{total} vCPUs ({pct}%) | waiting: {quota['pending']}")
+
+        final = ('COMPLETED', 'TERMINATED', 'ERROR', 'TERM_TIMEOUT', 'TERM_FAILED')
+        groups = {}
+        total_cost = 0.0
+        burn_rate = 0.0
+        eta_sec = 0.0
+        for data in instances.values():
+            group = groups.setdefault(f"{data.get('cloud', 'UNKNOWN')} / {data.get('region', 'unknown-region')}", {})
+            status = data.get('status', '')
+            group[status] = group.get(status, 0) + 1
+            _, _, cost = self._instance_cost(data)
+            total_cost += cost
+            if status in final:
+                continue
+            burn_rate += data['cpu_cost'] + data['storage_cost']
+            # ETA: remaining workloads at this instance's mean workload duration
+            # (skipped workloads count as done but not as a duration sample)
+            done = [h for h in data.get('history', []) if h['name'].startswith('W')]
+            timed = [h['seconds'] for h in done if h['status'] != 'SKIP']
+            workload_total = data.get('workload_total')
+            if timed and workload_total:
+                eta_sec = max(eta_sec, (sum(timed) / len(timed)) * max(0, workload_total - len(done)))
+
+        eta_str = str(timedelta(seconds=int(eta_sec))) if eta_sec else "n/a"
+        lines.append(f"COST: ${total_cost:.2f} | BURN: ${burn_rate:.2f}/h | ETA: {eta_str}")
+        lines.append("=" * 100)
+        stat_order = ['RUNNING', 'PENDING', 'COMPLETED', 'TERMINATED', 'ERROR', 'TERM_TIMEOUT', 'TERM_FAILED']
+        for group_key in sorted(groups):
+            counts = groups[group_key]
+            parts = [f"{stat}: {counts[stat]}" for stat in stat_order if counts.get(stat)]
+            parts += [f"{stat}: {n}" for stat, n in sorted(counts.items()) if stat not in stat_order]
+            lines.append(f"{group_key:<40} | " + " | ".join(parts))
+        lines.append("=" * 100)
+        return lines
+
+    def _detail_lines(self, instances, quota):
         lines = []
 
         run_duration = datetime.now() - self.start_time
         run_str = str(run_duration).split('.')[0]
         lines.append(f"{self.BOLD}CLOUD BENCHMARKING EXECUTOR (Run: {run_str}){self.ENDC}")
 
-        with self.lock:
-            summary_items = []
-            summary_stat_map = {
-                'RUNNING': 'RUN', 'COMPLETED': 'DONE', 'TERMINATED': 'TERM',
-                'PENDING': 'WAIT', 'ERROR': 'ERR', 'TERM_TIMEOUT': 'T/O',
-                'TERM_FAILED': 'TFAL'
-            }
-            for name, data in sorted(
-                self.instances.items(),
-                key=lambda item: (
-                    item[1].get('cloud') or '',
-                    item[1].get('region') or '',
-                    item[0]
-                )
-            ):
-                end = data['end_time'] if data['end_time'] else datetime.now()
-                duration = end - data['start_time']
-                duration_str = str(duration).split('.')[0]
+        if quota:
+            total = quota['quota']
+            pct = 100 * quota['used'] // total if total > 0 else 0
+            quota_str = f"QUOTA: {quota['used']}/{total} vCPUs ({pct}%) | waiting: {quota['pending']}"
+            for region, (used, limit) in sorted(quota['regions'].items()):
+                quota_str += f" | {region}: {used}/{limit}"
+            lines.append(quota_str)
+
+        summary_items = []
+        summary_stat_map = {
+            'RUNNING': 'RUN', 'COMPLETED': 'DONE', 'TERMINATED': 'TERM',
+            'PENDING': 'WAIT', 'ERROR': 'ERR', 'TERM_TIMEOUT': 'T/O',
+            'TERM_FAILED': 'TFAL'
+        }
+        for name, data in sorted(
+            instances.items(),
+            key=lambda item: (
+                item[1].get('cloud') or '',
+                item[1].get('region') or '',
+                item[0]
+            )
+        ):
+            end = data['end_time'] if data['end_time'] else datetime.now()
+            duration = end - data['start_time']
+            duration_str = str(duration).split('.')[0]
 
-                hours = duration.total_seconds() / 3600.0
-                total_rate = data['cpu_cost'] + data['storage_cost']
-                cost = hours * total_rate
-                cost_str = f"${cost:.2f}"
-                compact_stat = summary_stat_map.get(data.get('status', ''), str(data.get('status', ''))[:4])
+            hours = duration.total_seconds() / 3600.0
+            total_rate = data['cpu_cost'] + data['storage_cost']
+            cost = hours * total_rate
+            cost_str = f"${cost:.2f}"
+            compact_stat = summary_stat_map.get(data.get('status', ''), str(data.get('status', ''))[:4])
 
-                hour_str = f"{hours:.2f}h"
-                summary_items.append((duration.total_seconds(), name, compact_stat, hour_str, cost_str))
+            hour_str = f"{hours:.2f}h"
+            summary_items.append((duration.total_seconds(), name, compact_stat, hour_str, cost_str))
 
-            summary_items.sort(key=lambda item: item[0])
+        summary_items.sort(key=lambda item: item[0])
 
         lines.append(f"{self.BOLD}SUMMARY (Instance | Stat | Hour | Cost){self.ENDC}")
         if summary_items:
@@ -1085,119 +1522,202 @@ class Dashboard:
         lines.append(f"{'INSTANCE (TYPE)':<30} | {'STAT':<4} | {'TIME':<7} | {'COST':<7}")
         lines.append("-" * 100)
 
-        with self.lock:
-            sorted_insts = sorted(
-                self.instances.items(),
-                key=lambda item: (
-                    item[1].get('cloud') or '',
-                    item[1].get('region') or '',
-                    item[0]
-                )
+        sorted_insts = sorted(
+            instances.items(),
+            key=lambda item: (
+                item[1].get('cloud') or '',
+                item[1].get('region') or '',
+                item[0]
             )
+        )
 
-            current_group = None
-            for name, data in sorted_insts:
-                group_key = f"{data.get('cloud', 'UNKNOWN')} / {data.get('region', 'unknown-region')}"
-                if group_key != current_group:
-                    lines.append(f"{self.BOLD}{group_key}{self.ENDC}")
-                    lines.append("-" * 100)
-                    current_group = group_key
-                # Status
-                raw_stat = data['status']
-                stat_map = {
-                    'RUNNING': 'RUN ', 'COMPLETED': 'DONE', 'TERMINATED': 'TERM',
-                    'PENDING': 'WAIT', 'ERROR': 'ERR ', 'TERM_TIMEOUT': 'T/O ',
-                    'TERM_FAILED': 'TFAL'
-                }
-                compact_stat = stat_map.get(raw_stat, raw_stat[:4])
-                status_str = f"{data['color']}{compact_stat}{self.ENDC}"
-
-                # Name
-                short_name = name
-                for suffix in ['-amd64', '-arm64', '-vcpu-2', '-vcpu-4', '-vcpu-8', '-vcpu-16']:
-                    short_name = short_name.replace(suffix, '')
-
-                short_type = data['type'].replace('standard', 'std').replace('large', 'lg')
-                display_name = f"{short_name} ({short_type})"
-                if len(display_name) > 30:
-                    display_name = display_name[:27] + "..."
-
-                # Duration and Cost
-                end = data['end_time'] if data['end_time'] else datetime.now()
-                duration = end - data['start_time']
-                duration_str = str(duration).split('.')[0]
-
-                hours = duration.total_seconds() / 3600.0
-                total_rate = data['cpu_cost'] + data['storage_cost']
-                cost = hours * total_rate
-                cost_str = f"${cost:.2f}"
-
-                lines.append(f"{display_name:<30} | {status_str:<4} | {duration_str:<7} | {cost_str:<7}")
-
-                # History
-                history_items = data.get('history', [])
-                workload_total = data.get('workload_total')
-                if workload_total and workload_total <= 10:
-                    display_history = history_items
+        current_group = None
+        for name, data in sorted_insts:
+            group_key = f"{data.get('cloud', 'UNKNOWN')} / {data.get('region', 'unknown-region')}"
+            if group_key != current_group:
+                lines.append(f"{self.BOLD}{group_key}{self.ENDC}")
+                lines.append("-" * 100)
+                current_group = group_key
+            # Status
+            raw_stat = data['status']
+            stat_map = {
+                'RUNNING': 'RUN ', 'COMPLETED': 'DONE', 'TERMINATED': 'TERM',
+                'PENDING': 'WAIT', 'ERROR': 'ERR ', 'TERM_TIMEOUT': 'T/O ',
+                'TERM_FAILED': 'TFAL'
+            }
+            compact_stat = stat_map.get(raw_stat, raw_stat[:4])
+            status_str = f"{data['color']}{compact_stat}{self.ENDC}"
+
+            # Name
+            short_name = name
+            for suffix in ['-amd64', '-arm64', '-vcpu-2', '-vcpu-4', '-vcpu-8', '-vcpu-16']:
+                short_name = short_name.replace(suffix, '')
+
+            short_type = data['type'].replace('standard', 'std').replace('large', 'lg')
+            display_name = f"{short_name} ({short_type})"
+            if len(display_name) > 30:
+                display_name = display_name[:27] + "..."
+
+            # Duration and Cost
+            end = data['end_time'] if data['end_time'] else datetime.now()
+            duration = end - data['start_time']
+            duration_str = str(duration).split('.')[0]
+
+            hours = duration.total_seconds() / 3600.0
+            total_rate = data['cpu_cost'] + data['storage_cost']
+            cost = hours * total_rate
+            cost_str = f"${cost:.2f}"
+
+            lines.append(f"{display_name:<30} | {status_str:<4} | {duration_str:<7} | {cost_str:<7}")
+
+            # History
+            history_items = data.get('history', [])
+            workload_total = data.get('workload_total')
+            if workload_total and workload_total <= 10:
+                display_history = history_items
+            else:
+                display_history = history_items[-5:]
+
+            for item in display_history:
+                stat = item['status']
+                color = self.GREEN if stat == "OK" else (self.FAIL if stat in ["ERR", "TO"] else self.BOLD)
+                item_str = f"  [{color}{stat}{self.ENDC}] {item['name']} ({item['duration']})"
+                lines.append(f"{item_str}")
+
+            # Current step
+            if raw_stat not in ['COMPLETED', 'TERMINATED', 'TERM_TIMEOUT', 'TERM_FAILED']:
+                step_elapsed = datetime.now() - data.get('step_start', datetime.now())
+
+                if step_elapsed.total_seconds() < 3600:
+                    mm = int(step_elapsed.total_seconds() // 60)
+                    ss = int(step_elapsed.total_seconds() % 60)
+                    step_timer = f"[{mm:02}:{ss:02}]"
                 else:
-                    display_history = history_items[-5:]
-
-                for item in display_history:
-                    stat = item['status']
-                    color = self.GREEN if stat == "OK" else (self.FAIL if stat in ["ERR", "TO"] else self.BOLD)
-                    item_str = f"  [{color}{stat}{self.ENDC}] {item['name']} ({item['duration']})"
-                    lines.append(f"{item_str}")
-
-                # Current step
-                if raw_stat not in ['COMPLETED', 'TERMINATED', 'TERM_TIMEOUT', 'TERM_FAILED']:
-                    step_elapsed = datetime.now() - data.get('step_start', datetime.now())
-
-                    if step_elapsed.total_seconds() < 3600:
-                        mm = int(step_elapsed.total_seconds() // 60)
-                        ss = int(step_elapsed.total_seconds() % 60)
-                        step_timer = f"[{mm:02}:{ss:02}]"
-                    else:
-                        step_timer = f"[{str(step_elapsed).split('.')[0]}]"
+                    step_timer = f"[{str(step_elapsed).split('.')[0]}]"
 
-                    step_name = data['step']
-                    simple_step_name = step_name
-                    if "Workload" in step_name:
-                        try:
-                            parts = step_name.split(':')
-                            w_part = parts[0].replace('Workload', 'W').split('/')[0].strip()
-                            cmd_part = parts[1].strip()
-                            simple_step_name = f"{w_part}: {cmd_part}"
-                        except:
-                            pass
+                step_name = data['step']
+                simple_step_name = step_name
+                if "Workload" in step_name:
+                    try:
+                        parts = step_name.split(':')
+                        w_part = parts[0].replace('Workload', 'W').split('/')[0].strip()
+                        cmd_part = parts[1].strip()
+                        simple_step_name = f"{w_part}: {cmd_part}"
+                    except:
+                        pass
 
-                    if len(simple_step_name) > 60:
-                        simple_step_name = simple_step_name[:57] + "..."
+                if len(simple_step_name) > 60:
+                    simple_step_name = simple_step_name[:57] + "..."
 
-                    current_str = f"  [{self.CYAN}>>{self.ENDC}]   {simple_step_name} {step_timer}"
-                    lines.append(f"{current_str}")
+                current_str = f"  [{self.CYAN}>>{self.ENDC}]   {simple_step_name} {step_timer}"
+                lines.append(f"{current_str}")
 
-                lines.append("-" * 100)
+            lines.append("-" * 100)
 
         lines.append("=" * 100)
+        return lines
 
-        full_output = "\n".join(lines)
 
-        # Print to console
-        print(f"\033[2J\033[H{full_output}")
-        sys.stdout.flush()
+class LogWriter:
+    """
+    Background writer for instance logs and the events.jsonl stream.
 
-        # Write to dashboard.log
-        if self.log_dir:
+    Lines are queued (bounded: a full queue blocks the caller instead of
+    dropping lines) and a single thread appends them in batches, one open()
+    per file per flush.  A flush happens every flush_interval seconds, right
+    away for urgent lines (ERROR/WARN) and on flush()/stop().  Before start()
+    (or after stop()) lines are written synchronously.
+    """
+
+    def __init__(self, max_queue: int = 10000, flush_interval: float = 0.5):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.flush_interval = flush_interval
+        self.thread = None
+        self.stats = {'lines': 0, 'flushes': 0, 'errors': 0}
+
+    def configure(self, common: Dict[str, Any]) -> None:
+        self.queue = queue.Queue(maxsize=common.get('log_queue_size', 10000))
+        self.flush_interval = common.get('log_flush_interval', 0.5)
+
+    def start(self) -> None:
+        if self.thread:
+            return
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+        atexit.register(self.stop)
+
+    def write(self, path: Path, text: str, urgent: bool = False,
+              on_error: Optional[Callable[[str], None]] = None) -> None:
+        if not self.thread:
+            self._append(path, [text], [on_error] if on_error else [])
+            return
+        self.queue.put((path, text, urgent, on_error))
+
+    def flush(self, timeout: float = 10) -> None:
+        """Block until everything queued so far is on disk."""
+        if not self.thread:
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def stop(self) -> None:
+        thread, self.thread = self.thread, None
+        if thread:
+            self.queue.put(None)
+            thread.join(timeout=10)
+
+    def _append(self, path: Path, lines: List[str], on_error: List[Callable[[str], None]]) -> None:
+        try:
+            with open(path, 'a') as f:
+                f.write(''.join(lines))
+        except Exception as e:
+            self.stats['errors'] += 1
+            for callback in on_error:
+                callback(str(e))
+
+    def _flush(self, pending: Dict[Path, List[str]], handlers: Dict[Path, List[Callable[[str], None]]]) -> None:
+        for path, lines in pending.items():
+            self._append(path, lines, handlers.get(path, []))
+            self.stats['lines'] += len(lines)
+        if pending:
+            self.stats['flushes'] += 1
+        pending.clear()
+        handlers.clear()
+
+    def _run(self) -> None:
+        pending: Dict[Path, List[str]] = {}
+        handlers: Dict[Path, List[Callable[[str], None]]] = {}
+        next_flush = time.time() + self.flush_interval
+        while True:
             try:
-                ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-                clean_output = ansi_escape.sub('', full_output)
+                item = self.queue.get(timeout=max(0.0, next_flush - time.time()))
+            except queue.Empty:
+                item = ()
+            flush_now = False
+            while item != ():
+                if item is None:
+                    self._flush(pending, handlers)
+                    return
+                if isinstance(item, threading.Event):
+                    self._flush(pending, handlers)
+                    item.set()
+                else:
+                    path, text, urgent, on_error = item
+                    pending.setdefault(path, []).append(text)
+                    if on_error and on_error not in handlers.setdefault(path, []):
+                        handlers[path].append(on_error)
+                    flush_now = flush_now or urgent
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    item = ()
+            if flush_now or time.time() >= next_flush:
+                self._flush(pending, handlers)
+                next_flush = time.time() + self.flush_interval
 
-                dashboard_file = self.log_dir / "dashboard.log"
-                with open(dashboard_file, 'w') as f:
-                    f.write(f"Last Update: {datetime.now()}\n")
-                    f.write(clean_output + "\n")
-            except Exception:
-                pass
+
+LOG_WRITER = LogWriter()
 
 
 class InstanceLogger:
@@ -1241,14 +1761,26 @@ class InstanceLogger:
         if status == "ERROR": color = self.dashboard.FAIL
         self.dashboard.update(self.name, status=status, step=step, color=color)
 
+    def event(self, event, workload=None, duration=None, **fields):
+        """Append a machine-readable record to <log_dir>/events.jsonl."""
+        record = {
+            'ts': round(time.time(), 3),
+            'instance': self.name,
+            'workload': workload,
+            'event': event,
+            'duration': round(duration, 1) if duration is not None else None,
+        }
+        record.update(fields)
+        LOG_WRITER.write(self.log_dir / "events.jsonl", json.dumps(record) + "\n")
+
     def _write(self, line):
         timestamp = datetime.now().strftime("%H:%M:%S")
-        try:
-            with open(self.log_file, 'a') as f:
-                f.write(f"[{timestamp}] {line}\n")
-        except Exception as e:
-            self.io_failed = True
-            self.last_io_error = str(e)
+        urgent = line.startswith(("[ERROR]", "[WARN]"))
+        LOG_WRITER.write(self.log_file, f"[{timestamp}] {line}\n", urgent=urgent, on_error=self._io_error)
+
+    def _io_error(self, error):
+        self.io_failed = True
+        self.last_io_error = error
 
     def log_dir_unavailable(self):
         """Return True if logger detected I/O failure or log directory disappeared."""
@@ -1295,58 +1827,1438 @@ def run_cmd(cmd, capture=True, ignore=False, timeout=None, logger=None):
             logger.cmd(f"Executing: {cmd[:150]}{'...' if len(cmd) > 150 else ''}")
 
         start_time = time.time()
-        res = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=capture,
-            text=True,
-            check=not ignore,
-            timeout=timeout,
-            stdin=subprocess.DEVNULL
-        )
+        if ASYNC_CORE.enabled:
+            # Spawned by the shared event loop under the global CLI/SSH limits
+            res = ASYNC_CORE.call(cmd, capture=capture, timeout=timeout)
+            if not ignore:
+                res.check_returncode()
+        else:
+            res = subprocess.run(
+                cmd,
+                shell=True,
+                capture_output=capture,
+                text=True,
+                check=not ignore,
+                timeout=timeout,
+                stdin=subprocess.DEVNULL
+            )
         elapsed = time.time() - start_time
 
         if logger:
             logger.info(f"Command completed in {elapsed:.2f}s")
 
         return res.stdout.strip() if capture else True
-    except subprocess.TimeoutExpired:
-        msg = f"Command timed out after {timeout} seconds"
+    except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
+        return _cmd_failed(e, timeout, ignore, logger)
+
+
+async def arun_cmd(cmd, capture=True, ignore=False, timeout=None, logger=None):
+    """
+    run_cmd() for the instance coroutines (same arguments, result and exceptions):
+    the command is awaited on the AsyncCore loop instead of blocking a thread.
+    """
+    if not ASYNC_CORE.in_loop():
+        # async_core disabled: the coroutine has a thread of its own
+        return run_cmd(cmd, capture=capture, ignore=ignore, timeout=timeout, logger=logger)
+    try:
         if logger:
-            if ignore:
-                logger.warn(msg)
-            else:
-                logger.error(msg)
-        else:
-            print(f"[{'Warn' if ignore else 'Error'}] {msg}")
+            logger.cmd(f"Executing: {cmd[:150]}{'...' if len(cmd) > 150 else ''}")
 
+        start_time = time.time()
+        res = await ASYNC_CORE.run(cmd, capture, timeout)
         if not ignore:
-            raise
-        return None
-    except subprocess.CalledProcessError as e:
-        err_msg = (e.stderr.strip() if e.stderr and e.stderr.strip() else
-                   e.stdout.strip() if e.stdout and e.stdout.strip() else
-                   'No error message')
-        msg = f"Command failed: {err_msg}"
+            res.check_returncode()
+        elapsed = time.time() - start_time
+
         if logger:
-            if ignore:
-                logger.warn(msg)
-            else:
-                logger.error(msg)
-        else:
-            print(f"[{'Warn' if ignore else 'Error'}] {err_msg}")
+            logger.info(f"Command completed in {elapsed:.2f}s")
 
-        if not ignore:
-            raise
-        return None
+        return res.stdout.strip() if capture else True
+    except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
+        return _cmd_failed(e, timeout, ignore, logger)
 
 
-def build_storage_config(inst, cloud_type):
-    """Build storage configuration arguments for different cloud providers."""
-    if not inst.get('extra_150g_storage', False):
-        return ""
+def _cmd_failed(error, timeout, ignore, logger):
+    """Report a failed run_cmd()/arun_cmd() command; re-raises it unless ignore (then None)."""
+    if isinstance(error, subprocess.TimeoutExpired):
+        msg = f"Command timed out after {timeout} seconds"
+        console = msg
+    else:
+        console = (error.stderr.strip() if error.stderr and error.stderr.strip() else
+                   error.stdout.strip() if error.stdout and error.stdout.strip() else
+                   'No error message')
+        msg = f"Command failed: {console}"
+    if logger:
+        if ignore:
+            logger.warn(msg)
+        else:
+            logger.error(msg)
+    else:
+        print(f"[{'Warn' if ignore else 'Error'}] {console}")
 
-    if cloud_type == 'aws':
+    if not ignore:
+        raise error
+    return None
+
+
+# =========================================================================================
+# SHARED RESOURCE CACHE
+# =========================================================================================
+
+class ResourceCache:
+    """
+    CSP lookups that rarely change, kept in <host_reports_dir>/resource_cache.json.
+
+    Security groups, key pairs, stock image IDs, subnets, availability
+    domains and the GCP project each cost a CLI call of several seconds per
+    region; an entry younger than resource_cache_ttl (seconds, default 12h)
+    is returned without any call.  Validation:
+    - an entry may carry a stamp (e.g. the gcloud configuration's mtime)
+      that must still match, otherwise it is looked up again
+    - invalidate_stale() drops entries whose value the CSP just rejected as
+      not found (deleted SG, deregistered AMI, ...), so the retried launch
+      looks them up again
+    Entries stored with persist=False (e.g. the host's public IP) live for
+    this run only.  Concurrent callers of the same key wait for one lookup.
+    """
+
+    NOT_FOUND_MARKERS = ('notfound', 'not found', 'does not exist', 'invalidamiid', 'invalidgroup',
+                         'invalidkeypair', 'not authorized or not found')
+
+    def __init__(self, enabled=True, ttl=43200, path: Optional[Path] = None):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.stats = {'hits': 0, 'lookups': 0, 'invalidated': 0}
+
+    def configure(self, common_config: Dict[str, Any]) -> None:
+        """Apply resource_cache / resource_cache_ttl and load the cache file."""
+        self.enabled = bool(common_config.get('resource_cache', self.enabled))
+        self.ttl = float(common_config.get('resource_cache_ttl', self.ttl))
+        self.path = Path(common_config['host_reports_dir']) / 'resource_cache.json'
+        self.entries = {}
+        if not self.enabled:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def _fresh(self, key: str, stamp: Optional[str]) -> bool:
+        entry = self.entries.get(key)
+        return bool(entry) and time.time() - entry['ts'] < self.ttl and entry.get('stamp') == stamp
+
+    def _save(self) -> None:
+        if not self.enabled or not self.path:
+            return
+        persistent = {key: entry for key, entry in self.entries.items() if entry.get('persist', True)}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.json.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(persistent, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any], stamp: Optional[str] = None,
+                     persist: bool = True, logger=None) -> Any:
+        """Cached value for key, or fetch() it (empty results and "None" are not cached)."""
+        with self.lock:
+            if self._fresh(key, stamp):
+                self.stats['hits'] += 1
+                return self.entries[key]['value']
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self.lock:
+                if self._fresh(key, stamp):
+                    self.stats['hits'] += 1
+                    return self.entries[key]['value']
+            value = fetch()
+            with self.lock:
+                self.stats['lookups'] += 1
+                if value and value != "None":
+                    self.entries[key] = {'value': value, 'ts': time.time(), 'stamp': stamp, 'persist': persist}
+                    if persist:
+                        self._save()
+            if logger and value and value != "None":
+                logger.info(f"Resource cache: {key} = {value}")
+            return value
+
+    def invalidate_stale(self, error_text: str) -> bool:
+        """Drop entries referenced by a not-found error; True if any was dropped (worth a retry)."""
+        lowered = error_text.lower()
+        if not any(marker in lowered for marker in self.NOT_FOUND_MARKERS):
+            return False
+        with self.lock:
+            stale = [key for key, entry in self.entries.items()
+                     if any(str(v) and str(v) in error_text
+                            for v in (entry['value'] if isinstance(entry['value'], list) else [entry['value']]))]
+            for key in stale:
+                del self.entries[key]
+            if stale:
+                self.stats['invalidated'] += len(stale)
+                self._save()
+        return bool(stale)
+
+    def summary(self) -> str:
+        return (f"{self.stats['hits']} cached, {self.stats['lookups']} looked up, "
+                f"{self.stats['invalidated']} invalidated")
+
+
+RESOURCE_CACHE = ResourceCache()
+
+
+# =========================================================================================
+# ASYNC SUBPROCESS CORE
+# =========================================================================================
+
+class AsyncStream:
+    """Long-lived command whose stdout lines are handed to a callback (see AsyncCore.open_stream)."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.proc = None
+        self.task = None
+        self.returncode = None
+        self.exited = threading.Event()
+
+    def poll(self) -> Optional[int]:
+        """None while the command is running (same as Popen.poll)."""
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        if self.loop is None and self.proc is not None:
+            # Reader thread: the command's exit counts, not the EOF of a pipe a child may still hold
+            try:
+                return self.proc.wait(timeout)
+            except subprocess.TimeoutExpired:
+                return None
+        self.exited.wait(timeout)
+        return self.returncode
+
+    async def wait_closed(self, timeout: Optional[float] = None) -> Optional[int]:
+        """wait() for coroutines."""
+        if self.task is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(self.task), timeout)
+            except asyncio.TimeoutError:
+                pass
+        elif not self.exited.is_set():
+            return await ASYNC_CORE.blocking(self.wait, timeout)
+        return self.returncode
+
+    def kill(self) -> None:
+        proc = self.proc
+        if proc is None or self.returncode is not None:
+            return
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._kill, proc)
+        else:
+            self._kill(proc)
+
+    @staticmethod
+    def _kill(proc) -> None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+
+    def _finish(self, returncode: Optional[int]) -> None:
+        self.returncode = returncode
+        self.exited.set()
+
+
+class _StreamProtocol(asyncio.SubprocessProtocol):
+    """Splits a stream's stdout into lines and reports when the command exits."""
+
+    def __init__(self, on_line: Callable[[str], None]):
+        self.on_line = on_line
+        self.buffer = b''
+        loop = asyncio.get_running_loop()
+        self.exited = loop.create_future()
+        self.eof = loop.create_future()
+
+    def pipe_data_received(self, fd: int, data: bytes) -> None:
+        *lines, self.buffer = (self.buffer + data).split(b'\n')
+        for line in lines:
+            self._deliver(line + b'\n')
+
+    def _deliver(self, raw: bytes) -> None:
+        try:
+            self.on_line(raw.decode(errors='replace'))
+        except Exception:
+            pass
+
+    def flush(self) -> None:
+        if self.buffer:
+            buffer, self.buffer = self.buffer, b''
+            self._deliver(buffer)
+
+    def pipe_connection_lost(self, fd: int, exc: Optional[Exception]) -> None:
+        if not self.eof.done():
+            self.eof.set_result(None)
+
+    def process_exited(self) -> None:
+        if not self.exited.done():
+            self.exited.set_result(None)
+
+
+class AsyncCore:
+    """
+    One asyncio event loop (in its own thread) that runs every instance and its subprocesses.
+
+    process_instance() and everything it drives (readiness wait, the
+    workload poll loops of run_ssh_commands() / run_remote_batch(), result
+    collection) are coroutines submitted to this loop (submit), so a run
+    with 100 instances waits in asyncio.sleep() and on subprocess/stream
+    futures instead of in 100 sleeping threads.  Their commands go through
+    arun_cmd(), which awaits run() on the loop.  run() starts the command
+    with asyncio.create_subprocess_exec while holding a slot of one of two
+    global semaphores:
+    - max_concurrent_cli (default 16): aws / gcloud / oci
+    - max_concurrent_ssh (default 64): ssh / scp / rsync
+    Other commands (local tar, cat, ...) are not limited.  Wrapped commands
+    (timeout ... ssh, bash -c 'ssh ...') count as what they run.
+
+    The CloudProvider methods (launch, terminate, status) and the few other
+    blocking helpers (incremental delta sync, SSH master start) keep the
+    blocking run_cmd(): coroutines run them through blocking(), a bounded
+    thread pool (max_blocking_calls, default 64) that only grows with the
+    number of such calls in flight, not with the instances.  A run_cmd() from such a thread is
+    handed to the loop as well (call: the thread waits at most the command
+    timeout plus CALL_MARGIN, then runs the command with subprocess directly).
+
+    The long-lived SSH streams (marker watch, --remote-batch status) are
+    read by the loop as well (stream / open_stream) instead of by a reader
+    thread each.  They take no semaphore slot: there is at most one per
+    instance and holding a slot for hours would starve the short calls.
+
+    "async_core": false runs every command with subprocess directly again
+    and every instance coroutine on its own thread (asyncio.run per instance).
+    """
+
+    SSH_COMMANDS = ('ssh', 'scp', 'rsync', 'sftp')
+    CLI_COMMANDS = ('aws', 'gcloud', 'oci')
+    # Extra seconds call() waits beyond the command timeout (slot queueing) before
+    # giving up on the loop and running the command directly
+    CALL_MARGIN = 60
+
+    def __init__(self, enabled=True, max_cli=16, max_ssh=64, max_blocking=64):
+        self.enabled = enabled
+        self.max_cli = max_cli
+        self.max_ssh = max_ssh
+        self.max_blocking = max_blocking
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._blocking: Optional[ThreadPoolExecutor] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._active = {'cli': 0, 'ssh': 0}
+        self.stats = {'cli': 0, 'ssh': 0, 'other': 0, 'streams': 0, 'queued': 0, 'peak_cli': 0, 'peak_ssh': 0,
+                      'fallbacks': 0, 'blocking': 0, 'instances': 0}
+
+    def configure(self, common_config: Dict[str, Any]) -> None:
+        """Apply async_core / max_concurrent_cli / max_concurrent_ssh / max_blocking_calls (before the first command)."""
+        self.enabled = bool(common_config.get('async_core', self.enabled))
+        self.max_cli = max(1, int(common_config.get('max_concurrent_cli', self.max_cli)))
+        self.max_ssh = max(1, int(common_config.get('max_concurrent_ssh', self.max_ssh)))
+        self.max_blocking = max(1, int(common_config.get('max_blocking_calls', self.max_blocking)))
+
+    @staticmethod
+    def _install_child_watcher(loop: asyncio.AbstractEventLoop) -> None:
+        """Before 3.12 asyncio waits for each child in its own thread unless it is given pidfds."""
+        if sys.version_info >= (3, 12) or not hasattr(os, 'pidfd_open'):
+            return
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+        except OSError:
+            return
+        watcher = asyncio.PidfdChildWatcher()
+        watcher.attach_loop(loop)
+        asyncio.set_child_watcher(watcher)
+
+    def start(self) -> None:
+        """Start the loop thread (done lazily by the first command)."""
+        with self.lock:
+            if self.loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            self._install_child_watcher(loop)
+            self._limits = {'cli': asyncio.Semaphore(self.max_cli), 'ssh': asyncio.Semaphore(self.max_ssh)}
+            self._thread = threading.Thread(target=loop.run_forever, name="async-core", daemon=True)
+            self._thread.start()
+            self.loop = loop
+
+    def stop(self) -> None:
+        with self.lock:
+            loop, self.loop = self.loop, None
+            thread, self._thread = self._thread, None
+            pool, self._blocking = self._blocking, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
+
+    @classmethod
+    def _programs(cls, cmd: str, depth: int = 0) -> List[str]:
+        """Basenames of every word of a command line, including the scripts of sh/bash -c."""
+        try:
+            lexer = shlex.shlex(cmd, posix=True, punctuation_chars=True)
+            lexer.whitespace_split = True
+            tokens = list(lexer)
+        except ValueError:
+            tokens = cmd.split()
+        names = []
+        for n, token in enumerate(tokens):
+            names.append(os.path.basename(token))
+            if re.match(r'^-[a-z]*c$', token) and n + 1 < len(tokens) and depth < 3:  # -c / -lc script
+                names.extend(cls._programs(tokens[n + 1], depth + 1))
+        return names
+
+    def kind(self, cmd: str) -> str:
+        """'cli', 'ssh' or 'other', from the first CLI/SSH program the command line runs (through timeout, bash -c, ...)."""
+        for name in self._programs(cmd):
+            if name in self.SSH_COMMANDS:
+                return 'ssh'
+            if name in self.CLI_COMMANDS:
+                return 'cli'
+        return 'other'
+
+    def in_loop(self) -> bool:
+        """True in the loop thread, i.e. inside an instance coroutine (arun_cmd awaits run() there)."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro) -> Future:
+        """Run a coroutine (an instance's process_instance) on the loop; returns a concurrent Future."""
+        self.start()
+        self.stats['instances'] += 1
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Await a blocking call (CloudProvider method, delta sync, ...) from a
+        coroutine.  It runs in the bounded blocking pool, never on the loop.
+        """
+        with self.lock:
+            if self._blocking is None:
+                self._blocking = ThreadPoolExecutor(max_workers=self.max_blocking,
+                                                    thread_name_prefix="async-core-blocking")
+            pool = self._blocking
+            self.stats['blocking'] += 1
+        return await asyncio.wrap_future(pool.submit(lambda: func(*args, **kwargs)))
+
+    async def run(self, cmd: str, capture: bool, timeout: Optional[float]) -> subprocess.CompletedProcess:
+        """
+        Run a shell command line on the loop (the backend of arun_cmd and call).
+
+        Raises:
+            subprocess.TimeoutExpired: the command was killed after `timeout` seconds
+        """
+        kind = self.kind(cmd)
+        self.stats[kind] += 1
+        limit = self._limits.get(kind)
+        if limit is not None:
+            if limit.locked():
+                self.stats['queued'] += 1
+            await limit.acquire()
+            self._active[kind] += 1
+            self.stats[f'peak_{kind}'] = max(self.stats[f'peak_{kind}'], self._active[kind])
+        try:
+            pipe = asyncio.subprocess.PIPE if capture else None
+            proc = await asyncio.create_subprocess_exec(
+                '/bin/sh', '-c', cmd, stdin=asyncio.subprocess.DEVNULL, stdout=pipe, stderr=pipe
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.CancelledError:
+                AsyncStream._kill(proc)  # call() gave up on the loop and runs the command itself
+                raise
+            except asyncio.TimeoutError:
+                AsyncStream._kill(proc)
+                try:
+                    await asyncio.wait_for(proc.wait(), 5)
+                except asyncio.TimeoutError:
+                    pass
+                raise subprocess.TimeoutExpired(cmd, timeout)
+        finally:
+            if limit is not None:
+                self._active[kind] -= 1
+                limit.release()
+        decode = (lambda data: data.decode(errors='replace') if data is not None else None)
+        return subprocess.CompletedProcess(cmd, proc.returncode, decode(stdout), decode(stderr))
+
+    def call(self, cmd: str, capture: bool = True, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """
+        Run a shell command line on the loop and wait for it (the backend of run_cmd).
+
+        Raises:
+            subprocess.TimeoutExpired: the command was killed after `timeout` seconds
+        """
+        self.start()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncCore.call() would block its own event loop")
+        future = asyncio.run_coroutine_threadsafe(self.run(cmd, capture, timeout), self.loop)
+        if timeout is None:
+            return future.result()
+        try:
+            return future.result(timeout=timeout + self.CALL_MARGIN)
+        except FutureTimeoutError:
+            # Loop stalled or slot queue too long: do not hang the caller on it
+            future.cancel()
+            with self.lock:
+                self.stats['fallbacks'] += 1
+            return subprocess.run(cmd, shell=True, capture_output=capture, text=True, timeout=timeout,
+                                  stdin=subprocess.DEVNULL)
+
+    async def stream(self, cmd: str, on_line: Callable[[str], None],
+                     on_exit: Optional[Callable[[AsyncStream], None]] = None) -> AsyncStream:
+        """open_stream() for coroutines."""
+        if not self.in_loop():
+            return self.open_stream(cmd, on_line, on_exit)
+        stream = AsyncStream(self.loop)
+        await self._spawn_stream(stream, cmd, on_line, on_exit)
+        return stream
+
+    def open_stream(self, cmd: str, on_line: Callable[[str], None],
+                    on_exit: Optional[Callable[[AsyncStream], None]] = None) -> AsyncStream:
+        """
+        Start a long-lived command; every stdout line is passed to on_line and
+        on_exit(stream) is called once it ended (both from the loop thread, or
+        from a reader thread when the core is disabled).
+        """
+        if not self.enabled:
+            stream = AsyncStream()
+            stream.proc = subprocess.Popen(cmd, shell=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                           stderr=subprocess.DEVNULL, text=True)
+
+            def reader():
+                try:
+                    for line in stream.proc.stdout:
+                        on_line(line)
+                except Exception:
+                    pass
+                finally:
+                    stream._finish(stream.proc.wait())
+                    if on_exit:
+                        on_exit(stream)
+
+            threading.Thread(target=reader, daemon=True).start()
+            return stream
+
+        self.start()
+        stream = AsyncStream(self.loop)
+        asyncio.run_coroutine_threadsafe(self._spawn_stream(stream, cmd, on_line, on_exit), self.loop).result()
+        return stream
+
+    async def _spawn_stream(self, stream: AsyncStream, cmd: str, on_line, on_exit) -> None:
+        protocol = _StreamProtocol(on_line)
+        stream.proc, _ = await self.loop.subprocess_exec(
+            lambda: protocol, '/bin/sh', '-c', cmd,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        self.stats['streams'] += 1
+        stream.task = asyncio.ensure_future(self._follow(stream, protocol, on_exit))
+
+    async def _follow(self, stream: AsyncStream, protocol: '_StreamProtocol', on_exit) -> None:
+        await protocol.exited
+        # The stream ends when the command exits, not at EOF: a child left
+        # behind by a killed ssh may keep the pipe open indefinitely.
+        try:
+            await asyncio.wait_for(asyncio.shield(protocol.eof), 1)
+        except asyncio.TimeoutError:
+            pass
+        protocol.flush()
+        stream.proc.close()
+        stream._finish(stream.proc.get_returncode())
+        if on_exit:
+            on_exit(stream)
+
+    def summary(self) -> str:
+        return (f"{self.stats['instances']} instance coroutines, "
+                f"{self.stats['cli']} CLI (peak {self.stats['peak_cli']}/{self.max_cli}), "
+                f"{self.stats['ssh']} SSH (peak {self.stats['peak_ssh']}/{self.max_ssh}), "
+                f"{self.stats['other']} local, {self.stats['queued']} queued for a slot, "
+                f"{self.stats['streams']} streams, {self.stats['blocking']} blocking calls, "
+                f"{self.stats['fallbacks']} direct fallbacks")
+
+
+ASYNC_CORE = AsyncCore()
+
+
+# =========================================================================================
+# SSH CONNECTION MULTIPLEXING
+# =========================================================================================
+
+class SSHConnectionPool:
+    """
+    Per-instance persistent SSH sessions shared by every remote call.
+
+    Each (ssh_user, ip) pair gets one OpenSSH ControlMaster started in the
+    background; subsequent ssh invocations attach to its control socket with
+    ControlMaster=no, so they skip the TCP connect and key exchange.  A master
+    is health-checked with `ssh -O check` (at most every health_check_interval
+    seconds) and re-established if it died.  When a master cannot be started
+    the plain (non-multiplexed) command is returned, which matches the
+    behavior before pooling was introduced.
+    """
+
+    def __init__(self, enabled=True, control_persist=600, health_check_interval=30, ssh_binary="ssh"):
+        self.enabled = enabled
+        self.control_persist = control_persist
+        self.health_check_interval = health_check_interval
+        self.ssh_binary = ssh_binary
+        self.lock = threading.Lock()
+        self._control_dir = None
+        self._masters = {}     # (ssh_user, ip) -> {'path': str, 'last_check': float}
+        self._host_locks = {}  # (ssh_user, ip) -> threading.Lock
+        self.stats = {
+            'masters_started': 0,
+            'multiplexed_calls': 0,
+            're_established': 0,
+            'fallback_calls': 0,
+        }
+
+    def configure(self, common_config: Dict[str, Any]) -> None:
+        """Apply ssh_multiplexing / ssh_control_persist settings from cloud_config.json."""
+        self.enabled = bool(common_config.get('ssh_multiplexing', self.enabled))
+        self.control_persist = int(common_config.get('ssh_control_persist', self.control_persist))
+        self.health_check_interval = float(
+            common_config.get('ssh_health_check_interval', self.health_check_interval)
+        )
+
+    def _get_control_dir(self) -> Path:
+        # Unix socket paths are limited to ~104 bytes, so keep the directory short.
+        with self.lock:
+            if self._control_dir is None:
+                self._control_dir = Path(tempfile.mkdtemp(prefix="cep_ssh_"))
+            return self._control_dir
+
+    def _control_path(self, ssh_user: str, ip: str) -> str:
+        digest = hashlib.sha1(f"{ssh_user}@{ip}".encode()).hexdigest()[:16]
+        return str(self._get_control_dir() / f"cm-{digest}")
+
+    def _host_lock(self, key) -> threading.Lock:
+        with self.lock:
+            if key not in self._host_locks:
+                self._host_locks[key] = threading.Lock()
+            return self._host_locks[key]
+
+    def _check_master(self, path: str, ssh_user: str, ip: str) -> bool:
+        """Return True if the control master behind `path` is alive."""
+        if not os.path.exists(path):
+            return False
+        try:
+            res = subprocess.run(
+                [self.ssh_binary, "-O", "check", "-o", f"ControlPath={path}", f"{ssh_user}@{ip}"],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10
+            )
+            return res.returncode == 0
+        except Exception:
+            return False
+
+    def _start_master(self, ssh_opt: str, path: str, ssh_user: str, ip: str, logger=None) -> bool:
+        """Start a backgrounded ControlMaster (ssh -N -f) for ssh_user@ip."""
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        # Keepalive options come first because ssh honors the first value given,
+        # so a dead master is noticed within a minute instead of ServerAliveInterval*3.
+        cmd = (
+            f"{self.ssh_binary} -o ServerAliveInterval=15 -o ServerAliveCountMax=4 {ssh_opt} "
+            f"-o ControlMaster=yes -o ControlPath={path} -o ControlPersist={self.control_persist} "
+            f"-N -f {ssh_user}@{ip}"
+        )
+        if logger:
+            logger.cmd(f"Starting SSH master: {cmd[:150]}{'...' if len(cmd) > 150 else ''}")
+        try:
+            # stdout/stderr must not be pipes: the daemonized master would keep
+            # them open and subprocess.run() would never return.
+            res = subprocess.run(
+                cmd,
+                shell=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=90
+            )
+        except subprocess.TimeoutExpired:
+            if logger:
+                logger.warn(f"Timed out starting SSH master for {ssh_user}@{ip}")
+            return False
+        if res.returncode != 0:
+            if logger:
+                logger.warn(f"SSH master for {ssh_user}@{ip} failed to start (exit {res.returncode})")
+            return False
+        return self._check_master(path, ssh_user, ip)
+
+    def command(self, ip: str, ssh_user: str, ssh_opt: str, logger=None) -> str:
+        """
+        Return the ssh command prefix ("ssh <opts> user@ip") for a remote call.
+
+        The prefix is routed through the shared control master for this host,
+        (re-)establishing it first if needed.
+        """
+        plain = f"{self.ssh_binary} {ssh_opt} {ssh_user}@{ip}"
+        if not self.enabled:
+            return plain
+
+        key = (ssh_user, ip)
+        with self._host_lock(key):
+            entry = self._masters.get(key)
+            now = time.time()
+            if entry and now - entry['last_check'] < self.health_check_interval:
+                pass
+            elif entry and self._check_master(entry['path'], ssh_user, ip):
+                entry['last_check'] = now
+            else:
+                if entry:
+                    if logger:
+                        logger.warn(f"SSH master for {ssh_user}@{ip} is gone, re-establishing...")
+                    with self.lock:
+                        self.stats['re_established'] += 1
+                path = self._control_path(ssh_user, ip)
+                if not self._start_master(ssh_opt, path, ssh_user, ip, logger):
+                    self._masters.pop(key, None)
+                    with self.lock:
+                        self.stats['fallback_calls'] += 1
+                    return plain
+                entry = {'path': path, 'last_check': time.time()}
+                self._masters[key] = entry
+                with self.lock:
+                    self.stats['masters_started'] += 1
+                if logger:
+                    logger.info(f"SSH master established for {ssh_user}@{ip}")
+
+            return self._multiplexed(ssh_opt, entry['path'], ssh_user, ip)
+
+    def _multiplexed(self, ssh_opt: str, path: str, ssh_user: str, ip: str) -> str:
+        with self.lock:
+            self.stats['multiplexed_calls'] += 1
+        # ControlMaster=no: never become an (un-daemonized) master by accident.
+        # If the socket vanished meanwhile, ssh falls back to a direct connection.
+        return f"{self.ssh_binary} {ssh_opt} -o ControlMaster=no -o ControlPath={path} {ssh_user}@{ip}"
+
+    async def acommand(self, ip: str, ssh_user: str, ssh_opt: str, logger=None) -> str:
+        """
+        command() for coroutines: a master checked within health_check_interval
+        is used directly, checking or (re-)starting it runs in ASYNC_CORE.blocking().
+        """
+        if self.enabled:
+            entry = self._masters.get((ssh_user, ip))
+            if entry and time.time() - entry['last_check'] < self.health_check_interval:
+                return self._multiplexed(ssh_opt, entry['path'], ssh_user, ip)
+        return await ASYNC_CORE.blocking(self.command, ip, ssh_user, ssh_opt, logger=logger)
+
+    def close(self, ip: str, logger=None) -> None:
+        """Stop every master connected to `ip` (call before terminating the instance)."""
+        with self.lock:
+            keys = [key for key in self._masters if key[1] == ip]
+        for key in keys:
+            with self._host_lock(key):
+                entry = self._masters.pop(key, None)
+                if not entry:
+                    continue
+                try:
+                    subprocess.run(
+                        [self.ssh_binary, "-O", "exit", "-o", f"ControlPath={entry['path']}", f"{key[0]}@{ip}"],
+                        stdin=subprocess.DEVNULL,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        timeout=10
+                    )
+                except Exception:
+                    pass
+                if logger:
+                    logger.info(f"SSH master closed for {key[0]}@{ip}")
+
+    def close_all(self) -> None:
+        with self.lock:
+            ips = {key[1] for key in self._masters}
+        for ip in ips:
+            self.close(ip)
+        with self.lock:
+            control_dir, self._control_dir = self._control_dir, None
+        if control_dir:
+            shutil.rmtree(control_dir, ignore_errors=True)
+
+    def handshakes_saved(self) -> int:
+        """Remote calls that reused an existing session instead of a fresh handshake."""
+        with self.lock:
+            return max(0, self.stats['multiplexed_calls'] - self.stats['masters_started'])
+
+    def summary(self) -> str:
+        with self.lock:
+            stats = dict(self.stats)
+        return (
+            f"masters={stats['masters_started']} (re-established={stats['re_established']}), "
+            f"multiplexed calls={stats['multiplexed_calls']}, "
+            f"fallback calls={stats['fallback_calls']}, "
+            f"handshakes saved={self.handshakes_saved()}"
+        )
+
+
+# Shared SSH session pool (configured from cloud_config.json in main())
+SSH_POOL = SSHConnectionPool()
+
+
+# =========================================================================================
+# INSTANCE STATUS CACHE
+# =========================================================================================
+
+class InstanceStatusCache:
+    """
+    Shared instance-status cache: one batched describe call per scope and TTL.
+
+    Every thread asking for an instance status (termination waits, the
+    SSH-failure fallback of the workload poll loop, resume checks) is served
+    from the last batched answer for the instance's scope (AWS region, GCP
+    project, OCI region+compartment) if it is younger than ttl seconds.
+    Otherwise one thread refreshes the scope for all tracked instances while
+    the others wait on the scope lock and reuse its result.  Lifecycle
+    transitions (launch, terminate request) invalidate the instance's entry;
+    forget() stops tracking it.  CSPs without a batched query, or a failed
+    batched call, fall back to provider.get_instance_status().
+    """
+
+    def __init__(self, enabled=True, ttl=10.0):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._providers: Dict[str, 'CloudProvider'] = {}
+        self._scopes: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self.stats = {'batched_calls': 0, 'cache_hits': 0, 'direct_calls': 0}
+
+    def configure(self, common_config: Dict[str, Any]) -> None:
+        """Apply status_cache / status_cache_ttl settings from cloud_config.json."""
+        self.enabled = bool(common_config.get('status_cache', self.enabled))
+        self.ttl = float(common_config.get('status_cache_ttl', self.ttl))
+
+    def register_provider(self, provider: 'CloudProvider') -> None:
+        """Make a provider reachable for callers that only know the CSP name."""
+        with self.lock:
+            self._providers[provider.csp_config.get('name', 'unknown').lower()] = provider
+
+    def provider_for(self, cloud: str) -> Optional['CloudProvider']:
+        with self.lock:
+            return self._providers.get((cloud or '').lower())
+
+    def _scope_entry(self, scope: Tuple[str, ...]) -> Dict[str, Any]:
+        with self.lock:
+            return self._scopes.setdefault(scope, {
+                'lock': threading.Lock(),
+                'keys': set(),
+                'statuses': {},
+                'fetched': 0.0,
+            })
+
+    def get(self, provider: 'CloudProvider', instance_id: str, inst: Dict[str, Any], logger=None) -> str:
+        scope = provider.status_scope(inst) if self.enabled else None
+        if scope is None:
+            with self.lock:
+                self.stats['direct_calls'] += 1
+            return provider.get_instance_status(instance_id, inst, logger=logger)
+
+        key = provider.status_key(instance_id, inst)
+        entry = self._scope_entry(scope)
+        with self.lock:
+            # Track before queueing on the scope lock so a refresh already
+            # in progress for another thread can be reused by this one
+            entry['keys'].add(key)
+        with entry['lock']:
+            fresh = time.time() - entry['fetched'] < self.ttl
+            if fresh and key in entry['statuses']:
+                with self.lock:
+                    self.stats['cache_hits'] += 1
+                return entry['statuses'][key]
+
+            with self.lock:
+                keys = sorted(entry['keys'])
+            statuses = provider.describe_instance_statuses(scope, keys, logger=logger)
+            if statuses is None:
+                with self.lock:
+                    self.stats['direct_calls'] += 1
+                return provider.get_instance_status(instance_id, inst, logger=logger)
+            with self.lock:
+                self.stats['batched_calls'] += 1
+            entry['statuses'] = {k: statuses.get(k, 'notfound') for k in keys}
+            entry['fetched'] = time.time()
+            return entry['statuses'][key]
+
+    def invalidate(self, provider: 'CloudProvider', instance_id: str, inst: Dict[str, Any]) -> None:
+        """Lifecycle transition: the next get() for this instance queries the CSP again."""
+        scope = provider.status_scope(inst) if self.enabled else None
+        if scope is None:
+            return
+        entry = self._scope_entry(scope)
+        with entry['lock']:
+            entry['statuses'].pop(provider.status_key(instance_id, inst), None)
+
+    def forget(self, provider: 'CloudProvider', instance_id: str, inst: Dict[str, Any]) -> None:
+        """Stop including a terminated instance in batched calls."""
+        scope = provider.status_scope(inst) if self.enabled else None
+        if scope is None:
+            return
+        key = provider.status_key(instance_id, inst)
+        entry = self._scope_entry(scope)
+        with entry['lock']:
+            with self.lock:
+                entry['keys'].discard(key)
+            entry['statuses'].pop(key, None)
+
+    def summary(self) -> str:
+        with self.lock:
+            return (f"{self.stats['batched_calls']} batched calls, {self.stats['cache_hits']} cache hits, "
+                    f"{self.stats['direct_calls']} direct calls")
+
+
+STATUS_CACHE = InstanceStatusCache()
+
+
+# =========================================================================================
+# READINESS PROBE (post-launch SSH availability)
+# =========================================================================================
+
+class ReadinessProber:
+    """
+    Wait until a freshly launched instance accepts SSH work, instead of a fixed sleep.
+
+    Stages (all timed from the moment launch_instance() returned the IP):
+    1. tcp:   port 22 accepts connections (retried with backoff)
+    2. ssh:   sshd sends its banner ("SSH-2.0-...")
+    3. ready: an SSH command succeeds (key installed) and `cloud-init status
+              --wait` has returned, when cloud-init is present
+
+    Boot-to-ready latencies are kept per image key (<csp>/<os_label>/<arch>)
+    in <host_reports_dir>/readiness_stats.json.  The median of earlier
+    samples is used to skip pointless early probes (predict()).
+    """
+
+    MAX_SAMPLES = 50
+    STAGES = ('tcp', 'ssh', 'ready')
+
+    def __init__(self, enabled=True, timeout=600, stats_path: Optional[Path] = None, port=22):
+        self.enabled = enabled
+        self.timeout = timeout
+        self.port = port
+        self.stats_path = stats_path
+        self.lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, List[float]]] = {}
+
+    def configure(self, common_config: Dict[str, Any]) -> None:
+        """Apply readiness_probe / readiness_timeout / readiness_port and load the latency history."""
+        self.enabled = bool(common_config.get('readiness_probe', self.enabled))
+        self.timeout = int(common_config.get('readiness_timeout', self.timeout))
+        self.port = int(common_config.get('readiness_port', self.port))
+        self.stats_path = Path(common_config['host_reports_dir']) / 'readiness_stats.json'
+        try:
+            with open(self.stats_path, encoding='utf-8') as f:
+                self.stats = json.load(f)
+        except (OSError, ValueError):
+            self.stats = {}
+
+    @staticmethod
+    def image_key(config: Dict[str, Any], inst: Dict[str, Any]) -> str:
+        os_label = get_os_label(parse_os_version(config['common']['os_version']))
+        return f"{inst.get('_csp', 'unknown')}/{os_label}/{inst.get('arch', 'unknown')}"
+
+    def predict(self, image_key: str, stage: str = 'ready') -> Optional[float]:
+        """Median boot-to-<stage> latency seen for this image, None without history."""
+        with self.lock:
+            samples = list(self.stats.get(image_key, {}).get(stage, []))
+        if not samples:
+            return None
+        samples.sort()
+        return samples[len(samples) // 2]
+
+    def _record(self, image_key: str, latencies: Dict[str, float]) -> None:
+        with self.lock:
+            entry = self.stats.setdefault(image_key, {})
+            for stage, value in latencies.items():
+                entry.setdefault(stage, []).append(round(value, 1))
+                entry[stage] = entry[stage][-self.MAX_SAMPLES:]
+            if not self.stats_path:
+                return
+            try:
+                self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.stats_path.with_suffix('.json.tmp')
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(self.stats, f, indent=2)
+                os.replace(tmp, self.stats_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    async def _banner(ip: str, port: int = 22, timeout: float = 3.0) -> Optional[bytes]:
+        """None if the port is closed; b'' if it accepted but sent no banner yet."""
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        try:
+            return await asyncio.wait_for(reader.read(256), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return b''
+        finally:
+            writer.close()
+
+    async def wait_until_ready(self, ip: str, ssh_target: Callable[[], Awaitable[str]], image_key: str,
+                               logger=None) -> bool:
+        """
+        Wait until the instance is ready (or timeout).
+
+        Returns:
+            True when every stage passed, False on timeout
+        """
+        if not self.enabled:
+            if logger:
+                logger.info(f"Waiting 60s for SSH (IP: {ip})...")
+            await asyncio.sleep(60)
+            return True
+
+        start = time.time()
+        deadline = start + self.timeout
+        latencies: Dict[str, float] = {}
+
+        # Nothing can answer much before the fastest previous boot of this image
+        predicted = self.predict(image_key, 'tcp')
+        if predicted:
+            initial_wait = min(predicted * 0.8, self.timeout)
+            if logger:
+                logger.info(f"Readiness: {image_key} usually opens port 22 after ~{predicted:.0f}s, "
+                            f"first probe in {initial_wait:.0f}s")
+            await asyncio.sleep(initial_wait)
+
+        delay = 1.0
+        while time.time() < deadline:
+            banner = await self._banner(ip, self.port)
+            if banner is not None and 'tcp' not in latencies:
+                latencies['tcp'] = time.time() - start
+            if banner and banner.startswith(b'SSH-'):
+                latencies['ssh'] = time.time() - start
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 10.0)
+        else:
+            if logger:
+                logger.warn(f"Readiness: no SSH banner from {ip} within {self.timeout}s")
+            return False
+
+        # Key may not be installed yet right after sshd starts: retry auth failures
+        ready_cmd = ("command -v cloud-init >/dev/null 2>&1 && "
+                     "sudo cloud-init status --wait >/dev/null 2>&1; echo CLOUD_EXEC_READY")
+        delay = 2.0
+        while time.time() < deadline:
+            remaining = max(int(deadline - time.time()), 10)
+            out = await arun_cmd(f"{await ssh_target()} {shlex.quote(ready_cmd)}",
+                                 capture=True, ignore=True, timeout=remaining, logger=logger)
+            if out and 'CLOUD_EXEC_READY' in out:
+                latencies['ready'] = time.time() - start
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 15.0)
+        else:
+            if logger:
+                logger.warn(f"Readiness: SSH to {ip} not usable within {self.timeout}s")
+            return False
+
+        self._record(image_key, latencies)
+        if logger:
+            logger.info("Readiness: " + ", ".join(f"{stage} {latencies[stage]:.0f}s" for stage in self.STAGES))
+        return True
+
+
+READINESS = ReadinessProber()
+
+
+# =========================================================================================
+# BAKED IMAGES (--bake)
+# =========================================================================================
+
+class ImageCache:
+    """
+    Golden images baked with --bake, kept in <host_reports_dir>/baked_images.json.
+
+    One entry per <csp>/<os_label>/<arch>/<location> (location: AWS/OCI
+    region, GCP project) holding the image ID and the setup_list_fingerprint()
+    it was baked with.  lookup() only returns an image whose fingerprint
+    still matches the current setup list and scripts, so an edited
+    prepare_tools.sh falls back to the stock image until the next --bake.
+    """
+
+    def __init__(self, enabled=True, path: Optional[Path] = None):
+        self.enabled = enabled
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.baked: List[str] = []  # keys recorded during this run
+
+    def configure(self, common_config: Dict[str, Any]) -> None:
+        """Apply use_baked_images and load the cache file."""
+        self.enabled = bool(common_config.get('use_baked_images', self.enabled))
+        self.path = Path(common_config['host_reports_dir']) / 'baked_images.json'
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def key(config: Dict[str, Any], inst: Dict[str, Any], location: str) -> str:
+        os_label = get_os_label(parse_os_version(config['common']['os_version']))
+        return f"{inst.get('_csp', 'unknown')}/{os_label}/{inst.get('arch', 'unknown')}/{location}"
+
+    def lookup(self, config: Dict[str, Any], inst: Dict[str, Any], location: str, logger=None) -> Optional[str]:
+        """Image ID to launch from, or None (no bake, stale fingerprint, or disabled)."""
+        if not self.enabled:
+            return None
+        key = self.key(config, inst, location)
+        with self.lock:
+            entry = dict(self.entries.get(key, {}))
+        if not entry:
+            return None
+        if entry.get('fingerprint') != setup_list_fingerprint(config, inst):
+            if logger:
+                logger.info(f"Baked image {entry.get('image_id')} for {key} is stale "
+                            f"(setup changed since {entry.get('created')}), using the stock image")
+            return None
+        if logger:
+            logger.info(f"Using baked image {entry['image_id']} for {key} (baked {entry.get('created')})")
+        return entry['image_id']
+
+    def record(self, config: Dict[str, Any], inst: Dict[str, Any], location: str, image_id: str,
+               fingerprint: str, logger=None) -> None:
+        key = self.key(config, inst, location)
+        with self.lock:
+            previous = self.entries.get(key, {}).get('image_id')
+            self.entries[key] = {
+                'image_id': image_id,
+                'fingerprint': fingerprint,
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'source_type': inst.get('type'),
+            }
+            self.baked.append(key)
+            if self.path:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix('.json.tmp')
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, indent=2)
+                os.replace(tmp, self.path)
+        if logger:
+            logger.info(f"Recorded baked image {image_id} for {key} in {self.path}")
+            if previous and previous != image_id:
+                logger.warn(f"Image {previous} previously baked for {key} is no longer used "
+                            f"(not deleted, remove it manually to stop storage charges)")
+
+
+IMAGE_CACHE = ImageCache()
+
+
+def plan_bake_instances(instances: List[Dict[str, Any]], provider: 'CloudProvider') -> List[Dict[str, Any]]:
+    """
+    One instance per (arch, image location) for --bake: the smallest enabled type of each.
+
+    os_version is common to the run and AWS/OCI images are regional (GCP
+    images are per project), so this is one bake per CSP/OS/arch wherever
+    the run launches.  Instance names get a '-bake' suffix so they never
+    collide with benchmark instances.
+    """
+    chosen: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for inst in instances:
+        group = (inst.get('arch', 'unknown'), provider.image_location(inst))
+        if group not in chosen or inst.get('vcpus', 0) < chosen[group].get('vcpus', 0):
+            chosen[group] = inst
+    planned = []
+    for inst in chosen.values():
+        bake = {k: v for k, v in inst.items() if k not in ('testloads', 'shards', 'hostname')}
+        bake['name'] = f"{inst['name']}-bake"
+        planned.append(bake)
+    return planned
+
+
+# =========================================================================================
+# INCREMENTAL RESULT COLLECTION
+# =========================================================================================
+
+class IncrementalCollector:
+    """
+    Mirror an instance's cloud_reports_dir on the host while the run is going on.
+
+    After every successful workload a background task pulls the files that
+    are new or changed since the last sync (size/mtime listing from the
+    instance), as one compressed delta tarball whose sha256 is verified
+    before it is unpacked into <log_dir>/incremental/<instance>/.  The final
+    collection is then only the last delta plus a local tar of the mirror,
+    so termination is not held up by a multi-GB transfer.
+
+    The task lives on the instance coroutine's event loop (create the
+    collector inside it).  The remote steps are awaited with arun_cmd();
+    only the local checksum / unpack / tar work goes to ASYNC_CORE.blocking().
+    """
+
+    REMOTE_DELTA = "/tmp/cloud_exec_delta"
+    # Worst case for one sync_now(): listing 120s + list upload 60s + remote tar 300s + transfer 300s
+    CLOSE_TIMEOUT = 120 + 60 + 300 + 300
+
+    def __init__(self, ip: str, ssh_user: str, ssh_opt: str, cloud_rep_dir: str, mirror_dir: Path,
+                 instance_name: str, logger=None):
+        self.ip = ip
+        self.ssh_user = ssh_user
+        self.ssh_opt = ssh_opt
+        self.cloud_rep_dir = cloud_rep_dir
+        self.mirror_dir = Path(mirror_dir)
+        self.instance_name = instance_name
+        self.logger = logger
+        self.base = os.path.basename(cloud_rep_dir.rstrip('/'))
+        self.sync_lock = asyncio.Lock()
+        self.manifest: Dict[str, Tuple[str, str]] = {}  # path -> (size, mtime)
+        self.stats = {'syncs': 0, 'files': 0, 'bytes': 0, 'failures': 0}
+        self.stats_lock = threading.Lock()
+        self._pending = asyncio.Event()
+        self._closed = False
+        self._task = asyncio.ensure_future(self._worker())
+
+    async def _ssh(self) -> str:
+        return await SSH_POOL.acommand(self.ip, self.ssh_user, self.ssh_opt, logger=self.logger)
+
+    def _count(self, **deltas) -> None:
+        with self.stats_lock:
+            for key, value in deltas.items():
+                self.stats[key] += value
+
+    def snapshot(self) -> Dict[str, int]:
+        """Consistent copy of the stats counters."""
+        with self.stats_lock:
+            return dict(self.stats)
+
+    def request_sync(self) -> None:
+        """Ask the background task for a sync (coalesced while one is pending)."""
+        self._pending.set()
+
+    async def _worker(self) -> None:
+        while True:
+            await self._pending.wait()
+            if self._closed:
+                return
+            self._pending.clear()
+            try:
+                await self.sync_now()
+            except Exception as e:
+                self._count(failures=1)
+                if self.logger:
+                    self.logger.warn(f"Incremental collection failed (will retry on next workload): {e}")
+
+    async def sync_now(self) -> int:
+        """Pull the current delta now. Returns the number of files transferred."""
+        async with self.sync_lock:
+            listing = await arun_cmd(
+                f"{await self._ssh()} 'cd $(dirname {self.cloud_rep_dir}) && "
+                f"find {self.base} -type f -printf \"%p\\t%s\\t%T@\\n\" 2>/dev/null'",
+                capture=True, timeout=120, logger=self.logger
+            )
+            current = {}
+            for line in (listing or "").splitlines():
+                parts = line.split('\t')
+                if len(parts) == 3:
+                    current[parts[0]] = (parts[1], parts[2])
+            changed = sorted(path for path, meta in current.items() if self.manifest.get(path) != meta)
+            if not changed:
+                return 0
+
+            self.mirror_dir.mkdir(parents=True, exist_ok=True)
+            list_file = self.mirror_dir.parent / f".{self.mirror_dir.name}.delta.list"
+            delta_file = self.mirror_dir.parent / f".{self.mirror_dir.name}.delta.tar.gz"
+            list_file.write_text("\n".join(changed) + "\n")
+            await arun_cmd(f"{await self._ssh()} 'cat > {self.REMOTE_DELTA}.list' < {shlex.quote(str(list_file))}",
+                           capture=True, timeout=60, logger=self.logger)
+            remote_sum = await arun_cmd(
+                f"{await self._ssh()} 'cd $(dirname {self.cloud_rep_dir}) && "
+                f"tar -czf {self.REMOTE_DELTA}.tar.gz -T {self.REMOTE_DELTA}.list 2>/dev/null; "
+                f"sha256sum {self.REMOTE_DELTA}.tar.gz'",
+                capture=True, timeout=300, logger=self.logger
+            )
+            await arun_cmd(f"{await self._ssh()} 'cat {self.REMOTE_DELTA}.tar.gz' > {shlex.quote(str(delta_file))}",
+                           capture=False, timeout=300, logger=self.logger)
+
+            expected = (remote_sum or "").split()[0] if remote_sum else ""
+            size = await ASYNC_CORE.blocking(self._unpack, delta_file, expected)
+            list_file.unlink(missing_ok=True)
+
+            for path in changed:
+                self.manifest[path] = current[path]
+            self._count(syncs=1, files=len(changed), bytes=size)
+            if self.logger:
+                self.logger.info(f"Incremental collection: {len(changed)} files ({size / 1024:.0f} KiB, sha256 verified)")
+            return len(changed)
+
+    def _unpack(self, delta_file: Path, expected: str) -> int:
+        """Verify the delta against the remote sha256 and extract it into the mirror. Returns its size."""
+        sha = hashlib.sha256()
+        with open(delta_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+        if sha.hexdigest() != expected:
+            delta_file.unlink(missing_ok=True)
+            raise RuntimeError(f"delta checksum mismatch ({sha.hexdigest()[:12]} != {expected[:12]})")
+
+        with tarfile.open(delta_file, 'r:gz') as tar:
+            if hasattr(tarfile, 'data_filter'):
+                tar.extractall(self.mirror_dir, filter='data')
+            else:
+                tar.extractall(self.mirror_dir)
+        size = delta_file.stat().st_size
+        delta_file.unlink(missing_ok=True)
+        return size
+
+    async def pack(self, local_f: str) -> str:
+        """Write the mirrored tree as a result tarball (same layout as the remote tar)."""
+        async with self.sync_lock:
+            return await ASYNC_CORE.blocking(self._pack, local_f)
+
+    def _pack(self, local_f: str) -> str:
+        Path(local_f).parent.mkdir(parents=True, exist_ok=True)
+        tmp_out = f"{local_f}.part"
+        with tarfile.open(tmp_out, 'w:gz') as tar:
+            tar.add(self.mirror_dir / self.base, arcname=self.base)
+        os.replace(tmp_out, local_f)
+        return local_f
+
+    async def close(self, remove_mirror: bool = False) -> None:
+        """
+        Stop the background task, letting an in-flight sync run to completion
+        (bounded by CLOSE_TIMEOUT) so the instance is not terminated mid-transfer.
+        """
+        self._closed = True
+        self._pending.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), self.CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            if self.logger:
+                self.logger.warn(f"Incremental collection still running after {self.CLOSE_TIMEOUT}s; "
+                                 f"keeping mirror {self.mirror_dir}")
+            return
+        if remove_mirror:
+            await ASYNC_CORE.blocking(shutil.rmtree, self.mirror_dir, ignore_errors=True)
+
+
+class RemoteMarkerWatcher:
+    """
+    Push-based completion channel for a nohup workload marker file.
+
+    Keeps one long-lived SSH stream open that blocks remotely (inotifywait when
+    available, otherwise a 2s stat loop) until the marker is written, then
+    prints "MARKER:<status>" and exits.  The polling loop waits on this stream
+    instead of sleeping, so completion is noticed within seconds.  If the
+    stream drops, wait() returns early and the caller falls back to polling.
+    """
+
+    def __init__(self, ssh_target: Callable[[], Awaitable[str]], marker_file: str, max_wait: int, logger=None):
+        self.ssh_target = ssh_target
+        self.marker_file = marker_file
+        self.max_wait = int(max_wait)
+        self.logger = logger
+        self.proc = None
+        self.status = None
+        self.restarts = 0
+        self._watching = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+
+    def _remote_script(self) -> str:
+        marker_q = shlex.quote(self.marker_file)
+        return (
+            f"m={marker_q}; end=$(( $(date +%s) + {self.max_wait} )); "
+            "if command -v inotifywait >/dev/null 2>&1; then w=1; else w=0; fi; "
+            "echo WATCHING; "
+            "while [ ! -s \"$m\" ]; do "
+            "[ \"$(date +%s)\" -ge \"$end\" ] && { echo EXPIRED; exit 0; }; "
+            "if [ \"$w\" = 1 ]; then "
+            "inotifywait -qq -t 10 -e close_write -e moved_to \"$(dirname \"$m\")\" >/dev/null 2>&1 || sleep 1; "
+            "else sleep 2; fi; "
+            "done; "
+            "echo \"MARKER:$(cat \"$m\")\""
+        )
+
+    async def start(self) -> bool:
+        """(Re)open the watch stream. Returns False if ssh could not be spawned."""
+        await self.stop()
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        self._watching = False
+        try:
+            self.proc = await ASYNC_CORE.stream(
+                f"{await self.ssh_target()} {shlex.quote(self._remote_script())}",
+                self._on_line,
+                on_exit=self._on_exit
+            )
+        except Exception as e:
+            if self.logger:
+                self.logger.warn(f"Marker watch stream could not be started: {e}")
+            self.proc = None
+            return False
+        return True
+
+    def _on_line(self, line: str) -> None:
+        line = line.strip()
+        if line == "WATCHING":
+            self._watching = True
+        elif line.startswith("MARKER:"):
+            self.status = line[len("MARKER:"):].strip() or None
+            self._wake()
+
+    def _on_exit(self, stream: AsyncStream) -> None:
+        if stream is self.proc:
+            self._watching = False
+        self._wake()
+
+    def _wake(self) -> None:
+        # Called from the loop thread, or from a reader thread when the core is disabled
+        self._loop.call_soon_threadsafe(self._changed.set)
+
+    def active(self) -> bool:
+        """True while the stream is connected and the marker has not been seen."""
+        return self.proc is not None and self.proc.poll() is None and self.status is None
+
+    async def wait(self, timeout: float) -> Optional[str]:
+        """
+        Wait up to `timeout` seconds, returning early when the marker is written
+        or the stream drops.  Returns the marker status if it was observed.
+        """
+        if self.status is None:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.status
+
+    async def stop(self) -> None:
+        proc, self.proc = self.proc, None
+        if proc and proc.poll() is None:
+            try:
+                proc.kill()
+                await proc.wait_closed(5)
+            except Exception:
+                pass
+
+
+def build_storage_config(inst, cloud_type):
+    """Build storage configuration arguments for different cloud providers."""
+    if not inst.get('extra_150g_storage', False):
+        return ""
+
+    if cloud_type == 'aws':
         return (
             '--block-device-mappings '
             '\'[{"DeviceName":"/dev/sda1","Ebs":{"VolumeSize":150,'
@@ -1362,6 +3274,29 @@ def build_storage_config(inst, cloud_type):
         return ""
 
 
+def build_spot_config(inst, cloud_type):
+    """Build spot/preemptible capacity arguments (empty unless spot mode is on for this instance)."""
+    if not inst.get('_spot', False):
+        return ""
+
+    # Preempted capacity is always terminated/deleted (never stopped): workloads are
+    # resumed on a fresh instance and a stopped spot instance would keep billing storage.
+    if cloud_type == 'aws':
+        return (
+            "--instance-market-options "
+            "'MarketType=spot,SpotOptions={SpotInstanceType=one-time,InstanceInterruptionBehavior=terminate}' "
+        )
+    elif cloud_type == 'gcp':
+        return "--provisioning-model=SPOT --instance-termination-action=DELETE "
+    elif cloud_type == 'oci':
+        return (
+            "--preemptible-instance-config "
+            "'{\"preemptionAction\":{\"type\":\"TERMINATE\",\"preserveBootVolume\":false}}' "
+        )
+    else:
+        return ""
+
+
 def build_oci_lvm_userdata():
     """
     Build base64-encoded cloud-init user-data that expands the root LV at first boot.
@@ -1406,13 +3341,29 @@ def build_oci_lvm_userdata():
     return userdata  # raw YAML; OCI CLI --user-data-file will base64-encode on upload
 
 
+def _gcloud_config_stamp() -> str:
+    """Changes whenever the active gcloud configuration (or its env overrides) changes."""
+    config_dir = Path(os.environ.get('CLOUDSDK_CONFIG') or Path.home() / '.config' / 'gcloud')
+    parts = [os.environ.get('CLOUDSDK_CORE_PROJECT', ''), os.environ.get('CLOUDSDK_ACTIVE_CONFIG_NAME', '')]
+    for path in [config_dir / 'active_config'] + sorted((config_dir / 'configurations').glob('config_*')):
+        try:
+            parts.append(f"{path.name}:{path.stat().st_mtime_ns}")
+        except OSError:
+            continue
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+
 def get_gcp_project(logger=None):
-    """Detect GCP project ID from gcloud config."""
+    """Detect GCP project ID from gcloud config (cached until the gcloud configuration changes)."""
     if logger:
         logger.info("Detecting GCP project ID...")
 
-    project = run_cmd("gcloud config get-value project", logger=logger)
-    if project and "(unset)" not in project:
+    def fetch():
+        project = run_cmd("gcloud config get-value project", logger=logger)
+        return project if project and "(unset)" not in project else None
+
+    project = RESOURCE_CACHE.get_or_fetch("gcp/project", fetch, stamp=_gcloud_config_stamp(), logger=logger)
+    if project:
         if logger:
             logger.info(f"GCP project: {project}")
         return project
@@ -1422,6 +3373,459 @@ def get_gcp_project(logger=None):
     return None
 
 
+# =========================================================================================
+# RUN JOURNAL (checkpoint / resume)
+# =========================================================================================
+
+REMOTE_JOURNAL_PATH = "~/.cloud_exec_journal.json"
+
+
+class RunJournal:
+    """
+    Durable per-instance run journal: <log_dir>/journal/<instance>.json.
+
+    Records the launched instance (id/ip/region), the status of every workload
+    index (RUNNING -> SUCCESS/FAILED/TIMEOUT with timestamps) and collected
+    result tarballs.  Written atomically on every change and mirrored to
+    ~/.cloud_exec_journal.json on the instance, so `--resume <run-id>` can
+    reattach to a still-running instance and continue from the first
+    incomplete workload.
+    """
+
+    FINAL_STATUSES = ("SUCCESS", "FAILED", "TIMEOUT")
+
+    def __init__(self, log_dir: Path, instance: str, resume: bool = False):
+        self.path = Path(log_dir) / "journal" / f"{instance}.json"
+        self.lock = threading.Lock()
+        self.data = {
+            'run_id': Path(log_dir).name,
+            'instance': instance,
+            'state': 'pending',
+            'instance_id': None,
+            'ip': None,
+            'launches': 0,
+            'workloads': {},
+            'collected_indices': [],
+            'artifacts': [],
+            'updated': None,
+        }
+        if resume and self.path.exists():
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self.data.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Could not read journal {self.path}: {e}")
+
+    # -- persistence ---------------------------------------------------------------
+
+    def save(self) -> None:
+        with self.lock:
+            self.data['updated'] = datetime.now().isoformat(timespec='seconds')
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.json.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+    async def mirror(self, ssh_target: Callable[[], Awaitable[str]], logger=None) -> None:
+        """Copy the journal to the instance (best effort, never raises)."""
+        try:
+            await arun_cmd(
+                f"{await ssh_target()} 'cat > {REMOTE_JOURNAL_PATH}' < {shlex.quote(str(self.path))}",
+                capture=True, ignore=True, timeout=30, logger=logger
+            )
+        except Exception:
+            pass
+
+    async def merge_remote(self, ssh_target: Callable[[], Awaitable[str]], logger=None) -> None:
+        """Adopt workload entries from the remote copy when it is newer (host journal lost updates)."""
+        out = await arun_cmd(f"{await ssh_target()} 'cat {REMOTE_JOURNAL_PATH} 2>/dev/null'",
+                             capture=True, ignore=True, timeout=30, logger=logger)
+        try:
+            remote = json.loads(out) if out else None
+        except ValueError:
+            remote = None
+        if not remote or (remote.get('updated') or '') <= (self.data.get('updated') or ''):
+            return
+        with self.lock:
+            self.data['workloads'].update(remote.get('workloads', {}))
+        if logger:
+            logger.info("Journal: merged newer workload state from instance copy")
+        self.save()
+
+    # -- updates -------------------------------------------------------------------
+
+    def set_state(self, state: str, **fields) -> None:
+        with self.lock:
+            self.data['state'] = state
+            self.data.update(fields)
+        self.save()
+
+    def record_launch(self, instance_id: str, ip: str, **fields) -> None:
+        with self.lock:
+            self.data['launches'] += 1
+            self.data.update(instance_id=instance_id, ip=ip, state='running', **fields)
+        self.save()
+
+    def workload_started(self, index: int, cmd: str, kind: str = 'workload') -> None:
+        with self.lock:
+            self.data['workloads'][str(index)] = {
+                'cmd': cmd,
+                'kind': kind,
+                'status': 'RUNNING',
+                'started': datetime.now().isoformat(timespec='seconds'),
+                'finished': None,
+            }
+        self.save()
+
+    def workload_finished(self, index: int, status: str) -> None:
+        with self.lock:
+            entry = self.data['workloads'].setdefault(str(index), {'cmd': None, 'started': None})
+            entry['status'] = status
+            entry['finished'] = datetime.now().isoformat(timespec='seconds')
+        self.save()
+
+    def record_artifact(self, local_path: str, indices: Optional[List[int]] = None) -> None:
+        """
+        Results collected: every finished workload so far (or only `indices`,
+        those finished when the copy started) is now safe on the host.
+        """
+        with self.lock:
+            if str(local_path) not in self.data['artifacts']:
+                self.data['artifacts'].append(str(local_path))
+            collected = set(self.data['collected_indices'])
+            if indices is None:
+                indices = [int(i) for i, w in self.data['workloads'].items()
+                           if w.get('status') in self.FINAL_STATUSES]
+            collected.update(indices)
+            self.data['collected_indices'] = sorted(collected)
+        self.save()
+
+    def reset_for_relaunch(self, keep_failed: bool = True) -> None:
+        """
+        The instance is gone: only collected workloads stay done (setup always
+        reruns).  keep_failed=False (--resume) also reruns collected workloads
+        that ended FAILED/TIMEOUT.
+        """
+        with self.lock:
+            collected = {str(i) for i in self.data['collected_indices']}
+            self.data['workloads'] = {
+                i: w for i, w in self.data['workloads'].items()
+                if i in collected and w.get('kind') != 'setup'
+                and (keep_failed or w.get('status') == 'SUCCESS')
+            }
+            self.data['collected_indices'] = sorted(int(i) for i in self.data['workloads'])
+            self.data.update(instance_id=None, ip=None, state='pending', completed=False)
+        self.save()
+
+    # -- queries -------------------------------------------------------------------
+
+    def status_of(self, index: int) -> Optional[str]:
+        with self.lock:
+            return self.data['workloads'].get(str(index), {}).get('status')
+
+    def finished_indices(self) -> List[int]:
+        with self.lock:
+            return [int(i) for i, w in self.data['workloads'].items() if w.get('status') in self.FINAL_STATUSES]
+
+    def is_finished(self) -> bool:
+        """Cleanly completed: terminated after a successful run with every workload SUCCESS."""
+        with self.lock:
+            return (self.data['state'] == 'terminated' and bool(self.data['artifacts'])
+                    and self.data.get('completed', True)
+                    and all(w.get('status') == 'SUCCESS' for w in self.data['workloads'].values()))
+
+
+# =========================================================================================
+# WORKLOAD SHARDING (makespan scheduling across same-shape instances)
+# =========================================================================================
+
+TEST_SUITE_PATH = Path(__file__).resolve().parent / "test_suite.json"
+
+# pts_runner_<testname>.py [first argument, usually the thread count]
+PTS_RUNNER_PATTERN = re.compile(r'pts_runner_([A-Za-z0-9_.+\-]+?)\.py(?:\s+(\S+))?')
+
+
+class WorkloadRuntimeEstimator:
+    """
+    Estimated runtime (seconds) of one workload command on a given instance.
+
+    Priority:
+    1. Median of earlier SUCCESS runs of the same command on the same instance
+       type, taken from the run journals under <host_reports_dir>/logs.
+    2. test_suite.json "exe_time_v8cpu" scaled from 8 vCPUs to the thread
+       count (single-threaded tests are not scaled), multiplied by the
+       history/suite ratio observed for that instance type, if any.
+    """
+
+    DEFAULT_EXE_TIME = 60.0  # pts_runner tests missing from test_suite.json
+
+    def __init__(self, config: Dict[str, Any], exclude_run: Optional[str] = None,
+                 test_suite_path: Path = TEST_SUITE_PATH):
+        self.suite = {}  # testname -> (exe_time_v8cpu, single_threaded)
+        try:
+            with open(test_suite_path, encoding='utf-8') as f:
+                suite = json.load(f)
+            for category in suite.get('test_category', {}).values():
+                for key, attrs in category.get('items', {}).items():
+                    try:
+                        exe_time = float(attrs.get('exe_time_v8cpu', 0.0))
+                    except ValueError:
+                        exe_time = 0.0
+                    single = 'single' in str(attrs.get('TH_scaling', '')).lower()
+                    self.suite[key.split('/', 1)[-1]] = (exe_time, single)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not read {test_suite_path}: {e}")
+
+        # (instance type, formatted command) -> [durations]
+        self.history: Dict[Tuple[str, str], List[float]] = {}
+        logs_dir = Path(config['common']['host_reports_dir']) / 'logs'
+        for journal_file in sorted(logs_dir.glob('*/journal/*.json')):
+            if exclude_run and journal_file.parent.parent.name == exclude_run:
+                continue  # --resume: keep the plan identical to the interrupted run
+            try:
+                with open(journal_file, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if not data.get('type'):
+                continue
+            for entry in data.get('workloads', {}).values():
+                if entry.get('status') != 'SUCCESS' or not entry.get('started') or not entry.get('finished'):
+                    continue
+                try:
+                    duration = (datetime.fromisoformat(entry['finished'])
+                                - datetime.fromisoformat(entry['started'])).total_seconds()
+                except (TypeError, ValueError):
+                    continue
+                self.history.setdefault((data['type'], entry.get('cmd')), []).append(duration)
+
+        # Per-type correction between suite estimates and observed runtimes
+        self.calibration: Dict[str, float] = {}
+        ratios: Dict[str, List[float]] = {}
+        for (machine_type, cmd), durations in self.history.items():
+            suite_estimate = self._suite_estimate(cmd, None)
+            if suite_estimate:
+                ratios.setdefault(machine_type, []).append(self._median(durations) / suite_estimate)
+        for machine_type, values in ratios.items():
+            self.calibration[machine_type] = self._median(values)
+
+    @staticmethod
+    def _median(values: List[float]) -> float:
+        ordered = sorted(values)
+        mid = len(ordered) // 2
+        return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+    def _suite_estimate(self, cmd: str, vcpus: Optional[int]) -> float:
+        match = PTS_RUNNER_PATTERN.search(cmd or '')
+        if not match:
+            return 0.0  # housekeeping (cache clean, git pull, ...)
+        exe_time, single = self.suite.get(match.group(1), (self.DEFAULT_EXE_TIME, False))
+        if single or not vcpus:
+            return exe_time
+        threads = vcpus
+        if match.group(2) and match.group(2).isdigit():
+            threads = min(int(match.group(2)), vcpus)
+        return exe_time * 8.0 / max(threads, 1)
+
+    def estimate(self, cmd: str, inst: Dict[str, Any]) -> float:
+        durations = self.history.get((inst.get('type'), cmd))
+        if durations:
+            return self._median(durations)
+        vcpus = int(inst.get('vcpus', 8) or 8)
+        return self._suite_estimate(cmd, vcpus) * self.calibration.get(inst.get('type'), 1.0)
+
+
+def group_workloads(workloads: List[str]) -> List[Dict[str, Any]]:
+    """
+    Split a workload list into the units a shard receives.
+
+    Consecutive commands of the same pts_runner script stay together (they
+    append to one log and share the installed test), and housekeeping
+    commands such as the PTS cache clean follow the group they came after.
+    Housekeeping before the first benchmark forms a group with test=None.
+    """
+    groups: List[Dict[str, Any]] = []
+    for order, cmd in enumerate(workloads):
+        match = PTS_RUNNER_PATTERN.search(cmd)
+        test = match.group(1) if match else None
+        if test and groups and groups[-1]['test'] == test:
+            groups[-1]['cmds'].append(cmd)
+        elif test or not groups:
+            groups.append({'test': test, 'order': order, 'cmds': [cmd]})
+        else:
+            groups[-1]['cmds'].append(cmd)
+    return groups
+
+
+def plan_shards(workloads: List[str], count: int, inst: Dict[str, Any],
+                estimator: WorkloadRuntimeEstimator) -> List[Tuple[List[str], float]]:
+    """
+    Distribute workload groups over `count` identical instances (LPT: longest
+    group first onto the least loaded shard).  Each shard keeps the original
+    command order; leading housekeeping runs on every shard.
+
+    Returns:
+        [(workloads, estimated_seconds), ...] one entry per shard
+    """
+    groups = group_workloads(workloads)
+    common = [cmd for g in groups if g['test'] is None for cmd in g['cmds']]
+    jobs = []
+    for g in groups:
+        if g['test'] is None:
+            continue
+        est = sum(estimator.estimate(cmd.format(vcpus=inst['vcpus']), inst) for cmd in g['cmds'])
+        jobs.append((est, g))
+    jobs.sort(key=lambda job: (-job[0], job[1]['order']))
+
+    loads = [(0.0, k) for k in range(count)]
+    assigned: List[List[Dict[str, Any]]] = [[] for _ in range(count)]
+    for est, g in jobs:
+        load, k = heapq.heappop(loads)
+        assigned[k].append(g)
+        heapq.heappush(loads, (load + est, k))
+
+    totals = dict((k, load) for load, k in loads)
+    plans = []
+    for k in range(count):
+        cmds = list(common)
+        for g in sorted(assigned[k], key=lambda g: g['order']):
+            cmds.extend(g['cmds'])
+        plans.append((cmds, totals[k]))
+    return plans
+
+
+def expand_sharded_instances(instances: List[Dict[str, Any]], config: Dict[str, Any],
+                             shard_count: int = 1, exclude_run: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Replace every instance with "shards": N (or --shards N) by N instances of
+    the same type, each running one part of the workloads.
+
+    All shards share the original hostname, so their results land in the same
+    results/<hostname>/ tree and merge_shard_results() can combine them.
+    Testloads instances are never sharded.
+    """
+    workloads = config['common'].get('workloads', [])
+    estimator = None
+    expanded = []
+    for inst in instances:
+        count = int(inst.get('shards', shard_count) or 1)
+        testloads = inst.get('testloads', config.get('_testloads_mode', False))
+        if count <= 1 or testloads or not workloads:
+            expanded.append(inst)
+            continue
+        if estimator is None:
+            estimator = WorkloadRuntimeEstimator(config, exclude_run=exclude_run)
+
+        plans = plan_shards(workloads, count, inst, estimator)
+        serial = sum(est for _, est in plans)
+        makespan = max(est for _, est in plans)
+        print(f"[SHARD] {inst['name']}: {count} shards, estimated makespan "
+              f"{makespan / 3600:.1f}h (serial {serial / 3600:.1f}h)")
+        for k, (cmds, est) in enumerate(plans, start=1):
+            if not any(PTS_RUNNER_PATTERN.search(cmd) for cmd in cmds):
+                continue  # more shards than benchmark groups
+            shard = copy.deepcopy(inst)
+            shard['name'] = f"{inst['name']}-s{k}"
+            shard['hostname'] = inst.get('hostname') or sanitize_instance_name(inst['name'])
+            shard['_shard'] = {
+                'group': inst['name'],
+                'index': k,
+                'count': count,
+                'workloads': cmds,
+                'estimate': est,
+            }
+            expanded.append(shard)
+    return expanded
+
+
+def merge_result_tarballs(tarballs: List[str], output: str) -> None:
+    """
+    Merge shard result tarballs into one results tree.
+
+    Files present in several shards: identical copies are kept once,
+    one_big_json_*.json are merged (missing keys added), anything else is
+    kept side by side as <file>.shard<k>.
+    """
+    with tempfile.TemporaryDirectory(prefix="cloud_exec_merge_") as tmp:
+        merged = Path(tmp) / "merged"
+        merged.mkdir()
+        for k, tarball in enumerate(tarballs, start=1):
+            src_root = Path(tmp) / f"shard{k}"
+            with tarfile.open(tarball, 'r:gz') as tar:
+                if hasattr(tarfile, 'data_filter'):
+                    tar.extractall(src_root, filter='data')
+                else:
+                    tar.extractall(src_root)
+            for src in sorted(p for p in src_root.rglob('*') if p.is_file()):
+                rel = src.relative_to(src_root)
+                dst = merged / rel
+                if not dst.exists():
+                    dst.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(src, dst)
+                elif dst.read_bytes() == src.read_bytes():
+                    continue
+                elif dst.name.startswith('one_big_json') and dst.suffix == '.json':
+                    try:
+                        with open(dst, encoding='utf-8') as f:
+                            base = json.load(f)
+                        with open(src, encoding='utf-8') as f:
+                            _merge_missing_keys(base, json.load(f))
+                        with open(dst, 'w', encoding='utf-8') as f:
+                            json.dump(base, f, indent=2)
+                    except (OSError, ValueError):
+                        shutil.copy2(src, dst.with_name(f"{dst.name}.shard{k}"))
+                else:
+                    shutil.copy2(src, dst.with_name(f"{dst.name}.shard{k}"))
+
+        tmp_out = f"{output}.part"
+        with tarfile.open(tmp_out, 'w:gz') as tar:
+            for top in sorted(merged.iterdir()):
+                tar.add(top, arcname=top.name)
+        os.replace(tmp_out, output)
+
+
+def _merge_missing_keys(base: Dict[str, Any], other: Dict[str, Any]) -> None:
+    """Recursively add keys of other that base does not have (base wins on conflicts)."""
+    for key, value in other.items():
+        if key not in base:
+            base[key] = value
+        elif isinstance(base[key], dict) and isinstance(value, dict):
+            _merge_missing_keys(base[key], value)
+
+
+def merge_shard_results(config: Dict[str, Any], cloud: str, instances: List[Dict[str, Any]]) -> None:
+    """After a sharded run: combine each shard group's collected tarballs into one machine result."""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for inst in instances:
+        if inst.get('_shard'):
+            groups.setdefault(inst['_shard']['group'], []).append(inst)
+
+    for group, shards in groups.items():
+        tarballs = []
+        for shard in shards:
+            journal = shard.get('_journal')
+            # Spot checkpoints may record the incremental mirror directory: take the last tarball
+            artifacts = [a for a in (journal.data['artifacts'] if journal else []) if os.path.isfile(a)]
+            if artifacts:
+                tarballs.append(artifacts[-1])
+        if len(tarballs) < len(shards):
+            print(f"[WARN] {group}: only {len(tarballs)}/{len(shards)} shards collected results")
+        if not tarballs:
+            continue
+        template = {k: v for k, v in shards[0].items() if k != '_shard'}
+        template['name'] = group
+        output = result_tarball_path(config, cloud, group, template)
+        try:
+            merge_result_tarballs(tarballs, output)
+            print(f"[SHARD] {group}: merged {len(tarballs)} shard results into {output}")
+        except Exception as e:
+            print(f"[ERROR] {group}: failed to merge shard results: {e} "
+                  f"(shard tarballs kept in {os.path.dirname(tarballs[0])})")
+
+
 # Note: The following large functions from cloud_exec.py are imported inline.
 # These include: setup_aws_sg, launch_aws_instance, launch_gcp_instance, 
 # launch_oci_instance, run_ssh_commands, collect_results
@@ -1444,51 +3848,59 @@ def setup_aws_sg(region, sg_name, logger=None):
         log(f"Setting up AWS security group: {sg_name} in {region}")
         log("Checking for existing security group...")
 
-    sg_id = run_cmd(
-        f"aws ec2 describe-security-groups --region {region} --group-names {sg_name} "
-        f"--query 'SecurityGroups[0].GroupId' --output text",
-        ignore=True,
-        logger=logger
-    )
-
-    if not sg_id or sg_id == "None":
-        if logger:
-            logger.info("Security group not found, creating new one...")
-        elif False:
-            log("Security group not found, creating new one...")
-            
-        vpc_id = run_cmd(
-            f"aws ec2 describe-vpcs --region {region} --query 'Vpcs[0].VpcId' --output text",
-            logger=logger
-        )
-        if logger:
-            logger.info(f"Using VPC: {vpc_id}")
-        elif False:
-            log(f"Using VPC: {vpc_id}")
-
+    def find_or_create():
         sg_id = run_cmd(
-            f"aws ec2 create-security-group --group-name {sg_name} "
-            f"--description 'SG for benchmarking' --vpc-id {vpc_id} --region {region} "
-            f"--query 'GroupId' --output text",
+            f"aws ec2 describe-security-groups --region {region} --group-names {sg_name} "
+            f"--query 'SecurityGroups[0].GroupId' --output text",
+            ignore=True,
             logger=logger
         )
-        if logger:
-            logger.info(f"Created security group: {sg_id}")
-        elif False:
-            log(f"Created security group: {sg_id}")
-    else:
-        if logger:
-            logger.info(f"Using existing security group: {sg_id}")
-        elif False:
-            log(f"Using existing security group: {sg_id}")
+
+        if not sg_id or sg_id == "None":
+            if logger:
+                logger.info("Security group not found, creating new one...")
+            elif False:
+                log("Security group not found, creating new one...")
+
+            vpc_id = run_cmd(
+                f"aws ec2 describe-vpcs --region {region} --query 'Vpcs[0].VpcId' --output text",
+                logger=logger
+            )
+            if logger:
+                logger.info(f"Using VPC: {vpc_id}")
+            elif False:
+                log(f"Using VPC: {vpc_id}")
+
+            sg_id = run_cmd(
+                f"aws ec2 create-security-group --group-name {sg_name} "
+                f"--description 'SG for benchmarking' --vpc-id {vpc_id} --region {region} "
+                f"--query 'GroupId' --output text",
+                logger=logger
+            )
+            if logger:
+                logger.info(f"Created security group: {sg_id}")
+            elif False:
+                log(f"Created security group: {sg_id}")
+        else:
+            if logger:
+                logger.info(f"Using existing security group: {sg_id}")
+            elif False:
+                log(f"Using existing security group: {sg_id}")
+        return sg_id
+
+    sg_id = RESOURCE_CACHE.get_or_fetch(f"aws/sg/{region}/{sg_name}", find_or_create, logger=logger)
 
     if logger:
         logger.info("Getting current public IP...")
     elif False:
         log("Getting current public IP...")
-        
-    my_ip = run_cmd("curl -s https://checkip.amazonaws.com", logger=logger)
-    
+
+    # The public IP may change between runs: looked up once per run, never persisted
+    my_ip = RESOURCE_CACHE.get_or_fetch(
+        "host/public_ip", lambda: run_cmd("curl -s https://checkip.amazonaws.com", logger=logger),
+        persist=False, logger=logger
+    )
+
     if logger:
         logger.info(f"Current IP: {my_ip}")
         logger.info(f"Authorizing SSH access from {my_ip}/32...")
@@ -1496,12 +3908,17 @@ def setup_aws_sg(region, sg_name, logger=None):
         log(f"Current IP: {my_ip}")
         log(f"Authorizing SSH access from {my_ip}/32...")
 
-    run_cmd(
-        f"aws ec2 authorize-security-group-ingress --group-id {sg_id} "
-        f"--protocol tcp --port 22 --cidr {my_ip}/32 --region {region}",
-        ignore=True,
-        logger=logger
-    )
+    def authorize():
+        run_cmd(
+            f"aws ec2 authorize-security-group-ingress --group-id {sg_id} "
+            f"--protocol tcp --port 22 --cidr {my_ip}/32 --region {region}",
+            ignore=True,
+            logger=logger
+        )
+        return True
+
+    # Once per region and run (the rule may have been removed since the last run)
+    RESOURCE_CACHE.get_or_fetch(f"aws/sg_ingress/{region}/{sg_id}/{my_ip}", authorize, persist=False, logger=logger)
     if logger:
         logger.info("Security group configured")
     elif False:
@@ -1509,15 +3926,9 @@ def setup_aws_sg(region, sg_name, logger=None):
 
     return sg_id
 
-def launch_aws_instance(inst, config, region, key_name, sg_id, logger=None):
-    """Launch AWS instance and return (instance_id, ip)."""
-    if logger:
-        logger.info(f"Launching AWS instance: {inst['name']} ({inst['type']})")
-    elif False:
-        log(f"Launching AWS instance: {inst['name']} ({inst['type']})")
-
-    os_version = config['common']['os_version']
-    os_info = parse_os_version(os_version)
+def _lookup_aws_ami(config, region, arch, logger=None) -> Optional[str]:
+    """Search the newest stock AMI (Canonical / Red Hat) for the configured OS."""
+    os_info = parse_os_version(config['common']['os_version'])
     effective = get_effective_os_for_csp(os_info, 'aws')
 
     if effective['provision_as'] == 'ubuntu':
@@ -1536,13 +3947,13 @@ def launch_aws_instance(inst, config, region, key_name, sg_id, logger=None):
                 logger.error(msg)
             else:
                 print(f"[Error] {msg}")
-            return None, None
+            return None
         if logger:
-            logger.info(f"Finding AMI for Ubuntu {os_info['version']} ({codename}) {inst['arch']}...")
+            logger.info(f"Finding AMI for Ubuntu {os_info['version']} ({codename}) {arch}...")
         ami_patterns = [
-            f"ubuntu/images/hvm-ssd-gp3/ubuntu-{codename}-{os_info['version']}-{inst['arch']}-server-*",
-            f"ubuntu/images/hvm-ssd/ubuntu-{codename}-{os_info['version']}-{inst['arch']}-server-*",
-            f"ubuntu/images/*ubuntu-{codename}-{os_info['version']}-{inst['arch']}-server-*"
+            f"ubuntu/images/hvm-ssd-gp3/ubuntu-{codename}-{os_info['version']}-{arch}-server-*",
+            f"ubuntu/images/hvm-ssd/ubuntu-{codename}-{os_info['version']}-{arch}-server-*",
+            f"ubuntu/images/*ubuntu-{codename}-{os_info['version']}-{arch}-server-*"
         ]
         owner_id = "099720109477"  # Canonical
         os_desc = f"Ubuntu {os_info['version']} ({codename})"
@@ -1550,7 +3961,7 @@ def launch_aws_instance(inst, config, region, key_name, sg_id, logger=None):
     elif effective['provision_as'] == 'rhel':
         # --- RHEL AMI search ---
         # AMI arch: amd64 -> x86_64, arm64 stays arm64
-        rhel_arch = "x86_64" if inst['arch'] in ("amd64", "x86_64") else "arm64"
+        rhel_arch = "x86_64" if arch in ("amd64", "x86_64") else "arm64"
         if logger:
             logger.info(f"Finding AMI for RHEL {effective['version']} {rhel_arch}...")
         ami_patterns = [
@@ -1565,7 +3976,7 @@ def launch_aws_instance(inst, config, region, key_name, sg_id, logger=None):
         msg = f"Unsupported OS for AWS: {effective['provision_as']}"
         if logger:
             logger.error(msg)
-        return None, None
+        return None
 
     ami = None
     for pattern in ami_patterns:
@@ -1590,14 +4001,41 @@ def launch_aws_instance(inst, config, region, key_name, sg_id, logger=None):
 
 
     if not ami or ami == "None":
-        msg = f"No AMI found for {os_desc} {inst['arch']} in {region}"
+        msg = f"No AMI found for {os_desc} {arch} in {region}"
         if logger:
             logger.error(msg)
         elif False:
             log(msg, "ERROR")
         else:
             print(f"[Error] {msg}")
-        return None, None
+        return None
+
+    return ami
+
+
+def find_aws_ami(config, region, arch, logger=None) -> Optional[str]:
+    """Stock AMI for the configured OS/arch in a region (RESOURCE_CACHE)."""
+    return RESOURCE_CACHE.get_or_fetch(
+        f"aws/ami/{region}/{config['common']['os_version']}/{arch}",
+        lambda: _lookup_aws_ami(config, region, arch, logger),
+        logger=logger
+    )
+
+
+def launch_aws_instance(inst, config, region, key_name, sg_id, logger=None):
+    """Launch AWS instance and return (instance_id, ip)."""
+    if logger:
+        logger.info(f"Launching AWS instance: {inst['name']} ({inst['type']})")
+    elif False:
+        log(f"Launching AWS instance: {inst['name']} ({inst['type']})")
+
+    if inst.get('_image'):
+        # AMI baked with --bake (IMAGE_CACHE)
+        ami = inst['_image']
+    else:
+        ami = find_aws_ami(config, region, inst['arch'], logger)
+        if not ami or ami == "None":
+            return None, None
 
     if logger:
         logger.info(f"Using AMI: {ami}")
@@ -1608,12 +4046,14 @@ def launch_aws_instance(inst, config, region, key_name, sg_id, logger=None):
 
     # Build storage configuration using centralized helper
     storage_config = build_storage_config(inst, 'aws')
+    spot_config = build_spot_config(inst, 'aws')
 
     tag_spec = f"--tag-specifications 'ResourceType=instance,Tags=[{{Key=Name,Value={inst['name']}}}]' "
     instance_id = run_cmd(
         f"aws ec2 run-instances --region {region} --image-id {ami} "
         f"--instance-type {inst['type']} --key-name {key_name} "
         f"--security-group-ids {sg_id} {storage_config}"
+        f"{spot_config}"
         f"{tag_spec}"
         f"--query 'Instances[0].InstanceId' --output text",
         logger=logger
@@ -1642,19 +4082,11 @@ def launch_aws_instance(inst, config, region, key_name, sg_id, logger=None):
     return instance_id, ip
 
 
-def launch_gcp_instance(inst, config, project, zone, logger=None):
-    """Launch GCP instance and return (instance_id, ip)."""
-    name = inst['name']
-
-    if logger:
-        logger.info(f"Launching GCP instance: {name} ({inst['type']})")
-    elif False:
-        log(f"Launching GCP instance: {name} ({inst['type']})")
-
-    os_version = config['common']['os_version']
-    os_info = parse_os_version(os_version)
+def _lookup_gcp_image_family(config, arch, logger=None) -> Optional[List[str]]:
+    """Search the public image family for the configured OS: [family, image_project]."""
+    os_info = parse_os_version(config['common']['os_version'])
     effective = get_effective_os_for_csp(os_info, 'gcp')
-    img_arch = "arm64" if inst['arch'] == "arm64" else "amd64"
+    img_arch = "arm64" if arch == "arm64" else "amd64"
 
     if effective['provision_as'] == 'ubuntu':
         # --- Ubuntu image family search ---
@@ -1665,7 +4097,7 @@ def launch_gcp_instance(inst, config, project, zone, logger=None):
                 logger.error(msg)
             else:
                 print(f"[Error] {msg}")
-            return None, None
+            return None
 
         version_number = os_info['version'].replace('.', '')
         is_lts = os_info['version'].endswith('.04') and int(os_info['version'].split('.')[0]) % 2 == 0
@@ -1702,7 +4134,7 @@ def launch_gcp_instance(inst, config, project, zone, logger=None):
         msg = f"Unsupported OS for GCP: {effective['provision_as']}"
         if logger:
             logger.error(msg)
-        return None, None
+        return None
 
     image_family = None
     for candidate in family_candidates:
@@ -1723,17 +4155,55 @@ def launch_gcp_instance(inst, config, project, zone, logger=None):
             logger.error(msg)
         else:
             print(f"[Error] {msg}")
-        return None, None
+        return None
+
+    return [image_family, image_project]
+
+
+def find_gcp_image_family(config, arch, logger=None) -> Optional[List[str]]:
+    """Public image family for the configured OS/arch: [family, image_project] (RESOURCE_CACHE)."""
+    return RESOURCE_CACHE.get_or_fetch(
+        f"gcp/image_family/{config['common']['os_version']}/{'arm64' if arch == 'arm64' else 'amd64'}",
+        lambda: _lookup_gcp_image_family(config, arch, logger),
+        logger=logger
+    )
+
+
+def launch_gcp_instance(inst, config, project, zone, logger=None):
+    """Launch GCP instance and return (instance_id, ip)."""
+    name = inst['name']
+
+    if logger:
+        logger.info(f"Launching GCP instance: {name} ({inst['type']})")
+    elif False:
+        log(f"Launching GCP instance: {name} ({inst['type']})")
+
+    os_version = config['common']['os_version']
+    os_info = parse_os_version(os_version)
+    effective = get_effective_os_for_csp(os_info, 'gcp')
+
+    if inst.get('_image'):
+        # Custom image baked with --bake (IMAGE_CACHE), kept in the instance's own project
+        image_flag = f"--image={inst['_image']} --image-project={project} "
+        image_desc = f"baked image {inst['_image']}"
+    else:
+        found = find_gcp_image_family(config, inst['arch'], logger)
+        if not found:
+            return None, None
+        image_family, image_project = found
+        image_flag = f"--image-family={image_family} --image-project={image_project} "
+        image_desc = f"image family {image_family}"
 
     if logger:
-        logger.info(f"Using image family: {image_family}")
+        logger.info(f"Using {image_desc}")
         logger.info("Creating instance...")
     elif False:
-        log(f"Using image family: {image_family}")
+        log(f"Using {image_desc}")
         log("Creating instance...")
 
     # Build storage configuration using centralized helper
     storage_config = build_storage_config(inst, 'gcp')
+    spot_config = build_spot_config(inst, 'gcp')
 
     # For RHEL on GCP, inject SSH key via metadata (no default user exists)
     metadata_flag = ""
@@ -1762,7 +4232,8 @@ def launch_gcp_instance(inst, config, project, zone, logger=None):
         f"gcloud compute instances create {name} --project={project} "
         f"--zone={zone} --machine-type={inst['type']} "
         f"{storage_config}"
-        f"--image-family={image_family} --image-project={image_project} "
+        f"{spot_config}"
+        f"{image_flag}"
         f"{metadata_flag}"
         f"--format='get(networkInterfaces[0].accessConfigs[0].natIP)'",
         logger=logger,
@@ -1822,7 +4293,28 @@ def get_instance_status(cloud, instance_id, region=None, project=None, zone=None
     return "unknown"
 
 
-def verify_ssh_build(ip, ssh_opt, ssh_user, instance_name, auto_rollback=True, logger=None):
+def external_instance_status(inst, logger=None):
+    """Cloud-side status of a workload's instance (used when SSH keeps failing)."""
+    cloud_name = (inst.get('cloud') or inst.get('_csp') or '').lower()
+    provider = STATUS_CACHE.provider_for(cloud_name)
+    if provider and inst.get('instance_id'):
+        # Shared, batched per region/project (see InstanceStatusCache)
+        return provider.cached_instance_status(inst['instance_id'], inst, logger=logger)
+
+    status_instance_id = inst.get('instance_id') or inst.get('name')
+    if cloud_name == 'gcp':
+        status_instance_id = inst.get('name') or status_instance_id
+    return get_instance_status(
+        cloud=cloud_name,
+        instance_id=status_instance_id,
+        region=inst.get('region'),
+        project=inst.get('project'),
+        zone=inst.get('region') or inst.get('zone'),
+        logger=logger
+    )
+
+
+async def verify_ssh_build(ip, ssh_opt, ssh_user, instance_name, auto_rollback=True, logger=None):
     """
     Verify SSH build status after build_openssh.sh execution.
 
@@ -1848,11 +4340,11 @@ def verify_ssh_build(ip, ssh_opt, ssh_user, instance_name, auto_rollback=True, l
             logger.info("Waiting 10 seconds for SSH service restart...")
         elif False:
             log("Waiting 10 seconds for SSH service restart...")
-        time.sleep(10)
+        await asyncio.sleep(10)
 
         # Check build status file
         status_cmd = f"ssh {ssh_opt} {ssh_user}@{ip} 'cat /tmp/ssh_build_status.txt 2>/dev/null || echo UNKNOWN'"
-        status = run_cmd(status_cmd, capture=True, timeout=10, logger=logger)
+        status = await arun_cmd(status_cmd, capture=True, timeout=10, logger=logger)
 
         if status == "SUCCESS":
             if logger:
@@ -1890,7 +4382,7 @@ def verify_ssh_build(ip, ssh_opt, ssh_user, instance_name, auto_rollback=True, l
                     f"echo ROLLBACK_SUCCESS || echo ROLLBACK_FAILED'"
                 )
 
-                rollback_result = run_cmd(rollback_cmd, capture=True, timeout=30, ignore=True, logger=logger)
+                rollback_result = await arun_cmd(rollback_cmd, capture=True, timeout=30, ignore=True, logger=logger)
 
                 if rollback_result == "ROLLBACK_SUCCESS":
                     if logger:
@@ -1919,21 +4411,25 @@ def verify_ssh_build(ip, ssh_opt, ssh_user, instance_name, auto_rollback=True, l
         return False
 
 
-def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, instance_name, logger=None):
-    """Execute all commands via SSH sequentially with output displayed."""
-    strict_hk = "yes" if ssh_strict_host_key_checking else "no"
-    ssh_connect_timeout = config['common'].get('ssh_timeout', 20)
-    ssh_opt = f"-i {key_path} -o StrictHostKeyChecking={strict_hk} -o UserKnownHostsFile=/dev/null -o ConnectTimeout={ssh_connect_timeout} -o ServerAliveInterval=300 -o ServerAliveCountMax=3 -o BatchMode=yes -o NumberOfPasswordPrompts=0"
-    os_info = parse_os_version(config['common']['os_version'])
-    ssh_user = get_ssh_user(os_info, inst.get('_csp', 'aws'))
-    # Each workload timeout (backward compatible with command_timeout)
-    workload_timeout = config['common'].get('workload_timeout', config['common'].get('command_timeout', 10800))
-    workload_timeout_limit = config['common'].get('workload_timeout_limit', 0)
-    timeout_count = 0
-    workload_error_limit = config['common'].get('workload_error_limit', 1)
-    error_count = 0
-    workload_aborted = False  # set True when error limit reached; still run post_process
+def setup_commands(config, os_info) -> Tuple[str, List[str]]:
+    """OS-specific setup list: (config key, commands)."""
+    if os_info['os_family'] == 'ubuntu' and os_info.get('version') == '26.04':
+        setup_key = 'ubuntu2604_setup'
+    elif os_info['os_family'] == 'ubuntu':
+        setup_key = 'debian_setup'
+    else:  # rhel, orcl
+        setup_key = 'fedra_setup'
+    return setup_key, config['common'].get(setup_key, [])
 
+
+def build_workload_list(config, inst, os_info, instance_name, logger=None) -> Tuple[List[str], int]:
+    """
+    Build the ordered command list for an instance.
+
+    Returns:
+        (workloads, setup_count): setup commands occupy indices 1..setup_count
+        of the returned list and their failures are fatal.
+    """
     # -----------------------------------------------------------
     # Determine Command List (Testloads vs Workloads)
     # -----------------------------------------------------------
@@ -1942,6 +4438,7 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
     # 2. Global --test flag (config._testloads_mode)
     # 3. Default: run workloads
     workloads = []
+    setup_count = 0  # testloads have no setup phase
 
     # Check if instance has explicit testloads setting
     if 'testloads' in inst:
@@ -1951,25 +4448,28 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
         # Fall back to global --test flag, or default to False
         testloads_mode = config.get('_testloads_mode', False)
 
-    if testloads_mode:
+    if testloads_mode and not config.get('_bake'):
         if logger:
             logger.info(f"Testloads mode ENABLED for {instance_name}. Running ONLY testloads.")
         workloads = config['common'].get('testloads', [])
     else:
-        # Determine OS-specific setup commands.
-        if os_info['os_family'] == 'ubuntu' and os_info.get('version') == '26.04':
-            setup_key = 'ubuntu2604_setup'
-        elif os_info['os_family'] == 'ubuntu':
-            setup_key = 'debian_setup'
-        else:  # rhel, orcl
-            setup_key = 'fedra_setup'
-        setup_cmds = config['common'].get(setup_key, [])
+        setup_key, setup_cmds = setup_commands(config, os_info)
         setup_count = len(setup_cmds)  # setup cmds occupy workload indices 1..setup_count (errors are fatal)
         if logger:
             logger.info(f"OS family '{os_info['os_family']}': prepending '{setup_key}' ({setup_count} commands)")
 
         # Standard workloads execution
-        if 'workloads' in config['common']:
+        if config.get('_bake'):
+            # --bake: setup only, the instance is snapshotted afterwards
+            workloads = list(setup_cmds)
+        elif inst.get('_shard'):
+            # Sharded run: this instance's part of the workloads (see plan_shards)
+            workloads = setup_cmds + inst['_shard']['workloads']
+            if logger:
+                logger.info(f"Shard {inst['_shard']['index']}/{inst['_shard']['count']} of {inst['_shard']['group']}: "
+                            f"{len(inst['_shard']['workloads'])} workloads "
+                            f"(estimated {inst['_shard']['estimate'] / 3600:.1f}h)")
+        elif 'workloads' in config['common']:
             # New format: array of workloads
             workloads = setup_cmds + config['common']['workloads']
         elif 'commands' in config['common']:
@@ -1991,6 +4491,258 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                     if cmd and cmd.strip():
                         workloads.append(cmd)
 
+    return workloads, setup_count
+
+
+def lookahead_prefetch_command(config, cmds: List[str]) -> Optional[str]:
+    """
+    Detached pts_runner/prefetch_downloads.py --lookahead for the given workloads.
+
+    Started on the instance before the first workload: it follows which
+    pts_runner_*.py is running and downloads the next `prefetch_lookahead`
+    benchmarks' files at low CPU/IO priority (capped by `prefetch_max_rate`,
+    e.g. "20M"), so installs of later benchmarks find them in the PTS cache.
+
+    Returns:
+        Shell command, or None when prefetch_lookahead is 0 or no workload runs a pts_runner
+    """
+    common = config['common']
+    lookahead = int(common.get('prefetch_lookahead', 0) or 0)
+    if lookahead <= 0:
+        return None
+    names = list(dict.fromkeys(re.findall(r'pts_runner_([A-Za-z0-9._+-]+?)\.py', "\n".join(cmds))))
+    if not names:
+        return None
+    repo_match = next((m for m in (re.search(r'cd\s+(\S+)\s*&&.*pts_runner_', c) for c in cmds) if m), None)
+    repo_dir = repo_match.group(1) if repo_match else "~/cloud_onehour"
+    opts = f"--lookahead {lookahead}"
+    if common.get('prefetch_max_rate'):
+        opts += f" --max-rate {shlex.quote(str(common['prefetch_max_rate']))}"
+    return (f"cd {repo_dir} && [ -x pts_runner/prefetch_downloads.py ] && "
+            f"./pts_runner/prefetch_downloads.py --background {opts} {' '.join(names)} "
+            f"> /tmp/pts_prefetch.log 2>&1 || true")
+
+
+# Completed setup steps, one fingerprint per line. Kept in $HOME so it survives
+# reboots and is carried into images snapshotted after setup.
+REMOTE_SETUP_FINGERPRINTS = "~/.cloud_exec_setup_fingerprints"
+_SCRIPT_DIR_HASHES: Dict[str, str] = {}
+_SCRIPT_DIR_HASHES_LOCK = threading.Lock()
+
+
+def _script_dir_hash(name: str) -> str:
+    """sha256 over every file of a repository scripts directory (computed once per run)."""
+    with _SCRIPT_DIR_HASHES_LOCK:
+        if name not in _SCRIPT_DIR_HASHES:
+            root = Path(__file__).resolve().parent / name
+            digest = hashlib.sha256()
+            for path in sorted(p for p in root.rglob('*') if p.is_file() and '__pycache__' not in p.parts):
+                digest.update(str(path.relative_to(root)).encode() + b'\0')
+                digest.update(path.read_bytes())
+            _SCRIPT_DIR_HASHES[name] = digest.hexdigest()
+        return _SCRIPT_DIR_HASHES[name]
+
+
+def _setup_chain(config, inst, setup_cmds) -> List[str]:
+    """
+    Chained content hash of each setup command.
+
+    A hash covers the command, the repository scripts directory it runs from
+    (cloud_onehour/<dir>, e.g. prepare_tools.sh), the OS version and the
+    architecture, plus the previous step's hash so that a changed step also
+    invalidates every step after it.
+    """
+    repo_root = Path(__file__).resolve().parent
+    chain = f"{config['common']['os_version']}|{inst.get('arch', '')}"
+    hashes = []
+    for workload in setup_cmds:
+        cmd = workload.format(vcpus=inst['vcpus'])
+        digest = hashlib.sha256(f"{chain}|{cmd}".encode())
+        for name in sorted(set(re.findall(r'cloud_onehour/([\w.-]+)', cmd))):
+            if (repo_root / name).is_dir():
+                digest.update(f"|{name}:{_script_dir_hash(name)}".encode())
+        chain = digest.hexdigest()[:16]
+        hashes.append(chain)
+    return hashes
+
+
+def setup_fingerprints(config, inst, workloads, setup_count) -> List[Optional[str]]:
+    """
+    Content fingerprint of each setup step (see _setup_chain), or None for
+    steps that always run: those matching setup_fingerprint_always (default:
+    'git pull', which also wipes the PTS install cache).
+    """
+    common = config['common']
+    if not common.get('setup_fingerprint', True):
+        return [None] * setup_count
+    always = common.get('setup_fingerprint_always', ['git pull'])
+    return [None if any(pattern in cmd for pattern in always) else fingerprint
+            for cmd, fingerprint in zip(workloads[:setup_count], _setup_chain(config, inst, workloads[:setup_count]))]
+
+
+def setup_list_fingerprint(config, inst) -> str:
+    """Fingerprint of the whole OS-specific setup list for this instance's arch (baked images)."""
+    _, setup_cmds = setup_commands(config, parse_os_version(config['common']['os_version']))
+    chain = _setup_chain(config, inst, setup_cmds)
+    return chain[-1] if chain else hashlib.sha256(config['common']['os_version'].encode()).hexdigest()[:16]
+
+
+def log_setup_timing(timings, logger=None) -> None:
+    """Log per-step setup durations, slowest first. timings: [(index, cmd, seconds, skipped)]."""
+    if not timings or not logger:
+        return
+    total = sum(sec for _, _, sec, _ in timings)
+    skipped = sum(1 for *_, was_skipped in timings if was_skipped)
+    logger.info(f"Setup timing: {total:.1f}s total, {skipped}/{len(timings)} steps skipped (fingerprint match)")
+    for index, cmd, sec, was_skipped in sorted(timings, key=lambda t: -t[2]):
+        logger.info(f"  setup {index}: {sec:7.1f}s {'(skipped) ' if was_skipped else ''}{cmd[:70]}")
+
+
+def setup_timing_summary(log_dir: Path, top: int = 3) -> Optional[str]:
+    """Run-wide slowest setup steps from events.jsonl (mean seconds over instances that ran them)."""
+    LOG_WRITER.flush()
+    events_path = Path(log_dir) / "events.jsonl"
+    if not events_path.exists():
+        return None
+    runs: Dict[str, List[float]] = {}
+    skipped = 0
+    with open(events_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                ev = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if ev.get('event') != 'setup_step':
+                continue
+            if ev.get('skipped'):
+                skipped += 1
+            elif ev.get('duration') is not None:
+                runs.setdefault(ev.get('cmd', ''), []).append(ev['duration'])
+    if not runs and not skipped:
+        return None
+    slowest = sorted(runs.items(), key=lambda kv: -sum(kv[1]) / len(kv[1]))[:top]
+    parts = [f"{sum(d) / len(d):.0f}s x{len(d)} {cmd[:40]}" for cmd, d in slowest]
+    return f"{skipped} steps skipped; slowest: " + "; ".join(parts)
+
+
+async def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, instance_name, logger=None):
+    """Execute all commands via SSH sequentially with output displayed."""
+    strict_hk = "yes" if ssh_strict_host_key_checking else "no"
+    ssh_connect_timeout = config['common'].get('ssh_timeout', 20)
+    ssh_opt = f"-i {key_path} -o StrictHostKeyChecking={strict_hk} -o UserKnownHostsFile=/dev/null -o ConnectTimeout={ssh_connect_timeout} -o ServerAliveInterval=300 -o ServerAliveCountMax=3 -o BatchMode=yes -o NumberOfPasswordPrompts=0"
+    os_info = parse_os_version(config['common']['os_version'])
+    ssh_user = get_ssh_user(os_info, inst.get('_csp', 'aws'))
+
+    async def ssh_target():
+        """SSH prefix for ssh_user@ip, multiplexed over the shared session."""
+        return await SSH_POOL.acommand(ip, ssh_user, ssh_opt, logger=logger)
+
+    journal = inst.get('_journal')
+    workload_started_at = {}  # index -> time.time(), for events.jsonl durations
+
+    async def journal_finish(index, status, skipped=False):
+        """Record a final workload status in the run journal (host + instance copy)."""
+        started = workload_started_at.pop(index, None)
+        duration = time.time() - started if started else None
+        if logger:
+            logger.event('workload_end', workload=index, status=status, duration=duration)
+        if journal:
+            journal.workload_finished(index, status)
+            await journal.mirror(ssh_target, logger)
+        if index > setup_count:
+            await workload_collected(status)
+        else:
+            await setup_finished(index, status, duration or 0.0, skipped)
+
+    async def setup_finished(index, status, duration, skipped):
+        """Record the step's fingerprint on the instance and its timing; report once setup is over."""
+        fingerprint = fingerprints[index - 1]
+        cmd = workloads[index - 1].format(vcpus=inst['vcpus'])
+        setup_timings.append((index, cmd, duration, skipped))
+        if logger:
+            logger.event('setup_step', workload=index, duration=duration, status=status,
+                         skipped=skipped, fingerprint=fingerprint, cmd=cmd[:200])
+        if status == 'SUCCESS' and fingerprint and not skipped:
+            await arun_cmd(f"{await ssh_target()} 'echo {fingerprint} >> {REMOTE_SETUP_FINGERPRINTS}'",
+                           capture=True, ignore=True, timeout=30, logger=logger)
+        if index == setup_count or status != 'SUCCESS':
+            log_setup_timing(setup_timings, logger)
+
+    async def workload_collected(status):
+        """A workload finished: pull its results (background delta / spot checkpoint)."""
+        if inst.get('_externally_terminated'):
+            return
+        collector = inst.get('_collector')
+        if inst.get('_spot') and inst.get('_checkpoint_path') and config['common'].get('spot_checkpoint_collect', True):
+            await spot_checkpoint(collector)
+        elif collector and status == 'SUCCESS':
+            collector.request_sync()
+
+    async def spot_checkpoint(collector):
+        """Spot mode: pull results after every workload so a preemption loses at most one."""
+        if collector:
+            # The incremental mirror is the checkpoint: wait for this workload's delta only
+            try:
+                await collector.sync_now()
+                if journal:
+                    journal.record_artifact(str(collector.mirror_dir))
+            except Exception as e:
+                if logger:
+                    logger.warn(f"Spot checkpoint sync failed (continuing): {e}")
+            return
+        # incremental_collect=false: full copy in the background, the next workload starts now
+        task = inst.get('_checkpoint_task')
+        if task is not None and not task.done():
+            inst['_checkpoint_again'] = True  # coalesced into one more copy after the running one
+            return
+        inst['_checkpoint_task'] = asyncio.ensure_future(full_checkpoint())
+
+    async def full_checkpoint():
+        while True:
+            inst['_checkpoint_again'] = False
+            covered = journal.finished_indices() if journal else None  # not the ones finishing during the copy
+            try:
+                local_f = await collect_results(ip, config, inst['_csp'], inst['name'], inst, key_path,
+                                                ssh_strict_host_key_checking, instance_name, logger,
+                                                local_f=inst['_checkpoint_path'])
+                if journal:
+                    journal.record_artifact(local_f, covered)
+            except Exception as e:
+                if logger:
+                    logger.warn(f"Spot checkpoint collection failed (continuing): {e}")
+            if not inst.get('_checkpoint_again') or inst.get('_externally_terminated'):
+                return
+
+    async def spot_preempted(index, current_cmd, started):
+        """Spot mode: a failed SSH step may be the preemption itself -> hand over to the relaunch."""
+        if not inst.get('_spot'):
+            return False
+        if inst.get('_externally_terminated'):
+            return True
+        status = await ASYNC_CORE.blocking(external_instance_status, inst, logger=logger)
+        normalized_status = (status or "unknown").strip().lower()
+        if normalized_status not in ['terminated', 'stopped', 'stopping', 'shutting-down', 'shutting_down', 'deleted', 'notfound']:
+            return False
+        if logger:
+            logger.error(f"Instance {instance_name} preempted during workload {index} (Status: {status})")
+        inst['_externally_terminated'] = True
+        DASHBOARD.update(instance_name, status='TERMINATED')
+        DASHBOARD.add_history(instance_name, f"Workload {index}/{len(workloads)}: {current_cmd}",
+                              time.time() - started, "EXT_TERM")
+        return True
+
+    # Each workload timeout (backward compatible with command_timeout)
+    workload_timeout = config['common'].get('workload_timeout', config['common'].get('command_timeout', 10800))
+    workload_timeout_limit = config['common'].get('workload_timeout_limit', 0)
+    timeout_count = 0
+    workload_error_limit = config['common'].get('workload_error_limit', 1)
+    error_count = 0
+    workload_aborted = False  # set True when error limit reached; still run post_process
+    marker_watch = config['common'].get('marker_watch', True)
+    marker_watch_max_restarts = config['common'].get('marker_watch_max_restarts', 5)
+
+    workloads, setup_count = build_workload_list(config, inst, os_info, instance_name, logger)
+
     if not workloads:
         if logger:
             logger.warn("No workloads to execute")
@@ -1998,6 +4750,14 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
             log("No workloads to execute", "WARNING")
         return False
 
+    fingerprints = setup_fingerprints(config, inst, workloads, setup_count)
+    setup_timings = []  # [(index, cmd, seconds, skipped)]
+
+    if config.get('_remote_batch', config['common'].get('remote_batch', False)):
+        return await run_remote_batch(ip, config, inst, workloads, setup_count, ssh_target,
+                                      ssh_opt, ssh_user, instance_name, logger,
+                                      on_workload_end=workload_collected, fingerprints=fingerprints)
+
     total_workloads = len(workloads)
     progress(instance_name, f"Workload execution started ({total_workloads} workloads)", logger)
 
@@ -2008,11 +4768,22 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
     #elif DEBUG_MODE == False:
         print(f"  [Workloads] Starting execution of {total_workloads} workloads...")
 
+    budget_estimates = BUDGET.workload_estimates(workloads, setup_count, inst, journal) if BUDGET.enabled else []
+    budget_skipped = set()
+    prefetch_started = False
+
+    # Setup steps this instance (or the image it was booted from) already completed
+    installed = set()
+    if any(fingerprints):
+        out = await arun_cmd(f"{await ssh_target()} 'cat {REMOTE_SETUP_FINGERPRINTS} 2>/dev/null || true'",
+                             capture=True, ignore=True, timeout=30, logger=logger)
+        installed = set((out or '').split())
+
     for i, workload in enumerate(workloads, start=1):
         if workload_aborted:
             break
 
-        def archive_failure_logs(reason: str, current_cmd: str, wrapper_log_path: Optional[str] = None) -> None:
+        async def archive_failure_logs(reason: str, current_cmd: str, wrapper_log_path: Optional[str] = None) -> None:
             """Archive remote debug logs into cloud_reports_dir/debug_logs for postmortem."""
             try:
                 cloud_rep_dir = config['common']['cloud_reports_dir']
@@ -2041,7 +4812,7 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
 
                 quoted_candidates = " ".join([f'"{p}"' for p in candidates])
                 debug_cmd = (
-                    f"ssh {ssh_opt} {ssh_user}@{ip} "
+                    f"{await ssh_target()} "
                     f"'DBG_DIR={cloud_rep_dir}/debug_logs; "
                     f"mkdir -p \"$DBG_DIR\"; "
                     f"TS=$(date +%Y%m%d_%H%M%S); "
@@ -2050,7 +4821,7 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                     f"done; "
                     f"echo archived:{reason}'"
                 )
-                run_cmd(debug_cmd, capture=True, ignore=True, timeout=60, logger=logger)
+                await arun_cmd(debug_cmd, capture=True, ignore=True, timeout=60, logger=logger)
                 if logger:
                     logger.info(f"Archived failure logs to {cloud_rep_dir}/debug_logs ({reason})")
             except Exception as archive_error:
@@ -2064,6 +4835,40 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
         if not cmd or cmd.strip() == "":
             continue
 
+        # Resume: skip workloads the journal already has a final status for
+        journal_status = journal.status_of(i) if journal else None
+        if journal_status in RunJournal.FINAL_STATUSES:
+            if logger:
+                logger.info(f"Workload {i}/{total_workloads} already {journal_status} (journal), skipping")
+            if i > setup_count:
+                if journal_status == "FAILED":
+                    error_count += 1
+                    if workload_error_limit > 0 and error_count >= workload_error_limit:
+                        workload_aborted = True
+                elif journal_status == "TIMEOUT":
+                    timeout_count += 1
+            continue
+
+        # Budget cap: skip the longest remaining workloads when the projection exceeds it
+        if BUDGET.enabled and i > setup_count:
+            budget_skipped |= BUDGET.plan_skips(
+                instance_name, [(j, sec) for j, sec in budget_estimates if j >= i and j not in budget_skipped], logger
+            )
+            if i in budget_skipped:
+                if logger:
+                    logger.warn(f"Workload {i}/{total_workloads} skipped (budget)")
+                DASHBOARD.add_history(instance_name, f"Workload {i}/{total_workloads}: {cmd}", 0, "SKIPPED")
+                continue
+
+        # Setup fingerprint: the same step already ran on this instance/image
+        if i <= setup_count and fingerprints[i - 1] in installed:
+            if logger:
+                logger.info(f"Workload {i}/{total_workloads} already installed (setup fingerprint "
+                            f"{fingerprints[i - 1]}), skipping")
+            DASHBOARD.add_history(instance_name, f"Workload {i}/{total_workloads}: {cmd}", 0, "SKIPPED")
+            await journal_finish(i, "SUCCESS", skipped=True)
+            continue
+
         if is_apt_setup_command(cmd):
             cmd = wrap_apt_command_with_retries(cmd)
             if logger:
@@ -2087,6 +4892,28 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
         long_running_indicators = config['common'].get('long_running_indicators', ['pts_regression.py', 'benchmark', 'phoronix-test-suite', 'pts_runner'])
         is_long_running = any(indicator in cmd for indicator in long_running_indicators)
 
+        # Lookahead prefetch: started once, right before the first benchmark
+        if i > setup_count and not prefetch_started:
+            prefetch_started = True
+            # Only what will still run: not budget-skipped, not already final in the journal
+            prefetch_cmd = lookahead_prefetch_command(config, [
+                w.format(vcpus=inst['vcpus']) for j, w in enumerate(workloads[i - 1:], start=i)
+                if j not in budget_skipped
+                and not (journal and journal.status_of(j) in RunJournal.FINAL_STATUSES)
+            ])
+            if prefetch_cmd:
+                if logger:
+                    logger.info(f"Starting lookahead prefetch ({config['common']['prefetch_lookahead']} ahead)")
+                await arun_cmd(f"{await ssh_target()} {shlex.quote(prefetch_cmd)}", capture=True, ignore=True,
+                               timeout=60, logger=logger)
+
+        if journal and journal_status != "RUNNING":
+            journal.workload_started(i, cmd, 'setup' if i <= setup_count else 'workload')
+        workload_started_at[i] = time.time()
+        if logger:
+            logger.event('workload_start', workload=i, kind='setup' if i <= setup_count else 'workload',
+                         cmd=cmd[:200])
+
         if is_long_running:
             # Run via nohup to survive SSH disconnections
             if logger:
@@ -2099,6 +4926,7 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
             # Create unique marker file for this command
             marker_file = f"/tmp/cloud_exec_cmd_{i}_done.marker"
             log_file = f"/tmp/cloud_exec_cmd_{i}.log"
+            pid_file = f"/tmp/cloud_exec_cmd_{i}.pid"
             remote_log_path = log_file
 
             # Wrap command with nohup and marker file creation.
@@ -2107,6 +4935,7 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
             marker_q = shlex.quote(marker_file)
             log_q = shlex.quote(log_file)
             inner_script = (
+                f"echo $$ > {shlex.quote(pid_file)}\n"
                 f"{cmd}\n"
                 "status=$?\n"
                 f'if [ "$status" -eq 0 ]; then echo SUCCESS > {marker_q}; '
@@ -2116,32 +4945,51 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
             wrapped_cmd = f"nohup bash -lc {shlex.quote(inner_script)} > {log_q} 2>&1 < /dev/null &"
             remote_wrapped_cmd = shlex.quote(wrapped_cmd)
 
-            # Start the command in background
-            nohup_max_retries = 3
-            for nohup_attempt in range(nohup_max_retries):
-                try:
-                    run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} {remote_wrapped_cmd}", capture=False, timeout=60, logger=logger)
-                    break  # nohup started successfully
-                except subprocess.TimeoutExpired:
-                    # SSH connected but nohup sh ... & did not return within 60s.
-                    # The background process may have already started; proceed to polling.
+            # Resume: the host lost track of this workload, but it may still be
+            # running (or already finished) on the instance -> reattach instead.
+            reattached = False
+            if journal_status == "RUNNING":
+                probe = await arun_cmd(
+                    f"{await ssh_target()} 'cat {marker_file} 2>/dev/null || "
+                    f"(kill -0 $(cat {pid_file} 2>/dev/null) 2>/dev/null && echo ALIVE) || echo DEAD'",
+                    capture=True, timeout=30, ignore=True, logger=logger
+                )
+                if probe and probe != "DEAD":
+                    reattached = True
                     if logger:
-                        logger.warn("Timeout while starting background command, proceeding to verification...")
-                    else:
-                        print("  [Warn] Timeout while starting background command, proceeding to verification...")
-                    break
-                except subprocess.CalledProcessError as e:
-                    # SSH connection itself failed (exit 255 = connection refused/timeout/unreachable).
-                    # The remote nohup was never started, so retrying is safe (no double-execution risk).
-                    if nohup_attempt < nohup_max_retries - 1:
-                        msg = f"nohup start failed (exit {e.returncode}), retrying in 15s ({nohup_attempt + 1}/{nohup_max_retries})..."
+                        logger.info(f"Reattaching to workload {i}/{total_workloads} on instance ({probe})")
+                else:
+                    journal.workload_started(i, cmd, 'setup' if i <= setup_count else 'workload')
+
+            if not reattached:
+                # Start the command in background
+                nohup_max_retries = 3
+                for nohup_attempt in range(nohup_max_retries):
+                    try:
+                        await arun_cmd(f"{await ssh_target()} {remote_wrapped_cmd}", capture=False, timeout=60, logger=logger)
+                        break  # nohup started successfully
+                    except subprocess.TimeoutExpired:
+                        # SSH connected but nohup sh ... & did not return within 60s.
+                        # The background process may have already started; proceed to polling.
                         if logger:
-                            logger.warn(msg)
+                            logger.warn("Timeout while starting background command, proceeding to verification...")
                         else:
-                            print(f"  [Warn] {msg}")
-                        time.sleep(15)
-                    else:
-                        raise  # All retries exhausted; propagate to workload error handler
+                            print("  [Warn] Timeout while starting background command, proceeding to verification...")
+                        break
+                    except subprocess.CalledProcessError as e:
+                        # SSH connection itself failed (exit 255 = connection refused/timeout/unreachable).
+                        # The remote nohup was never started, so retrying is safe (no double-execution risk).
+                        if await spot_preempted(i, cmd, workload_start):
+                            return False
+                        if nohup_attempt < nohup_max_retries - 1:
+                            msg = f"nohup start failed (exit {e.returncode}), retrying in 15s ({nohup_attempt + 1}/{nohup_max_retries})..."
+                            if logger:
+                                logger.warn(msg)
+                            else:
+                                print(f"  [Warn] {msg}")
+                            await asyncio.sleep(15)
+                        else:
+                            raise  # All retries exhausted; propagate to workload error handler
 
             if logger:
                 logger.info("Command started in background, waiting for completion...")
@@ -2158,17 +5006,41 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
             ssh_fail_threshold = 2
             warned_90_percent = False  # Track if we've issued 90% warning
 
+            # Push-based completion: wake up as soon as the marker is written.
+            # Polling below stays as the fallback when the stream is unavailable.
+            marker_watcher = None
+            if marker_watch:
+                marker_watcher = RemoteMarkerWatcher(ssh_target, marker_file, workload_timeout + 300, logger=logger)
+                if not await marker_watcher.start():
+                    marker_watcher = None
+
             while time.time() - start_time < workload_timeout:
                 # Exponential backoff: 30s -> 45s -> 67s -> 101s -> 151s -> 227s -> 300s (max 5 min)
                 poll_interval = min(30 * (1.5 ** check_count), 300)
-                time.sleep(poll_interval)
+                if (marker_watcher and marker_watcher.status is None and not marker_watcher.active()
+                        and marker_watcher.restarts < marker_watch_max_restarts):
+                    marker_watcher.restarts += 1
+                    if logger:
+                        logger.warn(f"Marker watch stream dropped, reconnecting ({marker_watcher.restarts}/{marker_watch_max_restarts})...")
+                    await marker_watcher.start()
+                if marker_watcher and (marker_watcher.active() or marker_watcher.status is not None):
+                    await marker_watcher.wait(poll_interval)
+                else:
+                    await asyncio.sleep(poll_interval)
                 check_count += 1
 
-                # Check if marker file exists
-                marker_check = run_cmd(
-                    f"ssh {ssh_opt} {ssh_user}@{ip} 'cat {marker_file} 2>/dev/null || echo RUNNING'",
+                # Check if marker file exists (LOST: no marker and the workload's
+                # pid is gone, e.g. the instance rebooted under the nohup job)
+                marker_check = await arun_cmd(
+                    f"{await ssh_target()} 'if [ -s {marker_file} ]; then cat {marker_file}; "
+                    f"elif [ ! -f {pid_file} ] || kill -0 $(cat {pid_file}) 2>/dev/null; then echo RUNNING; "
+                    f"elif [ -s {marker_file} ]; then cat {marker_file}; else echo LOST; fi'",
                     capture=True, timeout=10, ignore=True, logger=logger
                 )
+                if marker_check == "LOST":
+                    if logger:
+                        logger.error(f"Workload {i}/{total_workloads} process disappeared without a marker (instance reboot?)")
+                    marker_check = "FAILED"
 
                 if marker_check:
                     ssh_fail_count = 0
@@ -2181,19 +5053,7 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                         elif False:
                             log(f"SSH failed {ssh_fail_count} times, checking instance status...", "WARN")
 
-                        cloud_name = (inst.get('cloud') or inst.get('_csp') or '').lower()
-                        status_instance_id = inst.get('instance_id') or inst.get('name')
-                        if cloud_name == 'gcp':
-                            status_instance_id = inst.get('name') or status_instance_id
-
-                        status = get_instance_status(
-                            cloud=cloud_name,
-                            instance_id=status_instance_id,
-                            region=inst.get('region'),
-                            project=inst.get('project'),
-                            zone=inst.get('region') or inst.get('zone'),
-                            logger=logger
-                        )
+                        status = await ASYNC_CORE.blocking(external_instance_status, inst, logger=logger)
 
                         normalized_status = (status or "unknown").strip().lower()
                         if normalized_status in ['terminated', 'stopped', 'stopping', 'shutting-down', 'shutting_down', 'deleted', 'notfound']:
@@ -2203,8 +5063,11 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                             elif False:
                                 log(msg, "ERROR")
 
-                            archive_failure_logs("external-termination", cmd, log_file)
+                            if marker_watcher:
+                                await marker_watcher.stop()
+                            await archive_failure_logs("external-termination", cmd, log_file)
                             
+                            inst['_externally_terminated'] = True
                             DASHBOARD.update(instance_name, status='TERMINATED')
                             duration = time.time() - workload_start
                             DASHBOARD.add_history(instance_name, f"Workload {i}/{total_workloads}: {cmd}", duration, "EXT_TERM")
@@ -2217,8 +5080,8 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
 
 
                 # Show progress by checking log file size
-                log_size_check = run_cmd(
-                    f"ssh {ssh_opt} {ssh_user}@{ip} 'wc -c < {log_file} 2>/dev/null || echo 0'",
+                log_size_check = await arun_cmd(
+                    f"{await ssh_target()} 'wc -c < {log_file} 2>/dev/null || echo 0'",
                     capture=True, timeout=10, ignore=True, logger=logger
                 )
 
@@ -2234,6 +5097,8 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                     pass
 
                 if marker_check == "SUCCESS":
+                    if marker_watcher:
+                        await marker_watcher.stop()
                     if logger:
                         logger.info(f"Workload {i}/{total_workloads} completed successfully")
                     elif False:
@@ -2245,8 +5110,11 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                     
                     duration = time.time() - workload_start
                     DASHBOARD.add_history(instance_name, f"Workload {i}/{total_workloads}: {cmd}", duration, "OK")
+                    await journal_finish(i, "SUCCESS")
                     break
                 elif marker_check == "FAILED":
+                    if marker_watcher:
+                        await marker_watcher.stop()
                     if logger:
                         logger.error(f"Workload {i}/{total_workloads} failed")
                     elif False:
@@ -2260,8 +5128,8 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                     else:
                         print(f"  [Debug] Fetching error log from {log_file}...")
                     
-                    log_output = run_cmd(
-                        f"ssh {ssh_opt} {ssh_user}@{ip} 'tail -100 {log_file} 2>/dev/null || echo \"[Error] Could not read log file\"'",
+                    log_output = await arun_cmd(
+                        f"{await ssh_target()} 'tail -100 {log_file} 2>/dev/null || echo \"[Error] Could not read log file\"'",
                         capture=True, timeout=30, ignore=True, logger=logger
                     )
                     
@@ -2292,8 +5160,8 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                         else:
                             print(f"  [Debug] Checking workload output log: {workload_log_path}...")
                             
-                        workload_log = run_cmd(
-                            f"ssh {ssh_opt} {ssh_user}@{ip} 'tail -200 {workload_log_path} 2>/dev/null || echo \"No workload log found\"'",
+                        workload_log = await arun_cmd(
+                            f"{await ssh_target()} 'tail -200 {workload_log_path} 2>/dev/null || echo \"No workload log found\"'",
                             capture=True, timeout=30, ignore=True, logger=logger
                         )
                         
@@ -2312,7 +5180,8 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
 
                     duration = time.time() - workload_start
                     DASHBOARD.add_history(instance_name, f"Workload {i}/{total_workloads}: {cmd}", duration, "ERROR")
-                    archive_failure_logs("long-running-failed", cmd, log_file)
+                    await journal_finish(i, "FAILED")
+                    await archive_failure_logs("long-running-failed", cmd, log_file)
 
                     if i <= setup_count:
                         # Setup commands (debian_setup / fedra_setup) are fatal on any error
@@ -2356,16 +5225,16 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                     # Dump diagnostic info at 90%
                     try:
                         # Get process tree
-                        ps_output = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'ps auxf | head -100'",
-                                           capture=True, ignore=True, timeout=30, logger=logger)
+                        ps_output = await arun_cmd(f"{await ssh_target()} 'ps auxf | head -100'",
+                                                  capture=True, ignore=True, timeout=30, logger=logger)
                         if logger and ps_output:
                             logger.warn(f"Process tree (top 100 processes):\n{ps_output}")
                         elif ps_output:
                             print(f"  [DIAG] Process tree (top 100 processes):\n{ps_output}")
 
                         # Get last 50 lines of log
-                        log_tail = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'tail -200 {remote_log_path} 2>/dev/null || echo \"[No log available]\"'",
-                                          capture=True, ignore=True, timeout=30, logger=logger)
+                        log_tail = await arun_cmd(f"{await ssh_target()} 'tail -200 {remote_log_path} 2>/dev/null || echo \"[No log available]\"'",
+                                                 capture=True, ignore=True, timeout=30, logger=logger)
                         if logger and log_tail:
                             logger.warn(f"Last 200 lines of wrapper log ({remote_log_path}):\n{log_tail}")
                         elif log_tail:
@@ -2375,16 +5244,16 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                         workload_log_match = re.search(r'>\s*(/tmp/[^\s]+\.log)', cmd)
                         if workload_log_match:
                             workload_log_path = workload_log_match.group(1)
-                            wl_tail = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'tail -200 {workload_log_path} 2>/dev/null || echo \"[No workload log]\"'",
-                                             capture=True, ignore=True, timeout=30, logger=logger)
+                            wl_tail = await arun_cmd(f"{await ssh_target()} 'tail -200 {workload_log_path} 2>/dev/null || echo \"[No workload log]\"'",
+                                                    capture=True, ignore=True, timeout=30, logger=logger)
                             if logger and wl_tail:
                                 logger.warn(f"Last 200 lines of workload log ({workload_log_path}):\n{wl_tail}")
                             elif wl_tail:
                                 print(f"  [DIAG] Last 200 lines of workload log:\n{wl_tail}")
 
                         # Get memory/disk info
-                        mem_info = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'free -h'",
-                                          capture=True, ignore=True, timeout=30, logger=logger)
+                        mem_info = await arun_cmd(f"{await ssh_target()} 'free -h'",
+                                                 capture=True, ignore=True, timeout=30, logger=logger)
                         if logger and mem_info:
                             logger.warn(f"Memory status:\n{mem_info}")
                         elif mem_info:
@@ -2398,10 +5267,10 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
 
                 # Get CPU usage from remote instance
                 cpu_usage_cmd = (
-                    f"ssh {ssh_opt} {ssh_user}@{ip} "
+                    f"{await ssh_target()} "
                     f"'mpstat -P ALL 1 1 | awk \"/^[0-9]/ {{if (\\$2 ~ /^[0-9]+$/) print \\$2,100-\\$NF}}\" | sort -n'"
                 )
-                cpu_usage_output = run_cmd(cpu_usage_cmd, capture=True, timeout=10, ignore=True, logger=logger)
+                cpu_usage_output = await arun_cmd(cpu_usage_cmd, capture=True, timeout=10, ignore=True, logger=logger)
 
                 vcpu_ids = []
                 vcpu_usage = []
@@ -2432,6 +5301,8 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
 
             else:
                 # Timeout reached - Collect final diagnostic information
+                if marker_watcher:
+                    await marker_watcher.stop()
                 if logger:
                     logger.error(f"Workload {i}/{total_workloads} timed out after {workload_timeout}s")
                     logger.error("Collecting final diagnostic information...")
@@ -2442,16 +5313,16 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                 # Dump comprehensive diagnostic info at timeout
                 try:
                     # Get full process tree
-                    ps_output = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'ps auxf'",
-                                       capture=True, ignore=True, timeout=30, logger=logger)
+                    ps_output = await arun_cmd(f"{await ssh_target()} 'ps auxf'",
+                                              capture=True, ignore=True, timeout=30, logger=logger)
                     if logger and ps_output:
                         logger.error(f"Full process tree at timeout:\n{ps_output}")
                     elif ps_output:
                         print(f"  [TIMEOUT-DIAG] Full process tree:\n{ps_output}")
 
                     # Get last 100 lines of wrapper log
-                    log_tail = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'tail -100 {remote_log_path} 2>/dev/null || echo \"[No log available]\"'",
-                                      capture=True, ignore=True, timeout=30, logger=logger)
+                    log_tail = await arun_cmd(f"{await ssh_target()} 'tail -100 {remote_log_path} 2>/dev/null || echo \"[No log available]\"'",
+                                             capture=True, ignore=True, timeout=30, logger=logger)
                     if logger and log_tail:
                         logger.error(f"Last 100 lines of wrapper log ({remote_log_path}):\n{log_tail}")
                     elif log_tail:
@@ -2461,41 +5332,41 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                     workload_log_match = re.search(r'>\s*(/tmp/[^\s]+\.log)', cmd)
                     if workload_log_match:
                         workload_log_path = workload_log_match.group(1)
-                        wl_tail = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'tail -100 {workload_log_path} 2>/dev/null || echo \"[No workload log]\"'",
-                                         capture=True, ignore=True, timeout=30, logger=logger)
+                        wl_tail = await arun_cmd(f"{await ssh_target()} 'tail -100 {workload_log_path} 2>/dev/null || echo \"[No workload log]\"'",
+                                                capture=True, ignore=True, timeout=30, logger=logger)
                         if logger and wl_tail:
                             logger.error(f"Last 100 lines of workload log ({workload_log_path}):\n{wl_tail}")
                         elif wl_tail:
                             print(f"  [TIMEOUT-DIAG] Last 100 lines of workload log:\n{wl_tail}")
 
                     # Get memory and disk info
-                    sys_info = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'free -h && echo \"===DISK===\" && df -h'",
-                                      capture=True, ignore=True, timeout=30, logger=logger)
+                    sys_info = await arun_cmd(f"{await ssh_target()} 'free -h && echo \"===DISK===\" && df -h'",
+                                             capture=True, ignore=True, timeout=30, logger=logger)
                     if logger and sys_info:
                         logger.error(f"System resources at timeout:\n{sys_info}")
                     elif sys_info:
                         print(f"  [TIMEOUT-DIAG] System resources:\n{sys_info}")
 
                     # Get running pts/python processes
-                    pts_procs = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'ps aux | grep -E \"phoronix|python|pts_runner\" | grep -v grep'",
-                                       capture=True, ignore=True, timeout=30, logger=logger)
+                    pts_procs = await arun_cmd(f"{await ssh_target()} 'ps aux | grep -E \"phoronix|python|pts_runner\" | grep -v grep'",
+                                              capture=True, ignore=True, timeout=30, logger=logger)
                     if logger and pts_procs:
                         logger.error(f"PTS/Python processes at timeout:\n{pts_procs}")
                     elif pts_procs:
                         print(f"  [TIMEOUT-DIAG] PTS/Python processes:\n{pts_procs}")
 
                     # Try to get strace of any long-running process (if available)
-                    strace_check = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'which strace'",
-                                          capture=True, ignore=True, timeout=10, logger=logger)
+                    strace_check = await arun_cmd(f"{await ssh_target()} 'which strace'",
+                                                 capture=True, ignore=True, timeout=10, logger=logger)
                     if strace_check and strace_check.strip():
                         # Find the main python process PID
-                        pid_check = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'pgrep -f pts_runner | head -1'",
-                                           capture=True, ignore=True, timeout=10, logger=logger)
+                        pid_check = await arun_cmd(f"{await ssh_target()} 'pgrep -f pts_runner | head -1'",
+                                                  capture=True, ignore=True, timeout=10, logger=logger)
                         if pid_check and pid_check.strip():
                             main_pid = pid_check.strip()
                             # Get strace for 5 seconds to see what it's waiting on
-                            strace_out = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'timeout 5 strace -p {main_pid} 2>&1 || true'",
-                                               capture=True, ignore=True, timeout=10, logger=logger)
+                            strace_out = await arun_cmd(f"{await ssh_target()} 'timeout 5 strace -p {main_pid} 2>&1 || true'",
+                                                      capture=True, ignore=True, timeout=10, logger=logger)
                             if logger and strace_out:
                                 logger.error(f"strace of main process (PID {main_pid}):\n{strace_out}")
                             elif strace_out:
@@ -2509,6 +5380,7 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
 
                 duration = time.time() - workload_start
                 DASHBOARD.add_history(instance_name, f"Workload {i}/{total_workloads}: {cmd}", duration, "TIMEOUT")
+                await journal_finish(i, "TIMEOUT")
 
                 timeout_count += 1
                 if workload_timeout_limit > 0 and timeout_count > workload_timeout_limit:
@@ -2524,7 +5396,7 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} '{cmd}'", capture=False, ignore=False, timeout=workload_timeout, logger=logger)
+                    await arun_cmd(f"{await ssh_target()} '{cmd}'", capture=False, ignore=False, timeout=workload_timeout, logger=logger)
                     
                     # Success
                     if logger:
@@ -2538,6 +5410,7 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
 
                     duration = time.time() - workload_start
                     DASHBOARD.add_history(instance_name, f"Workload {i}/{total_workloads}: {cmd}", duration, "OK")
+                    await journal_finish(i, "SUCCESS")
                     break # Break retry loop on success
 
                 except subprocess.TimeoutExpired:
@@ -2545,7 +5418,7 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                         msg = f"Workload {i}/{total_workloads} timed out (Attempt {attempt+1}/{max_retries}), retrying..."
                         if logger: logger.warn(msg)
                         else: print(f"  [Warn] {msg}")
-                        time.sleep(10)
+                        await asyncio.sleep(10)
                         continue
 
                     # Final timeout - collect diagnostic information
@@ -2560,16 +5433,16 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                     # Dump diagnostic info for regular command timeout
                     try:
                         # Get process tree
-                        ps_output = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'ps auxf | head -100'",
-                                           capture=True, ignore=True, timeout=30, logger=logger)
+                        ps_output = await arun_cmd(f"{await ssh_target()} 'ps auxf | head -100'",
+                                                  capture=True, ignore=True, timeout=30, logger=logger)
                         if logger and ps_output:
                             logger.error(f"Process tree at timeout:\n{ps_output}")
                         elif ps_output:
                             print(f"  [TIMEOUT-DIAG] Process tree:\n{ps_output}")
 
                         # Get system info
-                        sys_info = run_cmd(f"ssh {ssh_opt} {ssh_user}@{ip} 'free -h && echo \"===UPTIME===\" && uptime'",
-                                          capture=True, ignore=True, timeout=30, logger=logger)
+                        sys_info = await arun_cmd(f"{await ssh_target()} 'free -h && echo \"===UPTIME===\" && uptime'",
+                                                 capture=True, ignore=True, timeout=30, logger=logger)
                         if logger and sys_info:
                             logger.error(f"System info at timeout:\n{sys_info}")
                         elif sys_info:
@@ -2583,7 +5456,8 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
 
                     duration = time.time() - workload_start
                     DASHBOARD.add_history(instance_name, f"Workload {i}/{total_workloads}: {cmd}", duration, "TIMEOUT")
-                    archive_failure_logs("regular-timeout", cmd)
+                    await journal_finish(i, "TIMEOUT")
+                    await archive_failure_logs("regular-timeout", cmd)
 
                     timeout_count += 1
                     if workload_timeout_limit > 0 and timeout_count > workload_timeout_limit:
@@ -2596,13 +5470,15 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                     continue 
 
                 except subprocess.CalledProcessError as e:
+                    if await spot_preempted(i, cmd, workload_start):
+                        return False
                     # Check return code
                     if attempt < max_retries - 1:
                         # Retry on SSH errors (255) or generally any error for setup commands
                         msg = f"Workload {i}/{total_workloads} failed with {e.returncode} (Attempt {attempt+1}/{max_retries}), retrying..."
                         if logger: logger.warn(msg)
                         else: print(f"  [Warn] {msg}")
-                        time.sleep(10)
+                        await asyncio.sleep(10)
                         continue
 
                     msg = f"Workload {i}/{total_workloads} failed: {e}"
@@ -2612,7 +5488,8 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
 
                     duration = time.time() - workload_start
                     DASHBOARD.add_history(instance_name, f"Workload {i}/{total_workloads}: {cmd}", duration, "ERROR")
-                    archive_failure_logs("regular-command-error", cmd)
+                    await journal_finish(i, "FAILED")
+                    await archive_failure_logs("regular-command-error", cmd)
 
                     if i <= setup_count:
                         # Setup commands (debian_setup / fedra_setup) are fatal on any error
@@ -2641,8 +5518,8 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
         if any(indicator in cmd for indicator in ssh_build_indicators):
             # Check if SSH build actually occurred by looking for status file
             try:
-                status_check = run_cmd(
-                    f"ssh {ssh_opt} {ssh_user}@{ip} 'test -f /tmp/ssh_build_status.txt && echo EXISTS || echo NOTFOUND'",
+                status_check = await arun_cmd(
+                    f"{await ssh_target()} 'test -f /tmp/ssh_build_status.txt && echo EXISTS || echo NOTFOUND'",
                     capture=True, timeout=5, ignore=True, logger=logger
                 )
 
@@ -2655,14 +5532,14 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
                     #elif DEBUG_MODE == False:
                         print("  [SSH Build] Verifying OpenSSH installation...")
 
-                    if not verify_ssh_build(ip, ssh_opt, ssh_user, instance_name, logger=logger):
+                    if not await verify_ssh_build(ip, ssh_opt, ssh_user, instance_name, logger=logger):
                         if logger:
                             logger.error("SSH build verification failed, aborting command execution")
                         elif False:
                             log("SSH build verification failed, aborting command execution", "ERROR")
                         #elif DEBUG_MODE == False:
                             print("  [Error] SSH build verification failed")
-                        archive_failure_logs("ssh-build-verify-failed", cmd)
+                        await archive_failure_logs("ssh-build-verify-failed", cmd)
                         return False
                 else:
                     # Status file doesn't exist - SSH build was not executed (skip verification)
@@ -2673,55 +5550,359 @@ def run_ssh_commands(ip, config, inst, key_path, ssh_strict_host_key_checking, i
             except Exception as e:
                 # Verification check failed, but continue (don't block on verification issues)
                 if logger:
-                    logger.warn(f"SSH build verification check failed: {e}, continuing...")
-                elif False:
-                    log(f"SSH build verification check failed: {e}, continuing...", "WARNING")
+                    logger.warn(f"SSH build verification check failed: {e}, continuing...")
+                elif False:
+                    log(f"SSH build verification check failed: {e}, continuing...", "WARNING")
+
+    progress(instance_name, "All workloads completed", logger)
+
+    if logger:
+        logger.info("All workloads completed" + (" (with errors)" if workload_aborted else " successfully"))
+    elif False:
+        log("All workloads completed")
+
+    # -----------------------------------------------------------
+    # Post-process phase (always runs after workloads, even if error limit was hit)
+    # -----------------------------------------------------------
+    post_process_cmds = [] if config.get('_bake') else config['common'].get('post_process', [])
+    cost_cmd = None if config.get('_bake') else effective_cost_command(config, inst)
+    if cost_cmd:
+        post_process_cmds = [cost_cmd] + post_process_cmds
+    post_process_failed = False
+    if post_process_cmds:
+        total_pp = len(post_process_cmds)
+        progress(instance_name, f"Post-process started ({total_pp} commands)", logger)
+        if logger:
+            logger.info(f"Starting post-process phase ({total_pp} commands)")
+
+        for j, cmd in enumerate(post_process_cmds, start=1):
+            if logger:
+                logger.info(f"Post-process {j}/{total_pp}: {cmd}")
+            else:
+                print(f"  [Post-process {j}/{total_pp}] {cmd}")
+            try:
+                await arun_cmd(
+                    f"{await ssh_target()} '{cmd}'",
+                    capture=False, timeout=workload_timeout, logger=logger
+                )
+            except Exception as e:
+                msg = f"Post-process {j}/{total_pp} failed: {e}"
+                if logger: logger.error(msg)
+                else: print(f"  [ERROR] {msg}")
+                post_process_failed = True
+
+        progress(instance_name, "Post-process completed", logger)
+        if logger:
+            logger.info("Post-process phase completed" + (" with errors" if post_process_failed else " successfully"))
+
+    if workload_aborted or post_process_failed:
+        return False
+    return True
+
+
+REMOTE_BATCH_DIR = "/tmp/cloud_exec_batch"
+REMOTE_BATCH_RUNNER = Path(__file__).resolve().parent / "cloud_batch_runner.py"
+
+
+async def run_remote_batch(ip, config, inst, workloads, setup_count, ssh_target, ssh_opt, ssh_user,
+                           instance_name, logger=None, on_workload_end=None, fingerprints=None) -> bool:
+    """
+    Execute the whole workload list on the instance in one shot (--remote-batch).
+
+    Uploads cloud_batch_runner.py plus a manifest of all commands, starts the
+    runner detached on the instance, then only follows its status.jsonl stream.
+    The stream is re-opened (and replayed from the start, deduplicated by seq)
+    whenever the SSH connection drops, so a sleeping host does not stop the run.
+
+    Returns:
+        True if every workload and post_process command succeeded
+    """
+    common = config['common']
+    workload_timeout = common.get('workload_timeout', common.get('command_timeout', 10800))
+    total_workloads = len(workloads)
+    state_dir = REMOTE_BATCH_DIR
+    journal = inst.get('_journal')
+
+    steps = []
+    resumed_errors = resumed_timeouts = 0
+    for i, workload in enumerate(workloads, start=1):
+        cmd = workload.format(vcpus=inst['vcpus'])
+        if not cmd or cmd.strip() == "":
+            continue
+        journal_status = journal.status_of(i) if journal else None
+        if journal_status in RunJournal.FINAL_STATUSES:
+            # Resume: already done in an earlier attempt of this run
+            if i > setup_count:
+                resumed_errors += journal_status == "FAILED"
+                resumed_timeouts += journal_status == "TIMEOUT"
+            continue
+        if is_apt_setup_command(cmd):
+            cmd = wrap_apt_command_with_retries(cmd)
+        step = {'index': i, 'cmd': cmd, 'kind': 'setup' if i <= setup_count else 'workload'}
+        if i <= setup_count and fingerprints and fingerprints[i - 1]:
+            step['fingerprint'] = fingerprints[i - 1]
+        steps.append(step)
+
+    if BUDGET.enabled:
+        # The runner cannot be asked mid-run, so the long tail is dropped up front
+        planned = {step['index'] for step in steps}
+        skipped = BUDGET.plan_skips(instance_name, [
+            (j, sec) for j, sec in BUDGET.workload_estimates(workloads, setup_count, inst, journal) if j in planned
+        ], logger)
+        for step in steps:
+            if step['index'] in skipped:
+                DASHBOARD.add_history(instance_name, f"Workload {step['index']}/{total_workloads}: {step['cmd']}",
+                                      0, "SKIPPED")
+        steps = [step for step in steps if step['index'] not in skipped]
+
+    manifest = {
+        'steps': steps,
+        'post_process': [] if config.get('_bake') else
+                        [c for c in [effective_cost_command(config, inst)] if c] + common.get('post_process', []),
+        'setup_count': setup_count,
+        'workload_timeout': workload_timeout,
+        'workload_timeout_limit': common.get('workload_timeout_limit', 0),
+        'workload_error_limit': common.get('workload_error_limit', 1),
+        'reports_dir': common['cloud_reports_dir'],
+        'fingerprint_file': REMOTE_SETUP_FINGERPRINTS,
+        'error_count': resumed_errors,
+        'timeout_count': resumed_timeouts,
+        'prefetch': lookahead_prefetch_command(config, [step['cmd'] for step in steps if step['kind'] == 'workload']),
+    }
+
+    async def runner_alive() -> Optional[bool]:
+        """True/False if the remote runner process is (not) running, None if unknown (SSH failed)."""
+        out = await arun_cmd(
+            f"{await ssh_target()} 'kill -0 $(cat {state_dir}/runner.pid 2>/dev/null) 2>/dev/null && echo ALIVE || echo DEAD'",
+            capture=True, timeout=30, ignore=True, logger=logger
+        )
+        return None if not out else out.strip() == "ALIVE"
+
+    if journal and journal.data.get('batch') == 'started' and await runner_alive():
+        # Resume: the runner from the interrupted host session is still going
+        if logger:
+            logger.info("Remote batch runner still running on instance, reattaching to its status stream")
+    else:
+        progress(instance_name, f"Uploading batch manifest ({total_workloads} workloads)", logger)
+        if logger:
+            logger.info(f"Remote batch mode: uploading runner and manifest ({len(steps)} steps) to {state_dir}")
+        else:
+            print(f"  [Batch] Uploading runner and manifest ({len(steps)} steps)...")
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as mf:
+            json.dump(manifest, mf, indent=2)
+            manifest_local = mf.name
+        try:
+            await arun_cmd(
+                f"{await ssh_target()} 'rm -rf {state_dir} && mkdir -p {state_dir} && cat > {state_dir}/runner.py' "
+                f"< {shlex.quote(str(REMOTE_BATCH_RUNNER))}",
+                capture=False, timeout=60, logger=logger
+            )
+            await arun_cmd(
+                f"{await ssh_target()} 'cat > {state_dir}/manifest.json' < {shlex.quote(manifest_local)}",
+                capture=False, timeout=60, logger=logger
+            )
+        finally:
+            os.unlink(manifest_local)
+
+        start_cmd = (
+            f"cd {state_dir} && nohup setsid python3 runner.py manifest.json --state-dir {state_dir} "
+            f"> {state_dir}/runner.out 2>&1 < /dev/null &"
+        )
+        await arun_cmd(f"{await ssh_target()} {shlex.quote(start_cmd)}", capture=False, timeout=60, logger=logger)
+        if journal:
+            journal.set_state('running', batch='started')
+    progress(instance_name, f"Workload execution started ({total_workloads} workloads, remote batch)", logger)
+
+    history_status = {'SUCCESS': 'OK', 'FAILED': 'ERROR', 'TIMEOUT': 'TIMEOUT'}
+    ssh_build_indicators = ['build_openssh.sh', 'prepare_tools.sh']
+    running = {}  # index -> cmd
+    setup_timings = []  # [(index, cmd, seconds, skipped)]
+    state = {'seen_seq': 0, 'done': None, 'ssh_build_failed': False}
+
+    async def handle_event(ev: Dict[str, Any]) -> None:
+        event = ev.get('event')
+        idx = ev.get('index')
+        if event == 'start':
+            running[idx] = ev.get('cmd', '')
+            if journal:
+                journal.workload_started(idx, running[idx], ev.get('kind', 'workload'))
+            if logger:
+                logger.event('workload_start', workload=idx, kind=ev.get('kind', 'workload'),
+                             cmd=running[idx][:200], mode='batch')
+            progress(instance_name, f"Workload {idx}/{total_workloads}", logger)
+            if logger:
+                logger.info(f"Workload {idx}/{total_workloads}: {running[idx][:80]}{'...' if len(running[idx]) > 80 else ''}")
+        elif event == 'end':
+            cmd = running.pop(idx, '')
+            status = ev.get('status', 'FAILED')
+            if logger:
+                logger.event('workload_end', workload=idx, status=status, duration=ev.get('duration'),
+                             rc=ev.get('rc'), mode='batch')
+            if journal:
+                journal.workload_finished(idx, status)
+                await journal.mirror(ssh_target, logger)
+            if on_workload_end and idx > setup_count:
+                await on_workload_end(status)
+            if idx <= setup_count:
+                setup_timings.append((idx, cmd, ev.get('duration') or 0.0, bool(ev.get('skipped'))))
+                if logger:
+                    logger.event('setup_step', workload=idx, duration=ev.get('duration'), status=status,
+                                 skipped=bool(ev.get('skipped')),
+                                 fingerprint=fingerprints[idx - 1] if fingerprints else None, cmd=cmd[:200])
+                if idx == setup_count or status != 'SUCCESS':
+                    log_setup_timing(setup_timings, logger)
+            DASHBOARD.add_history(instance_name, f"Workload {idx}/{total_workloads}: {cmd}",
+                                  ev.get('duration', 0),
+                                  'SKIPPED' if ev.get('skipped') else history_status.get(status, status))
+            msg = f"Workload {idx}/{total_workloads} {status} ({ev.get('duration', 0)}s, rc={ev.get('rc')})"
+            if logger:
+                (logger.info if status == 'SUCCESS' else logger.error)(msg)
+            else:
+                print(f"  [Batch] {msg}")
+            # Same post-build check as the host-driven loop; on failure the
+            # runner is told to stop before the next step.
+            if status == 'SUCCESS' and any(indicator in cmd for indicator in ssh_build_indicators):
+                status_check = await arun_cmd(
+                    f"{await ssh_target()} 'test -f /tmp/ssh_build_status.txt && echo EXISTS || echo NOTFOUND'",
+                    capture=True, timeout=5, ignore=True, logger=logger
+                )
+                if status_check == "EXISTS" and not await verify_ssh_build(ip, ssh_opt, ssh_user, instance_name, logger=logger):
+                    if logger:
+                        logger.error("SSH build verification failed, aborting remote batch")
+                    state['ssh_build_failed'] = True
+                    await arun_cmd(f"{await ssh_target()} 'touch {state_dir}/abort'", capture=True, ignore=True,
+                                   timeout=30, logger=logger)
+        elif event == 'post_start':
+            progress(instance_name, f"Post-process {idx}/{len(manifest['post_process'])}", logger)
+            if logger:
+                logger.info(f"Post-process {idx}/{len(manifest['post_process'])}: {ev.get('cmd')}")
+        elif event == 'post_end':
+            if ev.get('status') != 'SUCCESS' and logger:
+                logger.error(f"Post-process {idx}/{len(manifest['post_process'])} failed (rc={ev.get('rc')})")
+        elif event == 'done':
+            state['done'] = ev
+
+    liveness_interval = common.get('remote_batch_liveness_interval', 300)
+    stream_failures = 0
+    loop = asyncio.get_running_loop()
+    while state['done'] is None:
+        lines = asyncio.Queue()
+        # Lines arrive on the loop, or on a reader thread when the core is disabled
+        proc = await ASYNC_CORE.stream(
+            f"{await ssh_target()} 'tail -n +1 -F {state_dir}/status.jsonl 2>/dev/null'",
+            lambda line, out=lines: loop.call_soon_threadsafe(out.put_nowait, line),
+            on_exit=lambda _, out=lines: loop.call_soon_threadsafe(out.put_nowait, None)
+        )
+        connected = False
+        try:
+            while state['done'] is None:
+                try:
+                    line = await asyncio.wait_for(lines.get(), liveness_interval)
+                except asyncio.TimeoutError:
+                    # Quiet for a long time (normal for long benchmarks): make sure
+                    # the runner has not died without writing its final event.
+                    if await runner_alive() is False and state['done'] is None:
+                        if logger:
+                            logger.error("Remote batch runner exited without a final status")
+                        return False
+                    continue
+                if line is None:
+                    break
+                try:
+                    ev = json.loads(line)
+                except ValueError:
+                    continue
+                connected = True
+                if ev.get('seq', 0) <= state['seen_seq']:
+                    continue
+                state['seen_seq'] = ev['seq']
+                await handle_event(ev)
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                await proc.wait_closed()
+
+        if state['done'] is not None:
+            break
+
+        # Stream dropped: reconnect, checking the instance after repeated failures
+        stream_failures = 0 if connected else stream_failures + 1
+        if logger:
+            logger.warn(f"Batch status stream dropped, reconnecting (failures: {stream_failures})...")
+        if stream_failures >= 2:
+            status = await ASYNC_CORE.blocking(external_instance_status, inst, logger=logger)
+            normalized_status = (status or "unknown").strip().lower()
+            if normalized_status in ['terminated', 'stopped', 'stopping', 'shutting-down', 'shutting_down', 'deleted', 'notfound']:
+                if logger:
+                    logger.error(f"Instance {instance_name} terminated externally (Status: {status})")
+                inst['_externally_terminated'] = True
+                DASHBOARD.update(instance_name, status='TERMINATED')
+                for idx, cmd in running.items():
+                    DASHBOARD.add_history(instance_name, f"Workload {idx}/{total_workloads}: {cmd}", 0, "EXT_TERM")
+                return False
+        await asyncio.sleep(min(15 * (2 ** stream_failures), 300))
 
+    done = state['done']
+    result = done.get('result')
     progress(instance_name, "All workloads completed", logger)
-
     if logger:
-        logger.info("All workloads completed" + (" (with errors)" if workload_aborted else " successfully"))
-    elif False:
-        log("All workloads completed")
+        logger.info(
+            f"Remote batch finished: {result} (errors={done.get('error_count')}, "
+            f"timeouts={done.get('timeout_count')}, post_process_failed={done.get('post_process_failed')})"
+        )
+    else:
+        print(f"  [Batch] Finished: {result}")
 
-    # -----------------------------------------------------------
-    # Post-process phase (always runs after workloads, even if error limit was hit)
-    # -----------------------------------------------------------
-    post_process_cmds = config['common'].get('post_process', [])
-    post_process_failed = False
-    if post_process_cmds:
-        total_pp = len(post_process_cmds)
-        progress(instance_name, f"Post-process started ({total_pp} commands)", logger)
-        if logger:
-            logger.info(f"Starting post-process phase ({total_pp} commands)")
+    if state['ssh_build_failed'] or done.get('post_process_failed'):
+        return False
+    return result == "SUCCESS"
 
-        for j, cmd in enumerate(post_process_cmds, start=1):
-            if logger:
-                logger.info(f"Post-process {j}/{total_pp}: {cmd}")
-            else:
-                print(f"  [Post-process {j}/{total_pp}] {cmd}")
-            try:
-                run_cmd(
-                    f"ssh {ssh_opt} {ssh_user}@{ip} '{cmd}'",
-                    capture=False, timeout=workload_timeout, logger=logger
-                )
-            except Exception as e:
-                msg = f"Post-process {j}/{total_pp} failed: {e}"
-                if logger: logger.error(msg)
-                else: print(f"  [ERROR] {msg}")
-                post_process_failed = True
 
-        progress(instance_name, "Post-process completed", logger)
-        if logger:
-            logger.info("Post-process phase completed" + (" with errors" if post_process_failed else " successfully"))
+def result_tarball_path(config, cloud, name, inst, timestamp=None):
+    """
+    Local path of a result tarball: <host_reports_dir>/<hostname>_<os_label>_<yymmdd_HHMMSS>.tar.gz
 
-    if workload_aborted or post_process_failed:
-        return False
-    return True
+    Shard tarballs go to <host_reports_dir>/shards/ so that only the merged
+    result sits next to the other machine results.
+    """
+    host_rep_dir = config['common']['host_reports_dir']
+    # Use hostname if specified, otherwise fallback to cloud_name format
+    file_basename = inst.get('hostname', f"{cloud}_{name}")
+    if inst.get('_shard'):
+        file_basename += f"_s{inst['_shard']['index']}"
+        host_rep_dir = f"{host_rep_dir}/shards"
+    # Format OS label: "24.04" -> "ubuntu24_04", "rhel9" -> "rhel9", "orcl9" -> "orcl9"
+    os_label = get_os_label(parse_os_version(config['common']['os_version']))
+    # Add timestamp to filename (yymmdd_HHMMSS format)
+    timestamp = timestamp or datetime.now().strftime("%y%m%d_%H%M%S")
+    return f"{host_rep_dir}/{file_basename}_{os_label}_{timestamp}.tar.gz"
 
 
-def collect_results(ip, config, cloud, name, inst, key_path, ssh_strict_host_key_checking, instance_name, logger=None):
-    """Collect benchmark results from remote instance."""
+def effective_cost_command(config, inst):
+    """
+    Remote command recording the hourly price actually paid (spot instances).
+
+    Writes <cloud_reports_dir>/<machine>/effective_cost.json, which
+    make_one_big_json.py prefers over the on-demand price from
+    cloud_instances.json.  Returns None for on-demand instances.
+    """
+    if not inst.get('_spot') or inst.get('_effective_cost_hour') is None:
+        return None
+    payload = json.dumps({
+        "cost_hour[730h-mo]": round(inst['_effective_cost_hour'], 5),
+        "pricing": "spot",
+        "on_demand_cost_hour": inst.get('cpu_cost_hour[730h-mo]', 0.0),
+        "launches": inst.get('_spot_relaunches', 0) + 1,
+    })
+    # base64: post_process commands are sent inside single quotes
+    encoded = base64.b64encode(payload.encode()).decode()
+    machine_dir = f"{config['common']['cloud_reports_dir']}/$(hostname)"
+    return f"if [ -d {machine_dir} ]; then echo {encoded} | base64 -d > {machine_dir}/effective_cost.json; fi"
+
+
+async def collect_results(ip, config, cloud, name, inst, key_path, ssh_strict_host_key_checking, instance_name, logger=None, local_f=None):
+    """Collect benchmark results from remote instance (into local_f if given)."""
     progress(instance_name, "Collecting results", logger)
 
     if logger:
@@ -2733,31 +5914,43 @@ def collect_results(ip, config, cloud, name, inst, key_path, ssh_strict_host_key
     ssh_opt = f"-i {key_path} -o StrictHostKeyChecking={strict_hk} -o UserKnownHostsFile=/dev/null -o ServerAliveInterval=60 -o ServerAliveCountMax=10 -o BatchMode=yes -o NumberOfPasswordPrompts=0"
     os_info = parse_os_version(config['common']['os_version'])
     ssh_user = get_ssh_user(os_info, cloud)
+
+    async def ssh_target():
+        """SSH prefix for ssh_user@ip, multiplexed over the shared session."""
+        return await SSH_POOL.acommand(ip, ssh_user, ssh_opt, logger=logger)
+
     cloud_rep_dir = config['common']['cloud_reports_dir']
 
+    local_f = local_f or result_tarball_path(config, cloud, name, inst)
+    Path(local_f).parent.mkdir(parents=True, exist_ok=True)
+
+    # Incremental mode: only the last delta is transferred, the tarball is built locally
+    collector = inst.get('_collector')
+    if collector:
+        try:
+            await collector.sync_now()
+            await collector.pack(local_f)
+            progress(instance_name, "Results collected", logger)
+            if logger:
+                logger.info(f"Results collected: {local_f} (incremental)")
+            return local_f
+        except Exception as e:
+            if logger:
+                logger.warn(f"Incremental collection failed ({e}), falling back to full transfer")
+
     if logger:
         logger.info("Creating tarball on remote instance...")
     elif False:
         log("Creating tarball on remote instance...")
 
-    run_cmd(
-        f"ssh {ssh_opt} {ssh_user}@{ip} "
+    await arun_cmd(
+        f"{await ssh_target()} "
         f"'tar -czf /tmp/reports.tar.gz -C $(dirname {cloud_rep_dir}) $(basename {cloud_rep_dir})'",
         capture=False,
         timeout=300,
         logger=logger
     )
 
-    host_rep_dir = config['common']['host_reports_dir']
-    Path(host_rep_dir).mkdir(parents=True, exist_ok=True)
-    # Use hostname if specified, otherwise fallback to cloud_name format
-    file_basename = inst.get('hostname', f"{cloud}_{name}")
-    # Format OS label: "24.04" -> "ubuntu24_04", "rhel9" -> "rhel9", "orcl9" -> "orcl9"
-    os_label = get_os_label(parse_os_version(config['common']['os_version']))
-    # Add timestamp to filename (yymmdd_HHMMSS format)
-    timestamp = datetime.now().strftime("%y%m%d_%H%M%S")
-    local_f = f"{host_rep_dir}/{file_basename}_{os_label}_{timestamp}.tar.gz"
-
     if logger:
         logger.info(f"Downloading to {local_f} via SSH (avoiding SCP OpenSSL mismatch)...")
     elif False:
@@ -2765,12 +5958,15 @@ def collect_results(ip, config, cloud, name, inst, key_path, ssh_strict_host_key
 
     # Use SSH with stdout redirection instead of SCP to avoid OpenSSL version mismatch
     # This transfers the file via SSH stdout which is more reliable across different OpenSSL versions
-    run_cmd(
-        f"ssh {ssh_opt} {ssh_user}@{ip} 'cat /tmp/reports.tar.gz' > {local_f}",
+    # Download to a temporary name first so an interrupted transfer never
+    # replaces an earlier (checkpoint) tarball with a truncated one.
+    await arun_cmd(
+        f"{await ssh_target()} 'cat /tmp/reports.tar.gz' > {local_f}.part",
         capture=False,
         timeout=300,
         logger=logger
     )
+    os.replace(f"{local_f}.part", local_f)
 
     progress(instance_name, "Results collected", logger)
 
@@ -2781,6 +5977,8 @@ def collect_results(ip, config, cloud, name, inst, key_path, ssh_strict_host_key
     else:
         print(f"Collected: {local_f}")
 
+    return local_f
+
 
 def process_instance(cloud, inst, config, key_path, log_dir):
     """Process a single cloud instance: launch, benchmark, collect, terminate."""
@@ -2820,37 +6018,16 @@ class AWSProvider(CloudProvider):
         # Get quota from config (default to 32 if not specified)
         quota_vcpus = self.csp_config.get('quota_vcpus_all_regions', 32)
 
-        # Per-region shared resources (for multi-region support)
-        self._region_resources = {}
-        self._region_lock = threading.Lock()
-
-        # Setup Security Group
-        sg_id = setup_aws_sg(region, sg_name, logger)
-
-        # Get KeyPair name
-        key_name = run_cmd(
-            f"aws ec2 describe-key-pairs --region {region} --query 'KeyPairs[0].KeyName' --output text",
-            logger=logger
-        )
-        if not key_name or key_name == "None":
-            msg = f"AWS key pair not found in region {region}. Create a key pair before launching instances."
-            if logger:
-                logger.error(msg)
-            raise ValueError(msg)
-
-        self._region_resources[region] = {
-            'sg_id': sg_id,
-            'key_name': key_name
-        }
-
         self.shared_resources = {
-            'sg_id': sg_id,
-            'key_name': key_name,
             'region': region,
             'sg_name': sg_name,
             'quota_vcpus_all_regions': quota_vcpus
         }
 
+        # Security Group and KeyPair of the default region (per-region: _get_region_resources)
+        resources = self._get_region_resources(region, logger)
+        self.shared_resources.update(resources)
+
         return self.shared_resources
 
     def _get_region_for_instance(self, inst: Dict[str, Any]) -> str:
@@ -2858,31 +6035,32 @@ class AWSProvider(CloudProvider):
         return inst.get('region') or self.shared_resources.get('region') or self.csp_config.get('region')
 
     def _get_region_resources(self, region: str, logger=None) -> Dict[str, Any]:
-        """Get or initialize region-specific AWS resources."""
-        resources = self._region_resources.get(region)
-        if resources:
-            return resources
-
-        with self._region_lock:
-            resources = self._region_resources.get(region)
-            if resources:
-                return resources
-
-            sg_name = self.shared_resources.get('sg_name') or self.config['common']['security_group_name']
-            sg_id = setup_aws_sg(region, sg_name, logger)
-            key_name = run_cmd(
+        """Get or initialize region-specific AWS resources (RESOURCE_CACHE)."""
+        sg_name = self.shared_resources.get('sg_name') or self.config['common']['security_group_name']
+        sg_id = setup_aws_sg(region, sg_name, logger)
+        key_name = RESOURCE_CACHE.get_or_fetch(
+            f"aws/key_pair/{region}",
+            lambda: run_cmd(
                 f"aws ec2 describe-key-pairs --region {region} --query 'KeyPairs[0].KeyName' --output text",
                 logger=logger
-            )
-            if not key_name or key_name == "None":
-                msg = f"AWS key pair not found in region {region}. Create a key pair before launching instances."
-                if logger:
-                    logger.error(msg)
-                raise ValueError(msg)
-            resources = {'sg_id': sg_id, 'key_name': key_name}
-            self._region_resources[region] = resources
+            ),
+            logger=logger
+        )
+        if not key_name or key_name == "None":
+            msg = f"AWS key pair not found in region {region}. Create a key pair before launching instances."
+            if logger:
+                logger.error(msg)
+            raise ValueError(msg)
+        return {'sg_id': sg_id, 'key_name': key_name}
 
-        return resources
+    def resource_lookups(self, instances: List[Dict[str, Any]], logger=None) -> List[Callable[[], Any]]:
+        """Security group, key pair and stock AMI of every region/arch in the run."""
+        lookups = [lambda r=region: self._get_region_resources(r, logger)
+                   for region in sorted({self._get_region_for_instance(inst) for inst in instances})]
+        lookups += [lambda r=region, a=arch: find_aws_ami(self.config, r, a, logger)
+                    for region, arch in sorted({(self._get_region_for_instance(inst), inst['arch'])
+                                                for inst in instances})]
+        return lookups
 
     def validate_instance_name(self, name: str) -> None:
         """AWS has no name constraints (uses tags)."""
@@ -2935,6 +6113,10 @@ class AWSProvider(CloudProvider):
         if hasattr(exception, 'output') and exception.output:
             error_msg += " " + str(exception.output)
 
+        # A cached subnet/image/SG that no longer exists: drop it so the retry looks it up again
+        if RESOURCE_CACHE.invalidate_stale(error_msg):
+            return True
+
         return any(kw in error_msg for kw in [
             'InternalError',
             'ServiceUnavailable',
@@ -2994,6 +6176,84 @@ class AWSProvider(CloudProvider):
         except:
             return "unknown"
 
+    def status_scope(self, inst: Dict[str, Any]) -> Optional[Tuple[str, ...]]:
+        return ('aws', self._get_region_for_instance(inst))
+
+    def describe_instance_statuses(self, scope, keys, logger=None) -> Optional[Dict[str, str]]:
+        """All tracked instances of a region in one describe-instances call."""
+        region = scope[1]
+        try:
+            out = run_cmd(
+                f"aws ec2 describe-instances --region {region} --instance-ids {' '.join(keys)} "
+                f"--query 'Reservations[].Instances[].[InstanceId,State.Name]' --output text",
+                capture=True,
+                logger=logger
+            )
+        except Exception:
+            # e.g. InvalidInstanceID.NotFound for one ID fails the whole call
+            return None
+        statuses = {}
+        for line in (out or "").splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                statuses[parts[0]] = parts[1].lower()
+        return statuses
+
+    def get_spot_cpu_price(self, instance_id: str, inst: Dict[str, Any], logger=None) -> Optional[float]:
+        """Latest spot price for the instance type in the instance's availability zone."""
+        region = self._get_region_for_instance(inst)
+        try:
+            az = run_cmd(
+                f"aws ec2 describe-instances --region {region} --instance-ids {instance_id} "
+                f"--query 'Reservations[0].Instances[0].Placement.AvailabilityZone' --output text",
+                capture=True, ignore=True, logger=logger
+            )
+            if not az or az == "None":
+                return None
+            price = run_cmd(
+                f"aws ec2 describe-spot-price-history --region {region} --availability-zone {az} "
+                f"--instance-types {inst['type']} --product-descriptions 'Linux/UNIX' "
+                f"--start-time {datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S')} "
+                f"--query 'SpotPriceHistory[0].SpotPrice' --output text",
+                capture=True, ignore=True, logger=logger
+            )
+            if not price or price == "None":
+                return None
+            if logger:
+                logger.info(f"Spot price ({az}): {float(price):.5f} USD/h")
+            return float(price)
+        except (ValueError, TypeError):
+            return None
+
+    def create_image(self, instance_id: str, inst: Dict[str, Any], image_name: str, logger=None) -> Optional[str]:
+        """AMI from the instance (rebooted for a consistent filesystem), polled until available."""
+        region = self._get_region_for_instance(inst)
+        ami = run_cmd(
+            f"aws ec2 create-image --region {region} --instance-id {instance_id} --name {image_name} "
+            f"--tag-specifications 'ResourceType=image,Tags=[{{Key=Name,Value={image_name}}}]' "
+            f"--query 'ImageId' --output text",
+            logger=logger, timeout=300
+        )
+        if not ami or ami == "None":
+            return None
+        deadline = time.time() + self.config['common'].get('bake_image_timeout', 3600)
+        while time.time() < deadline:
+            state = run_cmd(
+                f"aws ec2 describe-images --region {region} --image-ids {ami} "
+                f"--query 'Images[0].State' --output text",
+                capture=True, ignore=True, logger=logger
+            )
+            if state == "available":
+                return ami
+            if state in ("failed", "error", "invalid", "deregistered"):
+                if logger:
+                    logger.error(f"AMI {ami} ended in state {state}")
+                return None
+            time.sleep(30)
+        if logger:
+            logger.error(f"AMI {ami} not available after {self.config['common'].get('bake_image_timeout', 3600)}s")
+        return None
+
 
 class GCPProvider(CloudProvider):
     """GCP-specific implementation of CloudProvider."""
@@ -3016,6 +6276,13 @@ class GCPProvider(CloudProvider):
 
         return self.shared_resources
 
+    def resource_lookups(self, instances: List[Dict[str, Any]], logger=None) -> List[Callable[[], Any]]:
+        """Image family per architecture (images are global, so no per-zone lookups)."""
+        return [
+            lambda a=arch: find_gcp_image_family(self.config, a, logger)
+            for arch in sorted({inst.get('arch', 'amd64') for inst in instances})
+        ]
+
     def _get_zone_for_instance(self, inst: Dict[str, Any]) -> str:
         """Resolve region-as-zone for an instance (instance override > CSP default > fallback)."""
         return (
@@ -3082,6 +6349,10 @@ class GCPProvider(CloudProvider):
         if hasattr(exception, 'output') and exception.output:
             error_msg += " " + str(exception.output)
 
+        # A cached subnet/image/SG that no longer exists: drop it so the retry looks it up again
+        if RESOURCE_CACHE.invalidate_stale(error_msg):
+            return True
+
         return any(kw in error_msg for kw in [
             'INTERNAL',
             'UNAVAILABLE',
@@ -3147,10 +6418,58 @@ class GCPProvider(CloudProvider):
         except Exception:
             return "unknown"
 
+    def status_scope(self, inst: Dict[str, Any]) -> Optional[Tuple[str, ...]]:
+        return ('gcp', self.shared_resources['project'])
+
+    def status_key(self, instance_id: str, inst: Dict[str, Any]) -> str:
+        # GCP addresses instances by name (same as get_instance_status)
+        return f"{self._get_zone_for_instance(inst)}/{inst.get('name', instance_id)}"
+
+    def describe_instance_statuses(self, scope, keys, logger=None) -> Optional[Dict[str, str]]:
+        """All instances of the project (every zone) in one instances list call."""
+        project = scope[1]
+        try:
+            out = run_cmd(
+                f"gcloud compute instances list --project={project} "
+                f"--format='value(zone.basename(),name,status)'",
+                capture=True,
+                logger=logger
+            )
+        except Exception:
+            return None
+        statuses = {}
+        for line in (out or "").splitlines():
+            parts = line.split()
+            if len(parts) == 3:
+                statuses[f"{parts[0]}/{parts[1]}"] = parts[2].lower()
+        return statuses
+
+    def image_location(self, inst: Dict[str, Any]) -> str:
+        # Images are global resources of the project, usable from every zone
+        return self.shared_resources.get('project', '')
+
+    def create_image(self, instance_id: str, inst: Dict[str, Any], image_name: str, logger=None) -> Optional[str]:
+        """Image from the boot disk (named after the instance); gcloud returns once it is READY."""
+        project = self.shared_resources['project']
+        try:
+            run_cmd(
+                f"gcloud compute images create {image_name} --project={project} "
+                f"--source-disk={inst['name']} --source-disk-zone={self._get_zone_for_instance(inst)} --force",
+                logger=logger, timeout=self.config['common'].get('bake_image_timeout', 3600)
+            )
+        except Exception as e:
+            if logger:
+                logger.error(f"GCP image creation failed: {e}")
+            return None
+        return image_name
+
 
 class OCIProvider(CloudProvider):
     """OCI-specific implementation of CloudProvider."""
 
+    # OCI preemptible capacity is billed at a fixed 50% of the on-demand price
+    DEFAULT_SPOT_PRICE_RATIO = 0.5
+
     # OCI supported Ubuntu versions
     # Update this list when OCI adds support for new Ubuntu versions
     OCI_SUPPORTED_UBUNTU_VERSIONS = ['22.04', '24.04']
@@ -3386,6 +6705,10 @@ class OCIProvider(CloudProvider):
         if hasattr(exception, 'output') and exception.output:
             error_msg += " " + str(exception.output)
 
+        # A cached subnet/image/SG that no longer exists: drop it so the retry looks it up again
+        if RESOURCE_CACHE.invalidate_stale(error_msg):
+            return True
+
         return any(kw in error_msg for kw in [
             'InternalServerError',
             'ServiceUnavailable',
@@ -3410,41 +6733,15 @@ class OCIProvider(CloudProvider):
         """OCI launch delay: 1.0 seconds."""
         return 1.0
 
-    def launch_instance(self, inst: Dict[str, Any], logger=None) -> Tuple[Optional[str], Optional[str]]:
-        """Launch OCI instance and return (instance_id, ip)."""
-        region = self._get_region_for_instance(inst)
-        if logger:
-            logger.info(f"OCI target region: {region}")
-        if not region:
-            msg = "OCI region is not set; aborting launch to prevent cross-region creation."
-            if logger:
-                logger.error(msg)
-            return None, None
-
+    def _find_subnet_id(self, inst: Dict[str, Any], logger=None) -> Optional[str]:
+        """Configured subnet, or the first public subnet of the compartment's VCN (RESOURCE_CACHE)."""
+        subnet_id = self._get_subnet_id_for_instance(inst)
+        if subnet_id:
+            return subnet_id
         compartment_id = self._get_compartment_id_for_instance(inst)
         cmd_prefix = self._oci_cmd_prefix(inst)
-        name = inst['name']
-
-        if logger:
-            logger.info(f"Launching OCI instance: {name} ({inst['type']})")
-
-        # If instance already exists in non-terminated state, do not create a new one
-        existing = self._find_existing_instance(inst, logger=logger)
-        if existing:
-            if logger:
-                logger.warn(f"Existing OCI instance found (state={existing['state']}), skipping create.")
-            if existing["state"].upper() != "RUNNING":
-                if logger:
-                    logger.info("Waiting for existing instance to reach RUNNING...")
-                if not self._wait_for_instance_running(inst, existing["id"], logger=logger):
-                    return None, None
-            ip = self._get_instance_ip(inst, existing["id"], logger=logger)
-            return existing["id"], ip
-
-        # 1. Find Subnet ID (from config or auto-detect public subnet)
-        subnet_id = self._get_subnet_id_for_instance(inst)
 
-        if not subnet_id:
+        def detect():
             if logger:
                 logger.info("Subnet ID not configured, auto-detecting public subnet in compartment...")
 
@@ -3459,30 +6756,33 @@ class OCIProvider(CloudProvider):
                     f"{cmd_prefix}oci network subnet list --compartment-id {compartment_id} --vcn-id {vcns_json} "
                     f"--query 'data[?\"prohibit-public-ip-on-vnic\"==`false`] | [0].id' --raw-output"
                 )
-                subnet_id = run_cmd(subnet_cmd, logger=logger)
-
-        if not subnet_id or subnet_id == "None":
-            msg = "Failed to detect a valid public subnet. Please specify 'subnet_id' in cloud_instances.json or create a public subnet."
-            if logger:
-                logger.error(msg)
-            return None, None
+                return run_cmd(subnet_cmd, logger=logger)
+            return None
 
-        if logger:
-            logger.info(f"Using Subnet ID: {subnet_id}")
+        return RESOURCE_CACHE.get_or_fetch(
+            f"oci/subnet/{self._get_region_for_instance(inst)}/{compartment_id}", detect, logger=logger
+        )
 
-        # 2. Find Availability Domain (AD-1 fixed; no AD rotation for cost safety)
+    def _find_availability_domain(self, inst: Dict[str, Any], logger=None) -> Optional[str]:
+        """Configured AD, or the compartment's first AD (RESOURCE_CACHE)."""
         ad = self._get_availability_domain_for_instance(inst)
-        if not ad:
-            ad = run_cmd(
-                f"{cmd_prefix}oci iam availability-domain list --compartment-id {compartment_id} --query 'data[0].name' --raw-output",
+        if ad:
+            return ad
+        compartment_id = self._get_compartment_id_for_instance(inst)
+        return RESOURCE_CACHE.get_or_fetch(
+            f"oci/ad/{self._get_region_for_instance(inst)}/{compartment_id}",
+            lambda: run_cmd(
+                f"{self._oci_cmd_prefix(inst)}oci iam availability-domain list --compartment-id {compartment_id} "
+                f"--query 'data[0].name' --raw-output",
                 logger=logger
-            )
-        if not ad:
-            if logger:
-                logger.error("Failed to get Availability Domain")
-            return None, None
+            ),
+            logger=logger
+        )
 
-        # 3. Find Image (Ubuntu, RHEL, or Oracle Linux)
+    def _find_image_id(self, inst: Dict[str, Any], logger=None) -> Optional[str]:
+        """Newest platform image for the configured OS and the instance shape (RESOURCE_CACHE)."""
+        compartment_id = self._get_compartment_id_for_instance(inst)
+        cmd_prefix = self._oci_cmd_prefix(inst)
         os_version = self.config['common']['os_version']
         os_info = parse_os_version(os_version)
         effective = get_effective_os_for_csp(os_info, 'oci')
@@ -3514,32 +6814,114 @@ class OCIProvider(CloudProvider):
         else:
             if logger:
                 logger.error(f"Unsupported OS for OCI: {effective['provision_as']}")
-            return None, None
-
-        image_query = (
-            f"{cmd_prefix}oci compute image list --compartment-id {compartment_id} "
-            f"--operating-system \"{op_sys}\" --operating-system-version \"{os_ver_for_query}\" "
-            f"--shape {inst['type']} --sort-by TIMECREATED --sort-order DESC "
-            f"--query 'data[0].id' --raw-output"
-        )
-
-        image_id = run_cmd(image_query, logger=logger)
+            return None
 
-        if not image_id or image_id == "None":
-            # Fallback: try searching without shape filter
-            image_query_fallback = (
+        def search():
+            image_query = (
                 f"{cmd_prefix}oci compute image list --compartment-id {compartment_id} "
                 f"--operating-system \"{op_sys}\" --operating-system-version \"{os_ver_for_query}\" "
-                f"--sort-by TIMECREATED --sort-order DESC "
+                f"--shape {inst['type']} --sort-by TIMECREATED --sort-order DESC "
                 f"--query 'data[0].id' --raw-output"
             )
-            image_id = run_cmd(image_query_fallback, logger=logger)
 
-        if not image_id or image_id == "None":
+            image_id = run_cmd(image_query, logger=logger)
+
+            if not image_id or image_id == "None":
+                # Fallback: try searching without shape filter
+                image_query_fallback = (
+                    f"{cmd_prefix}oci compute image list --compartment-id {compartment_id} "
+                    f"--operating-system \"{op_sys}\" --operating-system-version \"{os_ver_for_query}\" "
+                    f"--sort-by TIMECREATED --sort-order DESC "
+                    f"--query 'data[0].id' --raw-output"
+                )
+                image_id = run_cmd(image_query_fallback, logger=logger)
+            return image_id
+
+        image_id = RESOURCE_CACHE.get_or_fetch(
+            f"oci/image/{self._get_region_for_instance(inst)}/{compartment_id}/{op_sys}/{os_ver_for_query}/{inst['type']}",
+            search, logger=logger
+        )
+        if not image_id or image_id == "None":
+            if logger:
+                logger.error(f"Could not find {os_desc} image for {inst['type']}")
+            return None
+        return image_id
+
+    def resource_lookups(self, instances: List[Dict[str, Any]], logger=None) -> List[Callable[[], Any]]:
+        """Subnet and AD per region/compartment, platform image per region/shape."""
+        lookups = []
+        seen_scopes = set()
+        seen_images = set()
+        for inst in instances:
+            scope = (self._get_region_for_instance(inst), self._get_compartment_id_for_instance(inst))
+            if scope not in seen_scopes:
+                seen_scopes.add(scope)
+                lookups.append(lambda i=inst: self._find_subnet_id(i, logger))
+                lookups.append(lambda i=inst: self._find_availability_domain(i, logger))
+            if scope + (inst['type'],) not in seen_images:
+                seen_images.add(scope + (inst['type'],))
+                lookups.append(lambda i=inst: self._find_image_id(i, logger))
+        return lookups
+
+    def launch_instance(self, inst: Dict[str, Any], logger=None) -> Tuple[Optional[str], Optional[str]]:
+        """Launch OCI instance and return (instance_id, ip)."""
+        region = self._get_region_for_instance(inst)
+        if logger:
+            logger.info(f"OCI target region: {region}")
+        if not region:
+            msg = "OCI region is not set; aborting launch to prevent cross-region creation."
+            if logger:
+                logger.error(msg)
+            return None, None
+
+        compartment_id = self._get_compartment_id_for_instance(inst)
+        cmd_prefix = self._oci_cmd_prefix(inst)
+        name = inst['name']
+
+        if logger:
+            logger.info(f"Launching OCI instance: {name} ({inst['type']})")
+
+        # If instance already exists in non-terminated state, do not create a new one
+        existing = self._find_existing_instance(inst, logger=logger)
+        if existing:
+            if logger:
+                logger.warn(f"Existing OCI instance found (state={existing['state']}), skipping create.")
+            if existing["state"].upper() != "RUNNING":
+                if logger:
+                    logger.info("Waiting for existing instance to reach RUNNING...")
+                if not self._wait_for_instance_running(inst, existing["id"], logger=logger):
+                    return None, None
+            ip = self._get_instance_ip(inst, existing["id"], logger=logger)
+            return existing["id"], ip
+
+        # 1. Find Subnet ID (from config or auto-detect public subnet)
+        subnet_id = self._find_subnet_id(inst, logger)
+
+        if not subnet_id or subnet_id == "None":
+            msg = "Failed to detect a valid public subnet. Please specify 'subnet_id' in cloud_instances.json or create a public subnet."
+            if logger:
+                logger.error(msg)
+            return None, None
+
+        if logger:
+            logger.info(f"Using Subnet ID: {subnet_id}")
+
+        # 2. Find Availability Domain (AD-1 fixed; no AD rotation for cost safety)
+        ad = self._find_availability_domain(inst, logger)
+        if not ad:
             if logger:
-                logger.error(f"Could not find {os_desc} image for {inst['type']}")
+                logger.error("Failed to get Availability Domain")
             return None, None
 
+        # 3. Find Image (Ubuntu, RHEL, or Oracle Linux)
+        if inst.get('_image'):
+            # Custom image baked with --bake (IMAGE_CACHE)
+            image_id = inst['_image']
+        else:
+            image_id = self._find_image_id(inst, logger)
+            if not image_id:
+                return None, None
+
         if logger:
             logger.info(f"Using Image ID: {image_id}")
             logger.info(f"Using Availability Domain: {ad}")
@@ -3567,6 +6949,7 @@ class OCIProvider(CloudProvider):
             shape_config = f"--shape-config '{{\"ocpus\":{ocpus},\"memoryInGBs\":{memory_gb}}}' "
 
         storage_config = build_storage_config(inst, 'oci')
+        spot_config = build_spot_config(inst, 'oci')
 
         # When extra storage is requested, embed a cloud-init user-data that
         # expands the root LV at first boot (bootcmd stage, before Oracle
@@ -3597,6 +6980,7 @@ class OCIProvider(CloudProvider):
             f"--subnet-id {subnet_id} "
             f"--image-id {image_id} "
             f"{storage_config}"
+            f"{spot_config}"
             f"{userdata_arg}"
             f"--display-name \"{name}\" "
             f"--ssh-authorized-keys-file \"{pub_key_path}\" "
@@ -3678,6 +7062,305 @@ class OCIProvider(CloudProvider):
         except:
             return "unknown"
 
+    def status_scope(self, inst: Dict[str, Any]) -> Optional[Tuple[str, ...]]:
+        return ('oci', self._get_region_for_instance(inst), self._get_compartment_id_for_instance(inst))
+
+    def describe_instance_statuses(self, scope, keys, logger=None) -> Optional[Dict[str, str]]:
+        """All instances of a compartment/region in one instance list call."""
+        _, region, compartment_id = scope
+        cmd_prefix = f"OCI_REGION={region} " if region else ""
+        try:
+            out = run_cmd(
+                f"{cmd_prefix}oci compute instance list --compartment-id {compartment_id} --all "
+                f"--query 'data[].[id,\"lifecycle-state\"]' --output json",
+                capture=True,
+                logger=logger
+            )
+            rows = json.loads(out) if out else []
+        except Exception:
+            return None
+        return {row[0]: str(row[1]).lower() for row in rows if isinstance(row, list) and len(row) == 2}
+
+    def create_image(self, instance_id: str, inst: Dict[str, Any], image_name: str, logger=None) -> Optional[str]:
+        """Custom image from the instance (OCI stops it while capturing), waited for AVAILABLE."""
+        cmd_prefix = self._oci_cmd_prefix(inst)
+        timeout = self.config['common'].get('bake_image_timeout', 3600)
+        image_id = run_cmd(
+            f"{cmd_prefix}oci compute image create --compartment-id {self._get_compartment_id_for_instance(inst)} "
+            f"--instance-id {instance_id} --display-name {image_name} "
+            f"--wait-for-state AVAILABLE --max-wait-seconds {timeout} "
+            f"--query 'data.id' --raw-output",
+            logger=logger, timeout=timeout + 60
+        )
+        return image_id if image_id and image_id != "None" else None
+
+
+# =========================================================================================
+# SIMULATED PROVIDER (orchestrator tests and scale benchmarks without CSP accounts)
+# =========================================================================================
+
+# Local stand-in for ssh: runs the remote command with bash inside the
+# instance's sandbox directory (HOME, and /tmp/ rewritten to <sandbox>/tmp/)
+# and refuses connections before boot / after termination or preemption.
+# ControlMaster requests (ControlMaster=yes, -O check/exit) are emulated with flag files.
+SIM_FAKE_SSH = r'''#!/usr/bin/env bash
+root="$(cd "$(dirname "$0")/.." && pwd)"
+master=0; op=""; ctl=""
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -o) case "$2" in
+                ControlMaster=yes) master=1 ;;
+                ControlPath=*) ctl="${2#ControlPath=}" ;;
+            esac
+            shift 2 ;;
+        -i|-p|-l|-F|-S|-E) shift 2 ;;
+        -O) op="$2"; shift 2 ;;
+        -M) master=1; shift ;;
+        -*) shift ;;
+        *) break ;;
+    esac
+done
+host="${1#*@}"; shift
+dir="$root/hosts/$host"
+now=$(date +%s%3N)
+if [ ! -d "$dir" ] || [ -e "$dir/.terminated" ] || [ "$now" -lt "$(cat "$dir/.boot_at")" ] ||
+   { [ -e "$dir/.preempt_at" ] && [ "$now" -ge "$(cat "$dir/.preempt_at")" ]; }; then
+    echo "ssh: connect to host $host port 22: Connection refused" >&2
+    exit 255
+fi
+case "$op" in
+    check) [ -e "$dir/.master" ] && exit 0; exit 255 ;;
+    exit) rm -f "$dir/.master" "$ctl"; exit 0 ;;
+esac
+if [ "$master" = 1 ]; then touch "$dir/.master" ${ctl:+"$ctl"}; exit 0; fi
+cmd="$*"
+cd "$dir" && HOME="$dir" PATH="$root/shim:$PATH" exec bash -c "${cmd//\/tmp\//$dir/tmp/}"
+'''
+
+# Commands the orchestrator runs remotely that must not touch the real host
+SIM_SHIMS = {
+    'sudo': '#!/usr/bin/env bash\nwhile [ $# -gt 0 ]; do case "$1" in -u|-g) shift 2 ;; -*) shift ;; *) break ;; esac; done\nexec "$@"\n',
+    'cloud-init': '#!/bin/sh\necho "status: done"\n',
+}
+
+
+class SimulatedCloudError(RuntimeError):
+    """Injected CSP API failure (the message mimics real CLI error text)."""
+    pass
+
+
+class SimulatedProvider(CloudProvider):
+    """
+    Fake CSP for exercising the orchestrator without cloud accounts.
+
+    Instances are sandbox directories under csp_config['root'] with loopback
+    IPs (127.100.x.y).  Their "sshd" is <root>/bin/ssh (SIM_FAKE_SSH), which
+    must come first on PATH, and a banner listener on readiness_port opens
+    once the boot latency has passed, so process_instance(),
+    ReadinessProber, SSHConnectionPool, the marker polling and the status
+    cache all run unchanged.
+
+    csp_config keys (all optional):
+        root                   sandbox directory (default: a new temp dir)
+        boot_latency           [min, max] seconds until SSH accepts
+        launch_latency         seconds per launch API call
+        fail_rate              non-retryable launch failures
+        capacity_error_rate    retryable InsufficientInstanceCapacity errors
+        rate_limit_rate        RequestLimitExceeded errors (is_rate_limit_error)
+        preempt_rate           instances preempted while running
+        preempt_after          [min, max] seconds after boot
+        ssh_port               banner port (set common.readiness_port to match)
+        quota_vcpus_all_regions, max_workers, launch_delay, seed
+    """
+
+    def __init__(self, config: Dict[str, Any], csp_config: Dict[str, Any]):
+        super().__init__(config, csp_config)
+        self.root = Path(csp_config.get('root') or tempfile.mkdtemp(prefix='cloud_exec_sim_'))
+        self.rng = random.Random(csp_config.get('seed'))
+        self.lock = threading.Lock()
+        self.instances: Dict[str, Dict[str, Any]] = {}  # instance_id -> state
+        self.hosts: Dict[str, Dict[str, Any]] = {}  # ip -> same entry
+        self.stats = {'launches': 0, 'rate_limited': 0, 'capacity_errors': 0, 'failures': 0, 'preempted': 0}
+        self._boots: List[Tuple[float, str]] = []  # heap of (boot_at, ip) for the banner listener
+        self._listeners: Dict[str, socket.socket] = {}
+        self._running = False
+        self._thread = None
+
+    def _draw(self, key: str, stat: Optional[str] = None) -> bool:
+        """Inject the event configured by csp_config[key] (a probability), counted in stats[stat]."""
+        with self.lock:
+            hit = self.rng.random() < float(self.csp_config.get(key, 0.0))
+            if hit and stat:
+                self.stats[stat] += 1
+            return hit
+
+    def _uniform(self, key: str, default: Tuple[float, float]) -> float:
+        low, high = self.csp_config.get(key, default)
+        with self.lock:
+            return self.rng.uniform(low, high)
+
+    def initialize_shared_resources(self, logger=None) -> Dict[str, Any]:
+        """Create the sandbox root, the fake ssh and shims, start the banner listener."""
+        for sub in ('bin', 'shim', 'hosts'):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+        scripts = {self.root / 'bin' / 'ssh': SIM_FAKE_SSH}
+        scripts.update({self.root / 'shim' / name: body for name, body in SIM_SHIMS.items()})
+        for path, body in scripts.items():
+            path.write_text(body)
+            path.chmod(0o755)
+        self._running = True
+        self._thread = threading.Thread(target=self._banner_loop, name="sim-banner", daemon=True)
+        self._thread.start()
+        self.shared_resources = {
+            'region': self.csp_config.get('region', 'sim-local-1'),
+            'quota_vcpus_all_regions': self.csp_config.get('quota_vcpus_all_regions', 100000),
+        }
+        return self.shared_resources
+
+    def shutdown(self) -> None:
+        """Stop the banner listener and close its sockets."""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+        with self.lock:
+            for sock in self._listeners.values():
+                sock.close()
+            self._listeners.clear()
+
+    def _banner_loop(self) -> None:
+        """Open each instance's banner port at boot time and answer with an SSH banner."""
+        port = int(self.csp_config.get('ssh_port', 2222))
+        while self._running:
+            now = time.time()
+            with self.lock:
+                while self._boots and self._boots[0][0] <= now:
+                    _, ip = heapq.heappop(self._boots)
+                    if self.hosts.get(ip, {}).get('state') == 'terminated':
+                        continue
+                    try:
+                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                        sock.bind((ip, port))
+                        sock.listen(16)
+                        sock.setblocking(False)
+                        self._listeners[ip] = sock
+                    except OSError:
+                        pass
+                listeners = list(self._listeners.values())
+            for sock in listeners:
+                try:
+                    conn, _ = sock.accept()
+                except (BlockingIOError, OSError):
+                    continue
+                with conn:
+                    try:
+                        conn.sendall(b"SSH-2.0-OpenSSH_9.6 SimulatedProvider\r\n")
+                    except OSError:
+                        pass
+            time.sleep(0.05)
+
+    def validate_instance_name(self, name: str) -> None:
+        if not re.match(r'^[a-z0-9][a-z0-9-]{0,62}$', name):
+            raise ValueError(f"Simulated instance name '{name}' must match [a-z0-9-]{{1,63}}")
+
+    def check_instance_exists(self, instance_name: str, inst=None, logger=None) -> bool:
+        with self.lock:
+            return any(entry['name'] == instance_name and entry['state'] != 'terminated'
+                       for entry in self.instances.values())
+
+    def is_rate_limit_error(self, exception: Exception) -> bool:
+        return any(kw in str(exception) for kw in ('RequestLimitExceeded', 'Throttling'))
+
+    def is_retryable_error(self, exception: Exception) -> bool:
+        return self.is_rate_limit_error(exception) or 'InsufficientInstanceCapacity' in str(exception)
+
+    def get_recommended_max_workers(self) -> int:
+        return int(self.csp_config.get('max_workers', 50))
+
+    def get_launch_delay_between_instances(self) -> float:
+        return float(self.csp_config.get('launch_delay', 0.0))
+
+    def launch_instance(self, inst: Dict[str, Any], logger=None) -> Tuple[Optional[str], Optional[str]]:
+        time.sleep(float(self.csp_config.get('launch_latency', 0.0)))
+        if self._draw('rate_limit_rate', 'rate_limited'):
+            raise SimulatedCloudError("An error occurred (RequestLimitExceeded) when calling RunInstances")
+        if self._draw('capacity_error_rate', 'capacity_errors'):
+            raise SimulatedCloudError("An error occurred (InsufficientInstanceCapacity) when calling RunInstances")
+        if self._draw('fail_rate', 'failures'):
+            raise SimulatedCloudError("An error occurred (InvalidParameterValue): simulated launch failure")
+
+        with self.lock:
+            n = self.stats['launches']
+            self.stats['launches'] += 1
+        instance_id = f"sim-{n:06d}"
+        ip = f"127.{100 + n // 62500}.{(n // 250) % 250 + 1}.{n % 250 + 1}"
+        boot_at = time.time() + self._uniform('boot_latency', (1.0, 3.0))
+        host_dir = self.root / 'hosts' / ip
+        if inst.get('_image'):
+            # Boot from a baked image: start from a copy of the snapshotted home directory
+            shutil.copytree(self.root / 'images' / inst['_image'], host_dir, dirs_exist_ok=True)
+        (host_dir / 'tmp').mkdir(parents=True, exist_ok=True)
+        for flag in ('.terminated', '.preempt_at', '.master'):
+            (host_dir / flag).unlink(missing_ok=True)
+        (host_dir / '.boot_at').write_text(str(int(boot_at * 1000)))
+        entry = {'name': inst['name'], 'instance_id': instance_id, 'ip': ip, 'state': 'pending',
+                 'boot_at': boot_at, 'preempt_at': None}
+        if self._draw('preempt_rate'):
+            entry['preempt_at'] = boot_at + self._uniform('preempt_after', (5.0, 30.0))
+            (host_dir / '.preempt_at').write_text(str(int(entry['preempt_at'] * 1000)))
+        with self.lock:
+            self.instances[instance_id] = entry
+            self.hosts[ip] = entry
+            heapq.heappush(self._boots, (boot_at, ip))
+        if logger:
+            logger.info(f"Simulated launch: {instance_id} ({ip}), boots in {boot_at - time.time():.1f}s")
+        return instance_id, ip
+
+    def _status(self, instance_id: str) -> str:
+        with self.lock:
+            entry = self.instances.get(instance_id)
+            if not entry:
+                return 'notfound'
+            now = time.time()
+            if entry['state'] != 'terminated' and entry['preempt_at'] and now >= entry['preempt_at']:
+                entry['state'] = 'terminated'
+                self.stats['preempted'] += 1
+            elif entry['state'] == 'pending' and now >= entry['boot_at']:
+                entry['state'] = 'running'
+            return entry['state']
+
+    def terminate_instance(self, instance_id: str, inst: Dict[str, Any], logger=None) -> bool:
+        with self.lock:
+            entry = self.instances.get(instance_id)
+            if not entry:
+                return True
+            entry['state'] = 'terminated'
+            sock = self._listeners.pop(entry['ip'], None)
+        if sock:
+            sock.close()
+        (self.root / 'hosts' / entry['ip'] / '.terminated').touch()
+        wait_for_termination(self, instance_id, inst, logger, timeout=30, poll_interval=1)
+        return True
+
+    def get_instance_status(self, instance_id: str, inst: Dict[str, Any], logger=None) -> str:
+        return self._status(instance_id)
+
+    def create_image(self, instance_id: str, inst: Dict[str, Any], image_name: str, logger=None) -> Optional[str]:
+        """Snapshot the sandbox home directory (without /tmp and the simulator's state files)."""
+        with self.lock:
+            entry = self.instances.get(instance_id)
+        if not entry:
+            return None
+        shutil.copytree(self.root / 'hosts' / entry['ip'], self.root / 'images' / image_name,
+                        ignore=shutil.ignore_patterns('tmp', '.boot_at', '.terminated', '.preempt_at', '.master'))
+        return image_name
+
+    def status_scope(self, inst: Dict[str, Any]) -> Optional[Tuple[str, ...]]:
+        return ('sim',)
+
+    def describe_instance_statuses(self, scope, keys, logger=None) -> Optional[Dict[str, str]]:
+        return {key: self._status(key) for key in keys}
+
 
 # =========================================================================================
 # MAIN EXECUTION LOGIC
@@ -3729,7 +7412,79 @@ def cleanup_instance_safely(provider: CloudProvider, instance_id: str, inst: Dic
         )
 
 
-def process_instance(
+def release_launch_slot(inst: Dict[str, Any]) -> None:
+    """
+    Tell execute_instances_parallel() that this instance entered its tail
+    (result collection / termination), so the next one may launch.  Only the
+    first call per run of process_instance() has an effect.
+    """
+    release = inst.pop('_release_slot', None)
+    if release:
+        release()
+
+
+async def acquire_launch_slot(inst: Dict[str, Any]) -> bool:
+    """
+    Spot relaunch: wait until execute_instances_parallel() hands this
+    instance a launch slot again (the first one was released when the
+    preempted instance entered its tail).  False when the run is shutting
+    down and no slot will be granted.
+    """
+    acquire = inst.get('_acquire_slot')
+    return await acquire() if acquire else True
+
+
+async def cancel_spot_checkpoint(inst: Dict[str, Any]) -> None:
+    """Stop a background full-copy spot checkpoint: the final collection supersedes it."""
+    task = inst.pop('_checkpoint_task', None)
+    if task is not None and not task.done():
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def bake_image(provider: CloudProvider, inst: Dict[str, Any], instance_id: str, ip: str,
+                     config: Dict[str, Any], key_path: str, logger) -> bool:
+    """
+    --bake: remove per-run state from the set-up instance, snapshot it and record the image.
+
+    The setup fingerprints in ~/.cloud_exec_setup_fingerprints stay in the
+    image, so instances launched from it skip every setup step except the
+    always-run ones (git pull / PTS cache wipe).
+    """
+    fingerprint = setup_list_fingerprint(config, inst)
+    os_info = parse_os_version(config['common']['os_version'])
+    ssh_strict = config['common'].get('ssh_strict_host_key_checking', False)
+    ssh_prefix = await SSH_POOL.acommand(
+        ip, get_ssh_user(os_info, inst['_csp']),
+        f"{'-o StrictHostKeyChecking=no' if not ssh_strict else ''} -i {key_path}",
+        logger=logger
+    ) + " "
+    scrub = (
+        f"rm -rf {REMOTE_JOURNAL_PATH} {REMOTE_BATCH_DIR} /tmp/cloud_exec_cmd_*; "
+        "if command -v cloud-init >/dev/null 2>&1; then sudo cloud-init clean --logs || true; fi; "
+        "sync"
+    )
+    await arun_cmd(ssh_prefix + shlex.quote(scrub), timeout=120, ignore=True, logger=logger)
+    await ASYNC_CORE.blocking(SSH_POOL.close, ip, logger=logger)
+
+    image_name = re.sub(r'[^a-z0-9-]', '-', f"cloud-exec-{get_os_label(os_info)}-{inst.get('arch', 'unknown')}-"
+                                              f"{fingerprint[:12]}-{datetime.now():%Y%m%d%H%M}".lower())
+    progress(f"{inst['_csp'].upper()}:{inst['name']}", f"Baking image {image_name}", logger)
+    started = time.time()
+    try:
+        image_id = await ASYNC_CORE.blocking(provider.create_image, instance_id, inst, image_name, logger)
+    except Exception as e:
+        logger.error(f"Image creation failed: {e}")
+        image_id = None
+    logger.event('baked', duration=time.time() - started, image_id=image_id, fingerprint=fingerprint)
+    if not image_id:
+        logger.error(f"Baking {image_name} failed, the image cache is unchanged")
+        return False
+    IMAGE_CACHE.record(config, inst, provider.image_location(inst), image_id, fingerprint, logger)
+    return True
+
+
+async def process_instance(
     provider: CloudProvider,
     inst: Dict[str, Any],
     config: Dict[str, Any],
@@ -3764,8 +7519,41 @@ def process_instance(
     # Initialize logger
     logger = InstanceLogger(instance_name, DASHBOARD, log_dir)
 
-    # Check for name conflicts
-    if check_instance_name_conflict(provider, sanitized_name, inst, logger):
+    # Spot/preemptible mode: per-instance "spot" overrides --spot
+    inst['_spot'] = bool(inst.get('spot', config.get('_spot', False)))
+    spot_relaunch = inst.get('_spot_relaunches', 0) > 0
+
+    # Run journal (loaded from an earlier attempt when resuming; kept across spot relaunches)
+    if spot_relaunch:
+        journal = inst['_journal']
+    else:
+        journal = RunJournal(log_dir, sanitized_name, resume=config.get('_resume', False))
+    inst['_journal'] = journal
+    inst['_externally_terminated'] = False
+    if journal.is_finished():
+        logger.info(f"Journal: {sanitized_name} already finished in run {journal.data['run_id']}, skipping")
+        return True
+
+    # Resume: reattach to the instance from the interrupted run if it is still up
+    resume_target = None
+    if config.get('_resume') and not spot_relaunch and journal.data.get('instance_id') and journal.data.get('ip'):
+        inst['region'] = journal.data.get('region') or inst.get('region')
+        try:
+            resume_status = await ASYNC_CORE.blocking(provider.cached_instance_status,
+                                                      journal.data['instance_id'], inst, logger)
+        except Exception as e:
+            resume_status = f"unknown ({e})"
+        if str(resume_status).strip().lower() == 'running':
+            resume_target = (journal.data['instance_id'], journal.data['ip'])
+            logger.info(f"Resume: reattaching to {journal.data['instance_id']} ({journal.data['ip']})")
+        else:
+            journal.reset_for_relaunch(keep_failed=False)
+            logger.info(f"Resume: previous instance is {resume_status}, relaunching "
+                        f"({len(journal.data['collected_indices'])} successfully collected workloads will be skipped)")
+
+    # Check for name conflicts (our own instance is expected to exist when reattaching)
+    if not resume_target and await ASYNC_CORE.blocking(check_instance_name_conflict,
+                                                       provider, sanitized_name, inst, logger):
         logger.error(f"Instance name conflict detected. Skipping {sanitized_name}")
         DASHBOARD.update(instance_name, status="ERROR", step="Name conflict", color=DASHBOARD.FAIL)
         return False
@@ -3777,33 +7565,62 @@ def process_instance(
     elif isinstance(provider, OCIProvider):
         inst['region'] = provider._get_region_for_instance(inst)
 
-    # Register instance on dashboard
+    # Register instance on dashboard (a spot relaunch keeps its history)
     cpu_cost = inst.get('cpu_cost_hour[730h-mo]', 0.0)
     storage_cost = inst.get('extra_150g_storage_cost_hour', 0.0) if inst.get('extra_150g_storage') else 0.0
-    DASHBOARD.register(instance_name, csp_name, inst['type'], cpu_cost, storage_cost, region=inst.get('region'))
+    if spot_relaunch:
+        DASHBOARD.update(instance_name, status="PENDING", step=f"Spot relaunch #{inst['_spot_relaunches']}",
+                         color=DASHBOARD.BLUE)
+    else:
+        DASHBOARD.register(instance_name, csp_name, inst['type'], cpu_cost, storage_cost, region=inst.get('region'))
 
     logger.info(f"Processing instance: {sanitized_name}")
 
+    # Budget cap (--budget-usd): refuse the launch when its projected cost does not fit
+    budget_estimate = 0.0
+    if BUDGET.enabled:
+        budget_workloads, budget_setup_count = build_workload_list(
+            config, inst, parse_os_version(config['common']['os_version']), instance_name
+        )
+        budget_estimate = sum(seconds for _, seconds in
+                              BUDGET.workload_estimates(budget_workloads, budget_setup_count, inst, journal))
+        if not resume_target and not BUDGET.admit_launch(instance_name, cpu_cost + storage_cost,
+                                                         budget_estimate, logger):
+            DASHBOARD.remove(instance_name)
+            return False
+
     instance_id = None
     ip = None
     commands_success = False
     results_collected = False
+    incremental = config['common'].get('incremental_collect', True) and not config.get('_bake')
 
     # Inject CSP name into inst dict for downstream SSH user lookup
     inst['_csp'] = provider.csp_config.get('name', 'unknown')
     inst['cloud'] = inst['_csp']
 
+    # Launch from the image of an earlier --bake while it matches the current setup
+    inst.pop('_image', None)
+    if not config.get('_bake') and not resume_target:
+        baked_image = IMAGE_CACHE.lookup(config, inst, provider.image_location(inst), logger)
+        if baked_image:
+            inst['_image'] = baked_image
+
     try:
         # Launch instance
         progress(instance_name, "Launching instance", logger)
+        launch_started = time.time()
 
-        instance_id, ip = retry_with_exponential_backoff(
-            lambda: provider.launch_instance(inst, logger),
-            max_retries=120,   # Up to ~2 hours to poll for available capacity
-            base_delay=2.0,
-            logger=logger,
-            error_classifier=provider.is_retryable_error
-        )
+        if resume_target:
+            instance_id, ip = resume_target
+        else:
+            instance_id, ip = await aretry_with_exponential_backoff(
+                lambda: ASYNC_CORE.blocking(provider.launch_instance, inst, logger),
+                max_retries=120,   # Up to ~2 hours to poll for available capacity
+                base_delay=2.0,
+                logger=logger,
+                error_classifier=provider.is_retryable_error
+            )
 
         if not ip or ip == "None":
             logger.error(f"Failed to get IP for {sanitized_name}")
@@ -3812,6 +7629,26 @@ def process_instance(
             return False
 
         inst['instance_id'] = instance_id
+        logger.event('launched', duration=time.time() - launch_started, instance_id=instance_id,
+                     type=inst.get('type'), region=inst.get('region'), resumed=bool(resume_target))
+        await ASYNC_CORE.blocking(STATUS_CACHE.invalidate, provider, instance_id, inst)  # name may be reused (GCP relaunch)
+        if inst['_spot']:
+            inst['_effective_cost_hour'] = await ASYNC_CORE.blocking(provider.get_effective_price,
+                                                                     instance_id, inst, logger)
+            DASHBOARD.set_cost(instance_name, inst['_effective_cost_hour'] - storage_cost)
+            # Results are pulled here after every workload so a preemption loses at most one.
+            # The incremental mirror spans every launch, so its tarball keeps one path across relaunches.
+            if not (spot_relaunch and incremental and inst.get('_checkpoint_path')):
+                inst['_checkpoint_path'] = result_tarball_path(
+                    config, provider.csp_config.get('name', 'unknown'), sanitized_name, inst
+                )
+        if not resume_target:
+            journal.record_launch(instance_id, ip, region=inst.get('region'), type=inst.get('type'),
+                                  pricing='spot' if inst['_spot'] else 'on-demand',
+                                  cost_hour=inst.get('_effective_cost_hour', cpu_cost + storage_cost))
+        if BUDGET.enabled:
+            BUDGET.started(instance_name, inst.get('_effective_cost_hour', cpu_cost + storage_cost),
+                           budget_estimate + BUDGET.setup_seconds)
 
         # Register for cleanup
         register_instance(
@@ -3826,20 +7663,53 @@ def process_instance(
         progress(instance_name, f"Instance launched (IP: {ip})", logger)
 
         # Wait for SSH
-        logger.info(f"Waiting 60s for SSH (IP: {ip})...")
-        time.sleep(60)
+        if resume_target:
+            ssh_strict = config['common'].get('ssh_strict_host_key_checking', False)
+            await journal.merge_remote(
+                lambda: SSH_POOL.acommand(
+                    ip,
+                    get_ssh_user(parse_os_version(config['common']['os_version']), inst['_csp']),
+                    f"{'-o StrictHostKeyChecking=no' if not ssh_strict else ''} -i {key_path}",
+                    logger=logger
+                ),
+                logger
+            )
+        else:
+            progress(instance_name, f"Waiting for SSH (IP: {ip})", logger)
+            ssh_strict = config['common'].get('ssh_strict_host_key_checking', False)
+            ready_started = time.time()
+            ready = await READINESS.wait_until_ready(
+                ip,
+                lambda: SSH_POOL.acommand(
+                    ip,
+                    get_ssh_user(parse_os_version(config['common']['os_version']), inst['_csp']),
+                    f"{'-o StrictHostKeyChecking=no' if not ssh_strict else ''} -i {key_path} "
+                    f"-o UserKnownHostsFile=/dev/null -o ConnectTimeout=10 -o BatchMode=yes",
+                    logger=logger
+                ),
+                ReadinessProber.image_key(config, inst),
+                logger
+            )
+            logger.event('ready', duration=time.time() - ready_started, confirmed=bool(ready))
+            if not ready:
+                logger.warn("Instance not confirmed ready, continuing anyway")
 
         ensure_log_dir_available(log_dir, logger, "after SSH wait")
 
         # Set hostname if specified
-        if 'hostname' in inst and inst['hostname']:
+        if not resume_target and 'hostname' in inst and inst['hostname']:
             hostname = inst['hostname']
             logger.info(f"Setting hostname to: {hostname}")
             ssh_strict = config['common'].get('ssh_strict_host_key_checking', False)
             try:
-                run_cmd(
-                    f"ssh {'-o StrictHostKeyChecking=no' if not ssh_strict else ''} "
-                    f"-i {key_path} {get_ssh_user(parse_os_version(config['common']['os_version']), inst['_csp'])}@{ip} 'sudo hostnamectl set-hostname {hostname}'",
+                ssh_cmd = await SSH_POOL.acommand(
+                    ip,
+                    get_ssh_user(parse_os_version(config['common']['os_version']), inst['_csp']),
+                    f"{'-o StrictHostKeyChecking=no' if not ssh_strict else ''} -i {key_path}",
+                    logger=logger
+                )
+                await arun_cmd(
+                    f"{ssh_cmd} 'sudo hostnamectl set-hostname {hostname}'",
                     timeout=30,
                     logger=logger
                 )
@@ -3853,14 +7723,15 @@ def process_instance(
         # Oracle Linux growpart/resizefs and expands root at first boot.
         # Fallback: if for any reason bootcmd did not run (e.g. older image,
         # cloud-init disabled), attempt pvresize + lvextend here.
-        if inst.get('_csp') == 'oci' and inst.get('extra_150g_storage', False):
+        if not resume_target and inst.get('_csp') == 'oci' and inst.get('extra_150g_storage', False):
             logger.info("OCI: checking/expanding LVM root filesystem...")
             ssh_strict = config['common'].get('ssh_strict_host_key_checking', False)
             ssh_user = get_ssh_user(parse_os_version(config['common']['os_version']), inst['_csp'])
-            ssh_prefix = (
-                f"ssh {'-o StrictHostKeyChecking=no' if not ssh_strict else ''} "
-                f"-i {key_path} {ssh_user}@{ip} "
-            )
+            ssh_prefix = await SSH_POOL.acommand(
+                ip, ssh_user,
+                f"{'-o StrictHostKeyChecking=no' if not ssh_strict else ''} -i {key_path}",
+                logger=logger
+            ) + " "
             # Fallback LVM expansion: growpart -> pvresize -> lvextend.
             # Mirrors the cloud-init bootcmd (build_oci_lvm_userdata) but runs
             # via SSH after boot.  All three steps are needed:
@@ -3884,7 +7755,7 @@ def process_instance(
             )
             lvm_cmd = ssh_prefix + shlex.quote(lvm_fallback)
             try:
-                result = run_cmd(lvm_cmd, timeout=60, ignore=True, logger=logger)
+                result = await arun_cmd(lvm_cmd, timeout=60, ignore=True, logger=logger)
                 if result is not None:
                     logger.info(f"LVM expansion result: {result.strip()[:200]}")
                 else:
@@ -3894,31 +7765,78 @@ def process_instance(
             # Log final root LV size for diagnostics
             try:
                 df_cmd = ssh_prefix + "'df -h /'"
-                df_result = run_cmd(df_cmd, timeout=15, ignore=True, logger=logger)
+                df_result = await arun_cmd(df_cmd, timeout=15, ignore=True, logger=logger)
                 if df_result:
                     logger.info(f"OCI root disk after expansion:\n{df_result.strip()}")
             except Exception:
                 pass
 
+        # Pull results in the background while workloads run (final collection = last delta)
+        ssh_strict = config['common'].get('ssh_strict_host_key_checking', False)
+        if incremental:
+            inst['_collector'] = IncrementalCollector(
+                ip,
+                get_ssh_user(parse_os_version(config['common']['os_version']), inst['_csp']),
+                f"-i {key_path} -o StrictHostKeyChecking={'yes' if ssh_strict else 'no'} "
+                f"-o UserKnownHostsFile=/dev/null -o ServerAliveInterval=60 -o ServerAliveCountMax=10 "
+                f"-o BatchMode=yes -o NumberOfPasswordPrompts=0",
+                config['common']['cloud_reports_dir'],
+                Path(log_dir) / 'incremental' / sanitized_name,
+                instance_name,
+                logger
+            )
+
         # Run workloads
         try:
             ensure_log_dir_available(log_dir, logger, "before workload execution")
-            ssh_strict = config['common'].get('ssh_strict_host_key_checking', False)
-            commands_success = run_ssh_commands(ip, config, inst, key_path, ssh_strict, instance_name, logger)
+            commands_success = await run_ssh_commands(ip, config, inst, key_path, ssh_strict, instance_name, logger)
             ensure_log_dir_available(log_dir, logger, "after workload execution")
         except Exception as workload_error:
             logger.error(f"Workload execution failed: {workload_error}")
             commands_success = False
 
+        # Spot: any other failed step (setup reads, post_process, batch launch) may be a preemption
+        if inst['_spot'] and not commands_success and not inst.get('_externally_terminated'):
+            spot_status = await ASYNC_CORE.blocking(external_instance_status, inst, logger=logger)
+            spot_status = str(spot_status or "unknown").strip().lower()
+            if spot_status in ['terminated', 'stopped', 'stopping', 'shutting-down', 'shutting_down', 'deleted', 'notfound']:
+                logger.error(f"Instance {instance_name} preempted (Status: {spot_status})")
+                inst['_externally_terminated'] = True
+                DASHBOARD.update(instance_name, status='TERMINATED')
+
+        await cancel_spot_checkpoint(inst)
+
+        # Launch pipelining: the next instance may start while this one collects/terminates
+        release_launch_slot(inst)
+
         # Collect results (skip if instance was terminated externally)
         with DASHBOARD.lock:
             _current_status = DASHBOARD.instances.get(instance_name, {}).get('status')
-        if _current_status == 'TERMINATED':
+        if config.get('_bake'):
+            # --bake: the set-up instance itself is the result
+            if commands_success and _current_status != 'TERMINATED':
+                commands_success = await bake_image(provider, inst, instance_id, ip, config, key_path, logger)
+        elif _current_status == 'TERMINATED':
             logger.warn("Skipping result collection: instance was terminated externally")
+            collector = inst.get('_collector')
+            if collector and collector.snapshot()['syncs']:
+                # Keep what was already pulled during the run
+                try:
+                    local_f = await collector.pack(inst.get('_checkpoint_path') or result_tarball_path(
+                        config, provider.csp_config.get('name', 'unknown'), sanitized_name, inst))
+                    journal.record_artifact(local_f, [])
+                    logger.info(f"Saved incrementally collected results: {local_f}")
+                except Exception as pack_error:
+                    logger.error(f"Packing incrementally collected results failed: {pack_error}")
         else:
             try:
-                collect_results(ip, config, provider.csp_config.get('name', 'unknown'), sanitized_name, inst, key_path, ssh_strict, instance_name, logger)
+                journal.set_state('collecting')
+                collect_started = time.time()
+                local_f = await collect_results(ip, config, provider.csp_config.get('name', 'unknown'), sanitized_name, inst, key_path, ssh_strict, instance_name, logger,
+                                                local_f=inst.get('_checkpoint_path'))
+                journal.record_artifact(local_f)
                 results_collected = True
+                logger.event('collected', duration=time.time() - collect_started, path=str(local_f))
             except Exception as collect_error:
                 logger.error(f"Result collection failed: {collect_error}")
 
@@ -3940,7 +7858,7 @@ def process_instance(
         if ip and not results_collected:
             try:
                 ssh_strict = config['common'].get('ssh_strict_host_key_checking', False)
-                collect_results(
+                local_f = await collect_results(
                     ip,
                     config,
                     provider.csp_config.get('name', 'unknown'),
@@ -3951,6 +7869,7 @@ def process_instance(
                     instance_name,
                     logger
                 )
+                journal.record_artifact(local_f)
                 results_collected = True
                 print(f"[FAILSAFE] {instance_name}: collected partial results before termination", flush=True)
             except Exception as emergency_collect_error:
@@ -3971,13 +7890,352 @@ def process_instance(
 
     finally:
         # Guaranteed cleanup
+        release_launch_slot(inst)
+        await cancel_spot_checkpoint(inst)
+        BUDGET.release(instance_name)
+        collector = inst.pop('_collector', None)
+        if collector:
+            await collector.close(remove_mirror=results_collected)
+            stats = collector.snapshot()
+            logger.info(f"Incremental collection: {stats['syncs']} deltas, "
+                        f"{stats['files']} files, {stats['bytes'] / 1048576:.1f} MiB")
+        if ip:
+            await ASYNC_CORE.blocking(SSH_POOL.close, ip, logger=logger)
         if instance_id:
             progress(instance_name, "Terminating instance", logger)
-            cleanup_instance_safely(provider, instance_id, inst, logger)
+            await ASYNC_CORE.blocking(cleanup_instance_safely, provider, instance_id, inst, logger)
+            journal.set_state('terminated', completed=bool(commands_success and results_collected))
+            BUDGET.finished(instance_name)
+            logger.event('terminated', instance_id=instance_id, success=commands_success,
+                         externally_terminated=bool(inst.get('_externally_terminated')))
+
+    # Spot preemption: relaunch and continue with the remaining workloads
+    # (finished ones are skipped via the journal; their results were checkpointed)
+    spot_max_relaunches = config['common'].get('spot_max_relaunches', 3)
+    if inst['_spot'] and inst.get('_externally_terminated'):
+        if inst.get('_spot_relaunches', 0) < spot_max_relaunches:
+            inst['_spot_relaunches'] = inst.get('_spot_relaunches', 0) + 1
+            logger.warn(f"Spot instance {instance_id} preempted, relaunching "
+                        f"({inst['_spot_relaunches']}/{spot_max_relaunches}, "
+                        f"{len(journal.data['collected_indices'])} finished workloads will be skipped)")
+            journal.reset_for_relaunch()
+            inst['name'] = original_name
+            if not await acquire_launch_slot(inst):
+                logger.error("No launch slot for the spot relaunch (run is shutting down), giving up")
+                return commands_success
+            return await process_instance(provider, inst, config, key_path, log_dir)
+        logger.error(f"Spot instance preempted {spot_max_relaunches} times, giving up")
 
     return commands_success
 
 
+class VcpuAdmissionController:
+    """
+    Token-bucket admission of instance launches under vCPU quotas.
+
+    A running instance holds its vCPUs in the global bucket
+    (quota_vcpus_all_regions) and in its region bucket (optional
+    "quota_vcpus" of a region in cloud_instances.json).  The tokens return
+    when process_instance() finishes, i.e. after the instance is terminated,
+    and pending instances are admitted in priority order as soon as they fit.
+
+    Smaller instances may start ahead of a blocked larger one (backfill)
+    until the first pending instance has waited starvation_timeout seconds;
+    from then on nothing else is admitted until it fits.  An instance larger
+    than the whole quota is started alone.
+    """
+
+    POLICIES = ('largest_first', 'smallest_first', 'fifo')
+
+    def __init__(
+        self,
+        instances: List[Dict[str, Any]],
+        quota: int,
+        region_quotas: Optional[Dict[str, int]] = None,
+        policy: str = 'largest_first',
+        starvation_timeout: float = 1800
+    ):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown admission_policy '{policy}' (expected one of {', '.join(self.POLICIES)})")
+        self.quota = quota
+        self.region_quotas = region_quotas or {}
+        self.starvation_timeout = starvation_timeout
+        self.lock = threading.Lock()
+        self.used = 0
+        self.region_used: Dict[str, int] = {}
+        self.holding: Dict[int, Tuple[int, str]] = {}  # id(inst) -> (vcpus, region)
+        self.peak = 0
+
+        order = list(enumerate(instances))
+        if policy == 'largest_first':
+            order.sort(key=lambda item: (-item[1].get('vcpus', 0), item[0]))
+        elif policy == 'smallest_first':
+            order.sort(key=lambda item: (item[1].get('vcpus', 0), item[0]))
+        self.pending = [inst for _, inst in order]
+        self.head_since = time.time()
+        self._publish()
+
+    @classmethod
+    def for_provider(cls, provider: 'CloudProvider', instances: List[Dict[str, Any]],
+                     config: Dict[str, Any]) -> 'VcpuAdmissionController':
+        quota = provider.shared_resources.get(
+            'quota_vcpus_all_regions', provider.csp_config.get('quota_vcpus_all_regions', 32)
+        )
+        region_quotas = {}
+        regions = provider.csp_config.get('regions')
+        if isinstance(regions, dict):
+            for region_name, region_cfg in regions.items():
+                if isinstance(region_cfg, dict) and region_cfg.get('quota_vcpus') is not None:
+                    region_quotas[region_name] = int(region_cfg['quota_vcpus'])
+        return cls(
+            instances, quota, region_quotas,
+            policy=config['common'].get('admission_policy', 'largest_first'),
+            starvation_timeout=config['common'].get('quota_starvation_timeout', 1800)
+        )
+
+    def _fits(self, vcpus: int, region: str) -> bool:
+        if self.used + vcpus > self.quota:
+            return False
+        region_quota = self.region_quotas.get(region)
+        return region_quota is None or self.region_used.get(region, 0) + vcpus <= region_quota
+
+    def admit(self, limit: int) -> List[Dict[str, Any]]:
+        """Take the pending instances that can start now (at most `limit`)."""
+        admitted = []
+        with self.lock:
+            head = self.pending[0] if self.pending else None
+            for inst in list(self.pending):
+                if len(admitted) >= limit:
+                    break
+                vcpus = inst.get('vcpus', 0)
+                region = inst.get('region') or 'unknown-region'
+                oversized = not self.holding and not admitted and inst is head
+                if self._fits(vcpus, region) or oversized:
+                    if oversized and not self._fits(vcpus, region):
+                        print(f"[QUOTA] {inst['name']} needs {vcpus} vCPUs (> quota), running it alone", flush=True)
+                    self.pending.remove(inst)
+                    self.holding[id(inst)] = (vcpus, region)
+                    self.used += vcpus
+                    self.region_used[region] = self.region_used.get(region, 0) + vcpus
+                    self.peak = max(self.peak, self.used)
+                    admitted.append(inst)
+                elif inst is head and time.time() - self.head_since >= self.starvation_timeout:
+                    break  # reserve the released vCPUs for the long-waiting head
+            if self.pending and self.pending[0] is not head:
+                self.head_since = time.time()
+        self._publish()
+        return admitted
+
+    def release(self, inst: Dict[str, Any]) -> None:
+        """Return the vCPUs of a finished (terminated) instance."""
+        with self.lock:
+            vcpus, region = self.holding.pop(id(inst), (0, None))
+            self.used -= vcpus
+            if region is not None:
+                self.region_used[region] -= vcpus
+        self._publish()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'quota': self.quota,
+                'used': self.used,
+                'pending': len(self.pending),
+                'regions': {
+                    region: (self.region_used.get(region, 0), limit)
+                    for region, limit in self.region_quotas.items()
+                },
+            }
+
+    def _publish(self) -> None:
+        if DASHBOARD:
+            DASHBOARD.set_quota(self.snapshot())
+
+
+class BudgetGuard:
+    """
+    Cost cap for a run (--budget-usd / "budget_usd").
+
+    Every launched instance contributes what it has cost so far (elapsed
+    time x hourly rate, spot price when known) plus the projected cost of
+    its remaining workloads (WorkloadRuntimeEstimator, i.e. journal history
+    or test_suite.json exe_time_v8cpu).  Policies ("budget_policy"):
+
+    - block_launch:   an instance whose projected cost would push the run
+                      over the cap is not launched.
+    - skip_long_tail: when the projection exceeds the cap, an instance skips
+                      its longest remaining workloads until it fits.
+
+    Every decision is appended to <log_dir>/budget.log and events.jsonl.
+    """
+
+    POLICIES = ('block_launch', 'skip_long_tail')
+
+    def __init__(self):
+        self.cap = None
+        self.policies = set(self.POLICIES)
+        self.setup_seconds = 900
+        self.estimator = None
+        self.log_path = None
+        self.lock = threading.Lock()
+        self.instances: Dict[str, Dict[str, Any]] = {}  # instance_name -> rate/start/end/remaining
+        self.pending: Dict[str, float] = {}  # instance_name -> projected cost admitted but not launched yet
+
+    @property
+    def enabled(self) -> bool:
+        return self.cap is not None
+
+    def configure(self, cap: Optional[float], config: Dict[str, Any], log_dir: Path,
+                  exclude_run: Optional[str] = None) -> None:
+        if cap is None:
+            return
+        common = config['common']
+        self.cap = float(cap)
+        policy = common.get('budget_policy', list(self.POLICIES))
+        self.policies = {policy} if isinstance(policy, str) else set(policy)
+        unknown = self.policies - set(self.POLICIES)
+        if unknown:
+            print(f"[WARN] Unknown budget_policy {sorted(unknown)}, expected {list(self.POLICIES)}")
+        self.setup_seconds = common.get('budget_setup_seconds', 900)
+        self.estimator = WorkloadRuntimeEstimator(config, exclude_run)
+        self.log_path = Path(log_dir) / "budget.log"
+        self._decide(None, 'configured', cap=self.cap, policies=sorted(self.policies))
+
+    def workload_estimates(self, workloads: List[str], setup_count: int, inst: Dict[str, Any],
+                           journal: Optional['RunJournal'] = None) -> List[Tuple[int, float]]:
+        """[(index, estimated seconds), ...] of the workloads still to run (setup excluded)."""
+        estimates = []
+        for i, workload in enumerate(workloads, start=1):
+            if i <= setup_count or (journal and journal.status_of(i) in RunJournal.FINAL_STATUSES):
+                continue
+            estimates.append((i, self.estimator.estimate(workload.format(vcpus=inst['vcpus']), inst)))
+        return estimates
+
+    # -- accounting ----------------------------------------------------------------
+
+    def _spent(self, entry: Dict[str, Any], now: float) -> float:
+        return max(0.0, (entry['end'] or now) - entry['start']) / 3600.0 * entry['rate']
+
+    def _projection(self, exclude: Optional[str] = None) -> Tuple[float, float]:
+        """projection() body; the caller holds self.lock."""
+        now = time.time()
+        spent = projected = 0.0
+        for name, entry in self.instances.items():
+            cost = self._spent(entry, now)
+            spent += cost
+            projected += cost
+            if name != exclude and entry['end'] is None:
+                projected += entry['remaining'] / 3600.0 * entry['rate']
+        projected += sum(cost for name, cost in self.pending.items() if name != exclude)
+        return spent, projected
+
+    def projection(self, exclude: Optional[str] = None) -> Tuple[float, float]:
+        """(spent so far, projected total) over all launched and admitted instances."""
+        with self.lock:
+            return self._projection(exclude)
+
+    def started(self, instance_name: str, rate: float, remaining: float) -> None:
+        with self.lock:
+            self.pending.pop(instance_name, None)
+            previous = self.instances.get(instance_name)
+            # Spot relaunch: keep the cost of the preempted instance
+            carried = self._spent(previous, time.time()) if previous else 0.0
+            self.instances[instance_name] = {
+                'rate': rate, 'start': time.time() - (carried / rate * 3600.0 if rate else 0.0),
+                'end': None, 'remaining': remaining,
+            }
+        self._publish()
+
+    def set_remaining(self, instance_name: str, remaining: float) -> None:
+        with self.lock:
+            if instance_name in self.instances:
+                self.instances[instance_name]['remaining'] = remaining
+        self._publish()
+
+    def release(self, instance_name: str) -> None:
+        """Drop the reservation of an admitted instance that never started (launch failed)."""
+        with self.lock:
+            released = self.pending.pop(instance_name, None)
+        if released is not None:
+            self._publish()
+
+    def finished(self, instance_name: str) -> None:
+        with self.lock:
+            entry = self.instances.get(instance_name)
+            if entry and entry['end'] is None:
+                entry['end'] = time.time()
+                entry['remaining'] = 0.0
+        self._publish()
+
+    # -- decisions -----------------------------------------------------------------
+
+    def admit_launch(self, instance_name: str, rate: float, estimate: float, logger=None) -> bool:
+        """block_launch policy: refuse an instance whose projected cost exceeds the cap."""
+        if not self.enabled:
+            return True
+        cost = (estimate + self.setup_seconds) / 3600.0 * rate
+        # Check and reserve atomically: parallel workers must not all fit into the same headroom
+        with self.lock:
+            _, projected = self._projection()
+            admitted = 'block_launch' not in self.policies or projected + cost <= self.cap
+            if admitted:
+                self.pending[instance_name] = cost
+        self._decide(logger, 'launch' if admitted else 'launch_refused', instance=instance_name,
+                     projected=round(projected, 2), instance_cost=round(cost, 2))
+        return admitted
+
+    def plan_skips(self, instance_name: str, remaining: List[Tuple[int, float]], logger=None) -> set:
+        """
+        skip_long_tail policy: indices of this instance's remaining workloads
+        to skip, longest first, until its projected cost fits under the cap.
+
+        Args:
+            remaining: [(workload index, estimated seconds), ...] not yet run
+        """
+        total = sum(seconds for _, seconds in remaining)
+        self.set_remaining(instance_name, total)
+        if not self.enabled or 'skip_long_tail' not in self.policies:
+            return set()
+        with self.lock:
+            entry = self.instances.get(instance_name)
+        if not entry or not entry['rate']:
+            return set()
+        _, others = self.projection(exclude=instance_name)
+        allowed = (self.cap - others) / entry['rate'] * 3600.0
+        skipped = set()
+        for index, seconds in sorted(remaining, key=lambda item: item[1], reverse=True):
+            if total <= allowed:
+                break
+            skipped.add(index)
+            total -= seconds
+        if skipped:
+            self.set_remaining(instance_name, total)
+            self._decide(logger, 'skip_workloads', instance=instance_name, workloads=sorted(skipped),
+                         projected=round(others + total / 3600.0 * entry['rate'], 2))
+        return skipped
+
+    def summary(self) -> str:
+        spent, projected = self.projection()
+        return f"${spent:.2f} spent of ${self.cap:.2f} cap (projected ${projected:.2f})"
+
+    def _decide(self, logger, decision: str, **fields) -> None:
+        """Write a budget decision to budget.log, events.jsonl and the instance log."""
+        message = f"Budget {decision}: " + ", ".join(f"{k}={v}" for k, v in fields.items())
+        if self.log_path:
+            LOG_WRITER.write(self.log_path, f"[{datetime.now().strftime('%H:%M:%S')}] {message}\n")
+        if logger:
+            (logger.warn if decision in ('launch_refused', 'skip_workloads') else logger.info)(message)
+            logger.event('budget', decision=decision, **fields)
+
+    def _publish(self) -> None:
+        if DASHBOARD and self.enabled:
+            spent, projected = self.projection()
+            DASHBOARD.set_budget({'cap': self.cap, 'spent': spent, 'projected': projected})
+
+
+BUDGET = BudgetGuard()
+
+
 def execute_instances_parallel(
     provider: CloudProvider,
     instances: List[Dict[str, Any]],
@@ -4001,67 +8259,143 @@ def execute_instances_parallel(
     stop_event = threading.Event()
     launch_delay = provider.get_launch_delay_between_instances()
 
-    def process_with_delay(inst):
+    async def process_with_delay(inst):
         """Process instance with rate limiting delay."""
         if stop_event.is_set():
             csp_name = provider.csp_config.get('name', 'unknown').upper()
             print(f"[SKIP] {csp_name}:{inst['name']} skipped (stop_after_error)", flush=True)
             return True
-        time.sleep(launch_delay)
+        await asyncio.sleep(launch_delay)
         if stop_event.is_set():
             csp_name = provider.csp_config.get('name', 'unknown').upper()
             print(f"[SKIP] {csp_name}:{inst['name']} skipped (stop_after_error)", flush=True)
             return True
-        return process_instance(provider, inst, config, key_path, log_dir)
+        return await process_instance(provider, inst, config, key_path, log_dir)
 
-    executor = None
+    def handle_result(future, inst):
+        try:
+            result = future.result()
+            if stop_after_error and result is False and not stop_event.is_set():
+                stop_event.set()
+                print(
+                    f"[STOP] Instance '{inst['name']}' ended with error. "
+                    f"Skipping remaining instances (stop_after_error=true).",
+                    flush=True
+                )
+        except Exception as exc:
+            # Log to general errors file
+            error_log = log_dir / "general_errors.log"
+            try:
+                error_log.parent.mkdir(parents=True, exist_ok=True)
+                with open(error_log, "a") as f:
+                    f.write(f"[{datetime.now()}] {inst['name']} failed: {exc}\n")
+                    import traceback
+                    f.write(traceback.format_exc() + "\n")
+            except Exception:
+                print(f"[WARN] Failed to write general error log for {inst['name']}: {exc}", flush=True)
+            if stop_after_error and not stop_event.is_set():
+                stop_event.set()
+                print(
+                    f"[STOP] Instance '{inst['name']}' raised exception. "
+                    f"Skipping remaining instances (stop_after_error=true).",
+                    flush=True
+                )
 
-    try:
-        executor = ThreadPoolExecutor(max_workers=max_workers)
+    # Dynamic vCPU admission (quota_admission=false: static max_workers trimming in main)
+    admission = None
+    if config['common'].get('quota_admission', True):
+        admission = VcpuAdmissionController.for_provider(provider, instances, config)
+    pending = list(instances)
+
+    def next_instances(limit: int) -> List[Dict[str, Any]]:
+        if admission is not None:
+            return admission.admit(limit)
+        batch, pending[:] = pending[:limit], pending[limit:]
+        return batch
+
+    # Every instance is a process_instance() coroutine on the AsyncCore loop
+    # (async_core=false: asyncio.run() of it in a pool thread).
+    # Launch pipelining: max_workers bounds the instances in launch/setup/workloads.
+    # An instance that reaches collection/termination hands its slot to the next
+    # launch (its vCPUs stay reserved until it is gone), so up to max_workers more
+    # instances may be busy with tails.  New instances are only submitted while
+    # fewer than pool_size are in flight, so a launch never queues behind the tails.
+    pipelining = config['common'].get('launch_pipelining', True)
+    pool_size = max_workers * 2 if pipelining else max_workers
+    events = queue.Queue()  # ('slot' | 'done', key) or ('acquire', (key, granted))
+    in_slot = set()
+    futures = {}
+    relaunch_waiting = []  # spot relaunches waiting for a slot: (key, granted)
+    closed = threading.Event()
+
+    async def acquire_slot(inst, key):
+        """Hold a spot relaunch until the main loop grants it a launch slot."""
+        granted = threading.Event()
+        events.put(('acquire', (key, granted)))
+        while not granted.is_set():
+            if closed.is_set():
+                return False
+            await asyncio.sleep(1.0)
+        inst['_release_slot'] = lambda: events.put(('slot', key))
+        return True
 
-        futures = {
-            executor.submit(process_with_delay, inst): inst
-            for inst in instances
-        }
+    executor = None
 
-        for future in as_completed(futures):
-            inst = futures[future]
-            try:
-                result = future.result()
-                if stop_after_error and result is False and not stop_event.is_set():
-                    stop_event.set()
-                    print(
-                        f"[STOP] Instance '{inst['name']}' ended with error. "
-                        f"Skipping remaining instances (stop_after_error=true).",
-                        flush=True
-                    )
-            except Exception as exc:
-                # Log to general errors file
-                error_log = log_dir / "general_errors.log"
-                try:
-                    error_log.parent.mkdir(parents=True, exist_ok=True)
-                    with open(error_log, "a") as f:
-                        f.write(f"[{datetime.now()}] {inst['name']} failed: {exc}\n")
-                        import traceback
-                        f.write(traceback.format_exc() + "\n")
-                except Exception:
-                    print(f"[WARN] Failed to write general error log for {inst['name']}: {exc}", flush=True)
-                if stop_after_error and not stop_event.is_set():
-                    stop_event.set()
-                    print(
-                        f"[STOP] Instance '{inst['name']}' raised exception. "
-                        f"Skipping remaining instances (stop_after_error=true).",
-                        flush=True
-                    )
+    try:
+        if not ASYNC_CORE.enabled:
+            executor = ThreadPoolExecutor(max_workers=pool_size)
+
+        while (admission.pending if admission is not None else pending) or futures:
+            # Relaunches are in flight already: they go before new instances
+            while relaunch_waiting and len(in_slot) < max_workers:
+                key, granted = relaunch_waiting.pop(0)
+                in_slot.add(key)
+                granted.set()
+            free = min(max_workers - len(in_slot), pool_size - len(futures))
+            for inst in (next_instances(free) if free > 0 and not relaunch_waiting else []):
+                key = id(inst)
+                in_slot.add(key)
+                if pipelining:
+                    inst['_release_slot'] = lambda key=key: events.put(('slot', key))
+                    inst['_acquire_slot'] = lambda inst=inst, key=key: acquire_slot(inst, key)
+                if executor is None:
+                    future = ASYNC_CORE.submit(process_with_delay(inst))
+                else:
+                    future = executor.submit(asyncio.run, process_with_delay(inst))
+                futures[key] = (future, inst)
+                future.add_done_callback(lambda _, key=key: events.put(('done', key)))
+            if not futures:
+                break
+            kind, key = events.get()
+            if kind == 'acquire':
+                relaunch_waiting.append(key)
+                continue
+            if kind == 'slot':
+                in_slot.discard(key)
+                continue
+            future, inst = futures.pop(key)
+            in_slot.discard(key)
+            inst.pop('_release_slot', None)
+            inst.pop('_acquire_slot', None)
+            if admission is not None:
+                admission.release(inst)
+            handle_result(future, inst)
+        if admission is not None:
+            print(f"[QUOTA] Peak vCPU usage: {admission.peak}/{admission.quota}", flush=True)
 
     except KeyboardInterrupt:
         print("\n[INTERRUPT] KeyboardInterrupt detected in main thread")
 
     finally:
+        closed.set()
         if executor:
             print("[SHUTDOWN] Waiting for active threads to complete cleanup...")
             executor.shutdown(wait=True, cancel_futures=False)
             print("[SHUTDOWN] All threads finished.")
+        elif futures:
+            print("[SHUTDOWN] Waiting for active instances to complete cleanup...")
+            wait_futures([future for future, _ in futures.values()])
+            print("[SHUTDOWN] All instances finished.")
 
 
 def validate_instance_definitions(instances_def: Dict[str, Any], csp_filter: Optional[str] = None) -> None:
@@ -4315,7 +8649,7 @@ def load_config(config_path: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
 
 def main():
     """Main entry point for cloud_exec_para.py with pre-flight checks."""
-    global DASHBOARD
+    global DASHBOARD, EMERGENCY_CLEANUP_DEADLINE, EMERGENCY_CLEANUP_REPORT
 
     # 1. SYNTAX CHECK FIRST (before anything else)
     if not verify_syntax():
@@ -4352,6 +8686,8 @@ Examples:
   ./cloud_exec_para.py --csp gcp --max-workers 3    # Run GCP with custom parallelism
   ./cloud_exec_para.py --csp oci --dry-run          # Show execution plan only
   ./cloud_exec_para.py --csp aws --test             # Run testloads only (quick verification)
+  ./cloud_exec_para.py --csp aws --resume 20250101_1200_aws   # Continue an interrupted run
+  ./cloud_exec_para.py --csp aws --bake             # Bake setup-only images, later runs launch from them
         """
     )
 
@@ -4365,6 +8701,18 @@ Examples:
                         help='Show execution plan without launching instances')
     parser.add_argument('--test', action='store_true',
                         help='Run testloads instead of workloads (quick verification)')
+    parser.add_argument('--remote-batch', action='store_true',
+                        help='Upload the whole workload list and run it on the instance (host only follows progress)')
+    parser.add_argument('--resume', metavar='RUN_ID',
+                        help='Resume an interrupted run (RUN_ID = log directory name, e.g. 20250101_1200_aws)')
+    parser.add_argument('--shards', type=int, default=None, metavar='N',
+                        help='Split the workloads of each instance across N instances of the same type')
+    parser.add_argument('--spot', action='store_true',
+                        help='Launch spot/preemptible instances; relaunch and continue on preemption')
+    parser.add_argument('--budget-usd', type=float, default=None, metavar='USD',
+                        help='Cost cap for the run: refuse launches / skip long-tail workloads beyond it')
+    parser.add_argument('--bake', action='store_true',
+                        help='Run only the setup list on one instance per arch/region and snapshot it as an image')
 
     args = parser.parse_args()
 
@@ -4384,6 +8732,18 @@ Examples:
 
     # Add testloads mode flag to config
     config['_testloads_mode'] = args.test
+    config['_remote_batch'] = args.remote_batch or config['common'].get('remote_batch', False)
+    config['_spot'] = args.spot or config['common'].get('spot', False)
+    config['_bake'] = args.bake
+
+    # Shared SSH sessions (ControlMaster) for all remote calls
+    SSH_POOL.configure(config['common'])
+    STATUS_CACHE.configure(config['common'])
+    READINESS.configure(config['common'])
+    LOG_WRITER.configure(config['common'])
+    IMAGE_CACHE.configure(config['common'])
+    RESOURCE_CACHE.configure(config['common'])
+    ASYNC_CORE.configure(config['common'])
 
     # Get CSP-specific config
     csp_config = instances_def.get(args.csp)
@@ -4408,6 +8768,14 @@ Examples:
     if csp_config.get('arm64_only', False):
         instances = [inst for inst in instances if inst.get('arch') != 'amd64']
 
+    # Shard workloads across identical instances ("shards": N per instance, or --shards N)
+    if not args.bake:
+        instances = expand_sharded_instances(
+            instances, config,
+            shard_count=args.shards or config['common'].get('shards', 1),
+            exclude_run=args.resume
+        )
+
     instances, regions = order_instances_by_region(instances)
 
     if not instances:
@@ -4425,6 +8793,11 @@ Examples:
     }
 
     provider = provider_map[args.csp](config, csp_config)
+    STATUS_CACHE.register_provider(provider)
+
+    # --bake: one setup-only instance per arch and image location
+    if args.bake:
+        instances = plan_bake_instances(instances, provider)
 
     # Determine max_workers
     if args.max_workers:
@@ -4441,7 +8814,7 @@ Examples:
             max_workers = adjusted_max_workers
         
         print(f"\n{'='*80}")
-        mode_str = "TESTLOADS MODE" if args.test else "PRODUCTION MODE"
+        mode_str = "BAKE MODE" if args.bake else "TESTLOADS MODE" if args.test else "PRODUCTION MODE"
         print(f"DRY RUN - {mode_str} - Execution Plan for {args.csp.upper()}")
         print(f"{'='*80}")
         print(f"Max Workers: {max_workers}")
@@ -4457,18 +8830,39 @@ Examples:
         for i, inst in enumerate(instances, 1):
             testloads = " [testloads]" if inst.get('testloads') or args.test else ""
             region = inst.get('region') or "unknown-region"
-            print(f"  {i}. {inst['name']} ({inst['type']}) @ {region}{testloads}")
+            shard = ""
+            if inst.get('_shard'):
+                shard = (f" [shard {inst['_shard']['index']}/{inst['_shard']['count']}: "
+                         f"{len(inst['_shard']['workloads'])} workloads, ~{inst['_shard']['estimate'] / 3600:.1f}h]")
+            print(f"  {i}. {inst['name']} ({inst['type']}) @ {region}{testloads}{shard}")
         print(f"{'='*80}\n")
         sys.exit(0)
 
     # Setup log directory (include CSP name to avoid collision when running multiple CSPs simultaneously)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-    log_dir = Path(config['common']['host_reports_dir']) / 'logs' / f"{timestamp}_{args.csp}"
-    log_dir.mkdir(parents=True, exist_ok=True)
+    if args.resume:
+        # Reuse the interrupted run's log directory: its journal/ holds the checkpoints
+        log_dir = Path(config['common']['host_reports_dir']) / 'logs' / args.resume
+        if not (log_dir / 'journal').is_dir():
+            print(f"[ERROR] No run journal found for '{args.resume}' ({log_dir / 'journal'})")
+            sys.exit(1)
+        if not args.resume.endswith(f"_{args.csp}"):
+            print(f"[WARN] Run ID '{args.resume}' does not look like a {args.csp} run")
+        config['_resume'] = True
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        log_dir = Path(config['common']['host_reports_dir']) / 'logs' / f"{timestamp}_{args.csp}"
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+    # Emergency cleanup writes instances it could not confirm as terminated next to the logs
+    EMERGENCY_CLEANUP_DEADLINE = config['common'].get('emergency_cleanup_deadline', EMERGENCY_CLEANUP_DEADLINE)
+    EMERGENCY_CLEANUP_REPORT = log_dir / 'unterminated_instances.json'
 
     # Initialize Dashboard
     DASHBOARD = Dashboard(enabled=True)
     DASHBOARD.set_log_dir(log_dir)
+    LOG_WRITER.start()
+    BUDGET.configure(args.budget_usd if args.budget_usd is not None else config['common'].get('budget_usd'),
+                     config, log_dir, exclude_run=args.resume)
     DASHBOARD.start()
 
     print(f"\n{'='*80}")
@@ -4483,10 +8877,19 @@ Examples:
         # Initialize shared resources
         print(f"[{args.csp.upper()}] Initializing shared resources...")
         provider.initialize_shared_resources()
+        provider.prefetch_resources(instances)
         print(f"[{args.csp.upper()}] Shared resources initialized\n")
 
-        # Check quota and adjust max_workers for all CSPs
-        max_workers = provider.check_quota_and_adjust(instances, max_workers)
+        # Check quota: launches are admitted dynamically against the vCPU quota
+        # (quota_admission=false: trim max_workers for the worst case up front)
+        if config['common'].get('quota_admission', True):
+            quota = provider.shared_resources.get('quota_vcpus_all_regions', 32)
+            provider.display_quota_info(instances, max_workers=max_workers,
+                                        concurrent_vcpus=min(quota, provider.calculate_total_vcpus(instances)))
+            print(f"[{args.csp.upper()} QUOTA] Dynamic admission: instances start as soon as "
+                  f"{quota} vCPUs allow (max_workers={max_workers})\n")
+        else:
+            max_workers = provider.check_quota_and_adjust(instances, max_workers)
 
         # Get SSH key path
         key_path = config['common']['ssh_key_path']
@@ -4494,6 +8897,9 @@ Examples:
         # Execute instances in parallel
         execute_instances_parallel(provider, instances, config, key_path, log_dir, max_workers)
 
+        # Combine shard results into one tarball per machine
+        merge_shard_results(config, args.csp, instances)
+
     except Exception as e:
         print(f"\n[ERROR] Execution failed: {e}")
         import traceback
@@ -4504,11 +8910,30 @@ Examples:
         # Stop dashboard
         if DASHBOARD:
             DASHBOARD.stop()
+        SSH_POOL.close_all()
 
     print(f"\n{'='*80}")
     print(f"EXECUTION COMPLETED")
     print(f"Logs saved to: {log_dir}")
+    if SSH_POOL.enabled:
+        print(f"SSH sessions: {SSH_POOL.summary()}")
+    if STATUS_CACHE.enabled:
+        print(f"Status queries: {STATUS_CACHE.summary()}")
+    if BUDGET.enabled:
+        print(f"Budget: {BUDGET.summary()}")
+    if RESOURCE_CACHE.enabled:
+        print(f"Resources: {RESOURCE_CACHE.summary()}")
+    if ASYNC_CORE.enabled:
+        print(f"Subprocesses: {ASYNC_CORE.summary()}")
+    setup_summary = setup_timing_summary(log_dir)
+    if setup_summary:
+        print(f"Setup: {setup_summary}")
+    if args.bake:
+        print(f"Baked images: {len(IMAGE_CACHE.baked)}/{len(instances)} recorded in {IMAGE_CACHE.path}")
+        for key in IMAGE_CACHE.baked:
+            print(f"  {key}: {IMAGE_CACHE.entries[key]['image_id']}")
     print(f"{'='*80}\n")
+    LOG_WRITER.stop()
 
 
 if __name__ == "__main__":
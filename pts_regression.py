@@ -77,6 +77,11 @@
 # - `--run` (省略可能)
 #     省略された場合は上記の dry_run モードが優先される。
 #     指定された場合は、プリントするだけでなくターミナルで実際にコマンド群を実行する。
+# - `--prefetch [N]` (省略可能)
+#     1行目の全消去コマンドの直後に `pts_runner/prefetch_downloads.py --background` を挿入し、
+#     実行予定の全テストの downloads.xml のファイルを、最初のテストの実行中に
+#     バックグラウンドで download-cache へ先読みする。
+#     N を指定した場合は実行中のテストを追跡し、次の N テスト分だけを先読みする (--lookahead N)。
 #
 # 7. 実行の順序
 # 実行（オプション生成も含む）は以下の順序で行う。
@@ -271,6 +276,9 @@ def main():
     # 実行モード
     parser.add_argument("--dry_run", action="store_true", help="Print commands without executing (Default)")
     parser.add_argument("--run", action="store_true", help="Execute generated commands (overrides dry_run)")
+    parser.add_argument("--prefetch", nargs="?", type=int, const=0, default=None, metavar="N",
+                        help="Prefetch downloads in the background while tests run "
+                             "(all selected tests, or only the next N with N > 0)")
     parser.add_argument("--regression", action="store_true", help="Output command to run pts_regression.py itself")
     parser.add_argument("-v", "--verbose", action="store_true", help="Outputs explicitly expanded arguments in --regression mode")
     
@@ -479,6 +487,15 @@ def main():
             
     # 必ず1行目に全消去＋ログ新規作成コマンドを挿入
     all_commands.append(first_clean_cmd)
+
+    # --prefetch: 実行予定の全テストのダウンロードをバックグラウンドで先読み
+    if args.prefetch is not None:
+        prefetch_targets = " ".join(dict.fromkeys(t["testname"] for t in ordered_plan))
+        lookahead_opt = f"--lookahead {args.prefetch} " if args.prefetch > 0 else ""
+        all_commands.append(
+            f"cd {base_dir_str} && ./pts_runner/prefetch_downloads.py --background {lookahead_opt}{prefetch_targets} "
+            f"> /tmp/pts_prefetch.log 2>&1"
+        )
     
     for idx, cat in enumerate(categories_in_plan):
         all_commands.append(f"\n# {'='*60}")
@@ -50,6 +50,10 @@ class ComplianceChecker:
         self.passed = []
         self.syntax_ok = True
         self.hardcoded_thread_lists = []
+        # Runners importing the shared downloader carry no aria2c code of their own
+        self.uses_shared_downloader = bool(
+            re.search(r'from\s+runner_common\s+import\s+[^\n]*\bPreSeedDownloader\b', self.content)
+        )
 
        
 
@@ -644,11 +648,7 @@ class ComplianceChecker:
 
             'run_benchmark',
 
-            'install_benchmark',
-
-            'get_cpu_frequencies',
-
-            'record_cpu_frequency'
+            'install_benchmark'
 
         ]
 
@@ -1680,61 +1680,61 @@ class ComplianceChecker:
 
     def check_cpu_frequency_methods(self):
         """
-        Check if cross-platform CPU frequency methods are implemented.
+        Check that CPU frequency is sampled with runner_common.CpuSampler.
 
-        Required methods:
-        - get_cpu_frequencies(): Multi-method approach for x86_64, ARM64, and cloud VMs
-        - record_cpu_frequency(): Wrapper to record frequencies to file
+        Required pattern (in run_benchmark):
+            cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+            cpu_sampler.start()
+            ... benchmark ...
+            cpu_sampler.stop()
 
         Old pattern to avoid:
+        - get_cpu_frequencies()/record_cpu_frequency() start/end snapshots
+          (miss turbo decay, throttling and idle gaps during the run)
         - grep "cpu MHz" /proc/cpuinfo (only works on x86_64)
-
-        New pattern required:
-        - Uses get_cpu_frequencies() which tries:
-          1. /proc/cpuinfo (x86_64)
-          2. /sys/devices/system/cpu/cpufreq (ARM64)
-          3. lscpu (fallback)
         """
-        # Check for get_cpu_frequencies method
-        has_get_cpu_freq = re.search(r'def\s+get_cpu_frequencies\s*\(', self.content)
-
-        # Check for record_cpu_frequency method
-        has_record_cpu_freq = re.search(r'def\s+record_cpu_frequency\s*\(', self.content)
-
-        # Check for old pattern usage in run_benchmark (not in get_cpu_frequencies method)
-        # Old pattern: cmd_template = 'grep "cpu MHz" /proc/cpuinfo | awk...'
-        # This pattern is ONLY acceptable inside get_cpu_frequencies() as a fallback
+        imports_sampler = re.search(r'from\s+runner_common\s+import\s+[^\n]*\bCpuSampler\b', self.content)
+        starts = re.search(r'CpuSampler\(\s*freq_start_file\s*,\s*freq_end_file\s*(,\s*cpu_list\s*=\s*cpu_list\s*)?\)',
+                           self.content)
+        stops = re.search(r'\.stop\(\)', self.content)
+        has_old_methods = re.search(r'def\s+(get_cpu_frequencies|record_cpu_frequency)\s*\(', self.content)
         has_old_pattern = re.search(r'cmd_template\s*=\s*["\']grep\s+["\']?cpu MHz', self.content)
 
-        # Check if record_cpu_frequency is used in run_benchmark
-        uses_new_pattern = re.search(r'self\.record_cpu_frequency\(', self.content)
-
         issues = []
 
-        if not has_get_cpu_freq:
-            issues.append("Missing get_cpu_frequencies() method")
+        if not imports_sampler:
+            issues.append("CpuSampler not imported from runner_common")
 
-        if not has_record_cpu_freq:
-            issues.append("Missing record_cpu_frequency() method")
+        if not (starts and stops):
+            issues.append("CpuSampler(freq_start_file, freq_end_file) not started/stopped in run_benchmark")
 
         if has_old_pattern:
             issues.append("Uses old 'grep cpu MHz' pattern (only works on x86_64)")
 
-        if has_get_cpu_freq and has_record_cpu_freq and not has_old_pattern:
-            if uses_new_pattern:
-                self.passed.append("✅ Cross-platform CPU frequency methods implemented and used")
-            else:
+        if not issues:
+            self.passed.append("✅ CPU frequency/utilization sampled with runner_common.CpuSampler")
+            if not re.search(r'repeat_on_steal\(\s*self\.run_benchmark\b', self.content):
                 self.warnings.append(
-                    "⚠️  WARNING: CPU frequency methods exist but may not be used in run_benchmark\n"
-                    "   Should use: self.record_cpu_frequency(freq_start_file)"
+                    "⚠️  WARNING: run_benchmark is not called through repeat_on_steal()\n"
+                    "   PTS_STEAL_RETRIES cannot repeat runs flagged for steal time"
                 )
-        elif issues:
+            if 'taskset -c' in self.content and not re.search(r'CpuSampler\([^)]*cpu_list\s*=', self.content):
+                self.warnings.append(
+                    "⚠️  WARNING: CpuSampler is not given the taskset cpu_list\n"
+                    "   steal_exceeded and <N>-thread_cpu_samples.json cover every CPU, not the run's CPUs"
+                )
+            if has_old_methods:
+                self.warnings.append(
+                    "⚠️  WARNING: get_cpu_frequencies()/record_cpu_frequency() are no longer needed\n"
+                    "   CpuSampler writes <N>-thread_freq_start.txt / _freq_end.txt itself"
+                )
+        else:
             self.errors.append(
-                "❌ CRITICAL: Cross-platform CPU frequency handling incomplete\n"
+                "❌ CRITICAL: CPU frequency sampling incomplete\n"
                 f"   Issues: {', '.join(issues)}\n"
-                "   Impact: CPU frequency recording will fail on ARM64 and some cloud VMs\n"
-                "   Fix: Add get_cpu_frequencies() and record_cpu_frequency() methods\n"
-                "   Reference: CODE_TEMPLATE.md 'クロスプラットフォームCPU周波数取得' section"
+                "   Impact: no <N>-thread_freq_start/end.txt or <N>-thread_cpu_samples.csv for this run\n"
+                "   Fix: from runner_common import CpuSampler; cpu_sampler.start() / cpu_sampler.stop()\n"
+                "   Reference: CODE_TEMPLATE.md 'CPU周波数・使用率のサンプリング' section"
             )
 
     def check_downloads_xml_prefetch(self):
@@ -1745,7 +1745,14 @@ class ComplianceChecker:
           - logs when downloads.xml is missing
           - runs 'phoronix-test-suite info <benchmark>' to fetch test profile
           - rechecks downloads.xml presence
+
+        Runners using runner_common.PreSeedDownloader inherit this (and the aria2
+        checks below) from runner_common.read_downloads_xml / DownloadManager.
         """
+        if self.uses_shared_downloader:
+            self.passed.append("✅ Downloads pre-seeded via shared runner_common.PreSeedDownloader")
+            return
+
         has_downloads_xml_check = re.search(r'downloads\.xml', self.content)
         has_pts_info_call = re.search(r'phoronix-test-suite["\']?,\s*[\'"]info', self.content)
         has_missing_log = re.search(r'downloads\.xml not found', self.content)
@@ -1830,9 +1837,9 @@ class ComplianceChecker:
           - compares actual file size against expected (stat().st_size or os.path.getsize)
           - passes --continue=true to aria2c for resume support
         """
-        # Only check runners that use PreSeedDownloader / aria2c
+        # Only check runners that use their own PreSeedDownloader / aria2c
         has_aria2 = bool(re.search(r'aria2c', self.content))
-        if not has_aria2:
+        if not has_aria2 or self.uses_shared_downloader:
             return
 
         has_size_param = bool(
@@ -1879,7 +1886,7 @@ class ComplianceChecker:
           - dynamic num_conn / connection count selection (not hardcoded -x 16 only)
         """
         has_aria2 = bool(re.search(r'aria2c', self.content))
-        if not has_aria2:
+        if not has_aria2 or self.uses_shared_downloader:
             return
 
         # 10 GB threshold: accept decimal (10_737_418_240) or expression form
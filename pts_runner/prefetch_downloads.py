@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Warm the PTS download-cache for a whole workload list.
+
+Collects the downloads.xml packages of every benchmark in the list and fetches
+them through runner_common.DownloadManager, several files at a time, into the
+content-addressed store behind ~/.phoronix-test-suite/download-cache.  Files
+are verified against the SHA256/MD5 in downloads.xml, so a later
+phoronix-test-suite batch-install (or the runner's own PreSeedDownloader)
+finds them ready.  Runners and this script lock per file: a runner that needs
+a file still being prefetched waits for it instead of downloading it again.
+
+Benchmarks are taken, in order, from:
+  - the command line (pts/x265-1.5.0, x265-1.5.0 or pts_runner_x265-1.5.0.py)
+  - --workloads FILE: any text listing runner commands, e.g. the output of
+    ./pts_regression.py (use - for stdin)
+  - otherwise every enabled benchmark in test_suite.json (--testcategory narrows it)
+
+With --lookahead N the list is treated as the workload order: the script
+follows which pts_runner_<name>.py is running (from /proc) and keeps only the
+next N benchmarks prefetched, so the network works while the CPUs run the
+current benchmark.  --max-rate caps the bandwidth it uses.  Each runner logs
+the download time this saved ("[PREFETCH] ... hidden") in its install step.
+
+Usage:
+    ./pts_runner/prefetch_downloads.py
+    ./pts_runner/prefetch_downloads.py pts/x265-1.5.0 ffmpeg-7.0.1 --workers 6
+    ./pts_runner/prefetch_downloads.py --testcategory Multimedia --threshold-mb 96
+    # detach and keep downloading while the first benchmark runs
+    ./pts_runner/prefetch_downloads.py --background > /tmp/pts_prefetch.log 2>&1
+    # follow a workload list, two benchmarks ahead, at most 20 MB/s
+    ./pts_runner/prefetch_downloads.py --background --lookahead 2 --max-rate 20M \
+        coremark-1.0.1 x265-1.5.0 llama-cpp-2.4.1 > /tmp/pts_prefetch.log 2>&1
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from runner_common import DEFAULT_MIN_FREE_GB, DEFAULT_PREFETCH_WORKERS, DownloadManager, parse_rate, read_downloads_xml
+
+
+RUNNER_NAME_RE = re.compile(r"pts_runner_([A-Za-z0-9._+-]+?)\.py")
+LOOKAHEAD_POLL_SECONDS = 10
+
+
+def normalize_benchmark(name):
+    """pts/<name>, <name> or pts_runner_<name>.py -> pts/<name>."""
+    match = RUNNER_NAME_RE.search(name)
+    if match:
+        name = match.group(1)
+    return name if "/" in name else f"pts/{name}"
+
+
+def benchmarks_from_suite(suite_path, categories):
+    with open(suite_path, encoding="utf-8") as f:
+        suite = json.load(f)
+    benchmarks = []
+    for cat_name, cat_data in suite.get("test_category", {}).items():
+        if categories and cat_name not in categories:
+            continue
+        if not cat_data.get("enabled", True):
+            continue
+        for item_key, attrs in cat_data.get("items", {}).items():
+            if item_key.startswith("pts/") and attrs.get("enabled", True):
+                benchmarks.append(item_key)
+    return benchmarks
+
+
+def benchmarks_from_workloads(path):
+    text = sys.stdin.read() if path == "-" else Path(path).read_text()
+    return [f"pts/{name}" for name in RUNNER_NAME_RE.findall(text)]
+
+
+def running_benchmarks():
+    """Benchmarks whose pts_runner_<name>.py is running now.
+
+    Only the program itself (argv[0], or argv[1] after the interpreter) counts:
+    a shell whose -c script lists several runners is not running any of them yet.
+    """
+    running = set()
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit() or int(pid) == os.getpid():
+            continue
+        try:
+            argv = Path(f"/proc/{pid}/cmdline").read_bytes().decode(errors="ignore").split("\0")
+        except OSError:
+            continue
+        for arg in argv[:2]:
+            match = RUNNER_NAME_RE.fullmatch(os.path.basename(arg))
+            if match:
+                running.add(f"pts/{match.group(1)}")
+                break
+    return running
+
+
+def collect_packages(benchmark, skip_optional):
+    packages = read_downloads_xml(benchmark)
+    if skip_optional:
+        packages = [p for p in packages if not p["optional"]]
+    return packages
+
+
+def lookahead(manager, benchmarks, args):
+    """Keep the args.lookahead benchmarks after the running one prefetched.
+
+    Stops once the last benchmark's downloads are done, or when no runner of
+    the list has been seen for args.idle_exit seconds (the run was aborted).
+    """
+    cursor = 0  # index of the benchmark running now (or about to start)
+    done = set()
+    last_seen = time.time()
+    ahead_bytes, ahead_seconds = 0, 0.0
+    while True:
+        running = running_benchmarks()
+        if running & set(benchmarks):
+            last_seen = time.time()
+            cursor = max([cursor] + [i for i, b in enumerate(benchmarks) if b in running and i >= cursor])
+
+        window = benchmarks[cursor + 1:cursor + 1 + args.lookahead]
+        pending = [b for b in window if b not in done]
+        if pending:
+            benchmark = pending[0]
+            packages = collect_packages(benchmark, args.skip_optional)
+            print(f"[LOOKAHEAD] {benchmark} ({benchmarks.index(benchmark) - cursor} after "
+                  f"{benchmarks[cursor]}): {len(packages)} file(s)", flush=True)
+            _, size_before, seconds_before = manager.fetched_in_background(packages)
+            manager.fetch(packages, threshold_mb=args.threshold_mb, max_workers=args.workers)
+            _, size, seconds = manager.fetched_in_background(packages)
+            ahead_bytes += size - size_before
+            ahead_seconds += seconds - seconds_before
+            done.add(benchmark)
+            continue
+
+        if cursor + 1 + args.lookahead >= len(benchmarks):
+            print("[LOOKAHEAD] Downloads of every remaining benchmark are in place")
+            break
+        if time.time() - last_seen > args.idle_exit:
+            print(f"[LOOKAHEAD] No benchmark of the list ran for {args.idle_exit}s, stopping")
+            break
+        time.sleep(LOOKAHEAD_POLL_SECONDS)
+
+    print(f"[LOOKAHEAD] Fetched {ahead_bytes / 1024 ** 2:.1f} MB ahead of time "
+          f"({ahead_seconds:.0f}s of download moved off the benchmarks' install steps)")
+
+
+def detach(argv):
+    """Re-run this script without --background in its own session."""
+    cmd = [sys.executable, str(Path(__file__).resolve())] + [a for a in argv if a != "--background"]
+    cmd.append("--low-priority")
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, start_new_session=True)
+    print(f"[INFO] Prefetch running in background (pid {proc.pid})", flush=True)
+    return 0
+
+
+def main():
+    script_dir = Path(__file__).parent.resolve()
+    parser = argparse.ArgumentParser(description="Prefetch PTS downloads for a workload list")
+    parser.add_argument("benchmarks", nargs="*", help="pts/<name>, <name> or pts_runner_<name>.py")
+    parser.add_argument("--workloads", metavar="FILE", help="Text listing pts_runner_*.py commands (- for stdin)")
+    parser.add_argument("--suite", default=str(script_dir.parent / "test_suite.json"),
+                        help="test_suite.json used when no benchmarks are given")
+    parser.add_argument("--testcategory", nargs="*", default=[], help="Only these test_suite.json categories")
+    parser.add_argument("--workers", type=int, default=DEFAULT_PREFETCH_WORKERS,
+                        help=f"Files downloaded at once (default: {DEFAULT_PREFETCH_WORKERS})")
+    parser.add_argument("--threshold-mb", type=float, default=0,
+                        help="Only prefetch files of at least this size (default: 0, everything)")
+    parser.add_argument("--skip-optional", action="store_true", help="Skip <Optional>TRUE</Optional> packages")
+    parser.add_argument("--min-free-gb", type=float, default=DEFAULT_MIN_FREE_GB,
+                        help=f"Skip files that would leave less free disk (default: {DEFAULT_MIN_FREE_GB:.0f})")
+    parser.add_argument("--lookahead", type=int, default=0, metavar="N",
+                        help="Follow the running benchmark and prefetch only the next N in the list")
+    parser.add_argument("--max-rate", default="0",
+                        help="Bandwidth cap for all downloads together, e.g. 20M (default: unlimited)")
+    parser.add_argument("--idle-exit", type=int, default=1800,
+                        help="--lookahead: stop after this many seconds without a listed benchmark running")
+    parser.add_argument("--background", action="store_true",
+                        help="Detach and run at low CPU/IO priority (returns immediately)")
+    parser.add_argument("--low-priority", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    try:
+        max_rate = parse_rate(args.max_rate)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.background:
+        return detach(sys.argv[1:])
+
+    if args.benchmarks:
+        benchmarks = [normalize_benchmark(b) for b in args.benchmarks]
+    elif args.workloads:
+        benchmarks = benchmarks_from_workloads(args.workloads)
+    else:
+        benchmarks = benchmarks_from_suite(args.suite, args.testcategory)
+    benchmarks = list(dict.fromkeys(benchmarks))
+    if not benchmarks:
+        print("[INFO] No benchmarks to prefetch")
+        return 0
+
+    # Detached next to a running benchmark: stay out of its way
+    if args.low_priority:
+        os.nice(10)
+
+    manager = DownloadManager(min_free_gb=args.min_free_gb, low_priority=args.low_priority, quiet=True,
+                              max_rate=max_rate, origin="prefetch")
+    print(f"[INFO] Prefetching downloads for {len(benchmarks)} benchmark(s) into {manager.cache_dir}"
+          + (f", at most {max_rate / 1024 ** 2:.1f} MB/s" if max_rate else ""), flush=True)
+    start = time.time()
+
+    if args.lookahead > 0:
+        lookahead(manager, benchmarks, args)
+        print(f"[INFO] Prefetch finished in {time.time() - start:.0f}s: {manager.summary() or 'nothing to do'}")
+        return 0
+
+    # Profiles are read one by one (phoronix-test-suite info is not safe to run
+    # concurrently); the downloads of all benchmarks then share one pool, in list order.
+    packages = []
+    for benchmark in benchmarks:
+        found = collect_packages(benchmark, args.skip_optional)
+        print(f"  [INFO] {benchmark}: {len(found)} file(s)")
+        packages.extend(found)
+
+    results = manager.fetch(packages, threshold_mb=args.threshold_mb, max_workers=args.workers)
+    print(f"[INFO] Prefetch finished in {time.time() - start:.0f}s: {manager.summary() or 'nothing to do'}")
+    return 1 if "failed" in results.values() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -41,170 +41,7 @@ import shutil
 import subprocess
 import sys
 from pathlib import Path
-from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts
-
-
-class PreSeedDownloader:
-    """
-    Utility to pre-download large test files into Phoronix Test Suite cache
-    using faster downloaders (aria2c) if available.
-    """
-    def __init__(self, cache_dir=None):
-        if cache_dir:
-            self.cache_dir = Path(cache_dir)
-        else:
-            self.cache_dir = Path.home() / ".phoronix-test-suite" / "download-cache"
-
-        self.aria2_available = shutil.which("aria2c") is not None
-
-    def is_aria2_available(self):
-        return self.aria2_available
-
-    def download_from_xml(self, benchmark_name, threshold_mb=96):
-        """
-        Parse downloads.xml for the benchmark and download large files.
-        """
-        if not self.aria2_available:
-            print("  [INFO] aria2c not found, skipping pre-seed (will rely on PTS default)")
-            return False
-
-        profile_path = Path.home() / ".phoronix-test-suite" / "test-profiles" / benchmark_name / "downloads.xml"
-
-        if not profile_path.exists():
-            print(f"  [WARN] downloads.xml not found at {profile_path}")
-            try:
-                subprocess.run(
-                    ['phoronix-test-suite', 'info', benchmark_name],
-                    check=False,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-            except Exception as e:
-                print(f"  [WARN] Failed to run phoronix-test-suite info: {e}")
-                return False
-
-            if not profile_path.exists():
-                print(f"  [WARN] downloads.xml still missing after info: {profile_path}")
-                return False
-
-        try:
-            import xml.etree.ElementTree as ET
-            tree = ET.parse(profile_path)
-            root = tree.getroot()
-
-            downloads_node = root.find('Downloads')
-            if downloads_node is None:
-                return False
-
-            for package in downloads_node.findall('Package'):
-                url_node = package.find('URL')
-                filename_node = package.find('FileName')
-                filesize_node = package.find('FileSize')
-
-                if url_node is None or filename_node is None:
-                    continue
-
-                url = url_node.text.strip()
-                filename = filename_node.text.strip()
-
-                size_bytes = -1
-                if filesize_node is not None and filesize_node.text:
-                    try:
-                        size_bytes = int(filesize_node.text.strip())
-                    except ValueError:
-                        pass
-
-                if size_bytes <= 0:
-                    size_bytes = self.get_remote_file_size(url)
-
-                if size_bytes > 0:
-                    size_mb = size_bytes / (1024 * 1024)
-                    if size_mb < threshold_mb:
-                        continue
-                    print(f"  [INFO] {filename} is large ({size_mb:.1f} MB), accelerating with aria2c...")
-                    self.ensure_file(url, filename, size_bytes=size_bytes)
-
-        except Exception as e:
-            print(f"  [ERROR] Failed to parse downloads.xml: {e}")
-            return False
-
-        return True
-
-    def get_remote_file_size(self, url):
-        try:
-            cmd = ['curl', '-s', '-I', '-L', url]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            if result.returncode != 0:
-                return -1
-
-            for line in result.stdout.splitlines():
-                if line.lower().startswith('content-length:'):
-                    try:
-                        size_str = line.split(':')[1].strip()
-                        return int(size_str)
-                    except ValueError:
-                        pass
-        except Exception:
-            pass
-
-        return -1
-
-    def ensure_file(self, url, filename, size_bytes=-1):
-        """
-        Directly download file using aria2c (assumes size check passed).
-        size_bytes: expected file size in bytes (-1 = unknown); used to detect
-                    partial/corrupt cache entries.
-        """
-        target_path = self.cache_dir / filename
-
-        # Cache hit: verify size when known to catch partial downloads
-        if target_path.exists():
-            if size_bytes > 0 and target_path.stat().st_size != size_bytes:
-                print(f"  [CACHE] Size mismatch for {filename} "
-                      f"(expected {size_bytes}, got {target_path.stat().st_size}), re-downloading...")
-            else:
-                print(f"  [CACHE] File found: {filename}")
-                return True
-
-        # Use fewer connections for very large files (>=10 GB) to avoid
-        # presigned-URL / thundering-herd stalls (e.g. HuggingFace XetHub CAS).
-        _LARGE_FILE_THRESHOLD_BYTES = 10 * 1024 * 1024 * 1024
-        num_conn = "4" if size_bytes >= _LARGE_FILE_THRESHOLD_BYTES else "16"
-        print(f"  [ARIA2] Downloading {filename} with {num_conn} connections...")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-
-        # --connect-timeout : abort if connection not established within 30s
-        # --timeout         : abort if no data received for 120s (stall guard)
-        # --max-tries       : retry twice on transient errors
-        # --continue=true   : resume partial downloads on retry
-        # subprocess timeout: hard ceiling of 90 min per file (prevents infinite hang)
-        cmd = [
-            "aria2c", f"-x{num_conn}", f"-s{num_conn}",
-            "--connect-timeout=30",
-            "--timeout=120",
-            "--max-tries=2",
-            "--retry-wait=5",
-            "--continue=true",
-            "-d", str(self.cache_dir),
-            "-o", filename,
-            url
-        ]
-
-        try:
-            subprocess.run(cmd, check=True, timeout=5400)  # 90 min hard ceiling
-            print(f"  [aria2c] Download completed: {filename}")
-            return True
-        except subprocess.TimeoutExpired:
-            print(f"  [WARN] aria2c timed out after 90 min for {filename}, falling back to PTS default")
-            if target_path.exists():
-                target_path.unlink()
-            return False
-        except subprocess.CalledProcessError:
-            print("  [WARN] aria2c download failed, falling back to PTS default")
-            if target_path.exists():
-                target_path.unlink()
-            return False
+from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts, place_cpus, describe_cpu_placement, PreSeedDownloader, CpuSampler, repeat_on_steal
 
 
 class AomAv1Runner:
@@ -344,96 +181,6 @@ class AomAv1Runner:
         except Exception:
             return False
 
-    def get_cpu_frequencies(self):
-        """
-        Get current CPU frequencies for all CPUs.
-        Tries multiple methods for cross-platform compatibility (x86_64, ARM64, cloud VMs).
-
-        Returns:
-            list: List of frequencies in kHz, one per CPU. Empty list if unavailable.
-        """
-        frequencies = []
-
-        # Method 1: /proc/cpuinfo (works on x86_64)
-        try:
-            result = subprocess.run(
-                ['bash', '-c', 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split('\n'):
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        mhz = float(parts[1].strip())
-                        frequencies.append(int(mhz * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-
-        # Method 2: /sys/devices/system/cpu/cpufreq (works on ARM64 and some x86)
-        try:
-            freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/scaling_cur_freq'))
-            if not freq_files:
-                freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/cpuinfo_cur_freq'))
-
-            for freq_file in freq_files:
-                try:
-                    with open(freq_file, 'r') as f:
-                        freq_khz = int(f.read().strip())
-                        frequencies.append(freq_khz)
-                except Exception:
-                    frequencies.append(0)
-
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        # Method 3: lscpu (fallback)
-        try:
-            result = subprocess.run(['lscpu'], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'CPU MHz' in line or 'CPU max MHz' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(',', '.'))
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-
-        return frequencies
-
-    def record_cpu_frequency(self, output_file):
-        """
-        Record current CPU frequencies to a file.
-
-        Args:
-            output_file: Path to output file
-
-        Returns:
-            bool: True if successful, False otherwise
-        """
-        frequencies = self.get_cpu_frequencies()
-        if frequencies:
-            try:
-                with open(output_file, 'w') as f:
-                    for freq in frequencies:
-                        f.write(f"{freq}\n")
-                return True
-            except Exception as e:
-                print(f"  [WARN] Failed to write frequency file: {e}")
-                return False
-        else:
-            try:
-                with open(output_file, 'w') as f:
-                    pass
-                return False
-            except Exception:
-                return False
-
     def get_perf_events(self):
         """
         Determine available perf events by testing actual command execution.
@@ -688,28 +435,16 @@ class AomAv1Runner:
 
     def get_cpu_affinity_list(self, n):
         """
-        Generate CPU affinity list for HyperThreading optimization.
+        Generate CPU affinity list for an n-thread run.
 
-        Prioritizes physical cores (even IDs) first, then logical cores (odd IDs).
-        Pattern: {0,2,4,...,1,3,5,...}
-
-        Args:
-            n: Number of threads
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
 
         Returns:
-            Comma-separated CPU list string (e.g., "0,2,4,1,3")
+            Comma-separated CPU list string (e.g., "0,1,2,3")
         """
-        half = self.vcpu_count // 2
-        cpu_list = []
-
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical_count = n - half
-            cpu_list.extend([str(i * 2 + 1) for i in range(logical_count)])
-
-        return ','.join(cpu_list)
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def install_benchmark(self):
         """
@@ -1090,8 +825,9 @@ class AomAv1Runner:
         print(f"    Perf summary: {perf_summary_file}")
         print(f"{'<'*80}\n")
 
-        print("[INFO] Recording CPU frequency before benchmark...")
-        if self.record_cpu_frequency(freq_start_file):
+        print("[INFO] Starting CPU frequency/utilization sampler...")
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+        if cpu_sampler.start():
             print("  [OK] Start frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -1124,8 +860,8 @@ class AomAv1Runner:
 
         pts_test_failed, pts_failure_reason = detect_pts_failure_from_log(log_file)
 
-        print("\n[INFO] Recording CPU frequency after benchmark...")
-        if self.record_cpu_frequency(freq_end_file):
+        print("\n[INFO] Stopping CPU frequency/utilization sampler...")
+        if cpu_sampler.stop():
             print("  [OK] End frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -1148,6 +884,9 @@ class AomAv1Runner:
                     cpu_list
                 )
 
+                perf_summary['cpu_placement'] = describe_cpu_placement(cpu_list)
+                perf_summary['cpu_samples'] = cpu_sampler.summary(cpu_list)
+
                 with open(perf_summary_file, 'w') as f:
                     json.dump(perf_summary, f, indent=2)
                 print(f"     Perf summary: {perf_summary_file}")
@@ -1348,7 +1087,7 @@ class AomAv1Runner:
         # Run for each thread count
         failed = []
         for num_threads in self.thread_list:
-            if not self.run_benchmark(num_threads):
+            if not repeat_on_steal(self.run_benchmark, num_threads):
                 failed.append(num_threads)
 
         # Export results to CSV and JSON
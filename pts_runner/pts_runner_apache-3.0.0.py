@@ -40,133 +40,7 @@ import shutil
 import subprocess
 import sys
 from pathlib import Path
-from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, pick_compiler
-
-
-class PreSeedDownloader:
-    """
-    Utility to pre-download large test files into Phoronix Test Suite cache
-    using faster downloaders (aria2c) if available.
-    """
-    def __init__(self, cache_dir=None):
-        if cache_dir:
-            self.cache_dir = Path(cache_dir)
-        else:
-            self.cache_dir = Path.home() / ".phoronix-test-suite" / "download-cache"
-        self.aria2_available = shutil.which("aria2c") is not None
-
-    def is_aria2_available(self):
-        return self.aria2_available
-
-    def download_from_xml(self, benchmark_name, threshold_mb=96):
-        """Parse downloads.xml for the benchmark and download large files."""
-        if not self.aria2_available:
-            return False
-
-        profile_path = Path.home() / ".phoronix-test-suite" / "test-profiles" / benchmark_name / "downloads.xml"
-        if not profile_path.exists():
-            print(f"  [WARN] downloads.xml not found at {profile_path}")
-            print(f"  [INFO] Attempting to fetch test profile via phoronix-test-suite info {benchmark_name}...")
-            try:
-                subprocess.run(
-                    ['phoronix-test-suite', 'info', benchmark_name],
-                    check=False,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-            except Exception as e:
-                print(f"  [WARN] Failed to run phoronix-test-suite info: {e}")
-                return False
-            if not profile_path.exists():
-                print(f"  [WARN] downloads.xml still missing after info: {profile_path}")
-                return False
-
-        try:
-            import xml.etree.ElementTree as ET
-            tree = ET.parse(profile_path)
-            root = tree.getroot()
-            downloads_node = root.find('Downloads')
-            if downloads_node is None:
-                return False
-            for package in downloads_node.findall('Package'):
-                url_node = package.find('URL')
-                filename_node = package.find('FileName')
-                filesize_node = package.find('FileSize')
-                if url_node is None or filename_node is None:
-                    continue
-                urls = [u.strip() for u in url_node.text.split(',')]
-                url = urls[0] if urls else None
-                filename = filename_node.text.strip()
-                if not url:
-                    continue
-                size_bytes = -1
-                if filesize_node is not None and filesize_node.text:
-                    try:
-                        size_bytes = int(filesize_node.text.strip())
-                    except ValueError:
-                        pass
-                if size_bytes <= 0:
-                    size_bytes = self.get_remote_file_size(url)
-                if size_bytes > 0:
-                    size_mb = size_bytes / (1024 * 1024)
-                    if size_mb >= threshold_mb:
-                        print(f"  [INFO] {filename} is large ({size_mb:.1f} MB), accelerating with aria2c...")
-                        self.ensure_file(urls, filename, size_bytes=size_bytes)
-        except Exception as e:
-            print(f"  [ERROR] Failed to parse downloads.xml: {e}")
-            return False
-        return True
-
-    def get_remote_file_size(self, url):
-        try:
-            cmd = ['curl', '-s', '-I', '-L', url]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                return -1
-            for line in result.stdout.splitlines():
-                if line.lower().startswith('content-length:'):
-                    try:
-                        return int(line.split(':')[1].strip())
-                    except ValueError:
-                        pass
-        except Exception:
-            pass
-        return -1
-
-    def ensure_file(self, urls, filename, size_bytes=-1):
-        _LARGE_FILE_THRESHOLD_BYTES = 10 * 1024 * 1024 * 1024
-        target_path = self.cache_dir / filename
-        if target_path.exists():
-            if size_bytes > 0:
-                actual = target_path.stat().st_size
-                if actual == size_bytes:
-                    print(f"  [CACHE] Verified: {filename}")
-                    return True
-                else:
-                    print(f"  [WARN] Incomplete cache: {filename} ({actual}/{size_bytes} bytes). Resuming...")
-            else:
-                print(f"  [CACHE] File found: {filename}")
-                return True
-        if isinstance(urls, str):
-            urls = [urls]
-        num_conn = 4 if size_bytes > 0 and size_bytes >= _LARGE_FILE_THRESHOLD_BYTES else 16
-        print(f"  [ARIA2] Downloading {filename} with {num_conn} connections...")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        cmd = [
-            "aria2c", "-x", str(num_conn), "-s", str(num_conn),
-            "--continue=true", "--connect-timeout=30", "--timeout=120",
-            "--max-tries=2", "--retry-wait=5",
-            "-d", str(self.cache_dir), "-o", filename,
-        ] + urls
-        try:
-            subprocess.run(cmd, check=True, timeout=5400)
-            print(f"  [aria2c] Download completed: {filename}")
-            return True
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-            print(f"  [WARN] aria2c download failed: {e}")
-            if target_path.exists():
-                target_path.unlink()
-            return False
+from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, pick_compiler, place_cpus, describe_cpu_placement, CpuSampler, repeat_on_steal
 
 
 class ApacheRunner:
@@ -268,77 +142,22 @@ class ApacheRunner:
             print(f"  [WARN] Failed to check/update user-config.xml: {e}")
 
     def get_cpu_affinity_list(self, n):
-        """Generate CPU affinity list preferring physical cores first."""
-        half = self.vcpu_count // 2
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            cpu_list = [str(i * 2) for i in range(half)]
-            cpu_list.extend([str(i * 2 + 1) for i in range(n - half)])
-        return ','.join(cpu_list)
+        """
+        Generate CPU affinity list for an n-thread run.
+
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
+
+        Returns:
+            Comma-separated CPU list string (e.g., "0,1,2,3")
+        """
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     # ------------------------------------------------------------------
     # CPU frequency monitoring
     # ------------------------------------------------------------------
 
-    def get_cpu_frequencies(self):
-        """Get CPU frequencies in kHz (cross-platform: x86_64, ARM64, cloud VMs)."""
-        frequencies = []
-        try:
-            result = subprocess.run(
-                ['bash', '-c', 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split('\n'):
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        frequencies.append(int(float(parts[1].strip()) * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-        try:
-            freq_files = sorted(
-                Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/scaling_cur_freq')
-            )
-            if not freq_files:
-                freq_files = sorted(
-                    Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/cpuinfo_cur_freq')
-                )
-            for freq_file in freq_files:
-                try:
-                    frequencies.append(int(freq_file.read_text().strip()))
-                except Exception:
-                    frequencies.append(0)
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-        try:
-            result = subprocess.run(['lscpu'], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'CPU MHz' in line or 'CPU max MHz' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(',', '.'))
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-        return frequencies
-
-    def record_cpu_frequency(self, output_file):
-        frequencies = self.get_cpu_frequencies()
-        try:
-            with open(output_file, 'w') as f:
-                for freq in frequencies:
-                    f.write(f"{freq}\n")
-            return bool(frequencies)
-        except Exception as e:
-            print(f"  [WARN] Failed to write frequency file: {e}")
-            return False
-
     # ------------------------------------------------------------------
     # Perf monitoring
     # ------------------------------------------------------------------
@@ -921,8 +740,9 @@ echo "[PATCH] GCC-14 compatibility patch applied to wrk Makefile"
         print(f"{'<'*80}\n")
 
         # Record start frequency
-        print("[INFO] Recording CPU frequency before benchmark...")
-        if self.record_cpu_frequency(freq_start_file):
+        print("[INFO] Starting CPU frequency/utilization sampler...")
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+        if cpu_sampler.start():
             print("  [OK] Start frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -950,8 +770,8 @@ echo "[PATCH] GCC-14 compatibility patch applied to wrk Makefile"
             returncode = process.returncode
 
         # Record end frequency
-        print("\n[INFO] Recording CPU frequency after benchmark...")
-        if self.record_cpu_frequency(freq_end_file):
+        print("\n[INFO] Stopping CPU frequency/utilization sampler...")
+        if cpu_sampler.stop():
             print("  [OK] End frequency recorded")
         else:
             print("  [WARN] CPU frequency not available")
@@ -980,6 +800,8 @@ echo "[PATCH] GCC-14 compatibility patch applied to wrk Makefile"
                     perf_summary = self.parse_perf_stats_and_freq(
                         perf_stats_file, freq_start_file, freq_end_file, cpu_list
                     )
+                    perf_summary['cpu_placement'] = describe_cpu_placement(cpu_list)
+                    perf_summary['cpu_samples'] = cpu_sampler.summary(cpu_list)
                     with open(perf_summary_file, 'w') as f:
                         json.dump(perf_summary, f, indent=2)
                     print(f"  [OK] Perf summary: {perf_summary_file}")
@@ -1167,7 +989,7 @@ echo "[PATCH] GCC-14 compatibility patch applied to wrk Makefile"
         # Run benchmark
         failed = []
         for num_threads in self.thread_list:
-            if not self.run_benchmark(num_threads):
+            if not repeat_on_steal(self.run_benchmark, num_threads):
                 failed.append(num_threads)
 
         # Export and summarize
@@ -32,140 +32,9 @@ import os
 import shutil
 import subprocess
 import sys
-import xml.etree.ElementTree as ET
 from pathlib import Path
 
-from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status
-
-
-class PreSeedDownloader:
-    """Pre-download large test files into PTS download cache using aria2c."""
-
-    def __init__(self, cache_dir=None):
-        if cache_dir:
-            self.cache_dir = Path(cache_dir)
-        else:
-            self.cache_dir = Path.home() / ".phoronix-test-suite" / "download-cache"
-        self.aria2_available = shutil.which("aria2c") is not None
-
-    def is_aria2_available(self):
-        return self.aria2_available
-
-    def download_from_xml(self, benchmark_name, threshold_mb=96):
-        """Parse downloads.xml and accelerate large files with aria2c."""
-        if not self.aria2_available:
-            return False
-
-        profile_path = Path.home() / ".phoronix-test-suite" / "test-profiles" / benchmark_name / "downloads.xml"
-        if not profile_path.exists():
-            print(f"  [WARN] downloads.xml not found at {profile_path}")
-            print(f"  [INFO] Fetching test profile via phoronix-test-suite info {benchmark_name}...")
-            try:
-                subprocess.run(
-                    ["phoronix-test-suite", "info", benchmark_name],
-                    check=False,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                )
-            except Exception as e:
-                print(f"  [WARN] Failed to run phoronix-test-suite info: {e}")
-                return False
-            if not profile_path.exists():
-                print(f"  [WARN] downloads.xml still missing after info: {profile_path}")
-                return False
-
-        try:
-            tree = ET.parse(profile_path)
-            root = tree.getroot()
-            downloads_node = root.find("Downloads")
-            if downloads_node is None:
-                return False
-
-            for package in downloads_node.findall("Package"):
-                url_node = package.find("URL")
-                filename_node = package.find("FileName")
-                filesize_node = package.find("FileSize")
-                if url_node is None or filename_node is None:
-                    continue
-
-                urls = [u.strip() for u in url_node.text.split(",")]
-                url = urls[0] if urls else None
-                filename = filename_node.text.strip()
-                if not url:
-                    continue
-
-                size_bytes = -1
-                if filesize_node is not None and filesize_node.text:
-                    try:
-                        size_bytes = int(filesize_node.text.strip())
-                    except ValueError:
-                        pass
-                if size_bytes <= 0:
-                    size_bytes = self.get_remote_file_size(url)
-                if size_bytes > 0 and size_bytes / (1024 * 1024) >= threshold_mb:
-                    print(f"  [INFO] {filename} is large ({size_bytes / (1024 * 1024):.1f} MB), accelerating with aria2c...")
-                    self.ensure_file(urls, filename, size_bytes=size_bytes)
-        except Exception as e:
-            print(f"  [ERROR] Failed to parse downloads.xml: {e}")
-            return False
-        return True
-
-    def get_remote_file_size(self, url):
-        try:
-            result = subprocess.run(["curl", "-s", "-I", "-L", url], capture_output=True, text=True)
-            if result.returncode != 0:
-                return -1
-            for line in result.stdout.splitlines():
-                if line.lower().startswith("content-length:"):
-                    return int(line.split(":", 1)[1].strip())
-        except Exception:
-            pass
-        return -1
-
-    def ensure_file(self, urls, filename, size_bytes=-1):
-        target_path = self.cache_dir / filename
-        if target_path.exists():
-            if size_bytes > 0 and target_path.stat().st_size != size_bytes:
-                print(f"  [CACHE] Size mismatch for {filename}, re-downloading...")
-            else:
-                print(f"  [CACHE] File found: {filename}")
-                return True
-
-        if isinstance(urls, str):
-            urls = [urls]
-
-        large_threshold = 10 * 1024 * 1024 * 1024
-        num_conn = "4" if size_bytes >= large_threshold else "16"
-        print(f"  [ARIA2] Downloading {filename}...")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        cmd = [
-            "aria2c",
-            f"-x{num_conn}",
-            f"-s{num_conn}",
-            "--connect-timeout=30",
-            "--timeout=120",
-            "--max-tries=2",
-            "--retry-wait=5",
-            "--continue=true",
-            "-d",
-            str(self.cache_dir),
-            "-o",
-            filename,
-        ] + urls
-        try:
-            subprocess.run(cmd, check=True, timeout=5400)
-            print(f"  [aria2c] Download completed: {filename}")
-            return True
-        except subprocess.TimeoutExpired:
-            print(f"  [ERROR] aria2c timed out downloading {filename}")
-            if target_path.exists():
-                target_path.unlink()
-            return False
-        except subprocess.CalledProcessError:
-            print("  [WARN] aria2c download failed, falling back to PTS default")
-            if target_path.exists():
-                target_path.unlink()
-            return False
+from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, place_cpus, describe_cpu_placement, PreSeedDownloader, CpuSampler, repeat_on_steal
 
 
 class ApacheSiegeRunner:
@@ -235,69 +104,17 @@ class ApacheSiegeRunner:
             return False
 
     def get_cpu_affinity_list(self, n):
-        half = self.vcpu_count // 2
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical_count = n - half
-            cpu_list.extend([str(i * 2 + 1) for i in range(logical_count)])
-        return ",".join(cpu_list)
+        """
+        Generate CPU affinity list for an n-thread run.
 
-    def get_cpu_frequencies(self):
-        frequencies = []
-        try:
-            result = subprocess.run(["bash", "-c", 'grep "cpu MHz" /proc/cpuinfo'], capture_output=True, text=True)
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split("\n"):
-                    parts = line.split(":")
-                    if len(parts) >= 2:
-                        frequencies.append(int(float(parts[1].strip()) * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-        try:
-            freq_files = sorted(Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/scaling_cur_freq"))
-            if not freq_files:
-                freq_files = sorted(Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/cpuinfo_cur_freq"))
-            for freq_file in freq_files:
-                try:
-                    frequencies.append(int(freq_file.read_text().strip()))
-                except Exception:
-                    frequencies.append(0)
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-        try:
-            result = subprocess.run(["lscpu"], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split("\n"):
-                    if "CPU MHz" in line or "CPU max MHz" in line:
-                        parts = line.split(":")
-                        if len(parts) >= 2:
-                            return [int(float(parts[1].strip().replace(",", ".")) * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-        return frequencies
-
-    def record_cpu_frequency(self, output_file):
-        frequencies = self.get_cpu_frequencies()
-        if frequencies:
-            try:
-                with open(output_file, "w") as handle:
-                    for freq in frequencies:
-                        handle.write(f"{freq}\n")
-                return True
-            except Exception as e:
-                print(f"  [WARN] Failed to write frequency file: {e}")
-                return False
-        try:
-            output_file.touch()
-        except Exception:
-            pass
-        return False
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
+
+        Returns:
+            Comma-separated CPU list string (e.g., "0,1,2,3")
+        """
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def parse_perf_stats(self, perf_stats_file, cpu_list):
         per_cpu_metrics = {}
@@ -446,8 +263,9 @@ class ApacheSiegeRunner:
             pts_cmd = f"{batch_env} {pts_base_cmd}"
             print("  [INFO] Running without perf")
 
-        print("[INFO] Recording CPU frequency before benchmark...")
-        self.record_cpu_frequency(freq_start_file)
+        print("[INFO] Starting CPU frequency/utilization sampler...")
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+        cpu_sampler.start()
 
         with open(log_file, "w") as log_f, open(stdout_log, "a") as stdout_f:
             stdout_f.write(f"\n{'=' * 80}\n")
@@ -473,7 +291,7 @@ class ApacheSiegeRunner:
             returncode = process.returncode
 
         print("[INFO] Recording CPU frequency after benchmark...")
-        self.record_cpu_frequency(freq_end_file)
+        cpu_sampler.stop()
 
         pts_test_failed, pts_failure_reason = detect_pts_failure_from_log(log_file)
         if returncode == 0 and not pts_test_failed:
@@ -481,6 +299,8 @@ class ApacheSiegeRunner:
             if self.perf_events and perf_stats_file.exists():
                 try:
                     perf_summary = self.parse_perf_stats(perf_stats_file, cpu_list)
+                    perf_summary['cpu_placement'] = describe_cpu_placement(cpu_list)
+                    perf_summary['cpu_samples'] = cpu_sampler.summary(cpu_list)
                     with open(perf_summary_file, "w") as handle:
                         json.dump(perf_summary, handle, indent=2)
                 except Exception as e:
@@ -689,7 +509,7 @@ class ApacheSiegeRunner:
             print(f"\n{'=' * 80}")
             print(f">>> Running {self.benchmark} with {num_threads} thread(s)")
             print(f"{'=' * 80}")
-            if not self.run_benchmark(num_threads):
+            if not repeat_on_steal(self.run_benchmark, num_threads):
                 print(f"[ERROR] Benchmark failed for {num_threads} thread(s)")
                 failed.append(num_threads)
 
@@ -27,162 +27,9 @@ import shutil
 import subprocess
 import sys
 from pathlib import Path
-from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, pick_compiler
+from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, pick_compiler, place_cpus, PreSeedDownloader, CpuSampler, repeat_on_steal
 
 
-class PreSeedDownloader:
-    """
-    Utility to pre-download large test files into Phoronix Test Suite cache
-    using faster downloaders (aria2c) if available.
-    """
-    def __init__(self, cache_dir=None):
-        if cache_dir:
-            self.cache_dir = Path(cache_dir)
-        else:
-            self.cache_dir = Path.home() / ".phoronix-test-suite" / "download-cache"
-        
-        self.aria2_available = shutil.which("aria2c") is not None
-
-    def is_aria2_available(self):
-        return self.aria2_available
-
-    def download_from_xml(self, benchmark_name, threshold_mb=96):
-        """
-        Parse downloads.xml for the benchmark and download large files.
-        
-        Args:
-            benchmark_name: Full benchmark name (e.g., "pts/x265-1.5.0")
-            threshold_mb: Size threshold in MB to trigger aria2c (default: 256MB)
-        """
-        if not self.aria2_available:
-            return False
-
-        # Locate downloads.xml
-        # ~/.phoronix-test-suite/test-profiles/<benchmark_name>/downloads.xml
-        profile_path = Path.home() / ".phoronix-test-suite" / "test-profiles" / benchmark_name / "downloads.xml"
-        
-        if not profile_path.exists():
-            print(f"  [WARN] downloads.xml not found at {profile_path}")
-            print(f"  [INFO] Attempting to fetch test profile via phoronix-test-suite info {benchmark_name}...")
-            try:
-                subprocess.run(
-                    ['phoronix-test-suite', 'info', benchmark_name],
-                    check=False,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-            except Exception as e:
-                print(f"  [WARN] Failed to run phoronix-test-suite info: {e}")
-                return False
-            
-            if not profile_path.exists():
-                print(f"  [WARN] downloads.xml still missing after info: {profile_path}")
-                return False
-        try:
-            import xml.etree.ElementTree as ET
-            tree = ET.parse(profile_path)
-            root = tree.getroot()
-            
-            # Find all Package elements
-            downloads_node = root.find('Downloads')
-            if downloads_node is None:
-                return False
-                
-            for package in downloads_node.findall('Package'):
-                url_node = package.find('URL')
-                filename_node = package.find('FileName')
-                filesize_node = package.find('FileSize')
-                
-                if url_node is None or filename_node is None:
-                    continue
-                    
-                url = url_node.text.strip()
-                filename = filename_node.text.strip()
-                
-                # Determine size
-                size_bytes = -1
-                if filesize_node is not None and filesize_node.text:
-                    try:
-                        size_bytes = int(filesize_node.text.strip())
-                    except ValueError:
-                        pass
-                
-                # If size not in XML, try to get it from network (fallback)
-                if size_bytes <= 0:
-                    size_bytes = self.get_remote_file_size(url)
-                    
-                # Check threshold
-                if size_bytes > 0:
-                    size_mb = size_bytes / (1024 * 1024)
-                    if size_mb >= threshold_mb:
-                        print(f"  [INFO] {filename} is large ({size_mb:.1f} MB), accelerating with aria2c...")
-                        self.ensure_file(url, filename)
-
-        except Exception as e:
-            print(f"  [ERROR] Failed to parse downloads.xml: {e}")
-            return False
-
-        return True
-
-    def get_remote_file_size(self, url):
-        """
-        Get remote file size in bytes using curl.
-        Returns -1 if size cannot be determined.
-        """
-        try:
-            # -s: Silent, -I: Header only, -L: Follow redirects
-            cmd = ['curl', '-s', '-I', '-L', url]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                return -1
-                
-            # Parse Content-Length
-            for line in result.stdout.splitlines():
-                if line.lower().startswith('content-length:'):
-                    try:
-                        size_str = line.split(':')[1].strip()
-                        return int(size_str)
-                    except ValueError:
-                        pass
-        except Exception:
-            pass
-            
-        return -1
-
-    def ensure_file(self, url, filename, size_bytes=-1):
-        target_path = self.cache_dir / filename
-        if target_path.exists():
-            if size_bytes > 0 and target_path.stat().st_size != size_bytes:
-                print(f"  [CACHE] Size mismatch for {filename}, re-downloading...")
-            else:
-                print(f"  [CACHE] File found: {filename}")
-                return True
-
-        print(f"  [ARIA2] Downloading {filename}...")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        _LARGE_FILE_THRESHOLD_BYTES = 10 * 1024 * 1024 * 1024
-        num_conn = "4" if size_bytes >= _LARGE_FILE_THRESHOLD_BYTES else "16"
-        cmd = [
-            "aria2c", f"-x{num_conn}", f"-s{num_conn}",
-            "--connect-timeout=30", "--timeout=120",
-            "--max-tries=2", "--retry-wait=5", "--continue=true",
-            "-d", str(self.cache_dir), "-o", filename, url
-        ]
-        try:
-            subprocess.run(cmd, check=True, timeout=5400)
-            print(f"  [aria2c] Download completed: {filename}")
-            return True
-        except subprocess.TimeoutExpired:
-            print(f"  [ERROR] aria2c timed out downloading {filename}")
-            if target_path.exists():
-                target_path.unlink()
-            return False
-        except subprocess.CalledProcessError:
-            print("  [WARN] aria2c download failed, falling back to PTS default")
-            if target_path.exists():
-                target_path.unlink()
-            return False
 class BuildLLVMRunner:
     def __init__(self, threads_arg=None, quick_mode=False):
         """
@@ -346,106 +193,6 @@ class BuildLLVMRunner:
                 return 'microsoft' in content or 'wsl' in content
         except Exception:
             return False
-    def get_cpu_frequencies(self):
-        """
-        Get current CPU frequencies for all CPUs.
-        Tries multiple methods for cross-platform compatibility (x86_64, ARM64, cloud VMs).
-
-        Returns:
-            list: List of frequencies in kHz, one per CPU. Empty list if unavailable.
-        """
-        frequencies = []
-
-        # Method 1: /proc/cpuinfo (works on x86_64)
-        try:
-            result = subprocess.run(
-                ['bash', '-c', 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split('\n'):
-                    # Format: "cpu MHz		: 3400.000"
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        mhz = float(parts[1].strip())
-                        frequencies.append(int(mhz * 1000))  # Convert MHz to kHz
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-
-        # Method 2: /sys/devices/system/cpu/cpufreq (works on ARM64 and some x86)
-        try:
-            # Try scaling_cur_freq first (more commonly available)
-            freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/scaling_cur_freq'))
-            if not freq_files:
-                # Fallback to cpuinfo_cur_freq
-                freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/cpuinfo_cur_freq'))
-
-            for freq_file in freq_files:
-                try:
-                    with open(freq_file, 'r') as f:
-                        freq_khz = int(f.read().strip())
-                        frequencies.append(freq_khz)
-                except Exception:
-                    frequencies.append(0)
-
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        # Method 3: lscpu (fallback)
-        try:
-            result = subprocess.run(
-                ['lscpu'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'CPU MHz' in line or 'CPU max MHz' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(',', '.'))
-                            # Return same frequency for all CPUs
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-
-        return frequencies
-
-    def record_cpu_frequency(self, output_file):
-        """
-        Record current CPU frequencies to a file.
-
-        Args:
-            output_file: Path to output file
-
-        Returns:
-            bool: True if successful, False otherwise
-        """
-        frequencies = self.get_cpu_frequencies()
-        if frequencies:
-            try:
-                with open(output_file, 'w') as f:
-                    for freq in frequencies:
-                        f.write(f"{freq}\n")
-                return True
-            except Exception as e:
-                print(f"  [WARN] Failed to write frequency file: {e}")
-                return False
-        else:
-            # Write empty file to indicate unavailability
-            try:
-                with open(output_file, 'w') as f:
-                    pass
-                return False
-            except Exception:
-                return False
-
-
 
     def get_perf_events(self):
         """
@@ -706,30 +453,16 @@ class BuildLLVMRunner:
 
     def get_cpu_affinity_list(self, n):
         """
-        Generate CPU affinity list for HyperThreading optimization.
+        Generate CPU affinity list for an n-thread run.
 
-        Prioritizes physical cores (even IDs) first, then logical cores (odd IDs).
-        Pattern: {0,2,4,...,1,3,5,...}
-
-        Args:
-            n: Number of threads
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
 
         Returns:
-            Comma-separated CPU list string (e.g., "0,2,4,1,3")
+            Comma-separated CPU list string (e.g., "0,1,2,3")
         """
-        half = self.vcpu_count // 2
-        cpu_list = []
-
-        if n <= half:
-            # Physical cores only: 0,2,4,...
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            # Physical cores + logical cores
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical_count = n - half
-            cpu_list.extend([str(i * 2 + 1) for i in range(logical_count)])
-
-        return ','.join(cpu_list)
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def install_benchmark(self):
         """
@@ -971,10 +704,11 @@ class BuildLLVMRunner:
         print(f"    Freq end: {freq_end_file}")
         print(f"{'<'*80}\n")
 
-        # Record CPU frequency before benchmark
-        # Uses cross-platform method (works on x86_64, ARM64, and cloud VMs)
-        print("[INFO] Recording CPU frequency before benchmark...")
-        if self.record_cpu_frequency(freq_start_file):
+        # Sample CPU frequency and utilization for the whole run
+        # (sysfs/procfs, read in-process by runner_common.CpuSampler)
+        print("[INFO] Starting CPU frequency/utilization sampler...")
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+        if cpu_sampler.start():
             print("  [OK] Start frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -1011,10 +745,9 @@ class BuildLLVMRunner:
 
         pts_test_failed, pts_failure_reason = detect_pts_failure_from_log(log_file)
 
-        # Record CPU frequency after benchmark
-        # Uses cross-platform method (works on x86_64, ARM64, and cloud VMs)
-        print("\n[INFO] Recording CPU frequency after benchmark...")
-        if self.record_cpu_frequency(freq_end_file):
+        # Stop sampling: writes the end frequency and <N>-thread_cpu_samples.csv/.json
+        print("\n[INFO] Stopping CPU frequency/utilization sampler...")
+        if cpu_sampler.stop():
             print("  [OK] End frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -1233,7 +966,7 @@ class BuildLLVMRunner:
         failed = []
         for num_threads in self.thread_list:
             # For runtime mode, NO reinstallation needed - just run with different NUM_CPU_CORES
-            if not self.run_benchmark(num_threads):
+            if not repeat_on_steal(self.run_benchmark, num_threads):
                 failed.append(num_threads)
 
         # Export results to CSV and JSON
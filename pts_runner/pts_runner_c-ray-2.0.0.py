@@ -32,7 +32,7 @@ import shutil
 import subprocess
 import sys
 from pathlib import Path
-from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts
+from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts, place_cpus, describe_cpu_placement, CpuSampler, repeat_on_steal
 
 
 class CRayRunner:
@@ -120,66 +120,6 @@ class CRayRunner:
         except Exception:
             return False
 
-    def get_cpu_frequencies(self):
-        """Get current CPU frequencies (cross-platform)."""
-        frequencies = []
-
-        try:
-            result = subprocess.run(
-                ['bash', '-c', 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split('\n'):
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        frequencies.append(int(float(parts[1].strip()) * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-
-        try:
-            freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/scaling_cur_freq'))
-            if not freq_files:
-                freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/cpuinfo_cur_freq'))
-            for freq_file in freq_files:
-                try:
-                    with open(freq_file, 'r') as f:
-                        frequencies.append(int(f.read().strip()))
-                except Exception:
-                    frequencies.append(0)
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        try:
-            result = subprocess.run(['lscpu'], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'CPU MHz' in line or 'CPU max MHz' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(',', '.'))
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-
-        return frequencies
-
-    def record_cpu_frequency(self, output_file):
-        """Record CPU frequencies to file."""
-        frequencies = self.get_cpu_frequencies()
-        try:
-            with open(output_file, 'w') as f:
-                for freq in frequencies:
-                    f.write(f"{freq}\n")
-            return bool(frequencies)
-        except Exception as e:
-            print(f"  [WARN] Failed to write frequency file: {e}")
-            return False
-
     def get_perf_events(self):
         """Determine available perf events (3-stage fallback)."""
         perf_path = shutil.which("perf")
@@ -274,20 +214,16 @@ class CRayRunner:
 
     def get_cpu_affinity_list(self, n):
         """
-        Generate CPU affinity list for HyperThreading optimization.
-        Prioritizes physical cores (even IDs) first, then logical cores (odd IDs).
-        """
-        half = self.vcpu_count // 2
-        cpu_list = []
+        Generate CPU affinity list for an n-thread run.
 
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical_count = n - half
-            cpu_list.extend([str(i * 2 + 1) for i in range(logical_count)])
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
 
-        return ','.join(cpu_list)
+        Returns:
+            Comma-separated CPU list string (e.g., "0,1,2,3")
+        """
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def install_benchmark(self):
         """
@@ -419,7 +355,8 @@ class CRayRunner:
         print(f"  [INFO] CPU affinity: {cpu_list} ({num_threads} threads via taskset)")
 
         print("  [INFO] Recording CPU frequency before benchmark...")
-        self.record_cpu_frequency(freq_start_file)
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+        cpu_sampler.start()
 
         with open(log_file, 'w') as log_f, open(stdout_log, 'a') as stdout_f:
             stdout_f.write(f"\n{'='*80}\n")
@@ -442,7 +379,7 @@ class CRayRunner:
             process.wait()
             returncode = process.returncode
 
-        self.record_cpu_frequency(freq_end_file)
+        cpu_sampler.stop()
 
         pts_test_failed, pts_failure_reason = detect_pts_failure_from_log(log_file)
 
@@ -451,7 +388,7 @@ class CRayRunner:
             if self.perf_events and perf_stats_file.exists():
                 try:
                     with open(perf_summary_file, 'w') as f:
-                        json.dump({'perf_stats_file': str(perf_stats_file), 'cpu_list': cpu_list}, f, indent=2)
+                        json.dump({'perf_stats_file': str(perf_stats_file), 'cpu_list': cpu_list, 'cpu_placement': describe_cpu_placement(cpu_list), 'cpu_samples': cpu_sampler.summary(cpu_list)}, f, indent=2)
                 except Exception as e:
                     print(f"  [WARN] Failed to save perf summary: {e}")
             return True
@@ -613,7 +550,7 @@ class CRayRunner:
 
         failed = []
         for num_threads in self.thread_list:
-            if not self.run_benchmark(num_threads):
+            if not repeat_on_steal(self.run_benchmark, num_threads):
                 failed.append(num_threads)
 
         self.export_results()
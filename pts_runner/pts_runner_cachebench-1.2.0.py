@@ -19,7 +19,7 @@ import subprocess
 import argparse
 import shutil
 from pathlib import Path
-from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts
+from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts, place_cpus, CpuSampler, repeat_on_steal
 
 
 class CachebenchRunner:
@@ -204,98 +204,17 @@ class CachebenchRunner:
             return False
 
     def get_cpu_affinity_list(self, n):
-        """Generate CPU affinity list for HyperThreading optimization."""
-        half = self.vcpu_count // 2
-        cpu_list = []
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical_count = n - half
-            cpu_list.extend([str(i * 2 + 1) for i in range(logical_count)])
-        return ','.join(cpu_list)
-
-    def get_cpu_frequencies(self):
         """
-        Get current CPU frequencies for all CPUs.
-        Tries multiple methods for cross-platform compatibility (x86_64, ARM64, cloud VMs).
-        """
-        frequencies = []
+        Generate CPU affinity list for an n-thread run.
 
-        # Method 1: /proc/cpuinfo (works on x86_64)
-        try:
-            result = subprocess.run(
-                ['bash', '-c', 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split('\n'):
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        mhz = float(parts[1].strip())
-                        frequencies.append(int(mhz * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
 
-        # Method 2: /sys/devices/system/cpu/cpufreq (works on ARM64 and some x86)
-        try:
-            freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/scaling_cur_freq'))
-            if not freq_files:
-                freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/cpuinfo_cur_freq'))
-
-            for freq_file in freq_files:
-                try:
-                    with open(freq_file, 'r') as f:
-                        freq_khz = int(f.read().strip())
-                        frequencies.append(freq_khz)
-                except Exception:
-                    frequencies.append(0)
-
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        # Method 3: lscpu (fallback)
-        try:
-            result = subprocess.run(
-                ['lscpu'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'CPU MHz' in line or 'CPU max MHz' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(',', '.'))
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-
-        return frequencies
-
-    def record_cpu_frequency(self, output_file):
-        """Record current CPU frequencies to a file."""
-        frequencies = self.get_cpu_frequencies()
-        if frequencies:
-            try:
-                with open(output_file, 'w') as f:
-                    for freq in frequencies:
-                        f.write(f"{freq}\n")
-                return True
-            except Exception as e:
-                print(f"  [WARN] Failed to write frequency file: {e}")
-                return False
-        try:
-            with open(output_file, 'w') as f:
-                pass
-            return False
-        except Exception:
-            return False
+        Returns:
+            Comma-separated CPU list string (e.g., "0,1,2,3")
+        """
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def clean_pts_cache(self):
         """Clean PTS installed tests."""
@@ -405,8 +324,9 @@ class CachebenchRunner:
         else:
             pts_cmd = f'{batch_env} {pts_base_cmd}'
 
-        print("[INFO] Recording CPU frequency before benchmark...")
-        if self.record_cpu_frequency(freq_start_file):
+        print("[INFO] Starting CPU frequency/utilization sampler...")
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file)
+        if cpu_sampler.start():
             print("  [OK] Start frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -425,8 +345,8 @@ class CachebenchRunner:
                 stdout_f.write(line)
             process.wait()
 
-        print("\n[INFO] Recording CPU frequency after benchmark...")
-        if self.record_cpu_frequency(freq_end_file):
+        print("\n[INFO] Stopping CPU frequency/utilization sampler...")
+        if cpu_sampler.stop():
             print("  [OK] End frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -503,7 +423,7 @@ class CachebenchRunner:
             print(f"[INFO] Benchmark already installed, skipping installation: {self.benchmark_full}")
 
         for t in self.thread_list:
-            self.run_benchmark(t)
+            repeat_on_steal(self.run_benchmark, t)
 
         self.export_results()
         self.generate_summary()
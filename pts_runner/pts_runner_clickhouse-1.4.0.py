@@ -34,149 +34,9 @@ import shutil
 import subprocess
 import sys
 from pathlib import Path
-from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts
+from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts, describe_cpu_placement, PreSeedDownloader, CpuSampler, repeat_on_steal
 
 
-class PreSeedDownloader:
-    """
-    Utility to pre-download large test files into Phoronix Test Suite cache
-    using faster downloaders (aria2c) if available.
-    """
-    def __init__(self, cache_dir=None):
-        if cache_dir:
-            self.cache_dir = Path(cache_dir)
-        else:
-            self.cache_dir = Path.home() / ".phoronix-test-suite" / "download-cache"
-
-        self.aria2_available = shutil.which("aria2c") is not None
-
-    def is_aria2_available(self):
-        return self.aria2_available
-
-    def download_from_xml(self, benchmark_name, threshold_mb=1):
-        """
-        Parse downloads.xml for the benchmark and download large files.
-
-        Args:
-            benchmark_name: Full benchmark name (e.g., "pts/clickhouse-1.4.0")
-            threshold_mb: Size threshold in MB to trigger aria2c (default: 1 MB — always pre-seed)
-        """
-        if not self.aria2_available:
-            print("  [INFO] aria2c not found, skipping pre-seed (will rely on PTS default)")
-            return False
-
-        profile_path = Path.home() / ".phoronix-test-suite" / "test-profiles" / benchmark_name / "downloads.xml"
-
-        if not profile_path.exists():
-            print(f"  [WARN] downloads.xml not found at {profile_path}")
-            print(f"  [INFO] Fetching test profile via phoronix-test-suite info {benchmark_name}...")
-            try:
-                subprocess.run(
-                    ['phoronix-test-suite', 'info', benchmark_name],
-                    check=False,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-            except Exception as e:
-                print(f"  [WARN] Failed to run phoronix-test-suite info: {e}")
-                return False
-
-            if not profile_path.exists():
-                print(f"  [WARN] downloads.xml still missing after info: {profile_path}")
-                return False
-
-        try:
-            import xml.etree.ElementTree as ET
-            tree = ET.parse(profile_path)
-            root = tree.getroot()
-
-            downloads_node = root.find('Downloads')
-            if downloads_node is None:
-                return False
-
-            for package in downloads_node.findall('Package'):
-                url_node = package.find('URL')
-                filename_node = package.find('FileName')
-                filesize_node = package.find('FileSize')
-
-                if url_node is None or filename_node is None:
-                    continue
-
-                url = url_node.text.strip()
-                filename = filename_node.text.strip()
-
-                size_bytes = -1
-                if filesize_node is not None and filesize_node.text:
-                    try:
-                        size_bytes = int(filesize_node.text.strip())
-                    except ValueError:
-                        pass
-
-                if size_bytes <= 0:
-                    size_bytes = self.get_remote_file_size(url)
-
-                if size_bytes > 0:
-                    size_mb = size_bytes / (1024 * 1024)
-                    if size_mb < threshold_mb:
-                        continue
-                    print(f"  [INFO] {filename} ({size_mb:.1f} MB), pre-seeding with aria2c...")
-                    self.ensure_file(url, filename)
-
-        except Exception as e:
-            print(f"  [ERROR] Failed to parse downloads.xml: {e}")
-            return False
-
-        return True
-
-    def get_remote_file_size(self, url):
-        try:
-            cmd = ['curl', '-s', '-I', '-L', url]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                return -1
-            for line in result.stdout.splitlines():
-                if line.lower().startswith('content-length:'):
-                    try:
-                        return int(line.split(':')[1].strip())
-                    except ValueError:
-                        pass
-        except Exception:
-            pass
-        return -1
-
-    def ensure_file(self, url, filename, size_bytes=-1):
-        target_path = self.cache_dir / filename
-        if target_path.exists():
-            if size_bytes > 0 and target_path.stat().st_size != size_bytes:
-                print(f"  [CACHE] Size mismatch for {filename}, re-downloading...")
-            else:
-                print(f"  [CACHE] File found: {filename}")
-                return True
-
-        print(f"  [ARIA2] Downloading {filename}...")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        _LARGE_FILE_THRESHOLD_BYTES = 10 * 1024 * 1024 * 1024
-        num_conn = "4" if size_bytes >= _LARGE_FILE_THRESHOLD_BYTES else "16"
-        cmd = [
-            "aria2c", f"-x{num_conn}", f"-s{num_conn}",
-            "--connect-timeout=30", "--timeout=120",
-            "--max-tries=2", "--retry-wait=5", "--continue=true",
-            "-d", str(self.cache_dir), "-o", filename, url
-        ]
-        try:
-            subprocess.run(cmd, check=True, timeout=5400)
-            print(f"  [aria2c] Download completed: {filename}")
-            return True
-        except subprocess.TimeoutExpired:
-            print(f"  [ERROR] aria2c timed out downloading {filename}")
-            if target_path.exists():
-                target_path.unlink()
-            return False
-        except subprocess.CalledProcessError:
-            print("  [WARN] aria2c download failed, falling back to PTS default")
-            if target_path.exists():
-                target_path.unlink()
-            return False
 class ClickHouseRunner:
     def __init__(self, threads_arg=None, quick_mode=False):
         """
@@ -260,35 +120,6 @@ class ClickHouseRunner:
         except Exception:
             return False
 
-    def get_cpu_frequencies(self):
-        """Get current CPU frequencies for all CPUs."""
-        freqs = []
-        # Try /sys/devices/system/cpu/cpu*/cpufreq/scaling_cur_freq
-        cpu_count = self.vcpu_count
-        for i in range(cpu_count):
-            freq_file = Path(f'/sys/devices/system/cpu/cpu{i}/cpufreq/scaling_cur_freq')
-            if freq_file.exists():
-                try:
-                    freqs.append(float(freq_file.read_text().strip()))
-                except Exception:
-                    freqs.append(0.0)
-            else:
-                freqs.append(0.0)
-        return freqs
-
-    def record_cpu_frequency(self, output_file):
-        """Record CPU frequencies to file (one per line in kHz)."""
-        try:
-            freqs = self.get_cpu_frequencies()
-            if any(f > 0 for f in freqs):
-                with open(output_file, 'w') as f:
-                    for freq in freqs:
-                        f.write(f"{freq}\n")
-                return True
-        except Exception:
-            pass
-        return False
-
     def ensure_upload_disabled(self):
         """Ensure PTS upload is disabled."""
         batch_setup_path = Path.home() / ".phoronix-test-suite" / "user-config.xml"
@@ -573,8 +404,9 @@ class ClickHouseRunner:
         print(f"  Perf stats:  {perf_stats_file}")
         print(f"{'<'*80}\n")
 
-        print("[INFO] Recording CPU frequency before benchmark...")
-        if self.record_cpu_frequency(freq_start_file):
+        print("[INFO] Starting CPU frequency/utilization sampler...")
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+        if cpu_sampler.start():
             print("  [OK] Start frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -605,7 +437,7 @@ class ClickHouseRunner:
             returncode = process.returncode
 
         print("[INFO] Recording CPU frequency after benchmark...")
-        if self.record_cpu_frequency(freq_end_file):
+        if cpu_sampler.stop():
             print("  [OK] End frequency recorded")
         else:
             print("  [WARN] CPU frequency not available")
@@ -616,6 +448,8 @@ class ClickHouseRunner:
                 perf_summary = self.parse_perf_stats_and_freq(
                     perf_stats_file, freq_start_file, freq_end_file, cpu_list
                 )
+                perf_summary['cpu_placement'] = describe_cpu_placement(cpu_list)
+                perf_summary['cpu_samples'] = cpu_sampler.summary(cpu_list)
                 with open(perf_summary_file, 'w') as f:
                     json.dump(perf_summary, f, indent=2)
                 print(f"  [OK] Perf summary saved: {perf_summary_file}")
@@ -812,7 +646,7 @@ class ClickHouseRunner:
         # Run benchmark
         failed = []
         for num_threads in self.thread_list:
-            if not self.run_benchmark(num_threads):
+            if not repeat_on_steal(self.run_benchmark, num_threads):
                 failed.append(num_threads)
 
         self.export_results()
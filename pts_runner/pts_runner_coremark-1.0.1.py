@@ -25,161 +25,8 @@ import re
 import shutil
 import subprocess
 import sys
-import xml.etree.ElementTree as ET
 from pathlib import Path
-from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, pick_compiler
-
-class PreSeedDownloader:
-    """
-    Handles pre-seeding of large benchmark files to avoid PTS download timeouts.
-    """
-    def __init__(self):
-        self.pts_home = Path.home() / '.phoronix-test-suite'
-        self.download_cache = self.pts_home / 'download-cache'
-
-    def get_remote_file_size(self, url):
-        """Get file size in bytes from URL using curl."""
-        try:
-            result = subprocess.run(
-                ['curl', '-sI', url],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                match = re.search(r'content-length:\s*(\d+)', result.stdout, re.IGNORECASE)
-                if match:
-                    return int(match.group(1))
-        except Exception:
-            pass
-        return 0
-
-    def ensure_file(self, filename, url, min_size_mb=0, size_bytes=-1):
-        """
-        Ensure file exists in PTS download cache.
-        If missing or size mismatch, download with aria2c.
-        """
-        self.download_cache.mkdir(parents=True, exist_ok=True)
-        file_path = self.download_cache / filename
-
-        should_download = True
-        if file_path.exists():
-            if size_bytes > 0:
-                if file_path.stat().st_size == size_bytes:
-                    print(f"  [CACHE] File {filename} exists and size matches ({size_bytes} bytes)")
-                    should_download = False
-                else:
-                    print(f"  [CACHE] File {filename} size mismatch, re-downloading...")
-            elif min_size_mb > 0:
-                size_mb = file_path.stat().st_size / (1024 * 1024)
-                if size_mb >= min_size_mb * 0.9:
-                    print(f"  [CACHE] File {filename} exists and size is valid ({size_mb:.1f} MB)")
-                    should_download = False
-                else:
-                    print(f"  [CACHE] File {filename} exists but size mismatch ({size_mb:.1f} MB < {min_size_mb} MB)")
-            else:
-                print(f"  [CACHE] File {filename} exists (skipping verification)")
-                should_download = False
-
-        if should_download:
-            print(f"  [DOWNLOAD] Downloading {filename} with aria2c...")
-            _LARGE_FILE_THRESHOLD_BYTES = 10 * 1024 * 1024 * 1024
-            num_conn = "4" if size_bytes >= _LARGE_FILE_THRESHOLD_BYTES else "16"
-            cmd = [
-                "aria2c", f"-x{num_conn}", f"-s{num_conn}", "-k", "1M",
-                "--connect-timeout=30", "--timeout=120",
-                "--max-tries=2", "--retry-wait=5", "--continue=true",
-                "-d", str(self.download_cache), "-o", filename, url
-            ]
-            try:
-                subprocess.run(cmd, check=True, timeout=5400)
-                print(f"  [OK] Download completed: {filename}")
-            except subprocess.TimeoutExpired:
-                print(f"  [ERROR] aria2c timed out downloading {filename}")
-                if file_path.exists():
-                    file_path.unlink()
-            except subprocess.CalledProcessError:
-                print(f"  [ERROR] Download failed for {filename}")
-    def download_from_xml(self, benchmark_name, threshold_mb=96):
-        """
-        Parse downloads.xml for the benchmark and download files larger than threshold.
-        
-        Args:
-            benchmark_name: Full benchmark name (e.g., 'pts/test-name')
-            threshold_mb: Download files larger than this size (MB)
-        """
-        print(f"\n>>> Checking for large files (> {threshold_mb} MB) in downloads.xml")
-        
-        # Locate downloads.xml
-        # Typically in ~/.phoronix-test-suite/test-profiles/pts/<benchmark>/downloads.xml
-        # Need to handle 'pts/' prefix
-        short_name = benchmark_name.replace('pts/', '')
-        profile_dir = self.pts_home / 'test-profiles' / 'pts' / short_name
-        xml_path = profile_dir / 'downloads.xml'
-
-        if not xml_path.exists():
-            print(f"  [INFO] downloads.xml not found at {xml_path}")
-            print(f"  [INFO] Attempting to fetch test profile via phoronix-test-suite info {benchmark_name}...")
-            try:
-                subprocess.run(
-                    ['phoronix-test-suite', 'info', benchmark_name],
-                    check=False,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-            except Exception as e:
-                print(f"  [WARN] Failed to run phoronix-test-suite info: {e}")
-                return
-
-            if not xml_path.exists():
-                print(f"  [WARN] downloads.xml still missing after info: {xml_path}")
-                return
-
-        try:
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-            
-            count = 0
-            for package in root.findall('Package'):
-                url_elem = package.find('URL')
-                filename_elem = package.find('FileName')
-                size_elem = package.find('FileSize')
-                
-                if url_elem is None or filename_elem is None:
-                    continue
-                    
-                url = url_elem.text.strip()
-                filename = filename_elem.text.strip()
-                
-                # Check URL links to other variables (not supported yet)
-                if ',' in url and 'http' not in url:
-                    continue
-
-                # Determine file size
-                file_size_mb = 0
-                if size_elem is not None and size_elem.text:
-                    try:
-                        file_size_bytes = int(size_elem.text)
-                        file_size_mb = file_size_bytes / (1024 * 1024)
-                    except ValueError:
-                        pass
-                
-                # If size not in XML, try to get it from network (expensive, optional)
-                # For optimization, we rely on XML size or user knowledge usually. 
-                # If XML size is 0/missing, we skip unless we want to force check.
-                
-                if file_size_mb > threshold_mb:
-                    print(f"  [INFO] Found large file: {filename} ({file_size_mb:.1f} MB)")
-                    self.ensure_file(filename, url, min_size_mb=file_size_mb)
-                    count += 1
-            
-            if count == 0:
-                print(f"  [INFO] No files larger than {threshold_mb} MB found in downloads.xml")
-                
-        except ET.ParseError:
-            print(f"  [WARN] Failed to parse {xml_path}")
-        except Exception as e:
-            print(f"  [WARN] Error processing downloads.xml: {e}")
+from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, pick_compiler, place_cpus, describe_cpu_placement, PreSeedDownloader, CpuSampler, repeat_on_steal
 
 
 class CoreMarkRunner:
@@ -304,106 +151,6 @@ class CoreMarkRunner:
                 return 'microsoft' in content or 'wsl' in content
         except Exception:
             return False
-    def get_cpu_frequencies(self):
-        """
-        Get current CPU frequencies for all CPUs.
-        Tries multiple methods for cross-platform compatibility (x86_64, ARM64, cloud VMs).
-
-        Returns:
-            list: List of frequencies in kHz, one per CPU. Empty list if unavailable.
-        """
-        frequencies = []
-
-        # Method 1: /proc/cpuinfo (works on x86_64)
-        try:
-            result = subprocess.run(
-                ['bash', '-c', 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split('\n'):
-                    # Format: "cpu MHz		: 3400.000"
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        mhz = float(parts[1].strip())
-                        frequencies.append(int(mhz * 1000))  # Convert MHz to kHz
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-
-        # Method 2: /sys/devices/system/cpu/cpufreq (works on ARM64 and some x86)
-        try:
-            # Try scaling_cur_freq first (more commonly available)
-            freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/scaling_cur_freq'))
-            if not freq_files:
-                # Fallback to cpuinfo_cur_freq
-                freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/cpuinfo_cur_freq'))
-
-            for freq_file in freq_files:
-                try:
-                    with open(freq_file, 'r') as f:
-                        freq_khz = int(f.read().strip())
-                        frequencies.append(freq_khz)
-                except Exception:
-                    frequencies.append(0)
-
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        # Method 3: lscpu (fallback)
-        try:
-            result = subprocess.run(
-                ['lscpu'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'CPU MHz' in line or 'CPU max MHz' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(',', '.'))
-                            # Return same frequency for all CPUs
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-
-        return frequencies
-
-    def record_cpu_frequency(self, output_file):
-        """
-        Record current CPU frequencies to a file.
-
-        Args:
-            output_file: Path to output file
-
-        Returns:
-            bool: True if successful, False otherwise
-        """
-        frequencies = self.get_cpu_frequencies()
-        if frequencies:
-            try:
-                with open(output_file, 'w') as f:
-                    for freq in frequencies:
-                        f.write(f"{freq}\n")
-                return True
-            except Exception as e:
-                print(f"  [WARN] Failed to write frequency file: {e}")
-                return False
-        else:
-            # Write empty file to indicate unavailability
-            try:
-                with open(output_file, 'w') as f:
-                    pass
-                return False
-            except Exception:
-                return False
-
-
 
     def get_perf_events(self):
         """
@@ -555,30 +302,16 @@ class CoreMarkRunner:
 
     def get_cpu_affinity_list(self, n):
         """
-        Generate CPU affinity list for HyperThreading optimization.
+        Generate CPU affinity list for an n-thread run.
 
-        Prioritizes physical cores (even IDs) first, then logical cores (odd IDs).
-        Pattern: {0,2,4,...,1,3,5,...}
-
-        Args:
-            n: Number of threads
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
 
         Returns:
-            Comma-separated CPU list string (e.g., "0,2,4,1,3")
+            Comma-separated CPU list string (e.g., "0,1,2,3")
         """
-        half = self.vcpu_count // 2
-        cpu_list = []
-
-        if n <= half:
-            # Physical cores only: 0,2,4,...
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            # Physical cores + logical cores
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical_count = n - half
-            cpu_list.extend([str(i * 2 + 1) for i in range(logical_count)])
-
-        return ','.join(cpu_list)
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def install_benchmark(self, num_threads):
         """
@@ -978,10 +711,11 @@ class CoreMarkRunner:
         print(f"    Perf summary: {perf_summary_file}")
         print(f"{'<'*80}\n")
 
-        # Record CPU frequency before benchmark
-        # Uses cross-platform method (works on x86_64, ARM64, and cloud VMs)
-        print("[INFO] Recording CPU frequency before benchmark...")
-        if self.record_cpu_frequency(freq_start_file):
+        # Sample CPU frequency and utilization for the whole run
+        # (sysfs/procfs, read in-process by runner_common.CpuSampler)
+        print("[INFO] Starting CPU frequency/utilization sampler...")
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+        if cpu_sampler.start():
             print("  [OK] Start frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -1018,10 +752,9 @@ class CoreMarkRunner:
 
         pts_test_failed, pts_failure_reason = detect_pts_failure_from_log(log_file)
 
-        # Record CPU frequency after benchmark
-        # Uses cross-platform method (works on x86_64, ARM64, and cloud VMs)
-        print("\n[INFO] Recording CPU frequency after benchmark...")
-        if self.record_cpu_frequency(freq_end_file):
+        # Stop sampling: writes the end frequency and <N>-thread_cpu_samples.csv/.json
+        print("\n[INFO] Stopping CPU frequency/utilization sampler...")
+        if cpu_sampler.stop():
             print("  [OK] End frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -1045,6 +778,8 @@ class CoreMarkRunner:
                 )
 
                 # Save perf summary to JSON
+                perf_summary['cpu_placement'] = describe_cpu_placement(cpu_list)
+                perf_summary['cpu_samples'] = cpu_sampler.summary(cpu_list)
                 with open(perf_summary_file, 'w') as f:
                     json.dump(perf_summary, f, indent=2)
                 print(f"     Perf summary: {perf_summary_file}")
@@ -1289,7 +1024,7 @@ class CoreMarkRunner:
                 print(f"[INFO] Benchmark already installed, skipping installation: {self.benchmark_full}")
 
             # Run benchmark
-            if not self.run_benchmark(num_threads):
+            if not repeat_on_steal(self.run_benchmark, num_threads):
                 failed.append(num_threads)
 
         # Export results to CSV and JSON
@@ -34,129 +34,7 @@ import subprocess
 import sys
 from pathlib import Path
 
-from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status
-
-
-class PreSeedDownloader:
-    """
-    Utility to pre-download large test files into the Phoronix Test Suite cache.
-    """
-
-    def __init__(self, cache_dir=None):
-        if cache_dir:
-            self.cache_dir = Path(cache_dir)
-        else:
-            self.cache_dir = Path.home() / ".phoronix-test-suite" / "download-cache"
-        self.aria2_available = shutil.which("aria2c") is not None
-
-    def is_aria2_available(self):
-        return self.aria2_available
-
-    def download_from_xml(self, benchmark_name, threshold_mb=512):
-        if not self.aria2_available:
-            print("  [INFO] aria2c not found, skipping pre-seed")
-            return False
-
-        profile_path = Path.home() / ".phoronix-test-suite" / "test-profiles" / benchmark_name / "downloads.xml"
-        if not profile_path.exists():
-            print(f"  [WARN] downloads.xml not found at {profile_path}")
-            print(f"  [INFO] Attempting to fetch test profile via phoronix-test-suite info {benchmark_name}...")
-            try:
-                subprocess.run(
-                    ["phoronix-test-suite", "info", benchmark_name],
-                    check=False,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                )
-            except Exception as exc:
-                print(f"  [WARN] Failed to run phoronix-test-suite info: {exc}")
-                return False
-            if not profile_path.exists():
-                print(f"  [WARN] downloads.xml still missing after info: {profile_path}")
-                return False
-
-        try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(profile_path)
-            root = tree.getroot()
-            downloads_node = root.find("Downloads")
-            if downloads_node is None:
-                return False
-
-            for package in downloads_node.findall("Package"):
-                url_node = package.find("URL")
-                filename_node = package.find("FileName")
-                filesize_node = package.find("FileSize")
-                if url_node is None or filename_node is None:
-                    continue
-
-                urls = [u.strip() for u in (url_node.text or "").split(",") if u.strip()]
-                filename = (filename_node.text or "").strip()
-                if not urls or not filename:
-                    continue
-
-                size_bytes = -1
-                if filesize_node is not None and filesize_node.text:
-                    try:
-                        size_bytes = int(filesize_node.text.strip())
-                    except ValueError:
-                        size_bytes = -1
-
-                if size_bytes > 0 and size_bytes / (1024 * 1024) >= threshold_mb:
-                    print(
-                        f"  [INFO] {filename} is large ({size_bytes / (1024 * 1024):.1f} MB), "
-                        "accelerating with aria2c..."
-                    )
-                    self.ensure_file(urls, filename, size_bytes=size_bytes)
-        except Exception as exc:
-            print(f"  [ERROR] Failed to parse downloads.xml: {exc}")
-            return False
-
-        return True
-
-    def ensure_file(self, urls, filename, size_bytes=-1):
-        large_file_threshold_bytes = 10 * 1024 * 1024 * 1024
-        target_path = self.cache_dir / filename
-
-        if target_path.exists():
-            if size_bytes > 0:
-                actual = target_path.stat().st_size
-                if actual == size_bytes:
-                    print(f"  [CACHE] Verified: {filename}")
-                    return True
-                print(f"  [WARN] Incomplete cache: {filename} ({actual}/{size_bytes} bytes). Resuming...")
-            else:
-                print(f"  [CACHE] File found: {filename}")
-                return True
-
-        num_conn = 4 if size_bytes > 0 and size_bytes >= large_file_threshold_bytes else 16
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        cmd = [
-            "aria2c",
-            "-x",
-            str(num_conn),
-            "-s",
-            str(num_conn),
-            "--continue=true",
-            "--connect-timeout=30",
-            "--timeout=120",
-            "--max-tries=2",
-            "--retry-wait=5",
-            "-d",
-            str(self.cache_dir),
-            "-o",
-            filename,
-        ] + urls
-        try:
-            subprocess.run(cmd, check=True, timeout=5400)
-            print(f"  [OK] Pre-seeded: {filename}")
-            return True
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as exc:
-            print(f"  [WARN] aria2c download failed: {exc}")
-            if target_path.exists():
-                target_path.unlink()
-            return False
+from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, place_cpus, PreSeedDownloader, CpuSampler, repeat_on_steal
 
 
 class DacapoBenchRunner:
@@ -244,80 +122,17 @@ class DacapoBenchRunner:
             return False
 
     def get_cpu_affinity_list(self, n):
-        half = max(1, (self.vcpu_count // 2))
-        cpu_list = []
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n) if i * 2 < self.vcpu_count]
-        else:
-            cpu_list = [str(i * 2) for i in range(half) if i * 2 < self.vcpu_count]
-            logical_count = n - len(cpu_list)
-            cpu_list.extend(
-                [str(i * 2 + 1) for i in range(logical_count) if (i * 2 + 1) < self.vcpu_count]
-            )
-        cpu_list = cpu_list[:n]
-        if not cpu_list:
-            cpu_list = [str(i) for i in range(min(n, self.vcpu_count))]
-        return ",".join(cpu_list)
-
-    def get_cpu_frequencies(self):
-        frequencies = []
-
-        try:
-            result = subprocess.run(
-                ["bash", "-c", 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().splitlines():
-                    parts = line.split(":")
-                    if len(parts) >= 2:
-                        mhz = float(parts[1].strip())
-                        frequencies.append(int(mhz * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-
-        try:
-            freq_files = sorted(Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/scaling_cur_freq"))
-            if not freq_files:
-                freq_files = sorted(Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/cpuinfo_cur_freq"))
-            for freq_file in freq_files:
-                try:
-                    frequencies.append(int(freq_file.read_text().strip()))
-                except Exception:
-                    frequencies.append(0)
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        try:
-            result = subprocess.run(["lscpu"], capture_output=True, text=True, check=False)
-            if result.returncode == 0:
-                for line in result.stdout.splitlines():
-                    if "CPU MHz" in line or "CPU max MHz" in line:
-                        parts = line.split(":")
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(",", "."))
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
+        """
+        Generate CPU affinity list for an n-thread run.
 
-        return frequencies
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
 
-    def record_cpu_frequency(self, output_file):
-        frequencies = self.get_cpu_frequencies()
-        try:
-            with open(output_file, "w") as f:
-                for freq in frequencies:
-                    f.write(f"{freq}\n")
-            return bool(frequencies)
-        except Exception as exc:
-            print(f"  [WARN] Failed to write frequency file: {exc}")
-            return False
+        Returns:
+            Comma-separated CPU list string (e.g., "0,1,2,3")
+        """
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def get_perf_events(self):
         if not shutil.which("perf"):
@@ -515,7 +330,7 @@ class DacapoBenchRunner:
 
     def install_benchmark(self):
         print(f"\n>>> Installing {self.benchmark_full}...")
-        self.preseed.download_from_xml(self.benchmark_full)
+        self.preseed.download_from_xml(self.benchmark_full, threshold_mb=512)
 
         install_cmd = f'phoronix-test-suite batch-install {self.benchmark_full}'
         install_log_env = os.environ.get("PTS_INSTALL_LOG", "").strip().lower()
@@ -643,8 +458,9 @@ class DacapoBenchRunner:
 
         print(f"[INFO] {cpu_info}")
         print(f"[INFO] Perf monitoring mode: {perf_mode}")
-        print("[INFO] Recording CPU frequency before benchmark...")
-        if self.record_cpu_frequency(freq_start_file):
+        print("[INFO] Starting CPU frequency/utilization sampler...")
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+        if cpu_sampler.start():
             print("  [OK] Start frequency recorded")
         else:
             print("  [WARN] CPU frequency not available")
@@ -674,8 +490,8 @@ class DacapoBenchRunner:
             process.wait()
             returncode = process.returncode
 
-        print("\n[INFO] Recording CPU frequency after benchmark...")
-        if self.record_cpu_frequency(freq_end_file):
+        print("\n[INFO] Stopping CPU frequency/utilization sampler...")
+        if cpu_sampler.stop():
             print("  [OK] End frequency recorded")
         else:
             print("  [WARN] CPU frequency not available")
@@ -850,7 +666,7 @@ class DacapoBenchRunner:
             self.patch_dacapo_wrapper()
 
         for num_threads in self.thread_list:
-            if not self.run_benchmark(num_threads):
+            if not repeat_on_steal(self.run_benchmark, num_threads):
                 print(f"[WARN] Run failed for {num_threads} thread(s)")
 
         self.export_results()
@@ -34,112 +34,7 @@ import subprocess
 import sys
 from pathlib import Path
 
-from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts
-
-
-class PreSeedDownloader:
-    """Utility to pre-download benchmark source archives using aria2c if available."""
-
-    def __init__(self, cache_dir=None):
-        if cache_dir:
-            self.cache_dir = Path(cache_dir)
-        else:
-            self.cache_dir = Path.home() / ".phoronix-test-suite" / "download-cache"
-        self.aria2_available = shutil.which("aria2c") is not None
-
-    def download_from_xml(self, benchmark_name, threshold_mb=64):
-        """Parse downloads.xml and accelerate large files via aria2c."""
-        if not self.aria2_available:
-            return False
-
-        profile_path = (
-            Path.home() / ".phoronix-test-suite" / "test-profiles" / benchmark_name / "downloads.xml"
-        )
-        if not profile_path.exists():
-            print(f"  [WARN] downloads.xml not found at {profile_path}")
-            try:
-                subprocess.run(
-                    ["phoronix-test-suite", "info", benchmark_name],
-                    check=False,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                )
-            except Exception:
-                return False
-            if not profile_path.exists():
-                return False
-
-        try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(profile_path)
-            root = tree.getroot()
-            downloads_node = root.find("Downloads")
-            if downloads_node is None:
-                return False
-
-            for package in downloads_node.findall("Package"):
-                url_node = package.find("URL")
-                filename_node = package.find("FileName")
-                filesize_node = package.find("FileSize")
-
-                if url_node is None or filename_node is None:
-                    continue
-
-                urls = [u.strip() for u in (url_node.text or "").split(",") if u.strip()]
-                filename = (filename_node.text or "").strip()
-                if not urls or not filename:
-                    continue
-
-                size_bytes = -1
-                if filesize_node is not None and filesize_node.text:
-                    try:
-                        size_bytes = int(filesize_node.text.strip())
-                    except ValueError:
-                        pass
-
-                if size_bytes > 0 and size_bytes / (1024 * 1024) >= threshold_mb:
-                    print(f"  [INFO] {filename} is large, accelerating with aria2c...")
-                    self.ensure_file(urls, filename, size_bytes=size_bytes)
-        except Exception as exc:
-            print(f"  [WARN] Failed to parse downloads.xml: {exc}")
-            return False
-
-        return True
-
-    def ensure_file(self, urls, filename, size_bytes=-1):
-        """Download file using aria2c with simple size-aware cache validation."""
-        target_path = self.cache_dir / filename
-
-        if target_path.exists():
-            if size_bytes > 0 and target_path.stat().st_size == size_bytes:
-                print(f"  [CACHE] Verified: {filename}")
-                return True
-            if size_bytes <= 0:
-                print(f"  [CACHE] Found: {filename}")
-                return True
-
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        num_conn = 16 if size_bytes < 10 * 1024 * 1024 * 1024 else 4
-        cmd = [
-            "aria2c",
-            "-x",
-            str(num_conn),
-            "-s",
-            str(num_conn),
-            "--continue=true",
-            "-d",
-            str(self.cache_dir),
-            "-o",
-            filename,
-        ] + list(urls)
-
-        try:
-            subprocess.run(cmd, check=True)
-            return True
-        except subprocess.CalledProcessError as exc:
-            print(f"  [WARN] aria2c download failed for {filename}: {exc}")
-            return False
+from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts, place_cpus, describe_cpu_placement, PreSeedDownloader, CpuSampler, repeat_on_steal
 
 
 class MocassinRunner:
@@ -224,67 +119,6 @@ class MocassinRunner:
         except Exception:
             return False
 
-    def get_cpu_frequencies(self):
-        """Get current CPU frequencies (cross-platform)."""
-        frequencies = []
-
-        try:
-            result = subprocess.run(
-                ["bash", "-c", 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True,
-                text=True,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split("\n"):
-                    parts = line.split(":")
-                    if len(parts) >= 2:
-                        frequencies.append(int(float(parts[1].strip()) * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-
-        try:
-            freq_files = sorted(Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/scaling_cur_freq"))
-            if not freq_files:
-                freq_files = sorted(Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/cpuinfo_cur_freq"))
-            for freq_file in freq_files:
-                try:
-                    with open(freq_file, "r") as f:
-                        frequencies.append(int(f.read().strip()))
-                except Exception:
-                    frequencies.append(0)
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        try:
-            result = subprocess.run(["lscpu"], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split("\n"):
-                    if "CPU MHz" in line or "CPU max MHz" in line:
-                        parts = line.split(":")
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(",", "."))
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-
-        return frequencies
-
-    def record_cpu_frequency(self, output_file):
-        """Record CPU frequencies to file."""
-        frequencies = self.get_cpu_frequencies()
-        try:
-            with open(output_file, "w") as f:
-                for freq in frequencies:
-                    f.write(f"{freq}\n")
-            return bool(frequencies)
-        except Exception as exc:
-            print(f"  [WARN] Failed to write frequency file: {exc}")
-            return False
-
     def get_perf_events(self):
         """Determine available perf events (3-stage fallback)."""
         perf_path = shutil.which("perf")
@@ -369,21 +203,16 @@ class MocassinRunner:
 
     def get_cpu_affinity_list(self, n):
         """
-        Generate CPU affinity list preferring physical cores first.
+        Generate CPU affinity list for an n-thread run.
 
-        This matches the convention used by other CPU-bound runners in this repo.
-        """
-        half = self.vcpu_count // 2
-        cpu_list = []
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
 
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical_count = n - half
-            cpu_list.extend([str(i * 2 + 1) for i in range(logical_count)])
-
-        return ",".join(cpu_list)
+        Returns:
+            Comma-separated CPU list string (e.g., "0,1,2,3")
+        """
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def detect_physical_core_count(self):
         """Best-effort physical core detection with conservative fallbacks."""
@@ -700,7 +529,8 @@ class MocassinRunner:
         print(f"  [INFO] Visible physical cores for this run: {visible_physical}")
         print(f"  [INFO] MPI rank count target: {mpi_ranks}")
 
-        self.record_cpu_frequency(freq_start_file)
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+        cpu_sampler.start()
 
         with open(log_file, "w") as log_f, open(stdout_log, "a") as stdout_f:
             stdout_f.write(f"\n{'='*80}\n")
@@ -725,7 +555,7 @@ class MocassinRunner:
             process.wait()
             returncode = process.returncode
 
-        self.record_cpu_frequency(freq_end_file)
+        cpu_sampler.stop()
         pts_test_failed, pts_failure_reason = detect_pts_failure_from_log(log_file)
 
         if returncode == 0 and not pts_test_failed:
@@ -733,7 +563,7 @@ class MocassinRunner:
             if self.perf_events and perf_stats_file.exists():
                 try:
                     with open(perf_summary_file, "w") as f:
-                        json.dump({"perf_stats_file": str(perf_stats_file), "cpu_list": cpu_list}, f, indent=2)
+                        json.dump({"perf_stats_file": str(perf_stats_file), "cpu_list": cpu_list, "cpu_placement": describe_cpu_placement(cpu_list), "cpu_samples": cpu_sampler.summary(cpu_list)}, f, indent=2)
                 except Exception as exc:
                     print(f"  [WARN] Failed to save perf summary: {exc}")
             return True
@@ -891,7 +721,7 @@ class MocassinRunner:
 
         failed = []
         for num_threads in self.thread_list:
-            if not self.run_benchmark(num_threads):
+            if not repeat_on_steal(self.run_benchmark, num_threads):
                 failed.append(num_threads)
 
         self.export_results()
@@ -43,7 +43,7 @@ import tempfile
 from contextlib import contextmanager
 from pathlib import Path
 
-from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status
+from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, place_cpus, CpuSampler, repeat_on_steal
 
 
 # ── Python version guard ──────────────────────────────────────────────────────
@@ -637,7 +637,8 @@ class NumpyBenchmarkRunner:
             self._bench_failed.append(f"{num_threads}threads")
             return False
 
-        self.record_cpu_frequency(freq_start_file)
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file)
+        cpu_sampler.start()
 
         # Perf wrap (informational; numpy benchmark is short enough for process-level perf)
         if self.perf_events and self.perf_paranoid <= 0:
@@ -652,12 +653,13 @@ class NumpyBenchmarkRunner:
             if value is not None:
                 values.append(value)
 
-        self.record_cpu_frequency(freq_end_file)
+        cpu_sampler.stop()
 
         # Perf summary (if collected)
         if self.perf_events and perf_stats_file.exists():
             try:
                 perf_summary = self.parse_perf_stats(perf_stats_file)
+                perf_summary["cpu_samples"] = cpu_sampler.summary()
                 with open(perf_summary_file, "w") as pf:
                     json.dump(perf_summary, pf, indent=2)
             except Exception as e:
@@ -810,93 +812,14 @@ class NumpyBenchmarkRunner:
             return False
 
     def get_cpu_affinity_list(self, n: int) -> str:
-        """Return comma-separated CPU list optimised for HyperThreading."""
-        half = self.vcpu_count // 2
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical_count = n - half
-            cpu_list.extend([str(i * 2 + 1) for i in range(logical_count)])
-        return ",".join(cpu_list)
-
-    def get_cpu_frequencies(self) -> list:
         """
-        Get current CPU frequencies for all CPUs.
-        Tries multiple methods for cross-platform compatibility (x86_64, ARM64, cloud VMs).
-        Returns list of frequencies in kHz; empty list if unavailable.
-        """
-        frequencies: list[int] = []
-
-        # Method 1: /proc/cpuinfo (x86_64)
-        try:
-            result = subprocess.run(
-                ["bash", "-c", 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True, text=True,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split("\n"):
-                    parts = line.split(":")
-                    if len(parts) >= 2:
-                        mhz = float(parts[1].strip())
-                        frequencies.append(int(mhz * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
+        Generate CPU affinity list for an n-thread run.
 
-        # Method 2: /sys/devices/system/cpu/cpufreq (ARM64 + some x86)
-        try:
-            freq_files = sorted(
-                Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/scaling_cur_freq")
-            )
-            if not freq_files:
-                freq_files = sorted(
-                    Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/cpuinfo_cur_freq")
-                )
-            for freq_file in freq_files:
-                try:
-                    frequencies.append(int(freq_file.read_text().strip()))
-                except Exception:
-                    frequencies.append(0)
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        # Method 3: lscpu (fallback)
-        try:
-            result = subprocess.run(["lscpu"], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split("\n"):
-                    if "CPU MHz" in line or "CPU max MHz" in line:
-                        parts = line.split(":")
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(",", "."))
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-
-        return frequencies
-
-    def record_cpu_frequency(self, output_file: Path) -> bool:
-        """Write CPU frequencies to file; return True on success."""
-        frequencies = self.get_cpu_frequencies()
-        if frequencies:
-            try:
-                with open(output_file, "w") as f:
-                    for freq in frequencies:
-                        f.write(f"{freq}\n")
-                return True
-            except Exception as e:
-                print(f"  [WARN] Failed to write frequency file: {e}")
-                return False
-        else:
-            try:
-                output_file.touch()
-            except Exception:
-                pass
-            return False
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
+        """
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def parse_perf_stats(self, perf_stats_file: Path) -> dict:
         """Parse perf stat output file and return metrics dict."""
@@ -1050,7 +973,7 @@ class NumpyBenchmarkRunner:
             print(f">>> Running {self.benchmark} with {num_threads} thread(s)")
             print(f"{'='*80}")
 
-            success = self.run_benchmark(num_threads)
+            success = repeat_on_steal(self.run_benchmark, num_threads)
             if not success:
                 print(f"[ERROR] Benchmark failed for {num_threads} thread(s)")
                 sys.exit(1)
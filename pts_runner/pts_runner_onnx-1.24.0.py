@@ -58,7 +58,7 @@ import urllib.request
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
-from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, get_pts_download_cache_dir, get_pts_home, get_pts_installed_dir, get_pts_profile_dir
+from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, get_pts_download_cache_dir, get_pts_home, get_pts_installed_dir, get_pts_profile_dir, place_cpus, PreSeedDownloader as SharedPreSeedDownloader, CpuSampler, repeat_on_steal
 
 
 # ---------------------------------------------------------------------------
@@ -87,9 +87,6 @@ RESULT_RE = re.compile(r"Number of inferences per second:\s+([\d.]+)")
 # Number of timed runs per model (matches PTS TimesToRun=3)
 TIMES_TO_RUN = 3
 
-# Large-file threshold for aria2c connection count decision
-_LARGE_FILE_THRESHOLD_BYTES = 10 * 1024 * 1024 * 1024  # 10 GB
-
 
 def normalize_onnx_download_url(url):
     marker = "https://github.com/onnx/models/blob/"
@@ -121,90 +118,16 @@ def probe_download_url(url, timeout=20):
 # PreSeedDownloader
 # ---------------------------------------------------------------------------
 
-class PreSeedDownloader:
-    """Pre-download large test files into PTS download cache using aria2c."""
+class PreSeedDownloader(SharedPreSeedDownloader):
+    """Shared downloader, restricted to mirrors that serve the file (not an HTML page)."""
 
     def __init__(self, cache_dir=None, pts_home=None):
-        self.pts_home = Path(pts_home) if pts_home else get_pts_home()
-        if cache_dir:
-            self.cache_dir = Path(cache_dir)
-        else:
-            self.cache_dir = get_pts_download_cache_dir()
-        self.aria2_available = shutil.which("aria2c") is not None
+        super().__init__(cache_dir=cache_dir, pts_home=pts_home)
         self._validated_urls = {}
 
-    def is_aria2_available(self):
-        return self.aria2_available
-
-    def download_from_xml(self, benchmark_name, threshold_mb=96, skip_optional=False):
-        """Parse downloads.xml and accelerate large files with aria2c."""
-        if not self.aria2_available:
-            return False
-
-        profile_path = self.pts_home / "test-profiles" / benchmark_name / "downloads.xml"
-        if not profile_path.exists():
-            print(f"  [WARN] downloads.xml not found at {profile_path}")
-            print(f"  [INFO] Fetching test profile via phoronix-test-suite info {benchmark_name}...")
-            try:
-                subprocess.run(
-                    ["phoronix-test-suite", "info", benchmark_name],
-                    check=False,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                )
-            except Exception as e:
-                print(f"  [WARN] Failed to run phoronix-test-suite info: {e}")
-                return False
-            if not profile_path.exists():
-                print(f"  [WARN] downloads.xml still missing: {profile_path}")
-                return False
-
-        try:
-            tree = ET.parse(profile_path)
-            root = tree.getroot()
-            downloads_node = root.find("Downloads")
-            if downloads_node is None:
-                return False
-            for package in downloads_node.findall("Package"):
-                url_node = package.find("URL")
-                filename_node = package.find("FileName")
-                filesize_node = package.find("FileSize")
-                if url_node is None or filename_node is None:
-                    continue
-                if skip_optional:
-                    optional_node = package.find("Optional")
-                    if optional_node is not None and optional_node.text:
-                        if optional_node.text.strip().upper() == "TRUE":
-                            filename_hint = filename_node.text.strip() if filename_node.text else "(unknown)"
-                            print(f"  [SKIP] Optional package skipped: {filename_hint}")
-                            continue
-                urls = self._get_alive_urls(url_node.text)
-                url = urls[0] if urls else None
-                filename = filename_node.text.strip()
-                if not url:
-                    print(f"  [SKIP] No live download URL: {filename}")
-                    continue
-                size_bytes = -1
-                if filesize_node is not None and filesize_node.text:
-                    try:
-                        size_bytes = int(filesize_node.text.strip())
-                    except ValueError:
-                        pass
-                if size_bytes <= 0:
-                    size_bytes = self._get_remote_file_size(url)
-                if size_bytes > 0:
-                    size_mb = size_bytes / (1024 * 1024)
-                    if size_mb >= threshold_mb:
-                        print(f"  [INFO] {filename} is large ({size_mb:.1f} MB), accelerating with aria2c...")
-                        self._ensure_file(urls, filename, size_bytes=size_bytes)
-        except Exception as e:
-            print(f"  [ERROR] Failed to parse downloads.xml: {e}")
-            return False
-        return True
-
-    def _get_alive_urls(self, raw_urls):
+    def resolve_urls(self, urls):
         alive_urls = []
-        for raw_url in [u.strip() for u in raw_urls.split(",") if u.strip()]:
+        for raw_url in urls:
             if raw_url not in self._validated_urls:
                 self._validated_urls[raw_url] = probe_download_url(raw_url)
             live_url = self._validated_urls[raw_url]
@@ -212,55 +135,6 @@ class PreSeedDownloader:
                 alive_urls.append(live_url)
         return alive_urls
 
-    def _get_remote_file_size(self, url):
-        try:
-            result = subprocess.run(
-                ["curl", "-s", "-I", "-L", url],
-                capture_output=True, text=True,
-            )
-            if result.returncode != 0:
-                return -1
-            for line in result.stdout.splitlines():
-                if line.lower().startswith("content-length:"):
-                    try:
-                        return int(line.split(":")[1].strip())
-                    except ValueError:
-                        pass
-        except Exception:
-            pass
-        return -1
-
-    def _ensure_file(self, urls, filename, size_bytes=-1):
-        target_path = self.cache_dir / filename
-        if target_path.exists():
-            if size_bytes > 0:
-                actual = target_path.stat().st_size
-                if actual == size_bytes:
-                    print(f"  [CACHE] Verified: {filename} ({actual / (1024 ** 3):.1f} GB)")
-                    return True
-                else:
-                    print(f"  [WARN] Incomplete cache: {filename} ({actual}/{size_bytes} bytes). Resuming...")
-            else:
-                print(f"  [CACHE] File found: {filename}")
-                return True
-        if isinstance(urls, str):
-            urls = [urls]
-        num_conn = 4 if (size_bytes > 0 and size_bytes >= _LARGE_FILE_THRESHOLD_BYTES) else 16
-        print(f"  [ARIA2] Downloading {filename} with {num_conn} connections...")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        cmd = [
-            "aria2c",
-            "-x", str(num_conn), "-s", str(num_conn),
-            "--continue=true",
-            "-d", str(self.cache_dir), "-o", filename,
-        ] + urls
-        try:
-            subprocess.run(cmd, check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"  [ERROR] aria2c download failed for {filename}: {e}")
-            return False
-        return True
-
 
 # ---------------------------------------------------------------------------
 # OnnxRuntimeRunner
@@ -405,7 +279,7 @@ class OnnxRuntimeRunner:
             print("\n" + "=" * 80)
             print(f">>> Running {self.benchmark} with {num_threads} thread(s)")
             print("=" * 80)
-            if not self.run_benchmark(num_threads, perf_bin, available_models):
+            if not repeat_on_steal(self.run_benchmark, num_threads, perf_bin, available_models):
                 print(f"[ERROR] Benchmark failed for {num_threads} thread(s)")
                 failed_threads.append(num_threads)
 
@@ -884,8 +758,9 @@ class OnnxRuntimeRunner:
         perf_summary_file = self.results_dir / f"{num_threads}-thread_perf_summary.json"
 
         # Record CPU frequency before
-        print("[INFO] Recording CPU frequency before benchmark...")
-        if self.record_cpu_frequency(freq_start_file):
+        print("[INFO] Starting CPU frequency/utilization sampler...")
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file)
+        if cpu_sampler.start():
             print("  [OK] Start frequency recorded")
         else:
             print("  [WARN] CPU frequency not available (common on ARM64/cloud VMs)")
@@ -940,7 +815,7 @@ class OnnxRuntimeRunner:
                 print(f"  [FAILED] {model_name}: all {n_runs} runs failed")
 
         # Record CPU frequency after
-        if self.record_cpu_frequency(freq_end_file):
+        if cpu_sampler.stop():
             print("  [OK] End frequency recorded")
         else:
             print("  [WARN] CPU frequency not available")
@@ -949,6 +824,7 @@ class OnnxRuntimeRunner:
         if self.perf_events and perf_stats_file.exists():
             try:
                 perf_summary = self.parse_perf_stats(perf_stats_file)
+                perf_summary["cpu_samples"] = cpu_sampler.summary()
                 with open(perf_summary_file, "w") as pf:
                     json.dump(perf_summary, pf, indent=2)
             except Exception as e:
@@ -1097,88 +973,17 @@ class OnnxRuntimeRunner:
             return False
 
     def get_cpu_affinity_list(self, n):
-        """Return comma-separated CPU list optimised for HyperThreading."""
-        half = self.vcpu_count // 2
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical = n - half
-            cpu_list.extend(str(i * 2 + 1) for i in range(logical))
-        return ",".join(cpu_list)
-
-    def get_cpu_frequencies(self):
-        """Return list of CPU frequencies in kHz (cross-platform)."""
-        frequencies = []
-
-        # Method 1: /proc/cpuinfo (x86_64)
-        try:
-            result = subprocess.run(
-                ["bash", "-c", 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True, text=True,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split("\n"):
-                    parts = line.split(":")
-                    if len(parts) >= 2:
-                        frequencies.append(int(float(parts[1].strip()) * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-
-        # Method 2: /sys/devices/system/cpu/cpufreq (ARM64 + some x86)
-        try:
-            freq_files = sorted(
-                Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/scaling_cur_freq")
-            )
-            if not freq_files:
-                freq_files = sorted(
-                    Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/cpuinfo_cur_freq")
-                )
-            for freq_file in freq_files:
-                try:
-                    frequencies.append(int(freq_file.read_text().strip()))
-                except Exception:
-                    frequencies.append(0)
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        # Method 3: lscpu (fallback)
-        try:
-            result = subprocess.run(["lscpu"], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split("\n"):
-                    if "CPU MHz" in line or "CPU max MHz" in line:
-                        parts = line.split(":")
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(",", "."))
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
+        """
+        Generate CPU affinity list for an n-thread run.
 
-        return frequencies
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
 
-    def record_cpu_frequency(self, output_file):
-        """Write CPU frequencies to file; return True on success."""
-        frequencies = self.get_cpu_frequencies()
-        if frequencies:
-            try:
-                with open(output_file, "w") as f:
-                    for freq in frequencies:
-                        f.write(f"{freq}\n")
-                return True
-            except Exception as e:
-                print(f"  [WARN] Failed to write frequency file: {e}")
-                return False
-        else:
-            try:
-                open(output_file, "w").close()
-            except Exception:
-                pass
-            return False
+        Returns:
+            Comma-separated CPU list string (e.g., "0,1,2,3")
+        """
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def parse_perf_stats(self, perf_stats_file):
         """Parse perf stat output file and return metrics dict."""
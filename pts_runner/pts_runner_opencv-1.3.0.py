@@ -22,7 +22,7 @@ import time
 import re
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts
+from runner_common import detect_pts_failure_from_log, get_install_status, cleanup_pts_artifacts, place_cpus, CpuSampler, repeat_on_steal
 
 class OpenCVRunner:
     def __init__(self, threads_arg=None, quick_mode=False):
@@ -145,116 +145,18 @@ class OpenCVRunner:
             return False
 
     def get_cpu_affinity_list(self, n):
-        """Generate CPU affinity list for HyperThreading optimization."""
-        half = self.vcpu_count // 2
-        cpu_list = []
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical_count = n - half
-            cpu_list.extend([str(i * 2 + 1) for i in range(logical_count)])
-        return ','.join(cpu_list)
-
-
-    def get_cpu_frequencies(self):
-        """
-        Get current CPU frequencies for all CPUs.
-        Tries multiple methods for cross-platform compatibility (x86_64, ARM64, cloud VMs).
-
-        Returns:
-            list: List of frequencies in kHz, one per CPU. Empty list if unavailable.
-        """
-        frequencies = []
-
-        # Method 1: /proc/cpuinfo (works on x86_64)
-        try:
-            result = subprocess.run(
-                ['bash', '-c', 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split('\n'):
-                    # Format: "cpu MHz		: 3400.000"
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        mhz = float(parts[1].strip())
-                        frequencies.append(int(mhz * 1000))  # Convert MHz to kHz
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-
-        # Method 2: /sys/devices/system/cpu/cpufreq (works on ARM64 and some x86)
-        try:
-            # Try scaling_cur_freq first (more commonly available)
-            freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/scaling_cur_freq'))
-            if not freq_files:
-                # Fallback to cpuinfo_cur_freq
-                freq_files = sorted(Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/cpuinfo_cur_freq'))
-
-            for freq_file in freq_files:
-                try:
-                    with open(freq_file, 'r') as f:
-                        freq_khz = int(f.read().strip())
-                        frequencies.append(freq_khz)
-                except Exception:
-                    frequencies.append(0)
-
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        # Method 3: lscpu (fallback)
-        try:
-            result = subprocess.run(
-                ['lscpu'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'CPU MHz' in line or 'CPU max MHz' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(',', '.'))
-                            # Return same frequency for all CPUs
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-
-        return frequencies
-
-    def record_cpu_frequency(self, output_file):
         """
-        Record current CPU frequencies to a file.
+        Generate CPU affinity list for an n-thread run.
 
-        Args:
-            output_file: Path to output file
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
 
         Returns:
-            bool: True if successful, False otherwise
+            Comma-separated CPU list string (e.g., "0,1,2,3")
         """
-        frequencies = self.get_cpu_frequencies()
-        if frequencies:
-            try:
-                with open(output_file, 'w') as f:
-                    for freq in frequencies:
-                        f.write(f"{freq}\n")
-                return True
-            except Exception as e:
-                print(f"  [WARN] Failed to write frequency file: {e}")
-                return False
-        else:
-            # Write empty file to indicate unavailability
-            try:
-                with open(output_file, 'w') as f:
-                    pass
-                return False
-            except Exception:
-                return False
+        return ','.join(str(cpu) for cpu in place_cpus(n))
+
 
     def get_perf_events(self):
         """
@@ -960,8 +862,9 @@ class OpenCVRunner:
         else:
             pts_cmd = f'{batch_env} {inner_cmd}'
 
-        # Record start freq (cross-platform: x86_64, ARM64, cloud VMs)
-        self.record_cpu_frequency(freq_start_file)
+        # Start sampling CPU frequency and utilization
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file)
+        cpu_sampler.start()
 
         with open(log_file, 'w') as log_f, open(stdout_log, 'a') as stdout_f:
             stdout_f.write(f"\n{'='*80}\n")
@@ -998,8 +901,8 @@ class OpenCVRunner:
         for cmd in remove_cmds:
             subprocess.run(['bash', '-c', cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-        # Record end freq (cross-platform: x86_64, ARM64, cloud VMs)
-        self.record_cpu_frequency(freq_end_file)
+        # Stop sampling CPU frequency and utilization
+        cpu_sampler.stop()
         
         if returncode == 124:
             print(f"  [ERROR] OpenCV benchmark timed out at {thread_timeout}s for {num_threads} threads")
@@ -1089,7 +992,7 @@ class OpenCVRunner:
             self.patch_test_definition_to_installed_binaries()
 
             for t in self.thread_list:
-                self.run_benchmark(t)
+                repeat_on_steal(self.run_benchmark, t)
 
             self.export_results()
             self.generate_summary()
@@ -49,7 +49,7 @@ import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status
+from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, place_cpus, CpuSampler, repeat_on_steal
 
 # ── Python version guard ──────────────────────────────────────────────────────
 
@@ -480,9 +480,10 @@ class PyperformanceBenchmarkRunner:
 
             freq_start_file = self.results_dir / f"{bench}-{num_threads}threads-freq_start.txt"
             freq_end_file = self.results_dir / f"{bench}-{num_threads}threads-freq_end.txt"
-            self.record_cpu_frequency(freq_start_file)
+            cpu_sampler = CpuSampler(freq_start_file, freq_end_file)
+            cpu_sampler.start()
             value = self._run_one_benchmark(bench)
-            self.record_cpu_frequency(freq_end_file)
+            cpu_sampler.stop()
             if value is not None:
                 results[bench] = value
                 print(f"  [RESULT] {bench}: {value:.3f} ms")
@@ -599,16 +600,14 @@ class PyperformanceBenchmarkRunner:
         return "Unknown_OS"
 
     def get_cpu_affinity_list(self, n: int) -> str:
-        """Generate CPU affinity list for HyperThreading optimization."""
-        half = self.vcpu_count // 2
-        cpu_list: list[str] = []
-        if n <= half:
-            cpu_list = [str(i * 2) for i in range(n)]
-        else:
-            cpu_list = [str(i * 2) for i in range(half)]
-            logical_count = n - half
-            cpu_list.extend([str(i * 2 + 1) for i in range(logical_count)])
-        return ','.join(cpu_list)
+        """
+        Generate CPU affinity list for an n-thread run.
+
+        Follows the real SMT/NUMA topology (runner_common.place_cpus); the
+        policy comes from PTS_CPU_PLACEMENT (default: one thread per physical
+        core first, then SMT siblings).
+        """
+        return ','.join(str(cpu) for cpu in place_cpus(n))
 
     def is_wsl(self) -> bool:
         """Detect if running in WSL environment (for logging purposes only)."""
@@ -621,85 +620,6 @@ class PyperformanceBenchmarkRunner:
         except Exception:
             return False
 
-    def get_cpu_frequencies(self) -> list:
-        """
-        Get current CPU frequencies for all CPUs.
-        Tries multiple methods for cross-platform compatibility (x86_64, ARM64, cloud VMs).
-        Returns list of frequencies in kHz; empty list if unavailable.
-        """
-        frequencies: list[int] = []
-
-        # Method 1: /proc/cpuinfo (works on x86_64)
-        try:
-            result = subprocess.run(
-                ['bash', '-c', 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True, text=True,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split('\n'):
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        mhz = float(parts[1].strip())
-                        frequencies.append(int(mhz * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-
-        # Method 2: /sys/devices/system/cpu/cpufreq (works on ARM64 and some x86)
-        try:
-            freq_files = sorted(
-                Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/scaling_cur_freq')
-            )
-            if not freq_files:
-                freq_files = sorted(
-                    Path('/sys/devices/system/cpu').glob('cpu[0-9]*/cpufreq/cpuinfo_cur_freq')
-                )
-            for freq_file in freq_files:
-                try:
-                    with open(freq_file) as f:
-                        frequencies.append(int(f.read().strip()))
-                except Exception:
-                    frequencies.append(0)
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-
-        # Method 3: lscpu (fallback)
-        try:
-            result = subprocess.run(['lscpu'], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'CPU MHz' in line or 'CPU max MHz' in line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            mhz = float(parts[1].strip().replace(',', '.'))
-                            return [int(mhz * 1000)] * self.vcpu_count
-        except Exception:
-            pass
-
-        return frequencies
-
-    def record_cpu_frequency(self, output_file: Path) -> bool:
-        """Record current CPU frequencies to a file."""
-        frequencies = self.get_cpu_frequencies()
-        if frequencies:
-            try:
-                with open(output_file, 'w') as f:
-                    for freq in frequencies:
-                        f.write(f"{freq}\n")
-                return True
-            except Exception as e:
-                print(f"  [WARN] Failed to write frequency file: {e}")
-                return False
-        else:
-            try:
-                output_file.touch()
-            except Exception:
-                pass
-            return False
-
     def check_and_setup_perf_permissions(self) -> int:
         """
         Check perf_event_paranoid and attempt sudo adjustment if too restrictive.
@@ -839,7 +759,7 @@ class PyperformanceBenchmarkRunner:
             print(f">>> Running {self.benchmark} with {num_threads} thread(s)")
             print(f"{'='*80}")
 
-            success = self.run_benchmark(num_threads)
+            success = repeat_on_steal(self.run_benchmark, num_threads)
             if not success:
                 print(f"[ERROR] Benchmark failed for {num_threads} thread(s)")
                 sys.exit(1)
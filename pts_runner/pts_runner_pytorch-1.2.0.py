@@ -44,7 +44,7 @@ import tempfile
 import textwrap
 from pathlib import Path
 
-from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, get_pts_profile_dir
+from runner_common import cleanup_pts_artifacts, detect_pts_failure_from_log, get_install_status, get_pts_profile_dir, CpuSampler, repeat_on_steal
 
 
 BENCHMARK = "pytorch-1.2.0"
@@ -433,7 +433,8 @@ class PyTorchBenchmarkRunner:
         perf_stats_file = self.results_dir / f"{num_threads}threads-perf_stats.txt"
         perf_summary_file = self.results_dir / f"{num_threads}threads-perf_summary.json"
 
-        self.record_cpu_frequency(freq_start_file)
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file)
+        cpu_sampler.start()
 
         thread_results: dict[str, float] = {}
         thread_failed: list[str] = []
@@ -454,11 +455,12 @@ class PyTorchBenchmarkRunner:
                 thread_failed.append(f"{num_threads}threads:{workload_key}")
                 print(f"  [FAILED] {workload_key}: all {self.times_to_run} run(s) failed")
 
-        self.record_cpu_frequency(freq_end_file)
+        cpu_sampler.stop()
 
         if self.perf_events and perf_stats_file.exists():
             try:
                 perf_summary = self.parse_perf_stats(perf_stats_file)
+                perf_summary["cpu_samples"] = cpu_sampler.summary()
                 with open(perf_summary_file, "w") as pf:
                     json.dump(perf_summary, pf, indent=2)
             except Exception as e:
@@ -599,59 +601,6 @@ class PyTorchBenchmarkRunner:
         except Exception:
             return False
 
-    def get_cpu_frequencies(self) -> list[int]:
-        frequencies: list[int] = []
-        try:
-            result = subprocess.run(
-                ["bash", "-c", 'grep "cpu MHz" /proc/cpuinfo'],
-                capture_output=True,
-                text=True,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                for line in result.stdout.strip().split("\n"):
-                    parts = line.split(":")
-                    if len(parts) >= 2:
-                        frequencies.append(int(float(parts[1].strip()) * 1000))
-                if frequencies:
-                    return frequencies
-        except Exception:
-            pass
-        try:
-            freq_files = sorted(
-                Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/scaling_cur_freq")
-            )
-            if not freq_files:
-                freq_files = sorted(
-                    Path("/sys/devices/system/cpu").glob("cpu[0-9]*/cpufreq/cpuinfo_cur_freq")
-                )
-            for freq_file in freq_files:
-                try:
-                    frequencies.append(int(freq_file.read_text().strip()))
-                except Exception:
-                    frequencies.append(0)
-            if frequencies:
-                return frequencies
-        except Exception:
-            pass
-        return frequencies
-
-    def record_cpu_frequency(self, output_file: Path) -> bool:
-        frequencies = self.get_cpu_frequencies()
-        if frequencies:
-            try:
-                with open(output_file, "w") as f:
-                    for freq in frequencies:
-                        f.write(f"{freq}\n")
-                return True
-            except Exception as e:
-                print(f"  [WARN] Failed to write frequency file: {e}")
-                return False
-        try:
-            output_file.touch()
-        except Exception:
-            pass
-        return False
-
     def parse_perf_stats(self, perf_stats_file: Path) -> dict:
         metrics: dict = {}
         try:
@@ -787,7 +736,7 @@ class PyTorchBenchmarkRunner:
             print(f"\n{'=' * 80}")
             print(f">>> Running {self.benchmark} with {num_threads} thread(s)")
             print(f"{'=' * 80}")
-            success = self.run_benchmark(num_threads)
+            success = repeat_on_steal(self.run_benchmark, num_threads)
             if not success:
                 print(f"[ERROR] Benchmark failed for {num_threads} thread(s)")
                 sys.exit(1)
@@ -1,10 +1,20 @@
 #!/usr/bin/env python3
 
+import fcntl
+import hashlib
+import json
 import os
+import platform
 import re
 import shutil
 import subprocess
+import threading
+import time
+import xml.etree.ElementTree as ET
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 
 def _strip_ansi(text: str) -> str:
@@ -177,3 +187,916 @@ def cleanup_pts_artifacts(benchmark: str) -> None:
                     print(f"  [WARN] Failed to remove PTS result {name}: {e}")
 
     print("  [CLEAN] Cleanup done (download-cache preserved)")
+
+
+# ---------------------------------------------------------------------------
+# CPU placement for N-thread runs (taskset lists)
+# ---------------------------------------------------------------------------
+
+CPU_PLACEMENT_POLICIES = ("physical", "compact", "scatter", "smt-pairs")
+DEFAULT_CPU_PLACEMENT = "physical"
+SYSFS_CPU_DIR = Path("/sys/devices/system/cpu")
+SYSFS_NODE_DIR = Path("/sys/devices/system/node")
+
+_topology_cache: dict = {}
+
+
+def _parse_cpu_range_list(text: str) -> list[int]:
+    """Parse a sysfs CPU list such as "0-3,8-11" or "0,64"."""
+    cpus = []
+    for part in (text or "").strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def read_cpu_topology(cpu_dir: Path = SYSFS_CPU_DIR, node_dir: Path = SYSFS_NODE_DIR) -> dict:
+    """Return the online CPUs grouped into physical cores and NUMA nodes.
+
+    Cores are taken from topology/thread_siblings_list, so SMT siblings are
+    found wherever the kernel numbers them: i and i+N/2 on most Intel/AMD
+    cloud VMs, i and i+1 on some others, and no siblings at all on
+    Graviton/Ampere.  Without sysfs topology (WSL1, some containers) every
+    CPU counts as its own core on node 0.
+
+    Returns:
+        {"cores": [[cpu, sibling, ...], ...] ordered by (node, first cpu),
+         "node_of": {cpu: node}, "source": "sysfs" | "fallback"}
+    """
+    key = (str(cpu_dir), str(node_dir))
+    if key in _topology_cache:
+        return _topology_cache[key]
+
+    try:
+        online = _parse_cpu_range_list((cpu_dir / "online").read_text())
+    except (OSError, ValueError):
+        online = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+
+    node_of = {}
+    for node_path in sorted(node_dir.glob("node[0-9]*")):
+        try:
+            for cpu in _parse_cpu_range_list((node_path / "cpulist").read_text()):
+                node_of[cpu] = int(node_path.name[len("node"):])
+        except (OSError, ValueError):
+            continue
+
+    source = "sysfs"
+    cores: dict[int, list[int]] = {}
+    for cpu in online:
+        try:
+            siblings = [c for c in _parse_cpu_range_list(
+                (cpu_dir / f"cpu{cpu}" / "topology" / "thread_siblings_list").read_text()) if c in online]
+        except (OSError, ValueError):
+            siblings, source = [cpu], "fallback"
+        cores.setdefault(min(siblings or [cpu]), sorted(siblings or [cpu]))
+
+    topology = {
+        "cores": sorted(cores.values(), key=lambda core: (node_of.get(core[0], 0), core[0])),
+        "node_of": {cpu: node_of.get(cpu, 0) for cpu in online},
+        "source": source,
+    }
+    _topology_cache[key] = topology
+    return topology
+
+
+def get_cpu_placement_policy() -> str:
+    """Placement policy from PTS_CPU_PLACEMENT (default: physical)."""
+    policy = os.environ.get("PTS_CPU_PLACEMENT", "").strip().lower() or DEFAULT_CPU_PLACEMENT
+    if policy not in CPU_PLACEMENT_POLICIES:
+        print(f"  [WARN] Unknown PTS_CPU_PLACEMENT '{policy}' "
+              f"(choose from {', '.join(CPU_PLACEMENT_POLICIES)}), using {DEFAULT_CPU_PLACEMENT}")
+        policy = DEFAULT_CPU_PLACEMENT
+    return policy
+
+
+def place_cpus(n: int, policy: Optional[str] = None, topology: Optional[dict] = None) -> list[int]:
+    """Pick the CPUs for an n-thread run.
+
+    Policies:
+        physical   one thread per physical core first (node by node), SMT siblings after
+        compact    fill each core's SMT siblings before moving to the next core
+        scatter    like physical, but alternating between NUMA nodes
+        smt-pairs  legacy {0,2,4,...,1,3,5,...}: assumes siblings are even/odd
+                   pairs; only for comparing with results taken before this module
+    """
+    policy = policy or get_cpu_placement_policy()
+    topology = topology or read_cpu_topology()
+    cores = topology["cores"]
+    all_cpus = sorted(cpu for core in cores for cpu in core)
+
+    if policy == "smt-pairs":
+        half = len(all_cpus) // 2
+        order = [all_cpus[i * 2] for i in range(half)] + [all_cpus[i * 2 + 1] for i in range(half)]
+        order += [cpu for cpu in all_cpus if cpu not in order]
+    elif policy == "compact":
+        order = [cpu for core in cores for cpu in core]
+    else:
+        if policy == "scatter":
+            by_node: dict[int, list[list[int]]] = {}
+            for core in cores:
+                by_node.setdefault(topology["node_of"].get(core[0], 0), []).append(core)
+            queues = [by_node[node] for node in sorted(by_node)]
+            cores = [queue[i] for i in range(max(len(q) for q in queues)) for queue in queues if i < len(queue)]
+        depth = max(len(core) for core in cores)
+        order = [core[level] for level in range(depth) for core in cores if level < len(core)]
+
+    return order[:max(1, min(n, len(order)))]
+
+
+def describe_cpu_placement(cpu_list: str, policy: Optional[str] = None, topology: Optional[dict] = None) -> dict:
+    """Placement record for <N>-thread_perf_summary.json.
+
+    Lets analytics tell whether two "N-thread" results used the same number
+    of physical cores.  policy is "all" when every online CPU was used (no taskset).
+    """
+    topology = topology or read_cpu_topology()
+    cpus = [int(c) for c in str(cpu_list).split(",") if c.strip()]
+    core_of = {cpu: core[0] for core in topology["cores"] for cpu in core}
+    used_cores: dict[int, int] = {}
+    for cpu in cpus:
+        used_cores[core_of.get(cpu, cpu)] = used_cores.get(core_of.get(cpu, cpu), 0) + 1
+    all_used = set(cpus) >= set(core_of)
+    return {
+        "policy": "all" if all_used else (policy or get_cpu_placement_policy()),
+        "cpus": cpus,
+        "physical_cores": len(used_cores),
+        "smt_siblings_shared": sum(1 for count in used_cores.values() if count > 1),
+        "numa_nodes": sorted({topology["node_of"].get(cpu, 0) for cpu in cpus}),
+        "machine_cores": len(topology["cores"]),
+        "machine_threads_per_core": max((len(core) for core in topology["cores"]), default=1),
+        "topology_source": topology["source"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# CPU frequency / utilization sampling during a thread-run
+# ---------------------------------------------------------------------------
+
+DEFAULT_CPU_SAMPLE_INTERVAL = 1.0
+DEFAULT_STEAL_THRESHOLD_PERCENT = 5.0
+PROC_STAT = Path("/proc/stat")
+PROC_CPUINFO = Path("/proc/cpuinfo")
+# /proc/stat field positions in read_proc_stat() tuples
+_STAT_IDLE, _STAT_IOWAIT, _STAT_SOFTIRQ, _STAT_STEAL = 3, 4, 6, 7
+
+_run_attempt = 1  # set by repeat_on_steal(), recorded by CpuSampler.summary()
+_steal_flagged: list = []  # runs flagged since repeat_on_steal() last cleared it
+
+
+def get_cpu_sample_interval() -> float:
+    """Sampling interval from PTS_CPU_SAMPLE_INTERVAL in seconds (default: 1.0, 0 = start/end only)."""
+    text = os.environ.get("PTS_CPU_SAMPLE_INTERVAL", "").strip()
+    if not text:
+        return DEFAULT_CPU_SAMPLE_INTERVAL
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        print(f"  [WARN] Invalid PTS_CPU_SAMPLE_INTERVAL '{text}', using {DEFAULT_CPU_SAMPLE_INTERVAL}")
+        return DEFAULT_CPU_SAMPLE_INTERVAL
+
+
+def get_steal_threshold() -> float:
+    """Steal % (on the worst CPU) above which a run is flagged, from PTS_STEAL_THRESHOLD (default: 5)."""
+    text = os.environ.get("PTS_STEAL_THRESHOLD", "").strip()
+    try:
+        return float(text) if text else DEFAULT_STEAL_THRESHOLD_PERCENT
+    except ValueError:
+        print(f"  [WARN] Invalid PTS_STEAL_THRESHOLD '{text}', using {DEFAULT_STEAL_THRESHOLD_PERCENT}")
+        return DEFAULT_STEAL_THRESHOLD_PERCENT
+
+
+def get_steal_retries() -> int:
+    """Extra attempts for a run flagged for steal, from PTS_STEAL_RETRIES (default: 0, flag only)."""
+    text = os.environ.get("PTS_STEAL_RETRIES", "").strip()
+    try:
+        return max(0, int(text)) if text else 0
+    except ValueError:
+        print(f"  [WARN] Invalid PTS_STEAL_RETRIES '{text}', not repeating runs")
+        return 0
+
+
+def read_proc_stat(path: Path = PROC_STAT) -> dict:
+    """Per-CPU jiffies from /proc/stat.
+
+    Returns:
+        {cpu: (user, nice, system, idle, iowait, irq, softirq, steal)}
+    """
+    stats = {}
+    with open(path, encoding="ascii") as f:
+        for line in f:
+            if not line.startswith("cpu") or line.startswith("cpu "):
+                if stats:
+                    break  # the per-CPU lines are contiguous
+                continue
+            fields = line.split()
+            stats[int(fields[0][3:])] = tuple(int(v) for v in (fields[1:9] + ["0"] * 8)[:8])
+    return stats
+
+
+def _cpu_frequency_files(cpu_dir: Path = SYSFS_CPU_DIR) -> tuple[Optional[str], dict]:
+    """sysfs cpufreq file of every CPU: ("scaling_cur_freq" | "cpuinfo_cur_freq" | None, {cpu: path})."""
+    for name in ("scaling_cur_freq", "cpuinfo_cur_freq"):
+        files = {}
+        for path in cpu_dir.glob(f"cpu[0-9]*/cpufreq/{name}"):
+            files[int(path.parent.parent.name[len("cpu"):])] = path
+        if files:
+            return name, files
+    return None, {}
+
+
+def _read_cpuinfo_mhz(path: Path = PROC_CPUINFO) -> dict:
+    """{cpu: kHz} from the "cpu MHz" lines of /proc/cpuinfo (x86 VMs without a cpufreq driver)."""
+    freqs, cpu = {}, None
+    try:
+        text = path.read_text(errors="ignore")
+    except OSError:
+        return freqs
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        key = key.strip()
+        try:
+            if key == "processor":
+                cpu = int(value)
+            elif key == "cpu MHz" and cpu is not None:
+                freqs[cpu] = int(float(value) * 1000)
+        except ValueError:
+            continue
+    return freqs
+
+
+def _percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class CpuSampler:
+    """Per-CPU frequency and busy % sampled in a background thread over one thread-run.
+
+    Every sample is appended to <N>-thread_cpu_samples.csv (t_sec, then MHz and
+    busy % per CPU), so turbo decay, throttling and idle gaps inside a long run
+    are visible; stop() writes summary() to <N>-thread_cpu_samples.json.
+    cpu_list ("0,2,4" as passed to taskset) restricts the summary, and with
+    it the steal flag, to the run's CPUs; without it every CPU counts.  The first and last samples are also written to
+    <N>-thread_freq_start.txt / <N>-thread_freq_end.txt (one kHz value per
+    CPU) for the result parsers.  Frequencies come from sysfs cpufreq, else
+    from /proc/cpuinfo; busy % from /proc/stat.  Everything is read
+    in-process, so sampling costs no fork.
+
+    The /proc/stat deltas over the run also give the share of time lost to
+    hypervisor steal, iowait and softirq; a run whose worst CPU exceeds
+    PTS_STEAL_THRESHOLD % steal is flagged (steal_exceeded) and can be
+    repeated with repeat_on_steal().
+
+    Usage:
+        cpu_sampler = CpuSampler(freq_start_file, freq_end_file, cpu_list=cpu_list)
+        cpu_sampler.start()
+        ... run the benchmark ...
+        cpu_sampler.stop()
+        perf_summary['cpu_samples'] = cpu_sampler.summary()
+    """
+
+    def __init__(self, freq_start_file, freq_end_file, cpu_list: Optional[str] = None,
+                 interval: Optional[float] = None, cpu_dir: Path = SYSFS_CPU_DIR,
+                 proc_stat: Path = PROC_STAT, cpuinfo: Path = PROC_CPUINFO):
+        self.freq_start_file = Path(freq_start_file)
+        self.freq_end_file = Path(freq_end_file)
+        self.cpu_list = cpu_list
+        name = self.freq_start_file.name
+        csv_name = name.replace("freq_start.txt", "cpu_samples.csv")
+        self.csv_file = self.freq_start_file.with_name(
+            csv_name if csv_name != name else f"{self.freq_start_file.stem}_cpu_samples.csv")
+        self.summary_file = self.csv_file.with_suffix(".json")
+        self.interval = get_cpu_sample_interval() if interval is None else interval
+        self.proc_stat = proc_stat
+        self.cpuinfo = cpuinfo
+        self.freq_source, self._freq_files = _cpu_frequency_files(cpu_dir)
+        if self.freq_source is None and _read_cpuinfo_mhz(cpuinfo):
+            self.freq_source = "cpuinfo"
+        try:
+            self.cpus = sorted(read_proc_stat(proc_stat))
+        except OSError:
+            self.cpus = sorted(self._freq_files) or list(range(os.cpu_count() or 1))
+        self.steal_threshold = get_steal_threshold()
+        self.attempt = _run_attempt
+        self.freq_khz = {cpu: array("I") for cpu in self.cpus}
+        self.busy_pct = {cpu: array("f") for cpu in self.cpus}
+        self.samples = 0
+        self._first_stat = None
+        self._last_stat = None
+        self._start_time = None
+        self._end_time = None
+        self._csv = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _read_frequencies(self) -> dict:
+        if self.freq_source == "cpuinfo":
+            return _read_cpuinfo_mhz(self.cpuinfo)
+        freqs = {}
+        for cpu, path in self._freq_files.items():
+            try:
+                freqs[cpu] = int(path.read_text())
+            except (OSError, ValueError):
+                freqs[cpu] = 0  # offline CPU or a read racing a hotplug
+        return freqs
+
+    def _sample(self) -> dict:
+        now = time.time()
+        freqs = self._read_frequencies() if self.freq_source else {}
+        try:
+            stat = read_proc_stat(self.proc_stat)
+        except OSError:
+            stat = {}
+
+        busy = {}
+        for cpu in self.cpus:
+            if cpu in freqs and freqs[cpu] > 0:
+                self.freq_khz[cpu].append(freqs[cpu])
+            prev, cur = (self._last_stat or {}).get(cpu), stat.get(cpu)
+            if prev and cur:
+                total = sum(cur) - sum(prev)
+                idle = (cur[_STAT_IDLE] + cur[_STAT_IOWAIT]) - (prev[_STAT_IDLE] + prev[_STAT_IOWAIT])
+                if total > 0:
+                    busy[cpu] = 100.0 * (total - idle) / total
+                    self.busy_pct[cpu].append(busy[cpu])
+        if stat:
+            self._first_stat = self._first_stat or stat
+            self._last_stat = stat
+        self._end_time = now
+        self.samples += 1
+
+        row = [f"{now - self._start_time:.1f}"]
+        if self.freq_source:
+            row += [str(freqs.get(cpu, 0) // 1000) for cpu in self.cpus]
+        row += [f"{busy[cpu]:.0f}" if cpu in busy else "" for cpu in self.cpus]
+        self._csv.write(",".join(row) + "\n")
+        self._csv.flush()
+        return freqs
+
+    def _write_frequencies(self, path: Path, freqs: dict) -> bool:
+        """kHz per CPU, one per line (empty file when no frequency is available)."""
+        try:
+            with open(path, "w") as f:
+                for cpu in self.cpus if freqs else []:
+                    f.write(f"{freqs.get(cpu, 0)}\n")
+        except OSError as e:
+            print(f"  [WARN] Failed to write frequency file: {e}")
+            return False
+        return bool(freqs)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample()
+            except Exception as e:
+                print(f"  [WARN] CPU sampler stopped: {e}")
+                return
+
+    def start(self) -> bool:
+        """Take the first sample and start sampling. True if frequencies are available."""
+        self._start_time = time.time()
+        self._csv = open(self.csv_file, "w", encoding="ascii")
+        header = ["t_sec"]
+        if self.freq_source:
+            header += [f"mhz_{cpu}" for cpu in self.cpus]
+        header += [f"busy_{cpu}" for cpu in self.cpus]
+        self._csv.write(",".join(header) + "\n")
+        ok = self._write_frequencies(self.freq_start_file, self._sample())
+        if self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="cpu-sampler", daemon=True)
+            self._thread.start()
+        return ok
+
+    def stop(self) -> bool:
+        """Take the last sample and stop. True if frequencies are available."""
+        if self._csv is None:
+            return False
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        ok = self._write_frequencies(self.freq_end_file, self._sample())
+        self._csv.close()
+        self._csv = None
+        summary = self.summary()
+        try:
+            with open(self.summary_file, "w") as f:
+                json.dump(summary, f, indent=2)
+        except OSError as e:
+            print(f"  [WARN] Failed to write CPU sample summary: {e}")
+        print(f"  [INFO] CPU samples: {self.samples} every {self.interval:g}s -> {self.csv_file}")
+        print(f"  [INFO] CPU time lost: steal {summary['steal_percent']}% "
+              f"(worst CPU {summary['steal_max_cpu_percent']}%), iowait {summary['iowait_percent']}%, "
+              f"softirq {summary['softirq_percent']}%")
+        if summary["steal_exceeded"]:
+            print(f"  [WARN] Steal time {summary['steal_max_cpu_percent']}% exceeds {self.steal_threshold:g}%: "
+                  f"this run is likely disturbed by noisy neighbors (steal_exceeded in {self.summary_file.name})")
+            _steal_flagged.append(self.csv_file.name)
+        return ok
+
+    def summary(self, cpu_list=None) -> dict:
+        """Condensed series for <N>-thread_perf_summary.json.
+
+        cpu_list ("0,2,4" as passed to taskset) limits the figures to the
+        run's CPUs; it defaults to the sampler's cpu_list, without either
+        every CPU is included.
+        """
+        cpu_list = cpu_list or self.cpu_list
+        try:
+            cpus = [int(c) for c in str(cpu_list).split(",") if c.strip()] if cpu_list else self.cpus
+        except ValueError:
+            cpus = self.cpus
+        cpus = [cpu for cpu in cpus if cpu in self.freq_khz] or self.cpus
+
+        def freq_stats(values) -> dict:
+            if not values:
+                return {"mean_frequency_ghz": None, "p5_frequency_ghz": None, "p95_frequency_ghz": None}
+            return {
+                "mean_frequency_ghz": round(sum(values) / len(values) / 1_000_000, 3),
+                "p5_frequency_ghz": round(_percentile(values, 5) / 1_000_000, 3),
+                "p95_frequency_ghz": round(_percentile(values, 95) / 1_000_000, 3),
+            }
+
+        def time_shares(cpu_ids) -> dict:
+            """busy / steal / iowait / softirq as % of all jiffies between the first and last sample."""
+            first, last = self._first_stat or {}, self._last_stat or {}
+            total, delta = 0, [0] * 8
+            for cpu in cpu_ids:
+                if cpu in first and cpu in last:
+                    total += sum(last[cpu]) - sum(first[cpu])
+                    delta = [d + b - a for d, a, b in zip(delta, first[cpu], last[cpu])]
+
+            def pct(jiffies):
+                return round(100.0 * jiffies / total, 2) if total > 0 else None
+
+            return {
+                "busy_percent": pct(total - delta[_STAT_IDLE] - delta[_STAT_IOWAIT]),
+                "steal_percent": pct(delta[_STAT_STEAL]),
+                "iowait_percent": pct(delta[_STAT_IOWAIT]),
+                "softirq_percent": pct(delta[_STAT_SOFTIRQ]),
+            }
+
+        per_cpu = {str(cpu): {**freq_stats(self.freq_khz[cpu]), **time_shares([cpu])} for cpu in cpus}
+        pooled = [value for cpu in cpus for value in self.freq_khz[cpu]]
+        worst_steal = max((v["steal_percent"] for v in per_cpu.values() if v["steal_percent"] is not None),
+                          default=None)
+        return {
+            "interval_sec": self.interval,
+            "samples": self.samples,
+            "duration_sec": round((self._end_time or 0) - (self._start_time or 0), 1),
+            "frequency_source": self.freq_source,
+            "csv_file": self.csv_file.name,
+            "cpus": cpus,
+            **freq_stats(pooled),
+            **time_shares(cpus),
+            "steal_max_cpu_percent": worst_steal,
+            "steal_threshold_percent": self.steal_threshold,
+            "steal_exceeded": worst_steal is not None and worst_steal > self.steal_threshold,
+            "attempt": self.attempt,
+            "per_cpu": per_cpu,
+        }
+
+
+def repeat_on_steal(run_benchmark, *args, **kwargs):
+    """Call run_benchmark(*args, **kwargs) and repeat it while its run is flagged for steal.
+
+    With PTS_STEAL_RETRIES=N a successful run whose CpuSampler reported
+    steal_exceeded is run again, up to N more times; each attempt overwrites
+    the previous one's files and records its number as "attempt".  The last
+    attempt is kept even if it is still flagged.  Default (0): flag only.
+    """
+    global _run_attempt
+    retries = get_steal_retries()
+    try:
+        for attempt in range(1, retries + 2):
+            _run_attempt = attempt
+            _steal_flagged.clear()
+            result = run_benchmark(*args, **kwargs)
+            if not result or not _steal_flagged or attempt > retries:
+                return result
+            print(f"\n[WARN] Steal time exceeded {get_steal_threshold():g}% in {', '.join(_steal_flagged)}: "
+                  f"repeating the run (retry {attempt}/{retries})")
+    finally:
+        _run_attempt = 1
+        _steal_flagged.clear()
+
+
+# ---------------------------------------------------------------------------
+# Shared download cache (downloads.xml pre-seeding and prefetch)
+# ---------------------------------------------------------------------------
+
+LARGE_FILE_THRESHOLD_BYTES = 10 * 1024 * 1024 * 1024  # 10 GB: aria2c drops to 4 connections
+DEFAULT_PREFETCH_WORKERS = 4
+DEFAULT_MIN_FREE_GB = 8.0
+_CHECKSUM_ALGORITHMS = ("sha256", "md5")
+_ARCH_ALIASES = (
+    ("x86_64", "amd64", "x86-64"),
+    ("aarch64", "arm64", "armv8"),
+)
+
+
+def get_pts_download_store_dir() -> Path:
+    """Content-addressed store behind download-cache (PTS_DOWNLOAD_STORE overrides)."""
+    store = os.environ.get("PTS_DOWNLOAD_STORE", "").strip()
+    if store:
+        return Path(store).expanduser()
+    return get_pts_home() / "download-store"
+
+
+def parse_rate(text) -> int:
+    """Bandwidth such as "50M", "800K" or "1.5G" (bytes/s, binary units) -> int; 0 = unlimited."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMG]?)i?B?\s*", str(text or "0"), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid rate: {text!r} (expected e.g. 50M, 800K)")
+    return int(float(match.group(1)) * 1024 ** " KMG".index(match.group(2).upper() or " "))
+
+
+def _split_csv(text: str) -> list[str]:
+    return [v.strip() for v in (text or "").split(",") if v.strip()]
+
+
+def _this_machine_arches() -> set:
+    machine = platform.machine().lower()
+    for names in _ARCH_ALIASES:
+        if machine in names:
+            return set(names)
+    return {machine}
+
+
+def read_downloads_xml(benchmark_full: str, pts_home: Optional[Path] = None) -> list[dict]:
+    """Packages of a test profile's downloads.xml that apply to this machine.
+
+    A missing profile is fetched once with `phoronix-test-suite info`.
+    Packages marked for another platform or architecture are dropped, as
+    PTS itself would not download them.
+
+    Returns:
+        [{"filename", "urls", "size" (-1 if unknown), "sha256", "md5", "optional"}, ...]
+    """
+    profile_path = (Path(pts_home) if pts_home else get_pts_home()) / "test-profiles" / benchmark_full / "downloads.xml"
+    if not profile_path.exists():
+        print(f"  [WARN] downloads.xml not found at {profile_path}")
+        print(f"  [INFO] Fetching test profile via phoronix-test-suite info {benchmark_full}...")
+        try:
+            subprocess.run(
+                ["phoronix-test-suite", "info", benchmark_full],
+                check=False,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except Exception as e:
+            print(f"  [WARN] Failed to run phoronix-test-suite info: {e}")
+            return []
+        if not profile_path.exists():
+            print(f"  [WARN] downloads.xml still missing: {profile_path}")
+            return []
+
+    try:
+        root = ET.parse(profile_path).getroot()
+    except (ET.ParseError, OSError) as e:
+        print(f"  [ERROR] Failed to parse downloads.xml: {e}")
+        return []
+
+    downloads_node = root.find("Downloads")
+    if downloads_node is None:
+        return []
+
+    arches = _this_machine_arches()
+    packages = []
+    for package in downloads_node.findall("Package"):
+        fields = {child.tag: (child.text or "").strip() for child in package}
+        urls = _split_csv(fields.get("URL", ""))
+        if not urls:
+            continue
+        platforms = [p.lower() for p in _split_csv(fields.get("PlatformSpecific", ""))]
+        if platforms and "linux" not in platforms:
+            continue
+        package_arches = {a.lower() for a in _split_csv(fields.get("ArchitectureSpecific", ""))}
+        if package_arches and not package_arches & arches:
+            continue
+        try:
+            size = int(fields.get("FileSize") or -1)
+        except ValueError:
+            size = -1
+        packages.append({
+            "filename": fields.get("FileName") or urls[0].rstrip("/").rsplit("/", 1)[-1],
+            "urls": urls,
+            "size": size,
+            "sha256": fields.get("SHA256", "").lower(),
+            "md5": fields.get("MD5", "").lower(),
+            "optional": fields.get("Optional", "").upper() == "TRUE",
+        })
+    return packages
+
+
+def get_remote_file_size(url: str) -> int:
+    """Content-Length of url via curl -I (-1 if it cannot be determined)."""
+    try:
+        result = subprocess.run(["curl", "-s", "-I", "-L", url], capture_output=True, text=True, timeout=60)
+    except Exception:
+        return -1
+    size = -1
+    if result.returncode == 0:
+        # Last Content-Length wins: earlier ones belong to redirect responses
+        for line in result.stdout.splitlines():
+            if line.lower().startswith("content-length:"):
+                try:
+                    size = int(line.split(":", 1)[1].strip())
+                except ValueError:
+                    pass
+    return size
+
+
+class DownloadManager:
+    """Content-addressed store behind the PTS download-cache.
+
+    Files live in <store>/<sha256|md5>/<digest> (<store>/name/<filename> when
+    downloads.xml has no checksum) and are hard-linked into download-cache
+    under the name PTS looks for.  A cached file is only used after its
+    checksum matched; the match is remembered in a .verified stamp (size +
+    mtime), so multi-GB files are hashed once.  A per-file lock lets a runner
+    and a background prefetch share the store without fetching a file twice.
+
+    Each download leaves a .fetch.json record (origin, seconds, bytes) next to
+    the stored file, from which a runner reports the download time a
+    background prefetch took off its install.
+    """
+
+    def __init__(self, cache_dir=None, pts_home=None, store_dir=None,
+                 min_free_gb: float = DEFAULT_MIN_FREE_GB, low_priority: bool = False, quiet: bool = False,
+                 max_rate: int = 0, origin: str = "runner"):
+        self.pts_home = Path(pts_home) if pts_home else get_pts_home()
+        self.cache_dir = Path(cache_dir) if cache_dir else self.pts_home / "download-cache"
+        if store_dir:
+            self.store_dir = Path(store_dir)
+        elif pts_home:
+            self.store_dir = self.pts_home / "download-store"
+        else:
+            self.store_dir = get_pts_download_store_dir()
+        self.aria2_available = shutil.which("aria2c") is not None
+        self.curl_available = shutil.which("curl") is not None
+        self.min_free_bytes = int(min_free_gb * 1024 ** 3)
+        self.low_priority = low_priority
+        self.quiet = quiet
+        self.max_rate = max_rate  # bytes/s shared by all concurrent downloads, 0 = unlimited
+        self.origin = origin
+        self.stats = {"hit": 0, "linked": 0, "downloaded": 0, "below_threshold": 0, "skipped": 0, "failed": 0}
+        self.lock_wait = 0.0  # seconds spent waiting for another process's download of the same file
+        self._rate_share = 1
+        self._stats_lock = threading.Lock()
+
+    def resolve_urls(self, urls: list[str]) -> list[str]:
+        """Mirror list actually passed to the downloader (runners may filter dead mirrors)."""
+        return urls
+
+    def store_path(self, package: dict) -> Path:
+        for algo in _CHECKSUM_ALGORITHMS:
+            if package.get(algo):
+                return self.store_dir / algo / package[algo]
+        return self.store_dir / "name" / package["filename"]
+
+    def _checksum_ok(self, path: Path, package: dict, stamp: bool = False) -> bool:
+        """Size and checksum check; with stamp=True the result is cached next to path."""
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        if package["size"] > 0 and st.st_size != package["size"]:
+            return False
+        algo = next((a for a in _CHECKSUM_ALGORITHMS if package.get(a)), None)
+        if algo is None:
+            return True
+        signature = f"{algo} {st.st_size} {st.st_mtime_ns}"
+        stamp_path = path.with_name(path.name + ".verified")
+        if stamp:
+            try:
+                if stamp_path.read_text().strip() == signature:
+                    return True
+            except OSError:
+                pass
+        digest = hashlib.new(algo)
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(4 * 1024 * 1024), b""):
+                    digest.update(chunk)
+        except OSError:
+            return False
+        if digest.hexdigest().lower() != package[algo]:
+            print(f"  [WARN] {algo.upper()} mismatch: {path}")
+            return False
+        if stamp:
+            try:
+                stamp_path.write_text(signature + "\n")
+            except OSError:
+                pass
+        return True
+
+    def _link(self, src: Path, dst: Path) -> None:
+        """Atomically place src at dst (hard link, copy across filesystems)."""
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+
+    def _download(self, urls: list[str], dest: Path, size_bytes: int) -> bool:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        rate = max(1, self.max_rate // self._rate_share) if self.max_rate else 0
+        if self.aria2_available:
+            num_conn = 4 if size_bytes >= LARGE_FILE_THRESHOLD_BYTES else 16
+            attempts = [[
+                "aria2c", "-x", str(num_conn), "-s", str(num_conn),
+                "--continue=true", "--auto-file-renaming=false", "--allow-overwrite=true",
+                "--connect-timeout=30", "--timeout=120", "--max-tries=2", "--retry-wait=5",
+                "-d", str(dest.parent), "-o", dest.name,
+            ] + (["--quiet=true"] if self.quiet else [])
+              + ([f"--max-download-limit={rate}"] if rate else []) + urls]
+        elif self.curl_available:
+            attempts = [["curl", "-fL", "--retry", "2", "-C", "-", "-o", str(dest)]
+                        + (["-sS"] if self.quiet else [])
+                        + (["--limit-rate", str(rate)] if rate else []) + [url] for url in urls]
+        else:
+            print("  [WARN] Neither aria2c nor curl found; PTS will handle downloads")
+            return False
+        prefix = []
+        if self.low_priority:
+            prefix = ["nice", "-n", "19"] + (["ionice", "-c", "3"] if shutil.which("ionice") else [])
+        for cmd in attempts:
+            try:
+                subprocess.run(prefix + cmd, check=True, timeout=5400)
+                return True
+            except subprocess.TimeoutExpired:
+                print(f"  [ERROR] {cmd[0]} timed out downloading {dest.name}")
+            except (subprocess.CalledProcessError, OSError) as e:
+                print(f"  [WARN] {cmd[0]} download failed for {dest.name}: {e}")
+        return False
+
+    def ensure(self, package: dict, size_hint: int = -1) -> str:
+        """Make package["filename"] a verified file in download-cache.
+
+        Returns "hit", "linked" (restored from the store), "downloaded",
+        "skipped" (low disk / no URL) or "failed".
+        """
+        filename = package["filename"]
+        target = self.cache_dir / filename
+        stored = self.store_path(package)
+        lock_path = self.store_dir / ".locks" / (stored.name + ".lock")
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, "w") as lock_f:
+            try:
+                fcntl.flock(lock_f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                print(f"  [CACHE] Waiting for in-flight download of {filename}...")
+                waited = time.time()
+                fcntl.flock(lock_f, fcntl.LOCK_EX)
+                with self._stats_lock:
+                    self.lock_wait += time.time() - waited
+
+            if self._checksum_ok(stored, package, stamp=True):
+                if target.exists() and os.path.samefile(target, stored):
+                    print(f"  [CACHE] Verified: {filename}")
+                    return "hit"
+                self._link(stored, target)
+                print(f"  [CACHE] Restored from store: {filename}")
+                return "linked"
+
+            if target.exists() and self._checksum_ok(target, package):
+                # Adopt a file PTS (or an older runner) already downloaded
+                self._link(target, stored)
+                print(f"  [CACHE] Verified: {filename}")
+                return "hit"
+
+            size = package["size"] if package["size"] > 0 else size_hint
+            if size > 0:
+                try:
+                    free = shutil.disk_usage(self.store_dir).free
+                except OSError:
+                    free = -1
+                if 0 <= free < size + self.min_free_bytes:
+                    print(f"  [SKIP] {filename}: {size / 1024 ** 3:.1f} GB would leave less than "
+                          f"{self.min_free_bytes / 1024 ** 3:.0f} GB free")
+                    return "skipped"
+
+            urls = self.resolve_urls(package["urls"])
+            if not urls:
+                print(f"  [SKIP] No live download URL: {filename}")
+                return "skipped"
+
+            partial = stored.with_name(stored.name + ".part")
+            print(f"  [DOWNLOAD] {filename}" + (f" ({size / 1024 ** 2:.1f} MB)" if size > 0 else ""))
+            started = time.time()
+            if not self._download(urls, partial, size):
+                return "failed"
+            seconds = time.time() - started
+            if not self._checksum_ok(partial, package):
+                print(f"  [ERROR] Downloaded {filename} failed verification, discarding")
+                partial.unlink(missing_ok=True)
+                return "failed"
+            os.replace(partial, stored)
+            self._checksum_ok(stored, package, stamp=True)
+            self._record_fetch(stored, seconds)
+            self._link(stored, target)
+            print(f"  [OK] Cached: {filename}")
+            return "downloaded"
+
+    def _record_fetch(self, stored: Path, seconds: float) -> None:
+        record = {"origin": self.origin, "seconds": round(seconds, 1),
+                  "bytes": stored.stat().st_size, "ts": round(time.time())}
+        try:
+            stored.with_name(stored.name + ".fetch.json").write_text(json.dumps(record) + "\n")
+        except OSError:
+            pass
+
+    def fetched_in_background(self, packages: list[dict]) -> tuple[int, int, float]:
+        """(files, bytes, download seconds) of packages a prefetch (not a runner) downloaded."""
+        files, size, seconds = 0, 0, 0.0
+        for package in packages:
+            stored = self.store_path(package)
+            try:
+                record = json.loads(stored.with_name(stored.name + ".fetch.json").read_text())
+            except (OSError, ValueError):
+                continue
+            if record.get("origin") == "prefetch" and stored.exists():
+                files += 1
+                size += int(record.get("bytes", 0))
+                seconds += float(record.get("seconds", 0.0))
+        return files, size, seconds
+
+    def _ensure_counted(self, package: dict, threshold_bytes: int) -> str:
+        size_hint = -1
+        if threshold_bytes > 0:
+            size_hint = package["size"] if package["size"] > 0 else get_remote_file_size(package["urls"][0])
+            if size_hint < threshold_bytes:
+                status = "below_threshold"
+                with self._stats_lock:
+                    self.stats[status] += 1
+                return status
+        try:
+            status = self.ensure(package, size_hint)
+        except Exception as e:
+            print(f"  [ERROR] Failed to cache {package['filename']}: {e}")
+            status = "failed"
+        with self._stats_lock:
+            self.stats[status] += 1
+        return status
+
+    def fetch(self, packages: list[dict], threshold_mb: float = 0,
+              max_workers: int = DEFAULT_PREFETCH_WORKERS) -> dict:
+        """Ensure every package of at least threshold_mb, max_workers at a time.
+
+        Size probes for packages without FileSize run in the same pool, so
+        they no longer serialize ahead of the downloads.
+        """
+        threshold_bytes = int(threshold_mb * 1024 * 1024)
+        unique = {}
+        for package in packages:
+            unique.setdefault(self.store_path(package), package)
+        if not unique:
+            return {}
+        workers = max(1, min(max_workers, len(unique)))
+        self._rate_share = workers
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            statuses = list(pool.map(lambda p: self._ensure_counted(p, threshold_bytes), unique.values()))
+        return {p["filename"]: s for p, s in zip(unique.values(), statuses)}
+
+    def summary(self) -> str:
+        return ", ".join(f"{key}={value}" for key, value in self.stats.items() if value)
+
+
+class PreSeedDownloader(DownloadManager):
+    """Runner front end: seed download-cache before phoronix-test-suite batch-install."""
+
+    def is_aria2_available(self):
+        return self.aria2_available
+
+    def download_from_xml(self, benchmark_name, threshold_mb=96, skip_optional=False):
+        """Fetch the benchmark's downloads.xml files of at least threshold_mb.
+
+        Args:
+            benchmark_name: Full benchmark name (e.g., "pts/x265-1.5.0")
+            threshold_mb: Smaller files are left to PTS (0 fetches everything)
+            skip_optional: Skip packages marked <Optional>TRUE</Optional>
+        """
+        packages = read_downloads_xml(benchmark_name, self.pts_home)
+        if not packages:
+            return False
+        if skip_optional:
+            for package in packages:
+                if package["optional"]:
+                    print(f"  [SKIP] Optional package skipped: {package['filename']}")
+            packages = [p for p in packages if not p["optional"]]
+        results = self.fetch(packages, threshold_mb=threshold_mb)
+
+        files, size, seconds = self.fetched_in_background(packages)
+        if files:
+            hidden = max(0.0, seconds - self.lock_wait)
+            print(f"  [PREFETCH] {files} file(s) ({size / 1024 ** 2:.1f} MB) were fetched in the background: "
+                  f"~{hidden:.0f}s of install download time hidden"
+                  + (f" (waited {self.lock_wait:.0f}s for in-flight prefetch)" if self.lock_wait >= 1 else ""))
+        return "failed" not in results.values()
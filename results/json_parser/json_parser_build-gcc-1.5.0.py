@@ -78,6 +78,17 @@ def _read_freq_file(freq_file: Path) -> Dict[str, int]:
     return freqs
 
 
+def _read_cpu_noise(samples_file: Path) -> Dict[str, Any]:
+    """Load steal/iowait/softirq % from `<thread>-thread_cpu_samples.json` (empty if not recorded)."""
+    try:
+        summary = json.loads(samples_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    keys = ("steal_percent", "steal_max_cpu_percent", "steal_exceeded",
+            "iowait_percent", "softirq_percent", "attempt")
+    return {key: summary[key] for key in keys if key in summary}
+
+
 def _discover_threads(benchmark_dir: Path) -> Iterable[str]:
     """Return iterable of thread identifiers."""
     log_threads = sorted(benchmark_dir.glob("*-thread.log"))
@@ -179,6 +190,7 @@ def _collect_thread_payload(
         perf_stat["start_freq"] = start_freq
     if end_freq:
         perf_stat["end_freq"] = end_freq
+    perf_stat.update(_read_cpu_noise(benchmark_dir / f"{thread_num}-thread_cpu_samples.json"))
 
     return {
         "perf_stat": perf_stat,
@@ -63,6 +63,17 @@ def _read_freq_file(freq_file: Path) -> Dict[str, int]:
     return freq
 
 
+def _read_cpu_noise(samples_file: Path) -> Dict[str, Any]:
+    """Load steal/iowait/softirq % from `<thread>-thread_cpu_samples.json` (empty if not recorded)."""
+    try:
+        summary = json.loads(samples_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    keys = ("steal_percent", "steal_max_cpu_percent", "steal_exceeded",
+            "iowait_percent", "softirq_percent", "attempt")
+    return {key: summary[key] for key in keys if key in summary}
+
+
 def _discover_threads(benchmark_dir: Path):
     """Yield thread identifiers from *-thread.log files."""
     for log_file in sorted(benchmark_dir.glob("*-thread.log")):
@@ -183,6 +194,7 @@ def _build_thread_node(benchmark_dir: Path, thread_num: str, cost_hour: float) -
     freq_end = _read_freq_file(benchmark_dir / f"{thread_num}-thread_freq_end.txt")
     if freq_end:
         perf_stat["end_freq"] = freq_end
+    perf_stat.update(_read_cpu_noise(benchmark_dir / f"{thread_num}-thread_cpu_samples.json"))
 
     return {
         "perf_stat": perf_stat,
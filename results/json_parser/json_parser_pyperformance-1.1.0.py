@@ -72,6 +72,17 @@ def _read_freq_file(freq_file: Path) -> Dict[str, int]:
     return freqs
 
 
+def _read_cpu_noise(samples_file: Path) -> Dict[str, Any]:
+    """Load steal/iowait/softirq % from `<thread>-thread_cpu_samples.json` (empty if not recorded)."""
+    try:
+        summary = json.loads(samples_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    keys = ("steal_percent", "steal_max_cpu_percent", "steal_exceeded",
+            "iowait_percent", "softirq_percent", "attempt")
+    return {key: summary[key] for key in keys if key in summary}
+
+
 def _discover_threads(benchmark_dir: Path) -> Iterable[str]:
     """Return iterable of thread identifiers."""
     discovered: set[str] = set()
@@ -274,6 +285,8 @@ def _collect_thread_payload(
             perf_stat[bench_name]["start_freq"] = start_freq
         if end_freq:
             perf_stat[bench_name]["end_freq"] = end_freq
+        perf_stat[bench_name].update(
+            _read_cpu_noise(benchmark_dir / f"{bench_name}-{thread_num}threads-cpu_samples.json"))
         if not perf_stat[bench_name]:
             perf_stat.pop(bench_name)
 
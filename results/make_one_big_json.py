@@ -9,7 +9,9 @@ Version info: v2.0.1 (Updated: 2026-02-19)
 
 Benchmark parsing is delegated to json_parser/json_parser_<benchmark>.py modules.
 Each module exports _collect_thread_payload(benchmark_dir, thread_num, cost_hour)
-that returns the per-thread payload dict.
+that returns the per-thread payload dict.  Its perf_stat carries the run's
+steal/iowait/softirq % (from <N>-thread_cpu_samples.json) when recorded;
+runs flagged with steal_exceeded are listed at the end.
 
 Usage:
     # Build from directories:
@@ -513,6 +515,26 @@ def get_machine_info(machinename: str) -> Dict[str, Any]:
     }
 
 
+def apply_effective_cost(machine_dir: Path, machine_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Override the Look-Up-Table cost with the price actually paid, if recorded.
+
+    cloud_exec_para.py writes <machine>/effective_cost.json for spot/preemptible
+    instances (same "cost_hour[730h-mo]" key as the Look-Up-Table).
+    """
+    cost_file = machine_dir / "effective_cost.json"
+    if not cost_file.is_file():
+        return machine_info
+    try:
+        with open(cost_file, encoding="utf-8") as f:
+            cost_hour = float(json.load(f)["cost_hour[730h-mo]"])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Warning: Ignoring unreadable {cost_file}: {e}", file=sys.stderr)
+        return machine_info
+    machine_info["cost_hour[730h-mo]"] = cost_hour
+    return machine_info
+
+
 # ---------------------------------------------------------------------------
 # Version and generation log
 # ---------------------------------------------------------------------------
@@ -822,7 +844,7 @@ def build_json_structure(project_root: Path) -> tuple:
             continue
 
         machinename = machine_dir.name
-        machine_info = get_machine_info(machinename)
+        machine_info = apply_effective_cost(machine_dir, get_machine_info(machinename))
 
         machine_data = {
             "CSP": machine_info["CSP"],
@@ -889,6 +911,23 @@ def _merge_missing(dst: Dict[str, Any], src: Dict[str, Any]) -> None:
             _merge_missing(dst[key], value)
 
 
+def find_steal_flagged(node: Any, path: str = "") -> List[str]:
+    """Paths of perf_stat nodes whose run exceeded the steal threshold (steal_exceeded)."""
+    flagged = []
+    if isinstance(node, dict):
+        perf_stat = node.get("perf_stat")
+        if isinstance(perf_stat, dict):
+            stats = [("", perf_stat)] + [(f" [{k}]", v) for k, v in perf_stat.items() if isinstance(v, dict)]
+            for label, stat in stats:
+                if stat.get("steal_exceeded"):
+                    flagged.append(f"{path}{label}: steal {stat.get('steal_percent')}% "
+                                   f"(worst CPU {stat.get('steal_max_cpu_percent')}%)")
+        for key, value in node.items():
+            if key != "perf_stat":
+                flagged.extend(find_steal_flagged(value, f"{path}/{key}" if path else key))
+    return flagged
+
+
 def merge_json_data(data1: Dict[str, Any], data2: Dict[str, Any]) -> Dict[str, Any]:
     """Merge two JSON structures without overwriting existing data."""
     result = data1.copy()
@@ -1100,6 +1139,13 @@ def main():
             print(f"        -> json_parser/json_parser_{name}.py", file=sys.stderr)
         print("Create the above file(s) to include these benchmarks.", file=sys.stderr)
 
+    steal_flagged = find_steal_flagged(merged_data)
+    if steal_flagged:
+        print(f"\n[STEAL] {len(steal_flagged)} run(s) exceeded the steal threshold "
+              f"(perf_stat.steal_exceeded; exclude or annotate them in analytics):", file=sys.stderr)
+        for entry in steal_flagged:
+            print(f"  {entry}", file=sys.stderr)
+
     print("\nChecking output JSON syntax...")
     if not check_json_syntax(output_file):
         print("Output JSON syntax check failed.", file=sys.stderr)
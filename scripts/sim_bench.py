@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Orchestrator scale benchmark on SimulatedProvider (no cloud account needed).
+
+Runs execute_instances_parallel() -> process_instance() for N fake instances
+whose "SSH" is a local bash stand-in, then reports the cost of the
+orchestrator itself: host CPU time, thread count, concurrent ssh processes
+and the end-to-end overhead per workload (everything except boot and the
+workloads' own runtime).
+
+Usage:
+    python3 scripts/sim_bench.py                      # 500 instances x 3 workloads
+    python3 scripts/sim_bench.py --instances 50 --workloads 5 --workload-seconds 2
+    python3 scripts/sim_bench.py --rate-limit-rate 0.05 --preempt-rate 0.1 --spot
+    python3 scripts/sim_bench.py --json bench.json --keep
+    python3 scripts/sim_bench.py --no-async-core      # subprocess per call, for comparison
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import cloud_exec_para as cep  # noqa: E402
+
+
+class ResourceSampler:
+    """Samples thread count and fake ssh processes while the run is in progress."""
+
+    def __init__(self, ssh_path: Path, interval: float = 0.5):
+        self.ssh_path = str(ssh_path).encode()
+        self.interval = interval
+        self.threads = []
+        self.ssh_procs = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _count_ssh(self) -> int:
+        count = 0
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                    if self.ssh_path in f.read():
+                        count += 1
+            except OSError:
+                continue
+        return count
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.threads.append(threading.active_count())
+            self.ssh_procs.append(self._count_ssh())
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def build_config(args, work: Path):
+    workloads = [
+        f"sleep {args.workload_seconds} && mkdir -p ~/cloud_onehour/results/w{k} && "
+        f"echo sim_workload > ~/cloud_onehour/results/w{k}/result.txt"
+        for k in range(1, args.workloads + 1)
+    ]
+    key_path = work / 'sim_key'
+    key_path.touch()
+    common = {
+        'os_version': '24.04',
+        'host_reports_dir': str(work / 'reports'),
+        'cloud_reports_dir': '~/cloud_onehour/results',
+        'ssh_key_path': str(key_path),
+        'debian_setup': [],
+        'workloads': workloads,
+        'post_process': [],
+        'long_running_indicators': ['sim_workload'],
+        'workload_timeout': 600,
+        'readiness_port': args.ssh_port,
+        'readiness_timeout': 300,
+        'quota_admission': True,
+        'spot_max_relaunches': args.spot_max_relaunches,
+        'async_core': not args.no_async_core,
+    }
+    csp_config = {
+        'name': 'sim',
+        'root': str(work / 'sandbox'),
+        'region': 'sim-local-1',
+        'boot_latency': args.boot_latency,
+        'launch_latency': args.launch_latency,
+        'fail_rate': args.fail_rate,
+        'capacity_error_rate': args.capacity_error_rate,
+        'rate_limit_rate': args.rate_limit_rate,
+        'preempt_rate': args.preempt_rate,
+        'preempt_after': args.preempt_after,
+        'ssh_port': args.ssh_port,
+        'quota_vcpus_all_regions': args.quota,
+        'max_workers': args.max_workers,
+        'seed': args.seed,
+    }
+    config = {'common': common, '_spot': args.spot}
+    instances = [
+        {
+            'name': f"sim-{i:04d}",
+            'type': 'sim.large',
+            'vcpus': 2,
+            'arch': 'amd64',
+            'region': 'sim-local-1',
+            'enable': True,
+            'cpu_cost_hour[730h-mo]': 0.1,
+        }
+        for i in range(args.instances)
+    ]
+    return config, csp_config, instances
+
+
+def summarize_events(log_dir: Path, workload_seconds: float):
+    """Per-workload and per-instance orchestration overhead from events.jsonl."""
+    per_instance = {}
+    workload_overheads = []
+    completed = set()  # (instance, workload) pairs; a relaunch may rerun a workload
+    events_path = log_dir / 'events.jsonl'
+    if not events_path.exists():
+        return workload_overheads, [], completed
+    with open(events_path, encoding='utf-8') as f:
+        for line in f:
+            ev = json.loads(line)
+            entry = per_instance.setdefault(ev['instance'], {'workloads': 0, 'ready': 0.0})
+            if ev['event'] == 'launched':
+                entry.setdefault('launched', ev['ts'] - (ev.get('duration') or 0.0))
+            elif ev['event'] == 'ready':
+                entry['ready'] += ev.get('duration') or 0.0
+            elif ev['event'] == 'workload_end' and ev.get('status') == 'SUCCESS':
+                entry['workloads'] += 1
+                completed.add((ev['instance'], ev.get('workload')))
+                if ev.get('duration') is not None:
+                    workload_overheads.append(ev['duration'] - workload_seconds)
+            elif ev['event'] == 'terminated':
+                entry['terminated'] = ev['ts']
+    instance_overheads = []
+    for entry in per_instance.values():
+        if 'launched' in entry and 'terminated' in entry and entry['workloads']:
+            busy = entry['terminated'] - entry['launched'] - entry['ready']
+            instance_overheads.append((busy - entry['workloads'] * workload_seconds) / entry['workloads'])
+    return workload_overheads, instance_overheads, completed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the orchestrator against SimulatedProvider")
+    parser.add_argument('--instances', type=int, default=500)
+    parser.add_argument('--workloads', type=int, default=3, help='Workloads per instance')
+    parser.add_argument('--workload-seconds', type=float, default=1.0, help='Runtime of each workload')
+    parser.add_argument('--max-workers', type=int, default=500)
+    parser.add_argument('--quota', type=int, default=100000, help='vCPU quota (2 vCPUs per instance)')
+    parser.add_argument('--boot-latency', type=float, nargs=2, default=[1.0, 3.0], metavar=('MIN', 'MAX'))
+    parser.add_argument('--launch-latency', type=float, default=0.05)
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    parser.add_argument('--capacity-error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--preempt-rate', type=float, default=0.0)
+    parser.add_argument('--preempt-after', type=float, nargs=2, default=[5.0, 30.0], metavar=('MIN', 'MAX'))
+    parser.add_argument('--spot', action='store_true', help='Spot mode: relaunch preempted instances')
+    parser.add_argument('--spot-max-relaunches', type=int, default=10,
+                        help='Relaunches per instance before giving up (spot mode)')
+    parser.add_argument('--ssh-port', type=int, default=2222, help='Port of the simulated SSH banner')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='FILE', help='Also write the report as JSON')
+    parser.add_argument('--keep', action='store_true', help='Keep the sandbox and logs')
+    parser.add_argument('--dashboard', action='store_true', help='Render the live dashboard')
+    parser.add_argument('--no-async-core', action='store_true',
+                        help='Run subprocesses directly instead of on the shared event loop')
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix='cloud_exec_simbench_'))
+    config, csp_config, instances = build_config(args, work)
+    log_dir = work / 'logs' / 'sim'
+    log_dir.mkdir(parents=True)
+
+    provider = cep.SimulatedProvider(config, csp_config)
+    provider.initialize_shared_resources()
+    os.environ['PATH'] = f"{provider.root / 'bin'}{os.pathsep}{os.environ['PATH']}"
+
+    common = config['common']
+    cep.SSH_POOL.configure(common)
+    cep.STATUS_CACHE.configure(common)
+    cep.STATUS_CACHE.register_provider(provider)
+    cep.READINESS.configure(common)
+    cep.ASYNC_CORE.configure(common)
+    cep.LOG_WRITER.configure(common)
+    cep.LOG_WRITER.start()
+    cep.DASHBOARD = cep.Dashboard(enabled=True)
+    cep.DASHBOARD.set_log_dir(log_dir)
+    if args.dashboard:
+        cep.DASHBOARD.start()
+
+    sampler = ResourceSampler(provider.root / 'bin' / 'ssh')
+    sampler.start()
+    cpu_before = resource.getrusage(resource.RUSAGE_SELF)
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.time()
+    try:
+        cep.execute_instances_parallel(provider, instances, config, common['ssh_key_path'], log_dir,
+                                       args.max_workers)
+    finally:
+        wall = time.time() - start
+        sampler.stop()
+        cep.DASHBOARD.stop()
+        cep.SSH_POOL.close_all()
+        cep.LOG_WRITER.stop()
+        provider.shutdown()
+        cep.ASYNC_CORE.stop()
+    cpu_after = resource.getrusage(resource.RUSAGE_SELF)
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    workload_overheads, instance_overheads, completed = summarize_events(log_dir, args.workload_seconds)
+    statuses = {}
+    for data in cep.DASHBOARD.instances.values():
+        statuses[data['status']] = statuses.get(data['status'], 0) + 1
+
+    report = {
+        'instances': args.instances,
+        'workloads_per_instance': args.workloads,
+        'workload_seconds': args.workload_seconds,
+        'wall_seconds': round(wall, 1),
+        'orchestrator_cpu_seconds': round((cpu_after.ru_utime - cpu_before.ru_utime)
+                                          + (cpu_after.ru_stime - cpu_before.ru_stime), 2),
+        'child_cpu_seconds': round((children_after.ru_utime - children_before.ru_utime)
+                                   + (children_after.ru_stime - children_before.ru_stime), 2),
+        'peak_threads': max(sampler.threads, default=0),
+        'mean_threads': round(sum(sampler.threads) / len(sampler.threads), 1) if sampler.threads else 0,
+        'peak_ssh_processes': max(sampler.ssh_procs, default=0),
+        'mean_ssh_processes': round(sum(sampler.ssh_procs) / len(sampler.ssh_procs), 1) if sampler.ssh_procs else 0,
+        'workloads_completed': len(completed),
+        'workload_overhead_p50': round(percentile(workload_overheads, 50), 2),
+        'workload_overhead_p95': round(percentile(workload_overheads, 95), 2),
+        'instance_overhead_per_workload_p50': round(percentile(instance_overheads, 50), 2),
+        'instance_overhead_per_workload_p95': round(percentile(instance_overheads, 95), 2),
+        'final_status': statuses,
+        'injected': provider.stats,
+        'ssh_sessions': cep.SSH_POOL.summary() if cep.SSH_POOL.enabled else 'disabled',
+        'status_queries': cep.STATUS_CACHE.summary(),
+        'log_writer': cep.LOG_WRITER.stats,
+        'subprocesses': cep.ASYNC_CORE.summary() if cep.ASYNC_CORE.enabled else 'async core disabled',
+    }
+
+    print(f"\n{'='*80}")
+    print("ORCHESTRATOR SCALE BENCHMARK (SimulatedProvider)")
+    print(f"{'='*80}")
+    for key, value in report.items():
+        print(f"{key:<38} {value}")
+    print(f"{'='*80}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.keep:
+        print(f"Sandbox and logs kept in {work}")
+    else:
+        shutil.rmtree(work, ignore_errors=True)
+
+    # Spot mode must not lose workloads to preemption: every one completes on some relaunch
+    expected = args.instances * args.workloads
+    if args.spot and len(completed) != expected:
+        print(f"[FAIL] {len(completed)}/{expected} workloads completed under preemption")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())